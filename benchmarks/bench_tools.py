@@ -0,0 +1,358 @@
+"""
+Latency, payload and memory benchmarks for every MCP tool.
+
+Calls each tool of mcp_server.py, migration/migration_server.py and
+migration/modus-migration-md-server.py in-process against the real catalog
+and records, per case:
+
+    cold_ms          first call (lazy loads, catalog build checks)
+    p50_ms, p95_ms   latency of the warm calls
+    bytes            size of the response (UTF-8)
+    peak_kib         peak memory allocated during one call (tracemalloc)
+    error            whether the response reported an error
+
+Each server is also spawned --startup-runs times in startup-profiling mode
+(see modus_migration/startup_profile.py); its `<server>.startup` case
+records the time from spawn to the first tool response (cold_ms is the first
+run, p50/p95 over all runs) and the time spent importing modules.
+
+Usage:
+    python benchmarks/bench_tools.py                    # compare with the baseline
+    python benchmarks/bench_tools.py --update-baseline  # record a new baseline
+    python benchmarks/bench_tools.py -k search --repeat 50 --threshold 0.3
+
+Results are compared with benchmarks/baseline.json (written on the first
+run, or with --update-baseline). A case regresses when p95 latency, peak
+memory or response size exceed the baseline by more than --threshold
+(latency differences under --min-ms are ignored as noise); the script then
+exits with status 1. Baselines are machine-specific, so record one on the
+machine that runs the comparison.
+
+Every registered tool needs at least one entry in CASES: a tool added to a
+server without a benchmark case fails the run.
+"""
+
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from modus_migration.startup_profile import profile_startup
+
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, "benchmarks", "baseline.json")
+
+SAMPLE_CONNECT_JSX = """export function Settings(props) {
+  return (
+    <div>
+      <CustomInput id="name" label="Name" value={name()} error={errors().name} onChange={(e) => setName(e.target.value)} />
+      <CustomCheckbox id="notify" checked={notify()} onChange={toggleNotify} />
+      <SwitchButton name="dark" isChecked={dark()} onChange={toggleDark} />
+      <Button color="primary" onClick={save}>Save</Button>
+    </div>
+  );
+}
+"""
+
+SAMPLE_V1_MARKUP = """<modus-button button-style="outline" color="primary" size="small">Save</modus-button>
+<modus-alert type="error" message="Something went wrong" dismissible></modus-alert>
+"""
+
+# (server, tool, kwargs); a tool may have several cases
+CASES: List[Tuple[str, str, Dict[str, Any]]] = [
+    ("mcp_server", "list_components", {}),
+    ("mcp_server", "list_components", {"version": "1.0"}),
+    ("mcp_server", "generate_component", {"component_name": "button"}),
+    ("mcp_server", "generate_component", {"component_name": "table"}),
+    ("mcp_server", "get_component_release_changes", {"component_name": "button"}),
+    ("mcp_server", "find_components", {"has_prop": "disabled,size"}),
+    ("mcp_server", "find_components", {"has_event": "expandedChange", "version": "1.0"}),
+    ("mcp_server", "search_docs", {"query": "table pagination page size"}),
+    ("mcp_server", "search_docs", {"query": "indeterminate", "component_name": "checkbox"}),
+    ("mcp_server", "get_smallest_example", {"component_name": "button", "props": "color,size"}),
+    ("mcp_server", "suggest_v2_equivalent", {"component_name": "action-bar"}),
+    ("mcp_server", "get_migration_guide", {}),
+    ("mcp_server", "get_component_migration_data", {"component_name": "button"}),
+    ("mcp_server", "get_migration_data", {}),
+    ("mcp_server", "get_server_stats", {}),
+    ("migration_server", "get_analyze_guidance", {}),
+    ("migration_server", "get_migrate_guidance", {}),
+    ("migration_server", "get_verify_guidance", {}),
+    ("migration_server", "get_log_guidance", {}),
+    ("migration_server", "get_workflow_guidance", {}),
+    ("migration_server", "list_source_frameworks", {}),
+    ("migration_server", "get_guidance", {"framework": "mui", "step": "migrate"}),
+    ("migration_server", "map_component", {"framework": "shadcn", "name": "Input"}),
+    ("migration_server", "get_connect_component_mapping", {"component_name": "CustomInput"}),
+    ("migration_server", "migrate_connect_jsx", {"source": SAMPLE_CONNECT_JSX}),
+    ("migration_server", "verify_migrated_source", {"path": "sample.html", "source": SAMPLE_V1_MARKUP}),
+    ("migration_server", "get_server_stats", {}),
+    ("md_server", "analyze_code_for_migration_md", {"file_content": SAMPLE_V1_MARKUP}),
+    ("md_server", "generate_migrated_code_md", {"file_content": SAMPLE_V1_MARKUP}),
+    ("md_server", "verify_migration_with_gold_standard_md", {"migrated_content": SAMPLE_V1_MARKUP}),
+    ("md_server", "log_migration_summary_md", {"summary_input": "Migrated 2 components"}),
+    ("md_server", "run_migration_workflow_md", {"user_input": SAMPLE_V1_MARKUP}),
+]
+
+# (server, script relative to the project root) spawned for the startup cases
+STARTUP_SCRIPTS = [
+    ("mcp_server", "mcp_server.py"),
+    ("migration_server", os.path.join("migration", "migration_server.py")),
+]
+
+# Metrics compared with the baseline
+COMPARED_METRICS = ("p95_ms", "peak_kib", "bytes")
+
+
+def load_servers() -> Dict[str, Tuple[Any, Any]]:
+    """{server name: (module, FastMCP instance)}"""
+    sys.path.insert(0, os.path.join(PROJECT_ROOT, "migration"))
+    mcp_server = importlib.import_module("mcp_server")
+    migration_server = importlib.import_module("migration_server")
+    spec = importlib.util.spec_from_file_location(
+        "modus_migration_md_server",
+        os.path.join(PROJECT_ROOT, "migration", "modus-migration-md-server.py"),
+    )
+    md_server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(md_server)
+    return {
+        "mcp_server": (mcp_server, mcp_server.mcp),
+        "migration_server": (migration_server, migration_server.migration_mcp),
+        "md_server": (md_server, md_server.md_mcp),
+    }
+
+
+def registered_tools(servers: Dict[str, Tuple[Any, Any]]) -> List[Tuple[str, str]]:
+    tools = []
+    for server, (_, instance) in servers.items():
+        tools.extend((server, tool.name) for tool in asyncio.run(instance.list_tools()))
+    return tools
+
+
+def case_id(server: str, tool: str, kwargs: Dict[str, Any]) -> str:
+    if not kwargs:
+        return f"{server}.{tool}"
+    args = ",".join(
+        f"{k}={v if len(str(v)) <= 24 else '<' + str(len(str(v))) + ' chars>'}"
+        for k, v in sorted(kwargs.items())
+    )
+    return f"{server}.{tool}[{args}]"
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of `samples`."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _response_error(response: str) -> bool:
+    try:
+        data = json.loads(response)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(data, dict) and bool(data.get("error"))
+
+
+def measure(call: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        response = call()
+    except Exception as e:
+        return {"exception": f"{type(e).__name__}: {e}"}
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    # Separate pass: tracing allocations slows the call down
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    text = response if isinstance(response, str) else json.dumps(response)
+    return {
+        "cold_ms": round(cold_ms, 3),
+        "p50_ms": round(percentile(latencies, 0.5), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "bytes": len(text.encode("utf-8")),
+        "peak_kib": round(peak / 1024, 1),
+        "error": _response_error(text),
+    }
+
+
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float,
+            min_ms: float) -> List[str]:
+    """Regression messages for cases exceeding the baseline by more than `threshold`."""
+    regressions = []
+    for case, result in sorted(current.items()):
+        base = baseline.get(case)
+        if not base or "exception" in base:
+            continue
+        if "exception" in result:
+            regressions.append(f"{case}: raised {result['exception']}")
+            continue
+        if result.get("error") and not base.get("error"):
+            regressions.append(f"{case}: now returns an error")
+        for metric in COMPARED_METRICS:
+            old, new = base.get(metric), result.get(metric)
+            if old is None or new is None or new <= old * (1 + threshold):
+                continue
+            if metric.endswith("_ms") and new - old < min_ms:
+                continue
+            change = f"+{(new / old - 1) * 100:.0f}%" if old else "from 0"
+            regressions.append(f"{case}: {metric} {old} -> {new} ({change})")
+    return regressions
+
+
+def run(cases, servers, repeat: int, pattern: Optional[str] = None) -> Dict[str, Dict]:
+    results = {}
+    for server, tool, kwargs in cases:
+        name = case_id(server, tool, kwargs)
+        if pattern and pattern not in name:
+            continue
+        module = servers[server][0]
+        function = getattr(module, tool)
+        results[name] = measure(lambda: function(**kwargs), repeat)
+        result = results[name]
+        if "exception" in result:
+            print(f"  {name}: EXCEPTION {result['exception']}")
+        else:
+            print(
+                f"  {name}: p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, "
+                f"cold {result['cold_ms']:.1f} ms, {result['bytes']:,} B, "
+                f"peak {result['peak_kib']:,.0f} KiB{' (error response)' if result['error'] else ''}"
+            )
+    return results
+
+
+def measure_startup(script: str, runs: int) -> Dict[str, Any]:
+    try:
+        profiles = [profile_startup(os.path.join(PROJECT_ROOT, script)) for _ in range(runs)]
+    except Exception as e:
+        return {"exception": f"{type(e).__name__}: {e}"}
+    totals = [profile["time_to_first_tool_ms"] for profile in profiles]
+    return {
+        "cold_ms": totals[0],
+        "p50_ms": percentile(totals, 0.5),
+        "p95_ms": percentile(totals, 0.95),
+        "imports_ms": percentile([profile["imports_ms"] for profile in profiles], 0.5),
+        "error": any(profile["tool_error"] for profile in profiles),
+    }
+
+
+def run_startup(runs: int, pattern: Optional[str] = None) -> Dict[str, Dict]:
+    results = {}
+    for server, script in STARTUP_SCRIPTS:
+        name = f"{server}.startup"
+        if pattern and pattern not in name:
+            continue
+        results[name] = result = measure_startup(script, runs)
+        if "exception" in result:
+            print(f"  {name}: EXCEPTION {result['exception']}")
+        else:
+            print(
+                f"  {name}: first tool response p50 {result['p50_ms']:.0f} ms, "
+                f"p95 {result['p95_ms']:.0f} ms, imports {result['imports_ms']:.0f} ms"
+                f"{' (error response)' if result['error'] else ''}"
+            )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every MCP tool in-process.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--output", help="Also write this run's results to this JSON file")
+    parser.add_argument("--repeat", type=int, default=20, help="Warm calls per case (default: 20)")
+    parser.add_argument(
+        "--threshold", type=float, default=0.5,
+        help="Allowed relative increase over the baseline (default: 0.5 = 50%%)",
+    )
+    parser.add_argument(
+        "--min-ms", type=float, default=2.0,
+        help="Ignore latency increases smaller than this many ms (default: 2.0)",
+    )
+    parser.add_argument(
+        "--startup-runs", type=int, default=5,
+        help="Server spawns per startup case (default: 5; 0 skips the startup cases)",
+    )
+    parser.add_argument("-k", dest="pattern", help="Only run cases whose id contains this text")
+    args = parser.parse_args(argv)
+
+    # Per-call logging would dominate the latency of the small tools; error
+    # responses are recorded per case instead
+    logging.disable(logging.ERROR)
+    servers = load_servers()
+
+    covered = {(server, tool) for server, tool, _ in CASES}
+    missing = [f"{s}.{t}" for s, t in registered_tools(servers) if (s, t) not in covered]
+    if missing:
+        print(f"No benchmark case for: {', '.join(missing)} (add them to CASES)")
+        return 1
+
+    print(f"Benchmarking {len(CASES)} cases ({args.repeat} warm calls each)...")
+    results = run(CASES, servers, max(1, args.repeat), args.pattern)
+    if args.startup_runs > 0:
+        print(f"Measuring server startup ({args.startup_runs} spawns each)...")
+        results.update(run_startup(args.startup_runs, args.pattern))
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "startup_runs": args.startup_runs,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        if args.pattern and os.path.exists(args.baseline):
+            # Only replace the cases that ran
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                previous = json.load(f)
+            report["results"] = {**previous.get("results", {}), **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline.get("results", {}), args.threshold, args.min_ms)
+    new_cases = sorted(set(results) - set(baseline.get("results", {})))
+    if new_cases:
+        print(f"Not in baseline (not compared): {', '.join(new_cases)}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%} of {args.baseline}:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print(f"No regressions over {args.threshold:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""
+Load test: one shared HTTP server versus one stdio server per developer.
+
+Runs the same tool call from --clients concurrent clients against
+
+    http    one `--transport streamable-http --stateless` server with
+            --workers processes, over keep-alive connections with gzip
+    stdio   one stdio server process per client, as every developer's IDE
+            runs today
+
+and reports, per mode, requests per second, latency, bytes per response on
+the wire and the resident memory of all server processes (Linux /proc;
+"peak" is the sum of each process' high-water mark).
+
+Usage:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --clients 16 --workers 4 --requests 100
+    python benchmarks/load_test.py --tool search_docs --arguments '{"query": "table paging"}'
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.bench_tools import percentile
+
+PROTOCOL_VERSION = "2025-06-18"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _call_message(request_id: int, tool: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": tool, "arguments": arguments},
+    }
+
+
+def _status_kib(pid: int, field: str) -> int:
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _process_tree(pid: int) -> List[int]:
+    """`pid` and its descendants (Linux); just `pid` elsewhere."""
+    children: Dict[int, List[int]] = {}
+    if os.path.isdir("/proc"):
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "r", encoding="utf-8") as f:
+                    # The command name may contain spaces; fields follow the last ')'
+                    parent = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(parent, []).append(int(entry))
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(children.get(current, []))
+    return tree
+
+
+def memory_mib(pids: List[int]) -> Dict[str, float]:
+    return {
+        "rss_mib": round(sum(_status_kib(p, "VmRSS") for p in pids) / 1024, 1),
+        "peak_mib": round(sum(_status_kib(p, "VmHWM") for p in pids) / 1024, 1),
+    }
+
+
+class HttpClient:
+    """Keep-alive MCP client for a stateless streamable HTTP endpoint."""
+
+    def __init__(self, port: int, compress: bool):
+        self.connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        self.headers = {
+            "Accept": "application/json, text/event-stream",
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip" if compress else "identity",
+        }
+
+    def request(self, message: Dict[str, Any]) -> Tuple[int, bytes, int]:
+        """(status, decoded body, bytes received) of one JSON-RPC request."""
+        self.connection.request("POST", "/mcp", json.dumps(message), self.headers)
+        response = self.connection.getresponse()
+        body = response.read()
+        size = len(body)
+        if response.getheader("Content-Encoding") == "gzip":
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        return response.status, body, size
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def _summary(latencies: List[float], sizes: List[int], errors: int, elapsed: float) -> Dict[str, Any]:
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.5), 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95), 2) if latencies else None,
+        "bytes_per_response": round(sum(sizes) / len(sizes)) if sizes else 0,
+    }
+
+
+def _run_clients(clients: int, client) -> Dict[str, Any]:
+    """Run client(index, record) in `clients` threads; record(latency_ms, bytes, ok)."""
+    latencies: List[float] = []
+    sizes: List[int] = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def record(latency_ms: float, size: int, ok: bool) -> None:
+        with lock:
+            latencies.append(latency_ms)
+            sizes.append(size)
+            if not ok:
+                errors[0] += 1
+
+    threads = [threading.Thread(target=client, args=(i, record)) for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return _summary(latencies, sizes, errors[0], time.perf_counter() - started)
+
+
+def run_http(script: str, clients: int, requests: int, workers: int, tool: str,
+             arguments: Dict[str, Any], compress: bool) -> Dict[str, Any]:
+    port = _free_port()
+    command = [
+        sys.executable, script, "--transport", "streamable-http", "--stateless",
+        "--port", str(port), "--workers", str(workers),
+    ]
+    if not compress:
+        command += ["--compress-min-bytes", "0"]
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        started = time.perf_counter()
+        while True:
+            probe = HttpClient(port, compress)
+            try:
+                probe.request(_call_message(0, tool, arguments))
+                break
+            except OSError:
+                if server.poll() is not None or time.perf_counter() - started > 120:
+                    raise RuntimeError(f"HTTP server did not start (exit code {server.poll()})")
+                time.sleep(0.2)
+            finally:
+                probe.close()
+        startup_s = time.perf_counter() - started
+
+        def client(index: int, record) -> None:
+            connection = HttpClient(port, compress)
+            try:
+                connection.request(_call_message(0, tool, arguments))  # warm-up
+                for i in range(requests):
+                    start = time.perf_counter()
+                    status, body, size = connection.request(_call_message(i + 1, tool, arguments))
+                    ok = status == 200 and "error" not in json.loads(body)
+                    record((time.perf_counter() - start) * 1000, size, ok)
+            finally:
+                connection.close()
+
+        result = _run_clients(clients, client)
+        result.update(memory_mib(_process_tree(server.pid)))
+        result.update(mode=f"http x{workers}{'' if compress else ' (no compression)'}",
+                      processes=len(_process_tree(server.pid)), startup_s=round(startup_s, 2))
+        return result
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+class StdioClient:
+    """Minimal MCP client over a server subprocess' stdin/stdout."""
+
+    def __init__(self, script: str):
+        self.process = subprocess.Popen(
+            [sys.executable, script], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True, encoding="utf-8", bufsize=1,
+        )
+        self.request({"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "load-test", "version": "1"},
+        }})
+        self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        self.process.stdin.write(json.dumps(message) + "\n")
+        self.process.stdin.flush()
+
+    def request(self, message: Dict[str, Any]) -> str:
+        """Send a request; the raw line of its response."""
+        self._send(message)
+        while True:
+            line = self.process.stdout.readline()
+            if not line:
+                raise RuntimeError("stdio server exited")
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue  # e.g. a print() from the server
+            if isinstance(response, dict) and response.get("id") == message["id"]:
+                return line
+
+    def close(self) -> None:
+        self.process.stdin.close()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def run_stdio(script: str, clients: int, requests: int, tool: str,
+              arguments: Dict[str, Any]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    servers = [StdioClient(script) for _ in range(clients)]
+    startup_s = time.perf_counter() - started
+    try:
+        def client(index: int, record) -> None:
+            server = servers[index]
+            server.request(_call_message(1, tool, arguments))  # warm-up
+            for i in range(requests):
+                start = time.perf_counter()
+                line = server.request(_call_message(i + 2, tool, arguments))
+                record((time.perf_counter() - start) * 1000, len(line.encode("utf-8")),
+                       "error" not in json.loads(line))
+
+        result = _run_clients(clients, client)
+        pids = [pid for server in servers for pid in _process_tree(server.process.pid)]
+        result.update(memory_mib(pids))
+        result.update(mode="stdio", processes=len(pids), startup_s=round(startup_s, 2))
+        return result
+    finally:
+        for server in servers:
+            server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare one HTTP server with N stdio servers.")
+    parser.add_argument("--script", default=os.path.join(PROJECT_ROOT, "mcp_server.py"),
+                        help="Server script (default: mcp_server.py)")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent clients (default: 8)")
+    parser.add_argument("--requests", type=int, default=50, help="Calls per client (default: 50)")
+    parser.add_argument("--workers", type=int, default=2, help="HTTP worker processes (default: 2)")
+    parser.add_argument("--tool", default="get_component_migration_data", help="Tool to call")
+    parser.add_argument("--arguments", default='{"component_name": "button"}',
+                        help="Tool arguments as JSON")
+    parser.add_argument("--modes", default="http,http-plain,stdio",
+                        help="Comma-separated: http, http-plain (no compression), stdio")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+    arguments = json.loads(args.arguments)
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+
+    results = []
+    for mode in modes:
+        print(f"Running {mode} with {args.clients} clients x {args.requests} calls of {args.tool}...")
+        if mode == "stdio":
+            result = run_stdio(args.script, args.clients, args.requests, args.tool, arguments)
+        else:
+            result = run_http(args.script, args.clients, args.requests, args.workers, args.tool,
+                              arguments, compress=mode == "http")
+        results.append(result)
+
+    print(f"\n{'mode':<28}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'B/resp':>9}"
+          f"{'procs':>7}{'RSS MiB':>9}{'peak MiB':>10}{'errors':>8}")
+    for r in results:
+        print(f"{r['mode']:<28}{r['rps']:>8}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['bytes_per_response']:>9}"
+              f"{r['processes']:>7}{r['rss_mib']:>9}{r['peak_mib']:>10}{r['errors']:>8}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"clients": args.clients, "requests": args.requests, "tool": args.tool,
+                       "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
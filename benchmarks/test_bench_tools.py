@@ -0,0 +1,40 @@
+import unittest
+
+from benchmarks.bench_tools import case_id, compare, percentile
+
+
+class TestBenchTools(unittest.TestCase):
+    def test_percentile(self):
+        samples = [5.0, 1.0, 3.0, 2.0, 4.0]
+        self.assertEqual(percentile(samples, 0.5), 3.0)
+        self.assertEqual(percentile(samples, 0.95), 5.0)
+        self.assertEqual(percentile([7.0], 0.95), 7.0)
+
+    def test_case_id(self):
+        self.assertEqual(case_id("mcp_server", "list_components", {}), "mcp_server.list_components")
+        self.assertEqual(
+            case_id("mcp_server", "search_docs", {"query": "x" * 30, "top_k": 3}),
+            "mcp_server.search_docs[query=<30 chars>,top_k=3]",
+        )
+
+    def test_compare(self):
+        baseline = {
+            "a": {"p95_ms": 10.0, "peak_kib": 100.0, "bytes": 1000, "error": False},
+            "b": {"p95_ms": 0.2, "peak_kib": 10.0, "bytes": 50, "error": False},
+        }
+        current = {
+            "a": {"p95_ms": 16.0, "peak_kib": 120.0, "bytes": 1000, "error": True},
+            # +100% latency, but below min_ms
+            "b": {"p95_ms": 0.4, "peak_kib": 10.0, "bytes": 50, "error": False},
+            "new": {"p95_ms": 1.0, "peak_kib": 1.0, "bytes": 1, "error": False},
+        }
+        self.assertEqual(
+            compare(current, baseline, threshold=0.5, min_ms=2.0),
+            ["a: now returns an error", "a: p95_ms 10.0 -> 16.0 (+60%)"],
+        )
+        self.assertEqual(compare({"a": {"exception": "KeyError: 'x'"}}, baseline, 0.5, 2.0),
+                         ["a: raised KeyError: 'x'"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,398 @@
+"""
+Indexed access to the Connect-UI -> Modus mapping, and a deterministic JSX
+rewriter for the simple migration types.
+
+connect_ui_to_modus_mapping.json describes each mapping in prose
+("input-id prop", "inputChange event", "not available", ...). Loading it once
+turns every property and event mapping into a ConnectRule:
+
+    rename   `id="x"`            -> `input-id="x"`
+    event    `onChange={f}`      -> `on:inputChange={f}` (see EVENT_SYNTAX)
+    object   `error="Required"`  -> `feedback={{ message: "Required", level: 'error' }}`
+    child    `error="Oops"`      -> rendered as the element's text content
+    drop     mapped to "not available"; removed and reported
+    manual   anything else; the attribute is kept as-is and reported
+
+plan_jsx_edits() applies the rules to every element of a "direct" or
+"direct_with_children" Connect component in a source file, renaming the tag
+to its Modus equivalent, and returns the changes as an edit list (see
+modus_migration/source_edits.py); rewrite_jsx() returns the rewritten source.
+Other migration types are reported, not rewritten.
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from modus_migration.source_edits import Edit, LineIndex, apply_edits
+
+CONNECT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "component_analysis")
+MAPPING_FILE = "connect_ui_to_modus_mapping.json"
+COMPONENTS_FILE = "connect_ui_components.json"
+
+REWRITABLE_TYPES = ("direct", "direct_with_children")
+
+# How a Modus event listener is written, per JSX framework
+EVENT_SYNTAX = {
+    "solid": lambda event: f"on:{event}",
+    "react": lambda event: f"on{event[0].upper()}{event[1:]}",
+    "lit": lambda event: f"@{event}",
+}
+
+_NOT_AVAILABLE = re.compile(r"^not available\b", re.IGNORECASE)
+_RENAME = re.compile(r"^([A-Za-z][\w-]*)(?:\s+prop)?(?:\s*\(([^)]*)\))?$")
+_EVENT = re.compile(r"^(?:on([A-Z]\w*)\s+event handler|([a-z]\w*)\s+event)(?:\s*\(([^)]*)\))?$")
+_OBJECT = re.compile(r"^(\w+)\.(\w+) with \1\.(\w+)\s*=\s*'([^']*)'$")
+_CHILD = re.compile(r"(?:^|\b)(?:use as text content in|place in) default slot", re.IGNORECASE)
+_CONNECT_TAG = re.compile(r"<([A-Z][A-Za-z0-9]*)(?=[\s/>])")
+
+
+class ConnectRule(NamedTuple):
+    kind: str  # rename | event | object | child | drop | manual
+    target: Optional[str]
+    note: Optional[str]
+    source_text: str
+
+
+def parse_mapping_text(text: str) -> ConnectRule:
+    """Structured rule for one property_mappings/event_mappings value."""
+    text = (text or "").strip()
+    if _NOT_AVAILABLE.match(text):
+        return ConnectRule("drop", None, text, text)
+    match = _EVENT.match(text)
+    if match:
+        handler, event, note = match.groups()
+        event = event or f"{handler[0].lower()}{handler[1:]}"
+        return ConnectRule("event", event, note, text)
+    match = _OBJECT.match(text)
+    if match:
+        obj, key, fixed_key, fixed_value = match.groups()
+        return ConnectRule("object", obj, json.dumps({"key": key, fixed_key: fixed_value}), text)
+    match = _RENAME.match(text)
+    if match and not re.search(r"\bon\b.*\bchild\b", match.group(2) or ""):
+        return ConnectRule("rename", match.group(1), match.group(2), text)
+    if _CHILD.search(text):
+        return ConnectRule("child", None, text, text)
+    return ConnectRule("manual", None, text, text)
+
+
+class ConnectMappingIndex:
+    """Connect component -> mapping entry and (component, prop) -> ConnectRule."""
+
+    def __init__(self, mapping: Dict[str, Any], components: Dict[str, Any]):
+        self.mapping = mapping
+        self.components = components
+        self._names = {name.lower(): name for name in mapping}
+        self.rules: Dict[str, Dict[str, ConnectRule]] = {}
+        for name, entry in mapping.items():
+            rules = {
+                prop: parse_mapping_text(text)
+                for prop, text in (entry.get("property_mappings") or {}).items()
+            }
+            # event_mappings are authoritative for handler props
+            for event, text in (entry.get("event_mappings") or {}).items():
+                rules[event] = parse_mapping_text(text)
+            self.rules[name] = rules
+
+    @classmethod
+    def load(cls, data_dir: str = CONNECT_DATA_DIR) -> "ConnectMappingIndex":
+        with open(os.path.join(data_dir, MAPPING_FILE), "r", encoding="utf-8") as f:
+            mapping = json.load(f)
+        components_path = os.path.join(data_dir, COMPONENTS_FILE)
+        components = {}
+        if os.path.exists(components_path):
+            with open(components_path, "r", encoding="utf-8") as f:
+                components = json.load(f)
+        return cls(mapping, components)
+
+    def resolve_name(self, name: str) -> Optional[str]:
+        return self._names.get(name.lower())
+
+    def entry(self, name: str) -> Optional[Dict[str, Any]]:
+        resolved = self.resolve_name(name)
+        return self.mapping[resolved] if resolved else None
+
+    def rule(self, component: str, prop: str) -> Optional[ConnectRule]:
+        resolved = self.resolve_name(component)
+        return self.rules.get(resolved, {}).get(prop) if resolved else None
+
+    def is_rewritable(self, component: str) -> bool:
+        entry = self.entry(component)
+        return bool(
+            entry
+            and entry.get("migration_type") in REWRITABLE_TYPES
+            and str(entry.get("modus_equivalent", "")).startswith("modus-")
+        )
+
+
+_cached: Dict[str, Tuple[Tuple, ConnectMappingIndex]] = {}
+# [hits, misses] of get_index
+_index_counts = [0, 0]
+
+
+def _file_signature(path: str) -> Tuple:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (None, None)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def get_index(data_dir: str = CONNECT_DATA_DIR) -> ConnectMappingIndex:
+    """Index of `data_dir`, loaded once and reloaded only when its files change."""
+    signature = tuple(
+        _file_signature(os.path.join(data_dir, name)) for name in (MAPPING_FILE, COMPONENTS_FILE)
+    )
+    cached = _cached.get(data_dir)
+    if cached is None or cached[0] != signature:
+        cached = (signature, ConnectMappingIndex.load(data_dir))
+        _cached[data_dir] = cached
+        _index_counts[1] += 1
+    else:
+        _index_counts[0] += 1
+    return cached[1]
+
+
+def cache_stats() -> Dict[str, Tuple[int, int]]:
+    """{"index": (hits, misses)} of get_index."""
+    return {"index": tuple(_index_counts)}
+
+
+# --- JSX scanning ---
+
+
+def _skip_string(source: str, pos: int) -> int:
+    quote = source[pos]
+    pos += 1
+    while pos < len(source) and source[pos] != quote:
+        pos += 2 if source[pos] == "\\" else 1
+    return pos + 1
+
+
+def _skip_braces(source: str, pos: int) -> int:
+    """Index just past the `}` matching the `{` at `pos`."""
+    depth = 0
+    while pos < len(source):
+        char = source[pos]
+        if char in "\"'`":
+            pos = _skip_string(source, pos)
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    raise ValueError("unbalanced braces in JSX expression")
+
+
+def _scan_opening_tag(source: str, pos: int) -> Tuple[List[Tuple[Optional[str], Optional[str]]], int, bool]:
+    """Attributes of the opening tag whose name ends at `pos`.
+
+    Returns ([(name, raw value)], index after the tag, self_closing); spread
+    attributes have name None and value `{...expr}`; boolean attributes have
+    value None.
+    """
+    attributes = []
+    while pos < len(source):
+        while pos < len(source) and source[pos].isspace():
+            pos += 1
+        if source.startswith("/>", pos):
+            return attributes, pos + 2, True
+        if source.startswith(">", pos):
+            return attributes, pos + 1, False
+        if source[pos] == "{":
+            end = _skip_braces(source, pos)
+            attributes.append((None, source[pos:end]))
+            pos = end
+            continue
+        match = re.compile(r"[\w:.@-]+").match(source, pos)
+        if not match:
+            raise ValueError(f"unexpected {source[pos]!r} in JSX tag at offset {pos}")
+        name, pos = match.group(0), match.end()
+        while pos < len(source) and source[pos].isspace():
+            pos += 1
+        if not source.startswith("=", pos):
+            attributes.append((name, None))
+            continue
+        pos += 1
+        while pos < len(source) and source[pos].isspace():
+            pos += 1
+        end = _skip_braces(source, pos) if source[pos] == "{" else _skip_string(source, pos)
+        attributes.append((name, source[pos:end]))
+        pos = end
+    raise ValueError("unterminated JSX tag")
+
+
+def _find_closing_tag(source: str, name: str, pos: int) -> Tuple[int, int]:
+    """(start, end) of the `</name>` closing the element whose children start at `pos`.
+
+    Expression containers and the attributes of other elements are skipped,
+    so `{"</Panel>"}` in the children does not end the element.
+    """
+    tag = re.compile(r"<(/?)([A-Za-z][\w.:-]*)\s*")
+    depth = 1
+    while pos < len(source):
+        char = source[pos]
+        if char == "{":
+            pos = _skip_braces(source, pos)
+            continue
+        match = tag.match(source, pos) if char == "<" else None
+        if not match:
+            pos += 1
+            continue
+        closing, tag_name = match.groups()
+        if closing:
+            end = source.index(">", match.end()) + 1
+            if tag_name == name:
+                depth -= 1
+                if depth == 0:
+                    return pos, end
+            pos = end
+            continue
+        _, pos, self_closing = _scan_opening_tag(source, pos + 1 + len(tag_name))
+        if tag_name == name and not self_closing:
+            depth += 1
+    raise ValueError(f"no closing tag for <{name}>")
+
+
+def _expression(raw: Optional[str]) -> str:
+    """JS expression for a raw attribute value (`"x"`, `{expr}` or boolean)."""
+    if raw is None:
+        return "true"
+    return raw[1:-1].strip() if raw.startswith("{") else raw
+
+
+def _child_content(raw: Optional[str]) -> str:
+    if raw is None:
+        return ""
+    return raw[1:-1] if raw[0] in "\"'" else raw
+
+
+def rewrite_element(index: ConnectMappingIndex, component: str,
+                    attributes: List[Tuple[Optional[str], Optional[str]]],
+                    event_syntax: str = "solid") -> Tuple[List[str], List[str], Dict[str, List]]:
+    """Apply a component's rules to its attributes.
+
+    Returns (new attribute strings, child content, report).
+    """
+    event_name = EVENT_SYNTAX[event_syntax]
+    output: List[str] = []
+    children: List[str] = []
+    objects: Dict[str, List[str]] = {}
+    report: Dict[str, List] = {"applied": [], "dropped": [], "manual": [], "unmapped": []}
+
+    for name, raw in attributes:
+        if name is None:
+            output.append(raw)
+            report["unmapped"].append(raw)
+            continue
+        rule = index.rule(component, name)
+        original = name if raw is None else f"{name}={raw}"
+        if rule is None:
+            output.append(original)
+            report["unmapped"].append(name)
+        elif rule.kind == "drop":
+            report["dropped"].append({"prop": name, "reason": rule.source_text})
+        elif rule.kind == "rename":
+            output.append(rule.target if raw is None else f"{rule.target}={raw}")
+            report["applied"].append({"prop": name, "to": rule.target, "note": rule.note})
+        elif rule.kind == "event":
+            output.append(f"{event_name(rule.target)}={raw}")
+            report["applied"].append({"prop": name, "to": event_name(rule.target), "note": rule.note})
+        elif rule.kind == "object":
+            fields = json.loads(rule.note)
+            key = fields.pop("key")
+            entries = objects.setdefault(rule.target, [])
+            entries.append(f"{key}: {_expression(raw)}")
+            entries.extend(f"{k}: '{v}'" for k, v in fields.items() if f"{k}: '{v}'" not in entries)
+            report["applied"].append({"prop": name, "to": f"{rule.target}.{key}", "note": None})
+        elif rule.kind == "child":
+            children.append(_child_content(raw))
+            report["applied"].append({"prop": name, "to": "default slot", "note": None})
+        else:
+            output.append(original)
+            report["manual"].append({"prop": name, "instruction": rule.source_text})
+
+    for obj, entries in objects.items():
+        output.append(f"{obj}={{{{ {', '.join(entries)} }}}}")
+    return output, children, report
+
+
+def _format_attributes(attributes: List[str], original_tag: str) -> str:
+    if not attributes:
+        return ""
+    if "\n" in original_tag:
+        indent = re.search(r"\n([ \t]*)\S", original_tag)
+        pad = indent.group(1) if indent else "  "
+        return "".join(f"\n{pad}{a}" for a in attributes) + "\n" + pad[: max(0, len(pad) - 2)]
+    return " " + " ".join(attributes)
+
+
+def plan_jsx_edits(source: str, index: ConnectMappingIndex,
+                   event_syntax: str = "solid") -> Tuple[List[Edit], List[Dict[str, Any]]]:
+    """The edits rewriting the direct-migration Connect elements of a JSX/TSX
+    source, in source order, and one report entry per Connect element found.
+    """
+    if event_syntax not in EVENT_SYNTAX:
+        raise ValueError(f"event_syntax must be one of {sorted(EVENT_SYNTAX)}")
+    edits: List[Edit] = []
+    elements: List[Dict[str, Any]] = []
+    lines = LineIndex(source)
+
+    scanned_until = 0
+    for match in _CONNECT_TAG.finditer(source):
+        if match.start() < scanned_until:
+            # Inside the attributes of an element already handled
+            continue
+        tag = match.group(1)
+        component = index.resolve_name(tag)
+        if component is None or component != tag:
+            continue
+        entry = index.mapping[component]
+        line = lines.line_of(match.start()) + 1
+        if not index.is_rewritable(component):
+            elements.append({
+                "component": component,
+                "line": line,
+                "rewritten": False,
+                "migration_type": entry.get("migration_type"),
+                "modus_equivalent": entry.get("modus_equivalent"),
+                "migration_notes": entry.get("migration_notes"),
+            })
+            continue
+
+        modus_tag = entry["modus_equivalent"]
+        attributes, tag_end, self_closing = _scan_opening_tag(source, match.end())
+        scanned_until = tag_end
+        new_attributes, children, report = rewrite_element(index, component, attributes, event_syntax)
+        opening = f"<{modus_tag}{_format_attributes(new_attributes, source[match.start():tag_end])}>"
+        child_text = "".join(children)
+        if self_closing:
+            edits.append(Edit(match.start(), tag_end - match.start(), f"{opening}{child_text}</{modus_tag}>"))
+        else:
+            close_start, close_end = _find_closing_tag(source, tag, tag_end)
+            edits.append(Edit(match.start(), tag_end - match.start(), opening + child_text))
+            edits.append(Edit(close_start, close_end - close_start, f"</{modus_tag}>"))
+        elements.append({
+            "component": component,
+            "line": line,
+            "rewritten": True,
+            "modus_equivalent": modus_tag,
+            **report,
+        })
+
+    # Closing tags of nested elements come after the edits of their children
+    return sorted(edits), elements
+
+
+def rewrite_jsx(source: str, index: ConnectMappingIndex,
+                event_syntax: str = "solid") -> Tuple[str, List[Dict[str, Any]]]:
+    """Rewrite the direct-migration Connect elements of a JSX/TSX source.
+
+    Returns the new source and one report entry per Connect element found.
+    """
+    edits, elements = plan_jsx_edits(source, index, event_syntax)
+    return apply_edits(source, edits), elements
@@ -0,0 +1,94 @@
+import unittest
+
+from connect_migration.connect_mapping import (
+    ConnectMappingIndex,
+    parse_mapping_text,
+    rewrite_jsx,
+)
+
+
+class TestParseMappingText(unittest.TestCase):
+    def test_rule_kinds(self):
+        self.assertEqual(parse_mapping_text("input-id prop").target, "input-id")
+        self.assertEqual(parse_mapping_text("value (0-100)").note, "0-100")
+        self.assertEqual(parse_mapping_text("inputChange event").target, "inputChange")
+        self.assertEqual(parse_mapping_text("onInputChange event handler").target, "inputChange")
+        self.assertEqual(parse_mapping_text("not available (use custom-class)").kind, "drop")
+        self.assertEqual(parse_mapping_text("Use as text content in default slot").kind, "child")
+        self.assertEqual(parse_mapping_text("Handle via custom logic in parent").kind, "manual")
+        rule = parse_mapping_text("feedback.message with feedback.level='error'")
+        self.assertEqual((rule.kind, rule.target), ("object", "feedback"))
+
+
+class TestRewriteJsx(unittest.TestCase):
+    def setUp(self):
+        self.index = ConnectMappingIndex(
+            {
+                "CustomInput": {
+                    "modus_equivalent": "modus-wc-text-input",
+                    "migration_type": "direct",
+                    "property_mappings": {
+                        "id": "input-id prop",
+                        "label": "label",
+                        "data-cy": "not available",
+                        "error": "feedback.message with feedback.level='error'",
+                        "touched": "Handle via custom logic",
+                    },
+                    "event_mappings": {"onChange": "inputChange event"},
+                },
+                "Panel": {
+                    "modus_equivalent": "modus-wc-card",
+                    "migration_type": "direct_with_children",
+                    "property_mappings": {"title": "header"},
+                },
+                "Modal": {
+                    "modus_equivalent": "modus-wc-modal",
+                    "migration_type": "direct_with_slots",
+                    "migration_notes": "Move header into the header slot",
+                },
+            },
+            {},
+        )
+
+    def test_direct_element(self):
+        source = '<CustomInput id="a" label={t("Name")} data-cy="x" error="Required" onChange={(e) => { set(e); }} touched />'
+        migrated, elements = rewrite_jsx(source, self.index)
+        self.assertEqual(
+            migrated,
+            '<modus-wc-text-input input-id="a" label={t("Name")} on:inputChange={(e) => { set(e); }} touched '
+            "feedback={{ message: \"Required\", level: 'error' }}></modus-wc-text-input>",
+        )
+        report = elements[0]
+        self.assertEqual([d["prop"] for d in report["dropped"]], ["data-cy"])
+        self.assertEqual([m["prop"] for m in report["manual"]], ["touched"])
+
+    def test_event_syntax(self):
+        source = "<CustomInput onChange={f} />"
+        self.assertIn("onInputChange={f}", rewrite_jsx(source, self.index, "react")[0])
+        self.assertIn("@inputChange={f}", rewrite_jsx(source, self.index, "lit")[0])
+        with self.assertRaises(ValueError):
+            rewrite_jsx(source, self.index, "vue")
+
+    def test_nested_children_and_skipped_types(self):
+        source = (
+            '<Panel title="Outer">\n'
+            '  <Panel title="Inner"><p>{"</Panel>"}</p></Panel>\n'
+            "  <Panel />\n"
+            "  <Modal open />\n"
+            "</Panel>"
+        )
+        migrated, elements = rewrite_jsx(source, self.index)
+        self.assertEqual(
+            migrated,
+            '<modus-wc-card header="Outer">\n'
+            '  <modus-wc-card header="Inner"><p>{"</Panel>"}</p></modus-wc-card>\n'
+            "  <modus-wc-card></modus-wc-card>\n"
+            "  <Modal open />\n"
+            "</modus-wc-card>",
+        )
+        self.assertEqual([e["rewritten"] for e in elements], [True, True, True, False])
+        self.assertEqual(elements[3]["migration_type"], "direct_with_slots")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,20 @@ import json
 import logging
 import os
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+from modus_migration.admission import BULK, HEAVY, AdmissionControl
+from modus_migration.catalog_model import Component, item_field, text
+from modus_migration.catalog_store import CatalogStore
+from modus_migration.doc_search import snippet
+from modus_migration.http_serving import serve
+from modus_migration.release_catalog import (
+    component_changes,
+    release_components,
+)
+from modus_migration.server_metrics import ServerMetrics
+from modus_migration.startup_profile import handle_startup_profile
+from modus_migration.tracing import span, traced
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -11,6 +24,28 @@ logger = logging.getLogger(__name__)
 
 # Create FastMCP server instance
 mcp = FastMCP("Modus Web Components Server")
+# Records every tool registered below (see get_server_stats)
+server_metrics = ServerMetrics(mcp)
+# Tools not listed run inline as the fast lane; these queue for a worker thread
+admission = AdmissionControl(
+    mcp,
+    {
+        "get_migration_data": BULK,
+        "get_component_migration_data": HEAVY,
+        "generate_component": HEAVY,
+        "suggest_v2_equivalent": HEAVY,
+    },
+)
+
+# Compiled, cached component catalogs (rebuilt when the extractor output changes)
+catalog_store = CatalogStore(
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "modus_migration",
+        "component_analysis",
+    )
+)
+server_metrics.add_caches("catalog", catalog_store.cache_stats)
 
 
 @mcp.tool()
@@ -38,14 +73,8 @@ def list_components(version: str = "2.0") -> str:
 
     # Load components file from the modus_migration/component_analysis folder
     try:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        data_path = os.path.join(
-            script_dir, "modus_migration", "component_analysis", file_name
-        )
-
-        with open(data_path, "r") as f:
-            components_data = json.load(f)
-            logger.info(f"Loaded {file_name} with {len(components_data)} components")
+        components_data = catalog_store.model(version)
+        logger.info(f"Loaded {file_name} with {len(components_data)} components")
     except Exception as e:
         logger.error(f"Error loading {file_name}: {e}")
         return json.dumps({"error": f"Error loading component data: {str(e)}"})
@@ -60,12 +89,12 @@ def list_components(version: str = "2.0") -> str:
             )
 
             # Get component description from documentation or first prop description
-            description = data.get("documentation", "")
-            if not description and data.get("props") and len(data["props"]) > 0:
-                for prop in data["props"]:
-                    if isinstance(prop, dict) and prop.get("description"):
+            description = text(data.documentation)
+            if not description:
+                for prop in data.props:
+                    if item_field(prop, "description"):
                         description = (
-                            f"A component that supports {prop.get('description')}"
+                            f"A component that supports {text(item_field(prop, 'description'))}"
                         )
                         break
 
@@ -73,27 +102,19 @@ def list_components(version: str = "2.0") -> str:
             capabilities = []
 
             # Add prop-based capabilities
-            for prop in data.get("props", []):
-                # Ensure prop is a dictionary before accessing its properties
-                if not isinstance(prop, dict):
-                    continue
-
-                prop_name = prop.get("name", "")
+            for prop in data.props:
+                prop_name = item_field(prop, "name")
                 if prop_name:
                     capabilities.append(f"Can be configured with '{prop_name}'")
 
             # Add event-based capabilities
-            for event in data.get("events", []):
-                # Ensure event is a dictionary before accessing its properties
-                if not isinstance(event, dict):
-                    continue
-
-                event_name = event.get("name", "")
+            for event in data.events:
+                event_name = item_field(event, "name")
                 if event_name:
                     capabilities.append(f"Emits '{event_name}' event")
 
             # Add slot-based capabilities
-            for slot in data.get("slots", []):
+            for slot in data.slots:
                 # Ensure slot is a dictionary before accessing its properties
                 if not isinstance(slot, dict):
                     continue
@@ -129,14 +150,25 @@ def list_components(version: str = "2.0") -> str:
     return json.dumps(result, indent=2)
 
 
+def _entry_field(entry, name: str, default: Any) -> Any:
+    """Resolved field of a catalog model Component or a release-catalog dict."""
+    if isinstance(entry, Component):
+        return entry.field(name) if name in entry.fields() else default
+    return catalog_store.resolve(entry.get(name, default))
+
+
 @mcp.tool()
-def generate_component(component_name: str, version: str = "2.0") -> str:
+def generate_component(
+    component_name: str, version: str = "2.0", release: Optional[str] = None
+) -> str:
     """
     Extract component data from v1_components.json or v2_components.json for the requested web component
 
     Args:
         component_name: The name of the component (e.g., 'button', 'alert', 'autocomplete')
         version: The version of Modus components to use ("1.0" or "2.0")
+        release: Optional release tag (e.g., '2.1.0') to read from the multi-release
+                 catalog instead of the latest extracted components
 
     Returns:
         JSON string with component properties, events, and other metadata
@@ -144,8 +176,11 @@ def generate_component(component_name: str, version: str = "2.0") -> str:
     Example:
         >>> generate_component('button')
         >>> generate_component('button', version="1.0")
+        >>> generate_component('button', release="2.1.0")
     """
-    logger.info(f"Extracting data for component: {component_name} (version {version})")
+    logger.info(
+        f"Extracting data for component: {component_name} (version {version}, release {release or 'latest'})"
+    )
 
     # Determine which file to load based on version
     file_name = "v1_components.json" if version == "1.0" else "v2_components.json"
@@ -159,16 +194,15 @@ def generate_component(component_name: str, version: str = "2.0") -> str:
         f"{component_name}{file_extension}",
     ]
 
-    # Load components file from the modus_migration/component_analysis folder
+    # Load the components from the catalog store (cached until the file changes)
     try:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        data_path = os.path.join(
-            script_dir, "modus_migration", "component_analysis", file_name
-        )
-
-        with open(data_path, "r") as f:
-            components_data = json.load(f)
-            logger.info(f"Loaded {file_name} with {len(components_data)} components")
+        if release:
+            catalog = catalog_store.release_catalog("v1" if version == "1.0" else "v2")
+            components_data = release_components(catalog, release)
+            file_name = f"release {release}"
+        else:
+            components_data = catalog_store.model(version)
+        logger.info(f"Loaded {file_name} with {len(components_data)} components")
     except Exception as e:
         logger.error(f"Error loading {file_name}: {e}")
         return json.dumps({"error": f"Error loading component data: {str(e)}"})
@@ -231,15 +265,406 @@ def generate_component(component_name: str, version: str = "2.0") -> str:
         "tag_name": tag_name,
         "found_key": found_key,  # Include the actual key found for debugging
         "version": version,
-        "props": component_data.get("props", []),
-        "events": component_data.get("events", []),
-        "slots": component_data.get("slots", []),
-        "documentation": component_data.get("documentation", ""),
+        "release": release,
+        "props": _entry_field(component_data, "props", []),
+        "events": _entry_field(component_data, "events", []),
+        "slots": _entry_field(component_data, "slots", []),
+        "documentation": _entry_field(component_data, "documentation", ""),
+    }
+
+    return json.dumps(result, indent=2)
+
+
+@mcp.tool()
+def get_component_release_changes(
+    component_name: str,
+    version: str = "2.0",
+    from_release: Optional[str] = None,
+    to_release: Optional[str] = None,
+) -> str:
+    """
+    Get the props, events and slots that were added, removed or changed type across releases
+
+    Reads the diff index of the multi-release catalog built with
+    `component_extractor.py --releases`.
+
+    Args:
+        component_name: The name of the component (e.g., 'button', 'modus-wc-button')
+        version: The version of Modus components to use ("1.0" or "2.0")
+        from_release: Only report changes made after this release (exclusive)
+        to_release: Only report changes up to this release (inclusive)
+
+    Returns:
+        JSON string with the known releases and per-release changes of the component
+
+    Example:
+        >>> get_component_release_changes('button', from_release='2.0.0')
+    """
+    logger.info(
+        f"Getting release changes for component: {component_name} (version {version})"
+    )
+    tag_prefix = "modus-" if version == "1.0" else "modus-wc-"
+
+    try:
+        catalog = catalog_store.release_catalog("v1" if version == "1.0" else "v2")
+    except Exception as e:
+        logger.error(f"Error loading release catalog: {e}")
+        return json.dumps(
+            {
+                "error": f"Error loading release catalog: {str(e)}",
+                "tip": "Build it with: python modus_migration/component_extractor.py --releases v2=<tag>,<tag>",
+            }
+        )
+
+    tag_name = (
+        component_name
+        if component_name.startswith(tag_prefix)
+        else f"{tag_prefix}{component_name}"
+    )
+    present_in = [
+        ref for ref in catalog.get("releases", []) if tag_name in catalog["manifests"][ref]
+    ]
+    try:
+        changes = component_changes(catalog, tag_name, from_release, to_release)
+    except KeyError as e:
+        return json.dumps(
+            {
+                "error": e.args[0],
+                "releases": catalog.get("releases", []),
+            }
+        )
+
+    result = {
+        "component_name": component_name,
+        "tag_name": tag_name,
+        "version": version,
+        "releases": catalog.get("releases", []),
+        "present_in_releases": present_in,
+        "changes": changes,
+    }
+
+    return json.dumps(result, indent=2)
+
+
+@mcp.tool()
+def find_components(
+    has_prop: Optional[str] = None,
+    has_event: Optional[str] = None,
+    has_slot: Optional[str] = None,
+    has_type: Optional[str] = None,
+    version: str = "2.0",
+) -> str:
+    """
+    Find the components that have the given props, events, slots or prop type values
+
+    Names are matched case- and separator-insensitively ('valueChange' matches
+    'value-change'). Several names can be given comma-separated; a component
+    must have all of them to match.
+
+    Args:
+        has_prop: Prop name(s) the component must have (e.g., 'expanded' or 'disabled,size')
+        has_event: Event name(s) the component must emit (e.g., 'expandedChange')
+        has_slot: Slot name(s) the component must accept (e.g., 'header')
+        has_type: Token(s) that must appear in a prop type (e.g., 'primary' or 'boolean')
+        version: The version of Modus components to search ("1.0" or "2.0")
+
+    Returns:
+        JSON string with the matching components and the attribute names that matched
+
+    Example:
+        >>> find_components(has_prop='expanded')
+        >>> find_components(has_event='expandedChange', has_slot='header')
+    """
+    terms = {
+        field: [name.strip() for name in value.split(",") if name.strip()]
+        for field, value in (
+            ("prop", has_prop),
+            ("event", has_event),
+            ("slot", has_slot),
+            ("type", has_type),
+        )
+        if value
+    }
+    logger.info(f"Finding components (version {version}) with {terms}")
+    if not terms:
+        return json.dumps(
+            {"error": "Give at least one of has_prop, has_event, has_slot or has_type"}
+        )
+
+    try:
+        index = catalog_store.attribute_index(version)
+    except Exception as e:
+        logger.error(f"Error loading attribute index: {e}")
+        return json.dumps({"error": f"Error loading component data: {str(e)}"})
+
+    matches = [
+        {
+            "component": key,
+            "matched": {
+                field: sorted(
+                    {match for name in names for match in index.matched_names(field, name)}
+                )
+                for field, names in terms.items()
+            },
+        }
+        for key in index.query(**terms)
+    ]
+    # Spell out near misses so the agent can refine the query
+    unknown = {
+        f"{field}:{name}": index.similar_terms(field, name)
+        for field, names in terms.items()
+        for name in names
+        if not index.bits(field, name)
+    }
+
+    result = {
+        "version": version,
+        "query": terms,
+        "total_count": len(matches),
+        "components": matches,
     }
+    if unknown:
+        result["no_component_has"] = unknown
 
     return json.dumps(result, indent=2)
 
 
+@mcp.tool()
+def search_docs(
+    query: str,
+    version: str = "2.0",
+    top_k: int = 5,
+    component_name: Optional[str] = None,
+) -> str:
+    """
+    Full-text search (BM25) over component documentation and storybook text
+
+    Returns the best matching passages with the component and section they come
+    from, their character offsets within that section's text, and a snippet.
+
+    Args:
+        query: Free-text query (e.g., 'dismissible alert with close button')
+        version: The version of Modus components to search ("1.0" or "2.0")
+        top_k: Maximum number of passages to return
+        component_name: Optional component to restrict the search to (e.g., 'table')
+
+    Returns:
+        JSON string with ranked passages
+
+    Example:
+        >>> search_docs('table pagination page size')
+        >>> search_docs('indeterminate', component_name='checkbox')
+    """
+    logger.info(f"Searching docs (version {version}) for: {query}")
+    tag_prefix = "modus-" if version == "1.0" else "modus-wc-"
+
+    try:
+        index = catalog_store.doc_index(version)
+        components_data = catalog_store.model(version)
+    except Exception as e:
+        logger.error(f"Error loading documentation index: {e}")
+        return json.dumps({"error": f"Error loading component data: {str(e)}"})
+
+    component_key = None
+    if component_name:
+        candidates = [
+            f"{tag_prefix}{component_name}",
+            component_name,
+            f"{tag_prefix}{component_name}.tsx",
+            f"{tag_prefix}{component_name}.js",
+        ]
+        component_key = next((c for c in candidates if c in components_data), None)
+        if component_key is None:
+            return json.dumps(
+                {
+                    "error": f"Component '{component_name}' not found",
+                    "tip": f"Use list_components(version='{version}') to see all available components",
+                }
+            )
+
+    results = []
+    for score, (key, section, start, end, _) in index.search(
+        query, max(1, top_k), component=component_key
+    ):
+        section_content = components_data[key].section_text(section)
+        snippet_start, snippet_end = snippet(section_content, start, end, query)
+        results.append(
+            {
+                "component": key,
+                "section": section,
+                "score": round(score, 3),
+                "start": start,
+                "end": end,
+                "snippet": {
+                    "start": snippet_start,
+                    "end": snippet_end,
+                    "text": section_content[snippet_start:snippet_end],
+                },
+            }
+        )
+
+    return json.dumps(
+        {
+            "query": query,
+            "version": version,
+            "total_count": len(results),
+            "results": results,
+        },
+        indent=2,
+    )
+
+
+@mcp.tool()
+def get_smallest_example(
+    component_name: str,
+    props: Optional[str] = None,
+    version: str = "2.0",
+) -> str:
+    """
+    Get the smallest storybook example of a component that sets the given props
+
+    Examples are deduplicated across the catalog (whitespace and attribute
+    order ignored) and returned as first written. Without props, returns the
+    component's examples ranked by how many of its props they cover.
+
+    Args:
+        component_name: Component name (e.g., 'button')
+        props: Comma-separated props the example must set (e.g., 'color,size');
+            kebab-case and camelCase spellings are equivalent
+        version: The version of Modus components ("1.0" or "2.0")
+
+    Returns:
+        JSON string with the example and the attributes it sets on the
+        component (as written, e.g. "?full-width"); "missing" lists requested
+        props that no example of the component sets
+
+    Example:
+        >>> get_smallest_example('button', props='color,disabled')
+    """
+    logger.info(f"Finding smallest {component_name} example (version {version}) with props: {props}")
+    tag_prefix = "modus-" if version == "1.0" else "modus-wc-"
+
+    try:
+        corpus = catalog_store.example_corpus(version)
+    except Exception as e:
+        logger.error(f"Error loading example corpus: {e}")
+        return json.dumps({"error": f"Error loading component data: {str(e)}"})
+
+    candidates = [
+        f"{tag_prefix}{component_name}",
+        component_name,
+        f"{tag_prefix}{component_name}.tsx",
+        f"{tag_prefix}{component_name}.js",
+    ]
+    component_key = next((c for c in candidates if c in corpus.components), None)
+    if component_key is None:
+        return json.dumps(
+            {
+                "error": f"No storybook examples found for '{component_name}'",
+                "tip": f"Use list_components(version='{version}') to see all available components",
+            }
+        )
+
+    wanted = [p.strip() for p in (props or "").split(",") if p.strip()]
+    if not wanted:
+        return json.dumps(
+            {
+                "component": component_key,
+                "version": version,
+                "examples": corpus.ranked(component_key),
+            },
+            indent=2,
+        )
+    return json.dumps(
+        {
+            "component": component_key,
+            "version": version,
+            "props": wanted,
+            "example": corpus.smallest_covering(component_key, wanted),
+        },
+        indent=2,
+    )
+
+
+@mcp.tool()
+def suggest_v2_equivalent(component_name: str, top_k: int = 5) -> str:
+    """
+    Rank the Modus 2.0 components most similar to a Modus 1.0 component
+
+    Similarity is TF-IDF cosine similarity over tag names, prop, event and slot
+    names, and documentation, computed offline. Useful for v1 components mapped
+    to "Not Found" in the component mapping (e.g., 'data-table', 'dropdown').
+
+    Args:
+        component_name: The Modus 1.0 component (e.g., 'dropdown' or 'modus-dropdown')
+        top_k: Number of candidates to return
+
+    Returns:
+        JSON string with the current mapping and ranked v2 candidates, including
+        the prop and event names each candidate shares with the v1 component
+
+    Example:
+        >>> suggest_v2_equivalent('data-table')
+    """
+    logger.info(f"Suggesting v2 equivalents for: {component_name}")
+    v1_tag = (
+        component_name
+        if component_name.startswith("modus-")
+        else f"modus-{component_name}"
+    )
+
+    try:
+        model = catalog_store.similarity_model()
+        v1_components = catalog_store.model("1.0")
+        v2_components = catalog_store.model("2.0")
+        mapping = catalog_store.mapping().get("Mapping_v1_v2", {})
+    except Exception as e:
+        logger.error(f"Error loading similarity data: {e}")
+        return json.dumps({"error": f"Error loading component data: {str(e)}"})
+
+    if v1_tag not in model.v1_keys:
+        return json.dumps(
+            {
+                "error": f"Modus 1.0 component '{component_name}' not found",
+                "tip": "Use list_components(version='1.0') to see all available components",
+            }
+        )
+
+    def names(component, field):
+        if component is None:
+            return set()
+        return {
+            item_field(item, "name")
+            for item in getattr(component, field)
+            if item_field(item, "name")
+        }
+
+    v1_data = v1_components[v1_tag]
+    candidates = []
+    for v2_tag, score in model.candidates(v1_tag, max(1, top_k)):
+        v2_data = v2_components.get(v2_tag)
+        candidates.append(
+            {
+                "v2_component": v2_tag,
+                "score": round(score, 4),
+                "shared_props": sorted(names(v1_data, "props") & names(v2_data, "props")),
+                "shared_events": sorted(
+                    names(v1_data, "events") & names(v2_data, "events")
+                ),
+            }
+        )
+
+    return json.dumps(
+        {
+            "v1_component": v1_tag,
+            "current_mapping": mapping.get(v1_tag),
+            "candidates": candidates,
+            "note": "Scores are lexical similarity; confirm candidates with generate_component before mapping.",
+        },
+        indent=2,
+    )
+
+
 @mcp.tool()
 def get_migration_guide() -> str:
     """
@@ -256,17 +681,7 @@ def get_migration_guide() -> str:
 
     # Load migration plan and verification rules
     try:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        mapping_path = os.path.join(
-            script_dir,
-            "modus_migration",
-            "component_analysis",
-            "component_mapping.json",
-        )
-
-        with open(mapping_path, "r") as f:
-            mapping_data = json.load(f)
-
+        mapping_data = catalog_store.mapping()
     except Exception as e:
         logger.error(f"Error loading migration guidance: {e}")
         return json.dumps({"error": f"Error loading migration guidance: {str(e)}"})
@@ -306,61 +721,13 @@ def get_migration_guide() -> str:
     return json.dumps(migration_guide, indent=2)
 
 
-@mcp.tool()
-def get_component_migration_data(component_name: str) -> str:
-    """
-    Get migration data for a specific component
-
-    This function retrieves data needed to migrate a specific component from
-    Modus 1.0 to Modus 2.0, including definitions for both versions and mapping information.
-
-    Args:
-        component_name: The name of the component to get migration data for (e.g., 'button', 'alert')
-
-    Returns:
-        JSON string with component-specific migration data
-    """
-    logger.info(f"Getting migration data for component: {component_name}")
-
-    # Standardize component name (remove any prefix)
-    if component_name.startswith("modus-"):
-        component_name = component_name.replace("modus-", "")
-    elif component_name.startswith("modus-wc-"):
-        component_name = component_name.replace("modus-wc-", "")
-
-    # Load required data
-    try:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        mapping_path = os.path.join(
-            script_dir,
-            "modus_migration",
-            "component_analysis",
-            "component_mapping.json",
-        )
-        v1_path = os.path.join(
-            script_dir, "modus_migration", "component_analysis", "v1_components.json"
-        )
-        v2_path = os.path.join(
-            script_dir, "modus_migration", "component_analysis", "v2_components.json"
-        )
-
-        with open(mapping_path, "r") as f:
-            mapping_data = json.load(f)
-
-        with open(v1_path, "r") as f:
-            v1_components = json.load(f)
-
-        with open(v2_path, "r") as f:
-            v2_components = json.load(f)
-
-    except Exception as e:
-        logger.error(f"Error loading component data: {e}")
-        return json.dumps({"error": f"Error loading component data: {str(e)}"})
-
+def _lookup_component(component_name, mapping_data, v1_components, v2_components):
+    """Catalog entries and mapping of a component name, matched leniently:
+    (v1 tag, v1 file, v1 data, v2 tag, v2 file, v2 data, mapping)"""
     # Get v1 component data with improved lookup
     v1_tag = f"modus-{component_name}"
     v1_file = f"{v1_tag}.js"
-    v1_component_data = v1_components.get(v1_file, {})
+    v1_component_data = v1_components.get(v1_file) or v1_components.get(v1_tag, {})
 
     if not v1_component_data:
         # Try alternative formats with more flexible matching
@@ -392,13 +759,58 @@ def get_component_migration_data(component_name: str) -> str:
             or k.lower() == v1_tag.lower()
             or component_name.lower() in k.lower()
         ):
-            component_mapping = {"v1_tag": k, "v2_tag": v.get("v2_component", "")}
+            component_mapping = {
+                "v1_tag": k,
+                "v2_tag": v if isinstance(v, str) else v.get("v2_component", ""),
+            }
             break
 
     # If still no mapping found but we have component data, create a default mapping
     if not component_mapping and (v1_component_data or v2_component_data):
         component_mapping = {"v1_tag": v1_tag, "v2_tag": v2_tag}
 
+    return (
+        v1_tag, v1_file, v1_component_data, v2_tag, v2_file, v2_component_data, component_mapping
+    )
+
+
+@mcp.tool()
+def get_component_migration_data(component_name: str) -> str:
+    """
+    Get migration data for a specific component
+
+    This function retrieves data needed to migrate a specific component from
+    Modus 1.0 to Modus 2.0, including definitions for both versions and mapping information.
+
+    Args:
+        component_name: The name of the component to get migration data for (e.g., 'button', 'alert')
+
+    Returns:
+        JSON string with component-specific migration data
+    """
+    logger.info(f"Getting migration data for component: {component_name}")
+
+    # Standardize component name (remove any prefix)
+    if component_name.startswith("modus-"):
+        component_name = component_name.replace("modus-", "")
+    elif component_name.startswith("modus-wc-"):
+        component_name = component_name.replace("modus-wc-", "")
+
+    # Load required data
+    try:
+        with span("load"):
+            mapping_data = catalog_store.mapping()
+            v1_components = catalog_store.model("1.0")
+            v2_components = catalog_store.model("2.0")
+    except Exception as e:
+        logger.error(f"Error loading component data: {e}")
+        return json.dumps({"error": f"Error loading component data: {str(e)}"})
+
+    with span("lookup"):
+        (
+            v1_tag, v1_file, v1_component_data, v2_tag, v2_file, v2_component_data, component_mapping
+        ) = _lookup_component(component_name, mapping_data, v1_components, v2_components)
+
     # If we couldn't find any data, return an error
     if not v1_component_data and not v2_component_data:
         return json.dumps(
@@ -410,6 +822,10 @@ def get_component_migration_data(component_name: str) -> str:
             }
         )
 
+    with span("resolve"):
+        v1_component_data = v1_component_data.to_dict() if v1_component_data else {}
+        v2_component_data = v2_component_data.to_dict() if v2_component_data else {}
+
     # Compile component migration data
     migration_data = {
         "component_name": component_name,
@@ -418,9 +834,7 @@ def get_component_migration_data(component_name: str) -> str:
         "mapping": component_mapping,
         "migration_guidance": {
             "tag_change": f"Change {v1_tag} to {v2_tag}",
-            "attribute_changes": get_attribute_mappings(
-                component_name, v1_component_data, v2_component_data
-            ),
+            **get_attribute_mappings(component_name, v1_tag),
         },
         "related_components": detect_related_components(
             component_name, v2_component_data, v2_components
@@ -432,44 +846,38 @@ def get_component_migration_data(component_name: str) -> str:
         ],
     }
 
-    return json.dumps(migration_data, indent=2)
+    with span("serialize"):
+        return json.dumps(migration_data, indent=2)
 
 
-def get_attribute_mappings(component_name, v1_data, v2_data):
-    """Helper function to determine attribute mappings between v1 and v2 components"""
+# Guidance that goes with a component's attribute changes
+ATTRIBUTE_NOTES = {"button": "Add aria-label attribute if not present"}
 
-    # Default mappings for common components
-    if component_name == "button":
-        return {
-            "buttonStyle": "color",
-            "note": "Add aria-label attribute if not present",
-        }
-    elif component_name == "alert":
-        return {"severity": "type"}
 
-    # For other components, compare props and suggest mappings
-    attribute_mappings = {}
+@traced("get_attribute_mappings")
+def get_attribute_mappings(component_name, v1_tag):
+    """Prop renames from the precomputed v1 -> v2 prop alignment table"""
+    # Deferred: prop_alignment imports numpy, which no other tool needs at startup
+    from modus_migration.prop_alignment import attribute_changes as attribute_changes_from
 
-    v1_props = {prop.get("name"): prop for prop in v1_data.get("props", [])}
-    v2_props = {prop.get("name"): prop for prop in v2_data.get("props", [])}
+    try:
+        alignment = catalog_store.prop_alignment().get(v1_tag, {})
+    except Exception as e:
+        logger.error(f"Error loading prop alignment: {e}")
+        alignment = {}
 
-    # Find props with similar names
-    for v1_name, v1_prop in v1_props.items():
-        if v1_name in v2_props:
-            # Same name in both versions
-            attribute_mappings[v1_name] = v1_name
-        else:
-            # Look for similar names
-            for v2_name in v2_props.keys():
-                if v1_name.lower() == v2_name.lower() or v1_name.replace(
-                    "-", ""
-                ) == v2_name.replace("-", ""):
-                    attribute_mappings[v1_name] = v2_name
-                    break
+    attribute_changes = attribute_changes_from(alignment)
+    if component_name in ATTRIBUTE_NOTES:
+        attribute_changes["note"] = ATTRIBUTE_NOTES[component_name]
 
-    return attribute_mappings
+    return {
+        "attribute_changes": attribute_changes,
+        "attribute_alignment": alignment.get("props", {}),
+        "unmatched_v2_props": alignment.get("unmatched_v2_props", []),
+    }
 
 
+@traced("detect_related_components")
 def detect_related_components(component_name, v2_component_data, v2_components):
     """Dynamically detect components that might be related to the current component"""
     related = []
@@ -554,48 +962,48 @@ def get_migration_data() -> str:
 
     # Load all migration data
     try:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        mapping_path = os.path.join(
-            script_dir,
-            "modus_migration",
-            "component_analysis",
-            "component_mapping.json",
-        )
-        v1_path = os.path.join(
-            script_dir, "modus_migration", "component_analysis", "v1_components.json"
-        )
-        v2_path = os.path.join(
-            script_dir, "modus_migration", "component_analysis", "v2_components.json"
-        )
-
-        with open(mapping_path, "r") as f:
-            mapping_data = json.load(f)
-
-        with open(v1_path, "r") as f:
-            v1_components = json.load(f)
-
-        with open(v2_path, "r") as f:
-            v2_components = json.load(f)
-
+        with span("load"):
+            mapping_data = catalog_store.mapping()
+            v1_components = catalog_store.model("1.0")
+            v2_components = catalog_store.model("2.0")
     except Exception as e:
         logger.error(f"Error loading migration data: {e}")
         return json.dumps({"error": f"Error loading migration data: {str(e)}"})
 
     # Compile complete migration dataset
-    migration_data = {
-        "component_mapping": mapping_data.get("Mapping_v1_v2", {}),
-        "verification_rules": mapping_data.get("verification_rules", []),
-        "migration_plan": mapping_data.get("migration_plan", []),
-        "v1_components": v1_components,
-        "v2_components": v2_components,
-        "usage_guidance": {
-            "process": "For a more targeted approach, use get_component_migration_data(component_name) to get migration data for specific components."
-        },
-    }
+    with span("resolve"):
+        migration_data = {
+            "component_mapping": mapping_data.get("Mapping_v1_v2", {}),
+            "verification_rules": mapping_data.get("verification_rules", []),
+            "migration_plan": mapping_data.get("migration_plan", []),
+            "v1_components": v1_components.to_dict(),
+            "v2_components": v2_components.to_dict(),
+            "usage_guidance": {
+                "process": "For a more targeted approach, use get_component_migration_data(component_name) to get migration data for specific components."
+            },
+        }
 
-    return json.dumps(migration_data, indent=2)
+    with span("serialize"):
+        return json.dumps(migration_data, indent=2)
+
+
+@mcp.tool()
+def get_server_stats() -> str:
+    """
+    Get this server process' tool metrics
+
+    Returns, per tool, the number of calls and error responses, latency
+    percentiles (estimated from a histogram) and response sizes, plus the
+    hit/miss counts of the catalog caches, since the server started, and the
+    current state of the heavy and bulk tool queues.
+
+    Returns:
+        JSON string with "tools", "caches" and "admission" statistics
+    """
+    return json.dumps(dict(server_metrics.snapshot(), admission=admission.snapshot()), indent=2)
 
 
 # execute and return the stdio output
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    handle_startup_profile(__file__, mcp, "list_components", {}, warm_up=catalog_store.warm)
+    serve(mcp, __file__, "mcp", default_port=8000)
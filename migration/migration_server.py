@@ -5,6 +5,24 @@ import os
 import re
 from typing import Any
 import datetime
+import sys
+
+# Allow running as `python migration_server.py` from inside migration/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from modus_migration.admission import BULK, AdmissionControl
+from modus_migration.catalog_store import CatalogStore
+from modus_migration.framework_plugins import FrameworkRegistry, GUIDANCE_STEPS
+from connect_migration import connect_mapping
+from connect_migration.connect_mapping import EVENT_SYNTAX, get_index, plan_jsx_edits
+from modus_migration.http_serving import serve
+from modus_migration.server_metrics import ServerMetrics
+from modus_migration.source_edits import apply_edits, make_patch, patch_edits, text_sha256
+from modus_migration.startup_profile import handle_startup_profile
+from modus_migration.tracing import span, traced
+from modus_migration.verification import ProjectVerifier, rules_for
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -12,12 +30,69 @@ logger = logging.getLogger(__name__)
 
 # Create FastMCP server instance
 migration_mcp = FastMCP("Modus Migration Data Provider")
+# Records every tool registered below (see get_server_stats)
+server_metrics = ServerMetrics(migration_mcp)
+# The guidance tools with component data return the full catalogs (~2 MB);
+# they queue for a worker thread while every other tool runs inline
+admission = AdmissionControl(
+    migration_mcp,
+    {
+        "get_analyze_guidance": BULK,
+        "get_migrate_guidance": BULK,
+        "get_verify_guidance": BULK,
+        "get_workflow_guidance": BULK,
+    },
+)
 
 print("FastMCP instance created. Registering tools...")
 
+# Compiled, cached component catalogs (rebuilt when the extractor output changes)
+catalog_store = CatalogStore(
+    os.path.join(PROJECT_ROOT, "modus_migration", "component_analysis")
+)
+server_metrics.add_caches("catalog", catalog_store.cache_stats)
+server_metrics.add_caches("connect_mapping", connect_mapping.cache_stats)
+
+# Per-file results of verify_migrated_source, so that a re-check after a fix
+# only looks at the changed elements
+verifiers = ProjectVerifier(
+    lambda: rules_for(catalog_store.mapping(), catalog_store.prop_alignment()), max_files=256
+)
+
+# Source frameworks migrating to Modus 2.0; packs load on first use
+framework_registry = FrameworkRegistry(PROJECT_ROOT, catalog_store)
+
+# (component_data key, file in component_analysis/, name used in warnings)
+COMPONENT_DATA_FILES = [
+    ("component_mapping", "component_mapping.json", "Component mapping"),
+    ("v1_components", "v1_components.json", "V1 components"),
+    ("v2_components", "v2_components.json", "V2 components"),
+    (
+        "v1_angular_framework_data",
+        "v1_angular_framework_data.json",
+        "V1 Angular framework data",
+    ),
+    (
+        "v1_react_framework_data",
+        "v1_react_framework_data.json",
+        "V1 React framework data",
+    ),
+    (
+        "v2_angular_framework_data",
+        "v2_angular_framework_data.json",
+        "V2 Angular framework data",
+    ),
+    (
+        "v2_react_framework_data",
+        "v2_react_framework_data.json",
+        "V2 React framework data",
+    ),
+]
+
 # --- MCP Tools ---
 
 
+@traced("load")
 def _get_migration_data(guidance_type: str) -> dict:
     """Loads migration-related data from files based on the guidance type.
 
@@ -74,94 +149,22 @@ def _get_migration_data(guidance_type: str) -> dict:
             component_analysis_dir = os.path.join(
                 script_dir, "..", "modus_migration", "component_analysis"
             )
-            component_mapping_path = os.path.join(
-                component_analysis_dir, "component_mapping.json"
-            )
-            v1_components_path = os.path.join(
-                component_analysis_dir, "v1_components.json"
-            )
-            v2_components_path = os.path.join(
-                component_analysis_dir, "v2_components.json"
-            )
-
-            # Framework-specific data paths
-            v1_angular_framework_data_path = os.path.join(
-                component_analysis_dir, "v1_angular_framework_data.json"
-            )
-            v1_react_framework_data_path = os.path.join(
-                component_analysis_dir, "v1_react_framework_data.json"
-            )
-            v2_angular_framework_data_path = os.path.join(
-                component_analysis_dir, "v2_angular_framework_data.json"
-            )
-            v2_react_framework_data_path = os.path.join(
-                component_analysis_dir, "v2_react_framework_data.json"
-            )
-
-            if os.path.exists(component_mapping_path):
-                with open(component_mapping_path, "r") as f:
-                    loaded_data["component_data"]["component_mapping"] = json.load(f)
-            else:
-                logger.warning(
-                    f"Component mapping file not found for {guidance_type}: {component_mapping_path}"
-                )
-
-            if os.path.exists(v1_components_path):
-                with open(v1_components_path, "r") as f:
-                    loaded_data["component_data"]["v1_components"] = json.load(f)
-            else:
-                logger.warning(
-                    f"V1 components file not found for {guidance_type}: {v1_components_path}"
-                )
-
-            if os.path.exists(v2_components_path):
-                with open(v2_components_path, "r") as f:
-                    loaded_data["component_data"]["v2_components"] = json.load(f)
-            else:
-                logger.warning(
-                    f"V2 components file not found for {guidance_type}: {v2_components_path}"
-                )
-
-            # Load framework-specific data
-            if os.path.exists(v1_angular_framework_data_path):
-                with open(v1_angular_framework_data_path, "r") as f:
-                    loaded_data["component_data"]["v1_angular_framework_data"] = (
-                        json.load(f)
-                    )
-            else:
-                logger.warning(
-                    f"V1 Angular framework data file not found for {guidance_type}: {v1_angular_framework_data_path}"
-                )
-
-            if os.path.exists(v1_react_framework_data_path):
-                with open(v1_react_framework_data_path, "r") as f:
-                    loaded_data["component_data"]["v1_react_framework_data"] = (
-                        json.load(f)
-                    )
-            else:
-                logger.warning(
-                    f"V1 React framework data file not found for {guidance_type}: {v1_react_framework_data_path}"
-                )
-
-            if os.path.exists(v2_angular_framework_data_path):
-                with open(v2_angular_framework_data_path, "r") as f:
-                    loaded_data["component_data"]["v2_angular_framework_data"] = (
-                        json.load(f)
-                    )
-            else:
-                logger.warning(
-                    f"V2 Angular framework data file not found for {guidance_type}: {v2_angular_framework_data_path}"
-                )
-
-            if os.path.exists(v2_react_framework_data_path):
-                with open(v2_react_framework_data_path, "r") as f:
-                    loaded_data["component_data"]["v2_react_framework_data"] = (
-                        json.load(f)
+            for key, file_name, label in COMPONENT_DATA_FILES:
+                file_path = os.path.join(component_analysis_dir, file_name)
+                if not os.path.exists(file_path):
+                    logger.warning(
+                        f"{label} file not found for {guidance_type}: {file_path}"
                     )
-            else:
-                logger.warning(
-                    f"V2 React framework data file not found for {guidance_type}: {v2_react_framework_data_path}"
-                )
+                elif file_name in ("v1_components.json", "v2_components.json"):
+                    with span("resolve", file=file_name):
+                        loaded_data["component_data"][key] = catalog_store.model(
+                            file_name[:2]
+                        ).to_dict()
+                else:
+                    with span("resolve", file=file_name):
+                        loaded_data["component_data"][key] = catalog_store.resolve(
+                            catalog_store.load(file_name)
+                        )
 
         # Load gold standard if needed
         if guidance_type in ["verify", "workflow"]:
@@ -254,20 +257,21 @@ def get_analyze_guidance() -> str:
                 "message": f"Failed to load migration data for 'analyze' step: {migration_data.get('error', 'Unknown error')}",
             }
         )
-    return json.dumps(
-        {
-            "guidance_text": migration_data.get("md_prompts", {}).get(
-                "analyze", "Analyze.md not found."
-            ),
-            "component_data": migration_data.get("component_data", {}),
-            "directories": {
-                "analysis_reports": migration_data.get("directories", {}).get(
-                    "analysis_reports", ""
-                )
+    with span("serialize"):
+        return json.dumps(
+            {
+                "guidance_text": migration_data.get("md_prompts", {}).get(
+                    "analyze", "Analyze.md not found."
+                ),
+                "component_data": migration_data.get("component_data", {}),
+                "directories": {
+                    "analysis_reports": migration_data.get("directories", {}).get(
+                        "analysis_reports", ""
+                    )
+                },
             },
-        },
-        indent=2,
-    )
+            indent=2,
+        )
 
 
 @migration_mcp.tool()
@@ -288,15 +292,16 @@ def get_migrate_guidance() -> str:
                 "message": f"Failed to load migration data for 'migrate' step: {migration_data.get('error', 'Unknown error')}",
             }
         )
-    return json.dumps(
-        {
-            "guidance_text": migration_data.get("md_prompts", {}).get(
-                "migrate", "Migrate.md not found."
-            ),
-            "component_data": migration_data.get("component_data", {}),
-        },
-        indent=2,
-    )
+    with span("serialize"):
+        return json.dumps(
+            {
+                "guidance_text": migration_data.get("md_prompts", {}).get(
+                    "migrate", "Migrate.md not found."
+                ),
+                "component_data": migration_data.get("component_data", {}),
+            },
+            indent=2,
+        )
 
 
 @migration_mcp.tool()
@@ -318,18 +323,19 @@ def get_verify_guidance() -> str:
                 "message": f"Failed to load migration data for 'verify' step: {migration_data.get('error', 'Unknown error')}",
             }
         )
-    return json.dumps(
-        {
-            "guidance_text": migration_data.get("md_prompts", {}).get(
-                "verify", "Verify.md not found."
-            ),
-            "component_data": migration_data.get("component_data", {}),
-            "gold_standard": migration_data.get(
-                "gold_standard", "Gold_standard.md not found."
-            ),
-        },
-        indent=2,
-    )
+    with span("serialize"):
+        return json.dumps(
+            {
+                "guidance_text": migration_data.get("md_prompts", {}).get(
+                    "verify", "Verify.md not found."
+                ),
+                "component_data": migration_data.get("component_data", {}),
+                "gold_standard": migration_data.get(
+                    "gold_standard", "Gold_standard.md not found."
+                ),
+            },
+            indent=2,
+        )
 
 
 @migration_mcp.tool()
@@ -350,19 +356,20 @@ def get_log_guidance() -> str:
                 "message": f"Failed to load migration data for 'log' step: {migration_data.get('error', 'Unknown error')}",
             }
         )
-    return json.dumps(
-        {
-            "guidance_text": migration_data.get("md_prompts", {}).get(
-                "log", "Log.md not found."
-            ),
-            "directories": {
-                "migration_logs": migration_data.get("directories", {}).get(
-                    "migration_logs", ""
-                )
+    with span("serialize"):
+        return json.dumps(
+            {
+                "guidance_text": migration_data.get("md_prompts", {}).get(
+                    "log", "Log.md not found."
+                ),
+                "directories": {
+                    "migration_logs": migration_data.get("directories", {}).get(
+                        "migration_logs", ""
+                    )
+                },
             },
-        },
-        indent=2,
-    )
+            indent=2,
+        )
 
 
 @migration_mcp.tool()
@@ -395,20 +402,277 @@ def get_workflow_guidance() -> str:
                 "message": f"Failed to load migration data for 'workflow' step: {migration_data.get('error', 'Unknown error')}",
             }
         )
+    with span("serialize"):
+        return json.dumps(
+            {
+                "workflow_specific_guidance": migration_data.get("md_prompts", {}).get(
+                    "workflow", "Workflow.md not found."
+                ),
+                "all_guidance_documents": migration_data.get("md_prompts", {}),
+                "component_data": migration_data.get("component_data", {}),
+                "gold_standard": migration_data.get("gold_standard", ""),
+                "directories": migration_data.get("directories", {}),
+            },
+            indent=2,
+        )
+
+
+# --- Source framework tools (one surface for every registered framework) ---
+
+
+def _unknown_framework(framework: str) -> str:
+    return json.dumps(
+        {
+            "error": True,
+            "message": f"Unknown source framework '{framework}'.",
+            "available_frameworks": framework_registry.names(),
+        },
+        indent=2,
+    )
+
+
+def list_source_frameworks() -> str:
+    return json.dumps({"frameworks": framework_registry.describe()}, indent=2)
+
+
+def get_guidance(framework: str, step: str) -> str:
+    try:
+        pack = framework_registry.pack(framework)
+    except KeyError:
+        return _unknown_framework(framework)
+    try:
+        guidance_text = pack.guidance(step)
+    except KeyError:
+        return json.dumps(
+            {
+                "error": True,
+                "message": f"Unknown step '{step}'.",
+                "steps": list(GUIDANCE_STEPS),
+            },
+            indent=2,
+        )
+    except OSError as e:
+        logger.warning(f"Guidance for {framework}/{step} not readable: {e}")
+        return json.dumps(
+            {"error": True, "message": f"{step} guidance for '{framework}' not found."},
+            indent=2,
+        )
+    return json.dumps(
+        {
+            "framework": pack.framework.name,
+            "step": step,
+            "guidance_text": guidance_text,
+        },
+        indent=2,
+    )
+
+
+def map_component(framework: str, name: str) -> str:
+    try:
+        pack = framework_registry.pack(framework)
+    except KeyError:
+        return _unknown_framework(framework)
+    try:
+        return json.dumps(pack.map_component(name), indent=2)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load the {framework} component mapping: {e}")
+        return json.dumps(
+            {"error": True, "message": f"Component mapping for '{framework}' unavailable: {e}"},
+            indent=2,
+        )
+
+
+_FRAMEWORK_NAMES = ", ".join(f'"{name}"' for name in framework_registry.names())
+list_source_frameworks.__doc__ = """List the source frameworks with Modus 2.0 migration packs."""
+get_guidance.__doc__ = f"""Return the migration guidance prompt of a source framework for one step.
+
+    Args:
+        framework: One of {_FRAMEWORK_NAMES}.
+        step: One of {", ".join(f'"{step}"' for step in GUIDANCE_STEPS)}.
+    """
+map_component.__doc__ = f"""Map a source framework component to its Modus 2.0 equivalent.
+
+    Args:
+        framework: One of {_FRAMEWORK_NAMES}.
+        name: Source component (e.g. "TextField", case-insensitive), or a Modus
+            tag (e.g. "modus-wc-button") to get the source components it replaces.
+
+    Mapped components include the Modus tag's props, events and slots from the
+    v2 catalog. "status" is "mapped", "no_equivalent" or "unknown" (with
+    close-match "suggestions").
+    """
+for _tool in (list_source_frameworks, get_guidance, map_component):
+    migration_mcp.tool()(_tool)
+
+
+# --- Connect UI migration tools ---
+
+
+@migration_mcp.tool()
+def get_connect_component_mapping(component_name: str, prop_name: str = "") -> str:
+    """Return the Modus mapping of a Connect UI component, with parsed rules per prop.
+
+    Args:
+        component_name: Connect component name (e.g. "CustomInput"), case-insensitive.
+        prop_name: Optional Connect prop or event handler to look up (e.g. "onChange").
+
+    Each rule has a "kind": rename, event, object, child, drop (no Modus
+    equivalent) or manual (needs a human, see "source_text").
+    """
+    index = get_index()
+    entry = index.entry(component_name)
+    if entry is None:
+        return json.dumps(
+            {
+                "error": True,
+                "message": f"Connect component '{component_name}' not found in the mapping.",
+                "available_components": sorted(index.mapping),
+            },
+            indent=2,
+        )
+    name = index.resolve_name(component_name)
+    rules = {prop: rule._asdict() for prop, rule in index.rules[name].items()}
+    if prop_name:
+        if prop_name not in rules:
+            return json.dumps(
+                {
+                    "error": True,
+                    "message": f"'{prop_name}' has no mapping for {name}.",
+                    "mapped_props": sorted(rules),
+                },
+                indent=2,
+            )
+        return json.dumps(
+            {"component": name, "prop": prop_name, "rule": rules[prop_name]}, indent=2
+        )
     return json.dumps(
         {
-            "workflow_specific_guidance": migration_data.get("md_prompts", {}).get(
-                "workflow", "Workflow.md not found."
-            ),
-            "all_guidance_documents": migration_data.get("md_prompts", {}),
-            "component_data": migration_data.get("component_data", {}),
-            "gold_standard": migration_data.get("gold_standard", ""),
-            "directories": migration_data.get("directories", {}),
+            "component": name,
+            "modus_equivalent": entry.get("modus_equivalent"),
+            "migration_type": entry.get("migration_type"),
+            "rewritable": index.is_rewritable(name),
+            "migration_notes": entry.get("migration_notes"),
+            "connect_api": index.components.get(name, {}),
+            "rules": rules,
         },
         indent=2,
     )
 
 
+@migration_mcp.tool()
+def migrate_connect_jsx(source: str, event_syntax: str = "solid", path: str = "source.tsx",
+                        output: str = "patch") -> str:
+    """Rewrite Connect UI elements in JSX/TSX source to Modus web components.
+
+    Only components with migration_type "direct" or "direct_with_children" are
+    rewritten; every other Connect element is listed under "elements" with
+    "rewritten": false and its migration notes. The rewrite is deterministic:
+    tags are renamed, props renamed or dropped per the mapping, and unmapped or
+    manual props are kept unchanged and reported.
+
+    By default the result is a patch rather than the rewritten file: "edits"
+    ({offset, length, replacement, line}, offsets into `source`) and the same
+    changes as a unified "diff", so its size follows the number of rewritten
+    elements. Apply it with `python -m modus_migration.source_edits FILE PATCH`
+    (the "source_sha256" guards against applying it to a changed file).
+
+    Args:
+        source: JSX or TSX source text.
+        event_syntax: How Modus events are bound: "solid" (on:inputChange),
+            "react" (onInputChange) or "lit" (@inputChange).
+        path: File path of the source, used in the diff headers.
+        output: "patch" (edits and diff) or "source" (the whole rewritten source).
+    """
+    if event_syntax not in EVENT_SYNTAX:
+        return json.dumps(
+            {
+                "error": True,
+                "message": f"event_syntax must be one of {sorted(EVENT_SYNTAX)}",
+            }
+        )
+    if output not in ("patch", "source"):
+        return json.dumps(
+            {"error": True, "message": 'output must be "patch" or "source"'}
+        )
+    try:
+        edits, elements = plan_jsx_edits(source, get_index(), event_syntax)
+    except ValueError as e:
+        return json.dumps(
+            {"error": True, "message": f"Could not parse JSX: {e}"}, indent=2
+        )
+    if output == "source":
+        result = {"source": apply_edits(source, edits)}
+    else:
+        result = make_patch(source, edits, path)
+    result.update(
+        rewritten=sum(1 for e in elements if e["rewritten"]),
+        needs_manual_migration=sum(1 for e in elements if not e["rewritten"]),
+        elements=elements,
+    )
+    return json.dumps(result, indent=2)
+
+
+@migration_mcp.tool()
+def verify_migrated_source(path: str, source: str = "", edits: str = "", all_findings: bool = False) -> str:
+    """Check a migrated file for Modus 1 leftovers.
+
+    Reports, with line numbers, the Modus 1 elements left ("v1-tag", or
+    "no-v2-equivalent" for components to keep) and attributes of Modus 2
+    elements that still use a Modus 1 prop name ("v1-attribute"). "status"
+    is "fail" while any v1-tag or v1-attribute finding is left.
+
+    Results are kept per path: call it again after each fix, with the new
+    source or only the edits, and just the changed elements are re-checked
+    ("rechecked" in the response). "counts" and "status" always cover the
+    whole file, but "findings" only lists the findings in the lines that were
+    re-checked ("rechecked_lines"; the whole file on the first call for a
+    path); findings elsewhere are unchanged, though their lines may have
+    moved.
+
+    Args:
+        path: Path of the migrated file; identifies it between calls.
+        source: The file's whole current text.
+        edits: Instead of source, the edits made since the last call for this
+            path: a JSON list of {"offset", "length", "replacement"}, or a
+            patch from migrate_connect_jsx (its "source_sha256" must match).
+        all_findings: List every finding of the file, not only the re-checked ones.
+    """
+    if bool(source) == bool(edits):
+        return json.dumps(
+            {"error": True, "message": "Pass either source or edits"}
+        )
+    try:
+        if source:
+            verifier = verifiers.verify(path, source=source)
+        else:
+            patch = json.loads(edits)
+            if isinstance(patch, list):
+                patch = {"edits": patch}
+            previous = verifiers.get(path)
+            expected = patch.get("source_sha256")
+            if previous is not None and expected and text_sha256(previous.text) != expected:
+                raise ValueError(f"The patch was not made for the last verified text of {path}")
+            verifier = verifiers.verify(path, edits=patch_edits(patch))
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        return json.dumps({"error": True, "message": f"Could not verify {path}: {e}"})
+    return json.dumps(verifier.report(path, full=all_findings), indent=2)
+
+
+@migration_mcp.tool()
+def get_server_stats() -> str:
+    """Return this server process' tool metrics.
+
+    Per tool: calls, error responses, latency percentiles (estimated from a
+    histogram) and response sizes; plus the hit/miss counts of the catalog
+    and Connect mapping caches, since the server started, and the current
+    state of the bulk tool queue.
+    """
+    return json.dumps(dict(server_metrics.snapshot(), admission=admission.snapshot()), indent=2)
+
+
 if __name__ == "__main__":
+    handle_startup_profile(
+        __file__, migration_mcp, "get_analyze_guidance", {}, warm_up=catalog_store.warm
+    )
     print("Starting migration server with context-rich agentic workflow...")
-    migration_mcp.run(transport="stdio")
+    serve(migration_mcp, __file__, "migration_mcp", default_port=8001)
@@ -7,7 +7,7 @@ md_mcp = FastMCP("Modus Migration Markdown Server")
 
 def load_md_prompt(tool_name):
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    md_path = os.path.join(script_dir, "md_prompts", f"{tool_name}.md")
+    md_path = os.path.join(script_dir, "..", "md_prompts", f"{tool_name}.md")
     with open(md_path, "r", encoding="utf-8") as f:
         return f.read()
 
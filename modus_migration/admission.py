@@ -0,0 +1,237 @@
+"""
+Admission control for expensive MCP tools.
+
+FastMCP calls synchronous tools directly on its event loop, so one call
+building a multi-MB catalog dump holds up every other request on the
+server, and a few concurrent dumps multiply peak memory. A server assigns
+its expensive tools a cost class right after creating FastMCP (after its
+ServerMetrics, so that queueing shows in the tool latency):
+
+    admission = AdmissionControl(mcp, {"get_migration_data": BULK,
+                                       "get_component_migration_data": HEAVY})
+
+LIGHT tools (every tool not listed) are the fast lane: they still run
+inline on the event loop and never queue. HEAVY and BULK tools run in a
+worker thread once admitted, so the loop stays free for light calls.
+Admission is first come, first served per class, bounded by
+
+  - the class' concurrency (--heavy-concurrency, default 4; --bulk-concurrency,
+    default 1)
+  - a memory budget shared by both classes (--memory-budget-mb, default 256).
+    Each call reserves an estimate of the memory it needs: MEMORY_FACTOR
+    times the response size of its previous call, or the class default
+    before the first one. A call larger than the whole budget runs when
+    nothing else holds a reservation.
+
+A call that would be more than --queue-limit deep in its class' queue, or
+that is not admitted within --queue-timeout seconds, is rejected with
+
+    {"error": "Server busy: ...", "retry_after_s": 2.5}
+
+where retry_after_s estimates when the queue ahead of it will have drained.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import time
+import weakref
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from modus_migration.server_metrics import response_size
+from modus_migration.tracing import span
+
+LIGHT = "light"
+HEAVY = "heavy"
+BULK = "bulk"
+
+# A response of N bytes needs about this many times N at peak: the dict it
+# is built from, the JSON string, and the JSON-RPC message wrapping it
+MEMORY_FACTOR = 4
+MIB = 1024 * 1024
+
+_controls: "weakref.WeakKeyDictionary[Any, AdmissionControl]" = weakref.WeakKeyDictionary()
+
+
+def admission_of(server: Any) -> Optional["AdmissionControl"]:
+    """The AdmissionControl of FastMCP `server`, if any."""
+    return _controls.get(server)
+
+
+class _Waiter:
+    __slots__ = ("estimate", "event", "admitted")
+
+    def __init__(self, estimate: int):
+        self.estimate = estimate
+        self.event = asyncio.Event()
+        self.admitted = False
+
+
+class CostClass:
+    def __init__(self, concurrency: int, default_estimate: int):
+        self.concurrency = concurrency
+        self.default_estimate = default_estimate
+        self.running = 0
+        self.waiting: Deque[_Waiter] = deque()
+        self.admitted = 0
+        self.rejected = 0
+        # Moving average of call durations, for the retry hint
+        self.mean_seconds = 0.0
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "waiting": len(self.waiting),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "mean_ms": round(self.mean_seconds * 1000, 2),
+        }
+
+
+class AdmissionControl:
+    def __init__(self, server: Any, costs: Dict[str, str]):
+        self.costs = dict(costs)
+        self.classes = {HEAVY: CostClass(4, 1 * MIB), BULK: CostClass(1, 16 * MIB)}
+        self.memory_budget = 256 * MIB
+        self.queue_limit = 16
+        self.queue_timeout = 30.0
+        self.reserved = 0
+        self._estimates: Dict[str, int] = {}
+        unknown = set(self.costs.values()) - {LIGHT, *self.classes}
+        if unknown:
+            raise ValueError(f"Unknown cost classes: {sorted(unknown)}")
+        self._instrument(server)
+
+    def configure(self, memory_budget_mb: Optional[float] = None, queue_timeout: Optional[float] = None,
+                  queue_limit: Optional[int] = None, heavy_concurrency: Optional[int] = None,
+                  bulk_concurrency: Optional[int] = None) -> None:
+        if memory_budget_mb is not None:
+            self.memory_budget = int(memory_budget_mb * MIB)
+        if queue_timeout is not None:
+            self.queue_timeout = queue_timeout
+        if queue_limit is not None:
+            self.queue_limit = max(1, queue_limit)
+        if heavy_concurrency is not None:
+            self.classes[HEAVY].concurrency = max(1, heavy_concurrency)
+        if bulk_concurrency is not None:
+            self.classes[BULK].concurrency = max(1, bulk_concurrency)
+
+    def _instrument(self, server: Any) -> None:
+        add_tool = server.add_tool
+
+        def add_admitted_tool(fn, name: Optional[str] = None, *args, **kwargs):
+            return add_tool(self.wrap(fn, name or fn.__name__), name, *args, **kwargs)
+
+        server.add_tool = add_admitted_tool
+        _controls[server] = self
+
+    def cost(self, tool: str) -> str:
+        return self.costs.get(tool, LIGHT)
+
+    def estimate(self, tool: str) -> int:
+        """Bytes reserved for a call of `tool`."""
+        return self._estimates.get(tool, self.classes[self.cost(tool)].default_estimate)
+
+    def wrap(self, fn: Callable, name: str) -> Callable:
+        """`fn` behind its cost class' queue; light and async tools are returned as is."""
+        cost = self.cost(name)
+        if cost == LIGHT or inspect.iscoroutinefunction(fn):
+            return fn
+
+        @functools.wraps(fn)
+        async def admitted(*args, **kwargs):
+            estimate = self.estimate(name)
+            rejection = await self._admit(name, cost, estimate)
+            if rejection is not None:
+                return rejection
+            start = time.perf_counter()
+            try:
+                response = await asyncio.to_thread(fn, *args, **kwargs)
+            finally:
+                self._release(cost, estimate, time.perf_counter() - start)
+            self._estimates[name] = max(response_size(response) * MEMORY_FACTOR, 64 * 1024)
+            return response
+
+        return admitted
+
+    def _dispatch(self) -> None:
+        """Admit the calls at the head of each queue while they fit."""
+        for queue in self.classes.values():
+            while queue.waiting and queue.running < queue.concurrency:
+                waiter = queue.waiting[0]
+                if not self._fits(waiter.estimate):
+                    break
+                queue.waiting.popleft()
+                queue.running += 1
+                queue.admitted += 1
+                self.reserved += waiter.estimate
+                waiter.admitted = True
+                waiter.event.set()
+
+    def _fits(self, estimate: int) -> bool:
+        return self.reserved == 0 or self.reserved + estimate <= self.memory_budget
+
+    async def _admit(self, tool: str, cost: str, estimate: int) -> Optional[str]:
+        """None once the call may run; otherwise the rejection response.
+
+        Runs on the event loop thread only, so the queues need no lock."""
+        queue = self.classes[cost]
+        if len(queue.waiting) >= self.queue_limit:
+            return self._reject(tool, cost, f"its queue is full ({len(queue.waiting)} waiting)")
+        waiter = _Waiter(estimate)
+        queue.waiting.append(waiter)
+        self._dispatch()
+        if waiter.admitted:
+            return None
+        with span("admission.wait", cost=cost, estimate=estimate):
+            try:
+                await asyncio.wait_for(waiter.event.wait(), self.queue_timeout)
+            except BaseException as e:
+                if waiter.admitted:
+                    if isinstance(e, asyncio.TimeoutError):
+                        return None  # admitted as the timeout fired
+                    self._release(cost, estimate)
+                    raise
+                queue.waiting.remove(waiter)
+                self._dispatch()
+                if isinstance(e, asyncio.TimeoutError):
+                    return self._reject(tool, cost, f"was not admitted within {self.queue_timeout:g} s")
+                raise
+        return None
+
+    def _release(self, cost: str, estimate: int, seconds: Optional[float] = None) -> None:
+        queue = self.classes[cost]
+        queue.running -= 1
+        self.reserved -= estimate
+        if seconds is not None:
+            queue.mean_seconds = seconds if not queue.mean_seconds else 0.8 * queue.mean_seconds + 0.2 * seconds
+        self._dispatch()
+
+    def retry_after(self, cost: str) -> float:
+        """Seconds until the calls queued or running in `cost` have likely finished."""
+        queue = self.classes[cost]
+        rounds = (len(queue.waiting) + queue.running) / queue.concurrency
+        return round(max(1.0, queue.mean_seconds * max(1.0, rounds)), 1)
+
+    def _reject(self, tool: str, cost: str, reason: str) -> str:
+        self.classes[cost].rejected += 1
+        return json.dumps({
+            "error": f"Server busy: {tool} is a {cost} tool and {reason}. Retry later.",
+            "retry_after_s": self.retry_after(cost),
+        })
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "memory_budget_bytes": self.memory_budget,
+            "reserved_bytes": self.reserved,
+            "queue_limit": self.queue_limit,
+            "queue_timeout_s": self.queue_timeout,
+            "classes": {cost: queue.to_json() for cost, queue in self.classes.items()},
+            "tools": {
+                tool: {"cost": cost, "estimate_bytes": self.estimate(tool)}
+                for tool, cost in sorted(self.costs.items())
+            },
+        }
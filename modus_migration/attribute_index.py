@@ -0,0 +1,140 @@
+"""
+Inverted index from prop, event and slot names (and prop type tokens) to the
+components that have them.
+
+Names are normalized (lower-cased, non-alphanumerics dropped) so `valueChange`,
+`value-change` and `value_change` are the same term. Each term maps to a bitset
+over the catalog's components, stored as a Python int; a query is a handful of
+dict lookups and bitwise ANDs.
+
+The catalog build writes the index of both versions to attribute_index.json,
+with bitsets as hex strings:
+
+    {"v2": {"components": ["modus-wc-accordion", ...],
+            "postings": {"prop": {"expanded": "4a1", ...}, "event": ..., "slot": ..., "type": ...},
+            "names": {"prop": {"expanded": ["expanded"], ...}, ...}}}
+"""
+
+import difflib
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+FIELDS = ("prop", "event", "slot", "type")
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+_TYPE_TOKEN = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+
+
+def normalize_name(name: str) -> str:
+    return _NON_ALNUM.sub("", name.lower())
+
+
+def _names(items: Iterable[Any]) -> List[str]:
+    names = []
+    for item in items or []:
+        name = item.get("name") if isinstance(item, dict) else item
+        if isinstance(name, str) and name:
+            names.append(name)
+    return names
+
+
+def component_terms(component: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Original (un-normalized) attribute names of a catalog entry, per field."""
+    types = []
+    for prop in component.get("props", []) or []:
+        if isinstance(prop, dict) and isinstance(prop.get("type"), str):
+            types.extend(_TYPE_TOKEN.findall(prop["type"]))
+    return {
+        "prop": _names(component.get("props")),
+        "event": _names(component.get("events")),
+        "slot": _names(component.get("slots")),
+        "type": types,
+    }
+
+
+def iter_set_bits(bits: int) -> Iterable[int]:
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class AttributeIndex:
+    """Bitset postings for one catalog version."""
+
+    def __init__(self, components: List[str], postings: Dict[str, Dict[str, int]],
+                 names: Dict[str, Dict[str, List[str]]]):
+        self.components = components
+        self.postings = postings
+        self.names = names
+        self.all_bits = (1 << len(components)) - 1
+
+    @classmethod
+    def from_catalog(cls, items: Iterable[Tuple[str, Dict[str, Any]]]) -> "AttributeIndex":
+        components: List[str] = []
+        postings: Dict[str, Dict[str, int]] = {field: {} for field in FIELDS}
+        names: Dict[str, Dict[str, set]] = {field: {} for field in FIELDS}
+        for key, component in items:
+            bit = 1 << len(components)
+            components.append(key)
+            for field, field_names in component_terms(component).items():
+                for name in field_names:
+                    term = normalize_name(name)
+                    if not term:
+                        continue
+                    postings[field][term] = postings[field].get(term, 0) | bit
+                    names[field].setdefault(term, set()).add(name)
+        return cls(
+            components,
+            postings,
+            {f: {t: sorted(n) for t, n in sorted(terms.items())} for f, terms in names.items()},
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "components": self.components,
+            "postings": {
+                field: {term: format(bits, "x") for term, bits in sorted(terms.items())}
+                for field, terms in self.postings.items()
+            },
+            "names": self.names,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "AttributeIndex":
+        return cls(
+            data["components"],
+            {
+                field: {term: int(bits, 16) for term, bits in terms.items()}
+                for field, terms in data["postings"].items()
+            },
+            data["names"],
+        )
+
+    def bits(self, field: str, name: str) -> int:
+        return self.postings.get(field, {}).get(normalize_name(name), 0)
+
+    def query(self, **terms: Optional[Iterable[str]]) -> List[str]:
+        """Components having every given term, e.g. query(prop=["expanded"], event=["toggle"])."""
+        bits = self.all_bits
+        for field, names in terms.items():
+            for name in names or []:
+                bits &= self.bits(field, name)
+                if not bits:
+                    return []
+        return [self.components[i] for i in iter_set_bits(bits)]
+
+    def matched_names(self, field: str, name: str) -> List[str]:
+        """Original spellings of the catalog attributes matching `name`."""
+        return self.names.get(field, {}).get(normalize_name(name), [])
+
+    def similar_terms(self, field: str, name: str, limit: int = 5) -> List[str]:
+        """Known names resembling `name`, for queries with no match."""
+        wanted = normalize_name(name)
+        if not wanted:
+            return []
+        field_names = self.names.get(field, {})
+        terms = [t for t in field_names if wanted in t or t in wanted]
+        if not terms:
+            terms = difflib.get_close_matches(wanted, field_names, n=limit, cutoff=0.6)
+        return [original for term in terms for original in field_names[term]][:limit]
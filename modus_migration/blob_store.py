@@ -0,0 +1,138 @@
+"""
+Content-addressed store for the large text fields of the component catalogs.
+
+Documentation, storybook content, examples and the (often repeated) prop and
+event descriptions are written once per distinct content to
+`blobs/<aa>/<sha256>` and replaced in the catalog by a reference:
+
+    {"$blob": "<sha256>", "size": 6388}
+
+References are resolved lazily: a server only reads the blobs of the fields
+it actually returns, through a size-bounded LRU cache.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Set
+
+from modus_migration.catalog_io import atomic_write
+
+BLOB_REF_KEY = "$blob"
+
+# Strings shorter than this stay inline; a reference costs ~90 bytes
+DEFAULT_MIN_BLOB_SIZE = 256
+
+
+def is_blob_ref(value: Any) -> bool:
+    return isinstance(value, dict) and BLOB_REF_KEY in value
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class BlobStore:
+    """Directory of immutable text blobs named by their SHA-256."""
+
+    def __init__(self, root: str, cache_bytes: int = 16 * 1024 * 1024):
+        self.root = root
+        self.cache_bytes = cache_bytes
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cached_size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def put(self, text: str) -> str:
+        """Store `text` (if not already present) and return its digest."""
+        digest = text_digest(text)
+        path = self.path(digest)
+        if not os.path.exists(path):
+            with atomic_write(path) as f:
+                f.write(text)
+        return digest
+
+    def get(self, digest: str) -> str:
+        with self._lock:
+            text = self._cache.get(digest)
+            if text is not None:
+                self._cache.move_to_end(digest)
+                self.hits += 1
+                return text
+        with open(self.path(digest), "r", encoding="utf-8", newline="") as f:
+            text = f.read()
+        with self._lock:
+            self.misses += 1
+            if digest not in self._cache:
+                self._cache[digest] = text
+                self._cached_size += len(text)
+                while self._cached_size > self.cache_bytes and len(self._cache) > 1:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cached_size -= len(evicted)
+        return text
+
+    def digests(self) -> Set[str]:
+        found = set()
+        if not os.path.isdir(self.root):
+            return found
+        for prefix in os.listdir(self.root):
+            prefix_dir = os.path.join(self.root, prefix)
+            if os.path.isdir(prefix_dir):
+                found.update(n for n in os.listdir(prefix_dir) if not n.startswith("."))
+        return found
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """Delete blobs not in `keep`; returns the number removed."""
+        keep = set(keep)
+        removed = 0
+        for digest in self.digests() - keep:
+            try:
+                os.unlink(self.path(digest))
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+
+def compact(value: Any, store: BlobStore, min_size: int = DEFAULT_MIN_BLOB_SIZE,
+            referenced: Optional[Set[str]] = None) -> Any:
+    """Return a copy of `value` with every string of at least `min_size`
+    characters moved into the store and replaced by a blob reference.
+
+    Digests of all references produced are added to `referenced`.
+    """
+    if isinstance(value, str):
+        if len(value) < min_size:
+            return value
+        digest = store.put(value)
+        if referenced is not None:
+            referenced.add(digest)
+        return {BLOB_REF_KEY: digest, "size": len(value)}
+    if isinstance(value, dict):
+        return {k: compact(v, store, min_size, referenced) for k, v in value.items()}
+    if isinstance(value, list):
+        return [compact(v, store, min_size, referenced) for v in value]
+    return value
+
+
+def resolve(value: Any, store: Optional[BlobStore]) -> Any:
+    """Return a copy of `value` with every blob reference replaced by its text.
+
+    Values without references are returned as-is (not copied).
+    """
+    if isinstance(value, dict):
+        if BLOB_REF_KEY in value:
+            return store.get(value[BLOB_REF_KEY])
+        if not any(isinstance(v, (dict, list)) for v in value.values()):
+            return value
+        return {k: resolve(v, store) for k, v in value.items()}
+    if isinstance(value, list):
+        if not any(isinstance(v, (dict, list)) for v in value):
+            return value
+        return [resolve(v, store) for v in value]
+    return value
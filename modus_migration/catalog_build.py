@@ -0,0 +1,383 @@
+"""
+Compile the extracted catalogs into the artifacts the MCP servers load.
+
+The extractor's JSON files in component_analysis/ stay the source of truth
+(split_components.py and the n8n workflows read them). Compiling produces a
+build directory next to them:
+
+    component_analysis/.catalog_build/
+        manifest.json             source file hashes + format version
+        .build.lock               held while a build is written (see build_lock)
+        blobs/<aa>/<sha256>       deduplicated large text fields
+        v1_components.json        catalogs with text fields as blob references
+        v2_components.json
+        catalog_offsets.json      byte range of every component in the two catalogs
+        v1_angular_framework_data.json ...
+        attribute_index.json      prop/event/slot/type name -> component bitsets
+        doc_index.json            BM25 index over documentation/storybook passages
+        similarity.json           v1 x v2 TF-IDF cosine similarity matrix
+        prop_alignment.json       ranked v1 -> v2 prop renames per mapped component
+        example_corpus.json       deduplicated storybook examples
+        snapshot.pickle           the artifacts above, already parsed (see catalog_snapshot.py)
+
+The build is keyed by the SHA-256 of every source file, so servers can cheaply
+tell whether it is current and rebuild it on demand. Additional artifacts are
+produced by appending functions to BUILD_STEPS.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from modus_migration.attribute_index import AttributeIndex
+from modus_migration.blob_store import BlobStore, compact
+from modus_migration.doc_search import DocSearchIndex
+from modus_migration.example_corpus import ExampleCorpus
+from modus_migration.catalog_snapshot import SNAPSHOT_FILE, write_snapshot
+from modus_migration.lazy_catalog import file_signature
+from modus_migration.tracing import span
+from modus_migration.catalog_io import (
+    iter_catalog_items,
+    write_catalog_stream,
+    write_json_atomic,
+)
+
+BUILD_DIR_NAME = ".catalog_build"
+BUILD_FORMAT = 9
+
+CATALOG_FILES = ["v1_components.json", "v2_components.json"]
+FRAMEWORK_DATA_FILES = [
+    "v1_angular_framework_data.json",
+    "v1_react_framework_data.json",
+    "v2_angular_framework_data.json",
+    "v2_react_framework_data.json",
+]
+MAPPING_FILE = "component_mapping.json"
+ATTRIBUTE_INDEX_FILE = "attribute_index.json"
+DOC_INDEX_FILE = "doc_index.json"
+SIMILARITY_FILE = "similarity.json"
+PROP_ALIGNMENT_FILE = "prop_alignment.json"
+EXAMPLE_CORPUS_FILE = "example_corpus.json"
+CATALOG_OFFSETS_FILE = "catalog_offsets.json"
+SOURCE_FILES = CATALOG_FILES + FRAMEWORK_DATA_FILES + [MAPPING_FILE]
+
+
+class BuildContext:
+    """State shared by the build steps of one compile run."""
+
+    def __init__(self, analysis_dir: str, build_dir: str, store: BlobStore):
+        self.analysis_dir = analysis_dir
+        self.build_dir = build_dir
+        self.store = store
+        self.referenced_blobs = set()
+        self.artifacts: Dict[str, str] = {}
+        self.sources: Dict[str, Dict] = {}
+
+    def source_path(self, file_name: str) -> str:
+        return os.path.join(self.analysis_dir, file_name)
+
+    def build_path(self, file_name: str) -> str:
+        return os.path.join(self.build_dir, file_name)
+
+
+def default_analysis_dir() -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "component_analysis")
+
+
+def build_dir_for(analysis_dir: str) -> str:
+    return os.path.join(analysis_dir, BUILD_DIR_NAME)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(analysis_dir: str) -> Dict[str, Dict]:
+    """Hash, size and mtime of every source file that exists."""
+    fingerprint = {}
+    for file_name in SOURCE_FILES:
+        path = os.path.join(analysis_dir, file_name)
+        if os.path.exists(path):
+            stat = os.stat(path)
+            fingerprint[file_name] = {
+                "sha256": file_sha256(path),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+    return fingerprint
+
+
+def read_manifest(build_dir: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(build_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_build_current(analysis_dir: str, manifest: Optional[Dict] = None) -> bool:
+    """True if the build matches the current source files.
+
+    Sources whose size and mtime are unchanged are not re-hashed.
+    """
+    if manifest is None:
+        manifest = read_manifest(build_dir_for(analysis_dir))
+    if not manifest or manifest.get("format") != BUILD_FORMAT:
+        return False
+    recorded = manifest.get("sources", {})
+    present = [f for f in SOURCE_FILES if os.path.exists(os.path.join(analysis_dir, f))]
+    if sorted(present) != sorted(recorded):
+        return False
+    for file_name in present:
+        path = os.path.join(analysis_dir, file_name)
+        stat = os.stat(path)
+        entry = recorded[file_name]
+        if stat.st_size != entry.get("size"):
+            return False
+        if stat.st_mtime_ns != entry.get("mtime_ns") and file_sha256(path) != entry.get("sha256"):
+            return False
+    return True
+
+
+def build_compact_catalogs(ctx: BuildContext) -> None:
+    """Move large text fields of every catalog into the blob store, and
+    record where each component of the two catalogs starts and ends."""
+    sidecar = {}
+    for file_name in CATALOG_FILES + FRAMEWORK_DATA_FILES:
+        source = ctx.source_path(file_name)
+        if not os.path.exists(source):
+            continue
+        offsets = {} if file_name in CATALOG_FILES else None
+        write_catalog_stream(
+            ctx.build_path(file_name),
+            (
+                (key, compact(value, ctx.store, referenced=ctx.referenced_blobs))
+                for key, value in iter_catalog_items(source)
+            ),
+            offsets=offsets,
+        )
+        ctx.artifacts[file_name] = file_name
+        if offsets is not None:
+            sidecar[file_name] = dict(file_signature(ctx.build_path(file_name)), offsets=offsets)
+    write_json_atomic(ctx.build_path(CATALOG_OFFSETS_FILE), sidecar, indent=None)
+    ctx.artifacts[CATALOG_OFFSETS_FILE] = CATALOG_OFFSETS_FILE
+
+
+def _build_version_index(ctx: BuildContext, artifact: str, index_class) -> None:
+    """Write `{"v1": ..., "v2": ...}` built by index_class.from_catalog()."""
+    index = {}
+    for version, file_name in (("v1", CATALOG_FILES[0]), ("v2", CATALOG_FILES[1])):
+        source = ctx.source_path(file_name)
+        if os.path.exists(source):
+            index[version] = index_class.from_catalog(iter_catalog_items(source)).to_json()
+    write_json_atomic(ctx.build_path(artifact), index, indent=None)
+    ctx.artifacts[artifact] = artifact
+
+
+def build_attribute_index(ctx: BuildContext) -> None:
+    """Inverted prop/event/slot/type index of both catalog versions."""
+    _build_version_index(ctx, ATTRIBUTE_INDEX_FILE, AttributeIndex)
+
+
+def build_doc_index(ctx: BuildContext) -> None:
+    """BM25 passage index of documentation and storybook text."""
+    _build_version_index(ctx, DOC_INDEX_FILE, DocSearchIndex)
+
+
+def build_similarity(ctx: BuildContext) -> None:
+    """TF-IDF similarity of every v1 component to every v2 component."""
+    from modus_migration.similarity import SimilarityModel
+
+    v1_source, v2_source = (ctx.source_path(f) for f in CATALOG_FILES)
+    if not (os.path.exists(v1_source) and os.path.exists(v2_source)):
+        return
+    model = SimilarityModel.fit(iter_catalog_items(v1_source), iter_catalog_items(v2_source))
+    write_json_atomic(ctx.build_path(SIMILARITY_FILE), model.to_json(), indent=None)
+    ctx.artifacts[SIMILARITY_FILE] = SIMILARITY_FILE
+
+
+def build_prop_alignment(ctx: BuildContext) -> None:
+    """Prop rename table of every v1 -> v2 pair in component_mapping.json."""
+    # Imported here: the extractor itself imports this module
+    from modus_migration.component_extractor import create_manual_component_map
+    from modus_migration.prop_alignment import build_alignment_table
+
+    sources = [ctx.source_path(f) for f in CATALOG_FILES + [MAPPING_FILE]]
+    if not all(os.path.exists(path) for path in sources):
+        return
+    v1_catalog, v2_catalog = (dict(iter_catalog_items(path)) for path in sources[:2])
+    with open(sources[2], "r", encoding="utf-8") as f:
+        component_map = json.load(f).get("Mapping_v1_v2", {})
+    table = build_alignment_table(
+        v1_catalog, v2_catalog, component_map, create_manual_component_map()["prop_mappings"]
+    )
+    write_json_atomic(ctx.build_path(PROP_ALIGNMENT_FILE), table, indent=None)
+    ctx.artifacts[PROP_ALIGNMENT_FILE] = PROP_ALIGNMENT_FILE
+
+
+def build_example_corpus(ctx: BuildContext) -> None:
+    """Deduplicated storybook examples of both catalog versions, ranked per component."""
+    _build_version_index(ctx, EXAMPLE_CORPUS_FILE, ExampleCorpus)
+
+
+def load_artifact(build_dir: str, artifact: str) -> Any:
+    with open(os.path.join(build_dir, artifact), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _parse_versions(index_class) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    def parse(data: Dict[str, Any]) -> Dict[str, Any]:
+        return {version: index_class.from_json(index) for version, index in data.items()}
+
+    return parse
+
+
+def _parse_similarity(data: Dict[str, Any]) -> Any:
+    # numpy is only imported once the similarity model is needed
+    from modus_migration.similarity import SimilarityModel
+
+    return SimilarityModel.from_json(data)
+
+
+# How the servers turn each build artifact's JSON into objects; artifacts not
+# listed are used as decoded
+ARTIFACT_PARSERS: Dict[str, Callable[[Any], Any]] = {
+    ATTRIBUTE_INDEX_FILE: _parse_versions(AttributeIndex),
+    DOC_INDEX_FILE: _parse_versions(DocSearchIndex),
+    EXAMPLE_CORPUS_FILE: _parse_versions(ExampleCorpus),
+    SIMILARITY_FILE: _parse_similarity,
+}
+SNAPSHOT_ARTIFACTS = [
+    ATTRIBUTE_INDEX_FILE,
+    DOC_INDEX_FILE,
+    EXAMPLE_CORPUS_FILE,
+    SIMILARITY_FILE,
+    PROP_ALIGNMENT_FILE,
+    CATALOG_OFFSETS_FILE,
+]
+
+
+def parse_artifact(build_dir: str, artifact: str) -> Any:
+    data = load_artifact(build_dir, artifact)
+    parse = ARTIFACT_PARSERS.get(artifact)
+    return data if parse is None else parse(data)
+
+
+def build_snapshot(ctx: BuildContext) -> None:
+    """Pickle the parsed artifacts so servers skip JSON decoding at startup."""
+    artifacts = {
+        name: (file_signature(ctx.build_path(name)), parse_artifact(ctx.build_dir, name))
+        for name in SNAPSHOT_ARTIFACTS
+        if name in ctx.artifacts
+    }
+    write_snapshot(ctx.build_path(SNAPSHOT_FILE), BUILD_FORMAT, ctx.sources, artifacts)
+    ctx.artifacts[SNAPSHOT_FILE] = SNAPSHOT_FILE
+
+
+# Each step takes the BuildContext; later steps may read earlier artifacts
+BUILD_STEPS: List[Callable[[BuildContext], None]] = [
+    build_compact_catalogs,
+    build_attribute_index,
+    build_doc_index,
+    build_similarity,
+    build_prop_alignment,
+    build_example_corpus,
+    build_snapshot,
+]
+
+
+# Serializes builds within this process; LOCK_FILE serializes them across processes
+_BUILD_LOCK = threading.Lock()
+LOCK_FILE = ".build.lock"
+
+
+@contextmanager
+def build_lock(build_dir: str) -> Iterator[None]:
+    """Hold the build lock of `build_dir` (created if missing) until exit."""
+    os.makedirs(build_dir, exist_ok=True)
+    with _BUILD_LOCK, open(os.path.join(build_dir, LOCK_FILE), "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def compile_catalog(analysis_dir: Optional[str] = None, verbose: bool = True) -> str:
+    """Build (or rebuild) the catalog artifacts; returns the build directory."""
+    analysis_dir = analysis_dir or default_analysis_dir()
+    with build_lock(build_dir_for(analysis_dir)):
+        return _compile(analysis_dir, verbose)
+
+
+def _compile(analysis_dir: str, verbose: bool) -> str:
+    build_dir = build_dir_for(analysis_dir)
+    fingerprint = source_fingerprint(analysis_dir)
+    ctx = BuildContext(analysis_dir, build_dir, BlobStore(os.path.join(build_dir, "blobs")))
+    ctx.sources = fingerprint
+    for step in BUILD_STEPS:
+        with span(f"catalog_build.{step.__name__}"):
+            step(ctx)
+
+    pruned = ctx.store.prune(ctx.referenced_blobs)
+    write_json_atomic(
+        os.path.join(build_dir, "manifest.json"),
+        {"format": BUILD_FORMAT, "sources": fingerprint, "artifacts": ctx.artifacts},
+    )
+
+    if verbose:
+        source_bytes = sum(entry["size"] for entry in fingerprint.values())
+        build_bytes = sum(
+            os.path.getsize(ctx.build_path(name)) for name in ctx.artifacts.values()
+        )
+        blob_bytes = sum(
+            os.path.getsize(ctx.store.path(d)) for d in ctx.referenced_blobs
+        )
+        print(
+            f"Compiled catalog into {build_dir}: {source_bytes:,} source bytes -> "
+            f"{build_bytes:,} bytes of artifacts + {blob_bytes:,} bytes in "
+            f"{len(ctx.referenced_blobs)} blobs ({pruned} stale blobs pruned)"
+        )
+    return build_dir
+
+
+def ensure_compiled(analysis_dir: Optional[str] = None) -> str:
+    """Compile the catalog unless the existing build is current.
+
+    Concurrent callers, in this process or others, wait for the build in
+    progress and reuse it instead of compiling again.
+    """
+    analysis_dir = analysis_dir or default_analysis_dir()
+    build_dir = build_dir_for(analysis_dir)
+    if is_build_current(analysis_dir):
+        return build_dir
+    with build_lock(build_dir):
+        if not is_build_current(analysis_dir):
+            _compile(analysis_dir, verbose=False)
+    return build_dir
+
+
+if __name__ == "__main__":
+    compile_catalog(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,139 @@
+"""
+Streaming, crash-safe reading and writing of the component catalogs.
+
+Catalog files are read by running MCP servers while the extractor and
+split_components.py rewrite them, so every writer here goes through a temp
+file in the target directory that is fsync'ed and atomically renamed over the
+live file. Readers see either the old or the new catalog, never a partial one.
+
+write_catalog_stream() emits a `{name: component}` object one component at a
+time, producing byte-for-byte the same output as json.dump(..., indent=2)
+without first holding the whole catalog in memory.
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+_WHITESPACE = " \t\n\r"
+
+
+def _fsync_directory(directory: str) -> None:
+    """Persist a rename on filesystems that need the directory entry synced."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Windows: os.replace is already durable enough
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = "w", encoding: str = "utf-8"):
+    """Open a temp file next to `path` and rename it over `path` on success.
+
+    On any exception the temp file is removed and `path` is left untouched.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        # mkstemp creates files as 0600; keep the permissions of the file we replace
+        try:
+            os.chmod(temp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(temp_path, 0o644)
+
+        file_kwargs = {} if "b" in mode else {"encoding": encoding, "newline": ""}
+        with os.fdopen(fd, mode, **file_kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        _fsync_directory(directory)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def write_json_atomic(path: str, data: Any, indent: int = 2) -> None:
+    """json.dump `data` to `path` through atomic_write()."""
+    with atomic_write(path) as f:
+        json.dump(data, f, indent=indent)
+
+
+def write_catalog_stream(
+    path: str,
+    items: Iterable[Tuple[str, Any]],
+    indent: int = 2,
+    offsets: Optional[Dict[str, List[int]]] = None,
+) -> int:
+    """Atomically write a JSON object from (key, value) pairs, one pair at a time.
+
+    If `offsets` is given, the [start, end) byte range of each value is
+    stored in it under its key (json.dumps escapes non-ASCII, so characters
+    and bytes coincide). Returns the number of entries written.
+    """
+    newline_indent = "\n" + " " * indent
+    count = 0
+    position = 0
+    with atomic_write(path) as f:
+        for key, value in items:
+            head = ("{" if count == 0 else ",") + newline_indent + json.dumps(key) + ": "
+            body = json.dumps(value, indent=indent).replace("\n", newline_indent)
+            f.write(head)
+            f.write(body)
+            if offsets is not None:
+                offsets[key] = [position + len(head), position + len(head) + len(body)]
+            position += len(head) + len(body)
+            count += 1
+        f.write("\n}" if count else "{}")
+    return count
+
+
+def _skip_whitespace(text: str, index: int) -> int:
+    while index < len(text) and text[index] in _WHITESPACE:
+        index += 1
+    return index
+
+
+def iter_catalog_items(path: str) -> Iterator[Tuple[str, Any]]:
+    """Yield the top-level (key, value) pairs of a JSON object file one by one.
+
+    Only the raw text and the value currently being yielded are held in
+    memory, instead of the fully decoded catalog.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    decoder = json.JSONDecoder()
+    index = _skip_whitespace(text, 0)
+    if text[index : index + 1] != "{":
+        raise ValueError(f"{path}: expected a JSON object")
+    index += 1
+
+    while True:
+        index = _skip_whitespace(text, index)
+        if text[index : index + 1] == "}":
+            return
+        key, index = decoder.raw_decode(text, index)
+        index = _skip_whitespace(text, index)
+        if text[index : index + 1] != ":":
+            raise ValueError(f"{path}: expected ':' at offset {index}")
+        index = _skip_whitespace(text, index + 1)
+        value, index = decoder.raw_decode(text, index)
+        yield key, value
+
+        index = _skip_whitespace(text, index)
+        if text[index : index + 1] == ",":
+            index += 1
+        elif text[index : index + 1] != "}":
+            raise ValueError(f"{path}: expected ',' or '}}' at offset {index}")
@@ -0,0 +1,261 @@
+"""
+Compact in-memory model of a component catalog.
+
+The catalog JSON loads as dicts of lists of dicts: one dict per prop and
+event, a 64-character hex string per blob reference, and a separate copy of
+every repeated name, type and default value. The model holds the same data in
+__slots__ records with interned strings:
+
+    model = store.model("2.0")
+    button = model["modus-wc-button"]
+    [p.name for p in button.props]          # interned str
+    button.documentation                    # LazyText (or a short str)
+    text(button.documentation)              # read from the blob store on demand
+
+Large text fields (documentation, storybook content and examples, long prop
+descriptions) are LazyText references into the build's BlobStore and are only
+read when a tool asks for them; the store's LRU cache bounds what stays
+resident. Over a LazyCatalog (see lazy_catalog.py) a component is decoded
+from the mapped file the first time it is looked up, so a process holds only
+the components its tools have touched. Component.to_dict() rebuilds the resolved catalog entry, identical
+to catalog_store.resolve() of the JSON entry.
+"""
+
+import sys
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from modus_migration.blob_store import BLOB_REF_KEY, BlobStore, is_blob_ref
+
+_intern = sys.intern
+
+
+class LazyText:
+    """A blob-store text field, read on access."""
+
+    __slots__ = ("digest", "size", "_blobs")
+
+    def __init__(self, digest: str, size: int, blobs: BlobStore):
+        self.digest = bytes.fromhex(digest)
+        self.size = size
+        self._blobs = blobs
+
+    @property
+    def value(self) -> str:
+        return self._blobs.get(self.digest.hex())
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return f"LazyText({self.digest.hex()[:12]}…, {self.size} chars)"
+
+
+Text = Union[str, LazyText]
+
+
+def text(value: Any) -> Any:
+    """The string of a LazyText; other values unchanged."""
+    return value.value if isinstance(value, LazyText) else value
+
+
+def _text(value: Any, blobs: Optional[BlobStore]) -> Any:
+    if is_blob_ref(value) and blobs is not None:
+        return LazyText(value[BLOB_REF_KEY], value.get("size", 0), blobs)
+    return value
+
+
+def _interned(value: Any) -> Any:
+    return _intern(value) if isinstance(value, str) else value
+
+
+def _lazy(value: Any, blobs: Optional[BlobStore]) -> Any:
+    """`value` with strings interned and blob references turned into LazyText."""
+    if isinstance(value, str):
+        return _intern(value)
+    if isinstance(value, dict):
+        if is_blob_ref(value):
+            return _text(value, blobs)
+        return {_intern(k): _lazy(v, blobs) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_lazy(v, blobs) for v in value]
+    return value
+
+
+def _materialize(value: Any) -> Any:
+    """Copy of a _lazy() value with LazyText read back into strings."""
+    if isinstance(value, LazyText):
+        return value.value
+    if isinstance(value, dict):
+        return {k: _materialize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_materialize(v) for v in value]
+    return value
+
+
+# Field orders seen so far, shared by every record with the same keys
+_FIELD_ORDERS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _field_order(keys) -> Tuple[str, ...]:
+    order = tuple(_intern(k) for k in keys)
+    return _FIELD_ORDERS.setdefault(order, order)
+
+
+class Prop:
+    __slots__ = ("name", "type", "description", "_order")
+
+    def __init__(self, data: Dict[str, Any], blobs: Optional[BlobStore]):
+        self.name = _interned(data.get("name"))
+        self.type = _lazy(data.get("type"), blobs)
+        self.description = _lazy(data.get("description"), blobs)
+        self._order = _field_order(data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: _materialize(getattr(self, key)) for key in self._order}
+
+
+class Event:
+    __slots__ = ("name", "description", "_order")
+
+    def __init__(self, data: Dict[str, Any], blobs: Optional[BlobStore]):
+        self.name = _interned(data.get("name"))
+        self.description = _lazy(data.get("description"), blobs)
+        self._order = _field_order(data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: _materialize(getattr(self, key)) for key in self._order}
+
+
+def _record(item: Any, record_class, blobs: Optional[BlobStore]):
+    """A Prop/Event for dicts with only the known keys; anything else as-is."""
+    if isinstance(item, dict) and set(item) <= set(record_class.__slots__):
+        return record_class(item, blobs)
+    return _lazy(item, blobs)
+
+
+def item_field(item: Any, key: str) -> Any:
+    """`key` of a prop or event, whether it is a record or a dict kept as-is."""
+    if isinstance(item, (Prop, Event)):
+        return getattr(item, key, None)
+    return item.get(key) if isinstance(item, dict) else None
+
+
+def _item_dict(item: Any) -> Any:
+    return item.to_dict() if isinstance(item, (Prop, Event)) else _materialize(item)
+
+
+class Storybook:
+    __slots__ = ("examples", "variants", "prop_usage")
+
+    def __init__(self, data: Dict[str, Any], blobs: Optional[BlobStore]):
+        self.examples: Tuple[Text, ...] = tuple(_lazy(e, blobs) for e in data.get("examples") or [])
+        self.variants: Tuple[Any, ...] = tuple(_lazy(v, blobs) for v in data.get("variants") or [])
+        self.prop_usage = _lazy(data.get("prop_usage"), blobs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "examples": [_materialize(e) for e in self.examples],
+            "variants": [_materialize(v) for v in self.variants],
+            "prop_usage": _materialize(self.prop_usage),
+        }
+
+
+_COMPONENT_FIELDS = (
+    "props", "events", "slots", "default_values", "documentation",
+    "storybook_content", "storybook", "tag_name",
+)
+
+
+class Component:
+    __slots__ = ("key", "_order", "_extra") + _COMPONENT_FIELDS
+
+    def __init__(self, key: str, data: Dict[str, Any], blobs: Optional[BlobStore]):
+        self.key = _intern(key)
+        self._order = _field_order(data)
+        self.props: Tuple[Any, ...] = tuple(_record(p, Prop, blobs) for p in data.get("props") or [])
+        self.events: Tuple[Any, ...] = tuple(_record(e, Event, blobs) for e in data.get("events") or [])
+        self.slots: Tuple[Any, ...] = tuple(_lazy(s, blobs) for s in data.get("slots") or [])
+        self.default_values = _lazy(data.get("default_values") or {}, blobs)
+        self.documentation = _lazy(data.get("documentation", ""), blobs)
+        self.storybook_content = _lazy(data.get("storybook_content"), blobs)
+        storybook = data.get("storybook")
+        self.storybook = Storybook(storybook, blobs) if isinstance(storybook, dict) else storybook
+        self.tag_name = _lazy(data.get("tag_name"), blobs)
+        extra = {k: _lazy(v, blobs) for k, v in data.items() if k not in _COMPONENT_FIELDS}
+        self._extra = extra or None
+
+    def fields(self) -> Tuple[str, ...]:
+        """Field names of the catalog entry, in catalog order."""
+        return self._order
+
+    def names(self, field: str) -> List[str]:
+        """Names of the component's props, events or slots."""
+        return [
+            item.name if isinstance(item, (Prop, Event))
+            else item.get("name") if isinstance(item, dict) else item
+            for item in getattr(self, field)
+        ]
+
+    def field(self, name: str) -> Any:
+        """A field as it appears in the resolved catalog entry."""
+        value = getattr(self, name) if name in _COMPONENT_FIELDS else (self._extra or {}).get(name)
+        if name in ("props", "events"):
+            return [_item_dict(item) for item in value]
+        if name == "slots":
+            return [_materialize(item) for item in value]
+        if isinstance(value, Storybook):
+            return value.to_dict()
+        return _materialize(value)
+
+    def section_text(self, section: str) -> str:
+        """Text of a search section (see doc_search.iter_text_sections)."""
+        if section.startswith("storybook.examples["):
+            return text(self.storybook.examples[int(section[19:-1])])
+        return text(getattr(self, section, "")) or ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self.field(key) for key in self._order}
+
+
+class CatalogModel(Mapping[str, Component]):
+    """Components of a catalog, each built from `entries` on first access.
+
+    `entries` is any `{key: catalog entry}` mapping; with a LazyCatalog only
+    the components a tool touches are decoded and kept.
+    """
+
+    def __init__(self, entries: Mapping[str, Any], blobs: Optional[BlobStore] = None):
+        self._entries = entries
+        self._blobs = blobs
+        self._components: Dict[str, Component] = {}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any], blobs: Optional[BlobStore] = None) -> "CatalogModel":
+        components = {key: Component(key, entry, blobs) for key, entry in data.items()}
+        model = cls(components, blobs)
+        model._components = components
+        return model
+
+    def __getitem__(self, key: str) -> Component:
+        component = self._components.get(key)
+        if component is None:
+            # A concurrent first access may build it twice; either copy is equal
+            component = Component(key, self._entries[key], self._blobs)
+            self._components[key] = component
+        return component
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def loaded(self) -> int:
+        """Number of components built so far."""
+        return len(self._components)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key].to_dict() for key in self._entries}
@@ -0,0 +1,92 @@
+"""
+Pickled snapshot of the parsed build artifacts.
+
+A starting server would otherwise json-decode every build artifact it touches
+and rebuild the index objects from it. The catalog build also writes
+snapshot.pickle, holding each artifact already parsed (the same objects
+CatalogStore builds from the JSON), pickled separately:
+
+    {"format": BUILD_FORMAT, "python": [3, 11],
+     "sources": {"v2_components.json": "<sha256>", ...},
+     "artifacts": {"doc_index.json": {"size": ..., "mtime_ns": ..., "pickle": b"..."}, ...}}
+
+"format" is catalog_build.BUILD_FORMAT at the time of the build.
+
+An artifact is only unpickled when first requested, so e.g. numpy is not
+imported until a tool needs the similarity model. The snapshot is used only
+if its build format, Python version and source hashes match the build
+manifest, and each artifact only while its JSON file is the one it was made
+from; anything else falls back to the JSON. The build directory is generated
+locally and trusted like the source tree.
+"""
+
+import logging
+import pickle
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+from modus_migration.catalog_io import atomic_write
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "snapshot.pickle"
+
+
+def _python_version() -> Tuple[int, int]:
+    return tuple(sys.version_info[:2])
+
+
+def source_hashes(sources: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+    """{file: sha256} of a build manifest's "sources" entry."""
+    return {file_name: entry.get("sha256") for file_name, entry in sources.items()}
+
+
+def write_snapshot(path: str, build_format: int, sources: Dict[str, Dict[str, Any]],
+                   artifacts: Dict[str, Tuple[Dict[str, int], Any]]) -> None:
+    """Write `artifacts` ({name: (file signature, parsed value)}) to `path`."""
+    snapshot = {
+        "format": build_format,
+        "python": _python_version(),
+        "sources": source_hashes(sources),
+        "artifacts": {
+            name: dict(signature, pickle=pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+            for name, (signature, value) in artifacts.items()
+        },
+    }
+    with atomic_write(path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class CatalogSnapshot:
+    def __init__(self, artifacts: Dict[str, Dict[str, Any]]):
+        self._artifacts = artifacts
+
+    @classmethod
+    def open(cls, path: str, build_format: int,
+             sources: Dict[str, Dict[str, Any]]) -> Optional["CatalogSnapshot"]:
+        """The snapshot at `path` if it matches the build; None otherwise."""
+        try:
+            with open(path, "rb") as f:
+                snapshot = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable catalog snapshot {path}: {e}")
+            return None
+        if (
+            snapshot.get("format") != build_format
+            or tuple(snapshot.get("python", ())) != _python_version()
+            or snapshot.get("sources") != source_hashes(sources)
+        ):
+            return None
+        return cls(snapshot["artifacts"])
+
+    def get(self, name: str, signature: Dict[str, int]) -> Any:
+        """Parsed artifact `name`; KeyError if absent or made from another file."""
+        entry = self._artifacts.get(name)
+        if entry is None or "pickle" not in entry:
+            raise KeyError(name)
+        if {k: entry.get(k) for k in signature} != signature:
+            raise KeyError(name)
+        # The caller caches the value; drop the pickled copy
+        return pickle.loads(entry.pop("pickle"))
@@ -0,0 +1,255 @@
+"""
+Cached, blob-aware access to the component catalogs for the MCP servers.
+
+Catalogs are loaded from the compiled build (see catalog_build.py), which is
+rebuilt on demand when the extractor output changes. Loaded catalogs are
+cached until their file changes on disk, so tools no longer re-parse the
+catalogs on every call. Large text fields stay blob references until a tool
+resolves the fields it actually returns:
+
+    store = CatalogStore(analysis_dir)
+    v2 = store.components("2.0")
+    docs = store.resolve(v2["modus-wc-button.tsx"].get("documentation", ""))
+
+Tools that only read parts of a catalog use store.model(version) instead, a
+slotted CatalogModel with interned names and lazy text (see catalog_model.py)
+over the memory-mapped catalog file, decoding a component only when it is
+first looked up (see lazy_catalog.py). The indexes are unpickled from the
+build's snapshot (see catalog_snapshot.py) rather than parsed from JSON.
+
+If the build cannot be produced (e.g. a read-only checkout), the source JSON
+files are loaded directly and contain no references.
+"""
+
+import json
+import logging
+import os
+import threading
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from modus_migration.attribute_index import AttributeIndex
+from modus_migration.blob_store import BlobStore, resolve
+from modus_migration.catalog_model import CatalogModel
+from modus_migration.catalog_snapshot import SNAPSHOT_FILE, CatalogSnapshot
+from modus_migration.doc_search import DocSearchIndex
+from modus_migration.example_corpus import ExampleCorpus
+from modus_migration.lazy_catalog import LazyCatalog, file_signature
+from modus_migration.release_catalog import release_catalog_path
+from modus_migration.tracing import span
+from modus_migration.catalog_build import (
+    ARTIFACT_PARSERS,
+    ATTRIBUTE_INDEX_FILE,
+    BUILD_FORMAT,
+    CATALOG_OFFSETS_FILE,
+    DOC_INDEX_FILE,
+    EXAMPLE_CORPUS_FILE,
+    PROP_ALIGNMENT_FILE,
+    SIMILARITY_FILE,
+    MAPPING_FILE,
+    build_dir_for,
+    default_analysis_dir,
+    ensure_compiled,
+    read_manifest,
+)
+
+if TYPE_CHECKING:
+    from modus_migration.similarity import SimilarityModel
+
+logger = logging.getLogger(__name__)
+
+
+# Read-only, so that sharing it between calls is safe
+_NO_ALIGNMENT: Mapping[str, Any] = MappingProxyType({})
+
+
+def catalog_file_name(version: str) -> str:
+    """Catalog file for a "1.0"/"v1" or "2.0"/"v2" version string."""
+    return "v1_components.json" if version in ("1.0", "v1", "1") else "v2_components.json"
+
+
+class CatalogStore:
+    def __init__(self, analysis_dir: Optional[str] = None):
+        self.analysis_dir = analysis_dir or default_analysis_dir()
+        self.build_dir = build_dir_for(self.analysis_dir)
+        self.blobs = BlobStore(os.path.join(self.build_dir, "blobs"))
+        self._lock = threading.Lock()
+        self._files: Dict[str, Tuple[Tuple[str, int, int], Any]] = {}
+        # kind -> [hits, misses] of _cached
+        self._counts: Dict[str, List[int]] = {}
+        self._compiled = False
+
+    def _ensure_build(self) -> bool:
+        try:
+            ensure_compiled(self.analysis_dir)
+            self._compiled = True
+        except Exception as e:
+            if self._compiled:
+                # Keep serving the last good build
+                logger.warning(f"Catalog rebuild failed, using existing build: {e}")
+            else:
+                logger.warning(f"Catalog build unavailable, reading source JSON: {e}")
+        return self._compiled
+
+    def _cached(self, path: str, kind: str, factory: Callable[[], Any]) -> Any:
+        """factory() for `path`, cached until the file changes."""
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        cache_key = f"{path}#{kind}"
+        with self._lock:
+            counts = self._counts.setdefault(kind, [0, 0])
+            cached = self._files.get(cache_key)
+            if cached is not None and cached[0] == key:
+                counts[0] += 1
+                return cached[1]
+        with span("catalog.load", kind=kind, file=os.path.basename(path)):
+            data = factory()
+        with self._lock:
+            counts[1] += 1
+            self._files[cache_key] = (key, data)
+        return data
+
+    def cache_stats(self) -> Dict[str, Tuple[int, int]]:
+        """{cache: (hits, misses)} of the parsed-file caches (by kind) and the blob cache."""
+        with self._lock:
+            stats = {kind: (hits, misses) for kind, (hits, misses) in self._counts.items()}
+        stats["blobs"] = (self.blobs.hits, self.blobs.misses)
+        return stats
+
+    def _load(self, path: str) -> Any:
+        """Parse `path`, cached until the file changes."""
+
+        def parse() -> Any:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        return self._cached(path, "json", parse)
+
+    def _snapshot(self) -> Optional[CatalogSnapshot]:
+        path = os.path.join(self.build_dir, SNAPSHOT_FILE)
+        if not os.path.exists(path):
+            return None
+
+        def open_snapshot() -> Optional[CatalogSnapshot]:
+            manifest = read_manifest(self.build_dir) or {}
+            return CatalogSnapshot.open(path, BUILD_FORMAT, manifest.get("sources", {}))
+
+        return self._cached(path, "snapshot", open_snapshot)
+
+    def _artifact(self, file_name: str) -> Optional[Any]:
+        """Parsed build artifact, unpickled from the snapshot when it is
+        current; None if the build has no such artifact."""
+        if not self._ensure_build():
+            return None
+        path = os.path.join(self.build_dir, file_name)
+        if not os.path.exists(path):
+            return None
+
+        def parse() -> Any:
+            snapshot = self._snapshot()
+            if snapshot is not None:
+                try:
+                    return snapshot.get(file_name, file_signature(path))
+                except KeyError:
+                    pass
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            transform = ARTIFACT_PARSERS.get(file_name)
+            return data if transform is None else transform(data)
+
+        return self._cached(path, "artifact", parse)
+
+    def load(self, file_name: str) -> Any:
+        """Load a catalog or framework data file (may contain blob references)."""
+        if self._ensure_build():
+            built = os.path.join(self.build_dir, file_name)
+            if os.path.exists(built):
+                return self._load(built)
+        return self._load(os.path.join(self.analysis_dir, file_name))
+
+    def components(self, version: str) -> Dict[str, Any]:
+        return self.load(catalog_file_name(version))
+
+    def model(self, version: str) -> CatalogModel:
+        """Compact catalog model of a version over the memory-mapped catalog
+        file; components are decoded on first lookup and large text fields
+        stay lazy until a tool reads them (see catalog_model.py)."""
+        file_name = catalog_file_name(version)
+        if self._ensure_build():
+            built = os.path.join(self.build_dir, file_name)
+            if os.path.exists(built):
+                return self._cached(built, "model", lambda: CatalogModel(
+                    LazyCatalog(built, self._offsets_sidecar().get(file_name)), self.blobs
+                ))
+        source = os.path.join(self.analysis_dir, file_name)
+        return self._cached(source, "model", lambda: CatalogModel(LazyCatalog(source)))
+
+    def warm(self) -> None:
+        """Check the build and open both catalog models, so the first tool
+        call does not pay for it."""
+        for version in ("1.0", "2.0"):
+            self.model(version)
+
+    def _offsets_sidecar(self) -> Dict[str, Any]:
+        return self._artifact(CATALOG_OFFSETS_FILE) or {}
+
+    def framework_data(self, version: str, framework: str) -> Dict[str, Any]:
+        prefix = "v1" if catalog_file_name(version).startswith("v1") else "v2"
+        return self.load(f"{prefix}_{framework}_framework_data.json")
+
+    def _version_index(self, version: str, artifact: str, index_class):
+        prefix = "v1" if catalog_file_name(version).startswith("v1") else "v2"
+        indexes = self._artifact(artifact)
+        if indexes is not None and prefix in indexes:
+            return indexes[prefix]
+        # No build: index the source catalog (slow, but keeps tools working)
+        return index_class.from_catalog(self.components(version).items())
+
+    def attribute_index(self, version: str) -> AttributeIndex:
+        """Inverted prop/event/slot/type index of a catalog version."""
+        return self._version_index(version, ATTRIBUTE_INDEX_FILE, AttributeIndex)
+
+    def doc_index(self, version: str) -> DocSearchIndex:
+        """BM25 documentation/storybook passage index of a catalog version."""
+        return self._version_index(version, DOC_INDEX_FILE, DocSearchIndex)
+
+    def example_corpus(self, version: str) -> ExampleCorpus:
+        """Deduplicated storybook examples of a catalog version, ranked per component."""
+        return self._version_index(version, EXAMPLE_CORPUS_FILE, ExampleCorpus)
+
+    def similarity_model(self) -> "SimilarityModel":
+        """v1 x v2 TF-IDF similarity of the current catalogs."""
+        model = self._artifact(SIMILARITY_FILE)
+        if model is not None:
+            return model
+        from modus_migration.similarity import SimilarityModel
+
+        return SimilarityModel.fit(
+            self.resolve(self.components("1.0")).items(),
+            self.resolve(self.components("2.0")).items(),
+        )
+
+    def prop_alignment(self) -> Mapping[str, Any]:
+        """v1 -> v2 prop alignment table keyed by v1 tag (see prop_alignment.py);
+        without a build, the same empty table on every call, so that callers
+        caching on it (verification.rules_for) keep their results."""
+        alignment = self._artifact(PROP_ALIGNMENT_FILE)
+        return _NO_ALIGNMENT if alignment is None else alignment
+
+    def release_catalog(self, version: str) -> Dict[str, Any]:
+        """Multi-release catalog of "v1" or "v2" (see release_catalog.py),
+        cached until the file changes; FileNotFoundError if it was never built."""
+        path = release_catalog_path(self.analysis_dir, version)
+
+        def parse() -> Any:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        return self._cached(path, "releases", parse)
+
+    def mapping(self) -> Dict[str, Any]:
+        return self._load(os.path.join(self.analysis_dir, MAPPING_FILE))
+
+    def resolve(self, value: Any) -> Any:
+        """Replace the blob references in `value` by their text."""
+        return resolve(value, self.blobs)
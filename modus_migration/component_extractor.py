@@ -1,13 +1,45 @@
+import argparse
 import json
 import re
 import os
 import sys
 import subprocess
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 import shutil
 import stat
 
+# Allow running as `python component_extractor.py` from inside modus_migration/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from modus_migration import extraction_profile as profiling
+from modus_migration import tracing
+from modus_migration.catalog_build import SIMILARITY_FILE, compile_catalog, load_artifact
+from modus_migration.catalog_io import write_catalog_stream, write_json_atomic
+from modus_migration.example_corpus import canonicalize, example_hash
+from modus_migration.git_source import GitObjectReader, group_by_parent
+from modus_migration.release_catalog import build_release_catalog, release_catalog_path
+from modus_migration.similarity import SimilarityModel
+
+# Where each Modus major version keeps its components and stories,
+# relative to the repository root
+REPO_LAYOUTS = {
+    "v1": {
+        "components": "stencil-workspace/src/components",
+        "storybook": "stencil-workspace/storybook/stories/components",
+        "tag_prefix": "modus-",
+        "excluded_suffixes": (".spec.tsx", ".e2e.tsx", ".stories.tsx"),
+    },
+    "v2": {
+        "components": "src/components",
+        "storybook": None,  # Stories live alongside the component files
+        "tag_prefix": "modus-wc-",
+        "excluded_suffixes": (".spec.tsx", ".stories.tsx"),
+    },
+}
+
 
 def handle_remove_error(func, path, exc_info):
     """Handle permission errors when removing files"""
@@ -38,6 +70,7 @@ def clone_repo(repo_url, target_dir, skip_clone_if_exists: bool):
         return False
 
 
+@profiling.timed("discovery")
 def find_component_dir(repo_path: str, version: str) -> str:
     """
     Find the components directory based on version and repo structure.
@@ -80,6 +113,7 @@ def find_component_dir(repo_path: str, version: str) -> str:
     return os.path.join(repo_path, "src", "components")  # Return a default path
 
 
+@profiling.timed("discovery")
 def find_storybook_dir(repo_path: str, version: str) -> str:
     """
     Find the storybook directory based on version and repo structure.
@@ -111,6 +145,7 @@ def find_storybook_dir(repo_path: str, version: str) -> str:
     return None
 
 
+@profiling.timed("discovery")
 def find_docs_dir(repo_path: str, version: str) -> str:
     """
     Find the documentation directory based on version and repo structure.
@@ -148,9 +183,8 @@ def find_docs_dir(repo_path: str, version: str) -> str:
     return os.path.join(repo_path, "docs")  # Return a default path
 
 
-def extract_storybook_and_docs(dir_path: str, is_v2: bool) -> dict:
-    """Extract full storybook content and documentation."""
-    result = {
+def _empty_docs_info(is_v2: bool) -> dict:
+    return {
         "documentation": "",
         "storybook_content": (
             "" if not is_v2 else None
@@ -160,82 +194,133 @@ def extract_storybook_and_docs(dir_path: str, is_v2: bool) -> dict:
         "prop_usage": {},
     }
 
+
+def extract_storybook_and_docs(dir_path: str, is_v2: bool) -> dict:
+    """Extract full storybook content and documentation."""
+    sources = []
     try:
         # Find story files and doc files
+        file_names = os.listdir(dir_path)
         story_files = [
             f
-            for f in os.listdir(dir_path)
+            for f in file_names
             if f.endswith(".stories.tsx") or f.endswith(".stories.ts")
         ]
-        doc_files = [f for f in os.listdir(dir_path) if f.endswith(".mdx")]
+        doc_files = [f for f in file_names if f.endswith(".mdx")]
 
-        # Process story files
-        for story_file in story_files:
-            file_path = os.path.join(dir_path, story_file)
+        for file_name in story_files + doc_files:
+            file_path = os.path.join(dir_path, file_name)
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
+                with profiling.phase("read"), open(file_path, "r", encoding="utf-8") as f:
                     content = f.read()
+                profiling.record_read(file_path, content)
+                sources.append((file_name, content))
+            except Exception as e:
+                print(f"Error reading storybook/documentation file {file_path}: {e}")
 
-                    # Store full storybook content
-                    if is_v2:
-                        # For v2, add to documentation directly
-                        result[
-                            "documentation"
-                        ] += f"\n\n--- {story_file} ---\n\n{content}"
-                    else:
-                        # For v1, store separately as we'll also have .mdx docs
-                        result[
-                            "storybook_content"
-                        ] += f"\n\n--- {story_file} ---\n\n{content}"
-
-                    # Extract tag examples for convenience
-                    tag_prefix = "modus-wc-" if is_v2 else "modus-"
-                    examples = re.findall(
-                        f"<{tag_prefix}[^>]+>[^<]*</{tag_prefix}[^>]+>", content
-                    )
-                    examples.extend(re.findall(f"<{tag_prefix}[^/>]+/>", content))
+    except Exception as e:
+        print(f"Error extracting storybook and docs from {dir_path}: {e}")
 
-                    # Extract from template literals
-                    template_literals = re.findall(r"`(.*?)`", content, re.DOTALL)
-                    for literal in template_literals:
-                        if f"<{tag_prefix}" in literal:
-                            examples.append(literal)
+    return extract_storybook_and_docs_from_sources(sources, is_v2)
 
-                    result["examples"].extend(examples[:5])
 
-                    # Extract variants
-                    variants = re.findall(
-                        r'[\'"]variant[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]', content
-                    )
-                    variants.extend(
-                        re.findall(r'variant=[\'"]{([^}]+)}[\'""]', content)
-                    )
-                    variants.extend(re.findall(r'variant=[\'"]([^\'"]+)[\'"]', content))
-                    result["variants"].extend(list(set(variants)))
-
-                    # Extract prop usage
-                    prop_pattern = r'(\w+)=[\'"]([^\'"]+)[\'"]'
-                    prop_matches = re.findall(prop_pattern, content)
-                    for prop, value in prop_matches:
-                        if prop not in result["prop_usage"]:
-                            result["prop_usage"][prop] = []
-                        if value not in result["prop_usage"][prop]:
-                            result["prop_usage"][prop].append(value)
-            except Exception as e:
-                print(f"Error processing story file {file_path}: {e}")
+@profiling.timed("storybook")
+def extract_storybook_and_docs_from_sources(sources: List[tuple], is_v2: bool) -> dict:
+    """Extract storybook content and documentation from (file_name, content) pairs.
 
-        # Process documentation files (primarily for v1)
-        for doc_file in doc_files:
-            file_path = os.path.join(dir_path, doc_file)
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    result["documentation"] += f"\n\n--- {doc_file} ---\n\n{content}"
-            except Exception as e:
-                print(f"Error processing documentation file {file_path}: {e}")
+    Story files (.stories.tsx/.stories.ts) are processed before .mdx docs,
+    other files are ignored.
+    """
+    result = _empty_docs_info(is_v2)
 
-    except Exception as e:
-        print(f"Error extracting storybook and docs from {dir_path}: {e}")
+    story_sources = [
+        (name, content)
+        for name, content in sources
+        if name.endswith(".stories.tsx") or name.endswith(".stories.ts")
+    ]
+    doc_sources = [(name, content) for name, content in sources if name.endswith(".mdx")]
+
+    # Dicts as insertion-ordered sets: O(1) membership, deterministic output
+    seen_examples = set()
+    variants_seen = {}
+    prop_usage_seen = {}
+
+    # Process story files
+    for story_file, content in story_sources:
+        try:
+            # Store full storybook content
+            if is_v2:
+                # For v2, add to documentation directly
+                result["documentation"] += f"\n\n--- {story_file} ---\n\n{content}"
+            else:
+                # For v1, store separately as we'll also have .mdx docs
+                result["storybook_content"] += f"\n\n--- {story_file} ---\n\n{content}"
+
+            # Extract tag examples for convenience
+            tag_prefix = "modus-wc-" if is_v2 else "modus-"
+            examples = profiling.findall(
+                "story_tag_example",
+                f"<{tag_prefix}[^>]+>[^<]*</{tag_prefix}[^>]+>",
+                content,
+            )
+            examples.extend(
+                profiling.findall(
+                    "story_self_closing_example", f"<{tag_prefix}[^/>]+/>", content
+                )
+            )
+
+            # Extract from template literals
+            template_literals = profiling.findall(
+                "story_template_literal", r"`(.*?)`", content, re.DOTALL
+            )
+            for literal in template_literals:
+                if f"<{tag_prefix}" in literal:
+                    examples.append(literal)
+
+            # Keep the first five distinct examples of each story file; copies
+            # differing only in whitespace or attribute order count once
+            kept = 0
+            for example in examples:
+                if kept == 5:
+                    break
+                digest = example_hash(canonicalize(example))
+                if digest not in seen_examples:
+                    seen_examples.add(digest)
+                    result["examples"].append(example)
+                    kept += 1
+
+            # Extract variants
+            variants = profiling.findall(
+                "story_variant_object",
+                r'[\'"]variant[\'"]\s*:\s*[\'"]([^\'"]+)[\'"]',
+                content,
+            )
+            variants.extend(
+                profiling.findall(
+                    "story_variant_expression", r'variant=[\'"]{([^}]+)}[\'""]', content
+                )
+            )
+            variants.extend(
+                profiling.findall(
+                    "story_variant_attribute", r'variant=[\'"]([^\'"]+)[\'"]', content
+                )
+            )
+            variants_seen.update(dict.fromkeys(variants))
+
+            # Extract prop usage
+            prop_pattern = r'(\w+)=[\'"]([^\'"]+)[\'"]'
+            prop_matches = profiling.findall("story_prop_usage", prop_pattern, content)
+            for prop, value in prop_matches:
+                prop_usage_seen.setdefault(prop, {})[value] = None
+        except Exception as e:
+            print(f"Error processing story file {story_file}: {e}")
+
+    result["variants"] = list(variants_seen)
+    result["prop_usage"] = {prop: list(values) for prop, values in prop_usage_seen.items()}
+
+    # Process documentation files (primarily for v1)
+    for doc_file, content in doc_sources:
+        result["documentation"] += f"\n\n--- {doc_file} ---\n\n{content}"
 
     return result
 
@@ -243,26 +328,44 @@ def extract_storybook_and_docs(dir_path: str, is_v2: bool) -> dict:
 def parse_component_file(path: Path) -> dict:
     """Parse a component file to extract props, events, and slots."""
     try:
-        with path.open("r", encoding="utf-8") as f:
+        with profiling.phase("read"), path.open("r", encoding="utf-8") as f:
             content = f.read()
+        profiling.record_read(str(path), content)
+    except Exception as e:
+        print(f"Error parsing file {path}: {e}")
+        return {"props": [], "events": [], "slots": [], "default_values": {}}
+    return parse_component_source(content, str(path))
+
 
+@profiling.timed("parse")
+def parse_component_source(content: str, source_name: str = "<source>") -> dict:
+    """Parse component source text to extract props, events, and slots."""
+    try:
         # Extract props
         props_pattern = r"@Prop\s*(?:\([^)]*\))?\s*(\w+)"
-        prop_names = re.findall(props_pattern, content)
+        prop_names = profiling.findall("prop_decorator", props_pattern, content)
 
         # Extract events
         events_pattern = r"@StencilEvent\s*(?:\([^)]*\))?\s*(\w+)"
-        event_names = re.findall(events_pattern, content)
+        event_names = profiling.findall("event_decorator", events_pattern, content)
 
-        slots = re.findall(r'<slot name="(\w+)"', content)
+        slots = profiling.findall("slot_name", r'<slot name="(\w+)"', content)
 
         # Fallback for props if using @property decorator
         if not prop_names:
-            prop_names = re.findall(r"@property\(\s*\{\s*[^}]*\s*\}\s*\)\s*(\w+)", content)
+            prop_names = profiling.findall(
+                "prop_property_fallback",
+                r"@property\(\s*\{\s*[^}]*\s*\}\s*\)\s*(\w+)",
+                content,
+            )
 
         # Fallback for events if using @event decorator (less common for Stencil V2)
         if not event_names:
-            event_names = re.findall(r"@event\(\s*\{\s*[^}]*\s*\}\s*\)\s*(\w+)", content)
+            event_names = profiling.findall(
+                "event_fallback",
+                r"@event\(\s*\{\s*[^}]*\s*\}\s*\)\s*(\w+)",
+                content,
+            )
 
         # Process props with details
         prop_details = []
@@ -276,24 +379,32 @@ def parse_component_file(path: Path) -> dict:
             jsdoc_pattern_property = rf"(\/\*\*[\s\S]*?\*\/)\s*@property\s*(?:\([^)]*\))?[\s\S]*?\b{escaped_prop_name}\b"
             single_line_pattern_property = rf"(//[^\n]*)\n\s*@property\s*(?:\([^)]*\))?[\s\S]*?\b{escaped_prop_name}\b"
 
-            match = re.search(jsdoc_pattern_prop, content)
+            match = profiling.search("prop_jsdoc", jsdoc_pattern_prop, content)
             if match:
                 comment = match.group(1).strip()
             else:
-                match = re.search(single_line_pattern_prop, content)
+                match = profiling.search(
+                    "prop_line_comment", single_line_pattern_prop, content
+                )
                 if match:
                     comment = match.group(1).strip("//").strip()
                 else: 
-                    match = re.search(jsdoc_pattern_property, content)
+                    match = profiling.search(
+                        "prop_property_jsdoc", jsdoc_pattern_property, content
+                    )
                     if match:
                         comment = match.group(1).strip()
                     else:
-                        match = re.search(single_line_pattern_property, content)
+                        match = profiling.search(
+                            "prop_property_line_comment",
+                            single_line_pattern_property,
+                            content,
+                        )
                         if match:
                             comment = match.group(1).strip("//").strip()
             
             type_pattern = rf"\b{escaped_prop_name}\b\s*[:?!]\s*([^;=]+)"
-            type_match = re.search(type_pattern, content)
+            type_match = profiling.search("prop_type", type_pattern, content)
             prop_type = ""
             if type_match:
                 prop_type = type_match.group(1).strip()
@@ -315,19 +426,27 @@ def parse_component_file(path: Path) -> dict:
             jsdoc_pattern_alt_event = rf"(\/\*\*[\s\S]*?\*\/)\s*@event\s*(?:\([^)]*\))?[\s\S]*?\b{escaped_event_name}\b"
             single_line_pattern_alt_event = rf"(//[^\n]*)\n\s*@event\s*(?:\([^)]*\))?[\s\S]*?\b{escaped_event_name}\b"
 
-            match = re.search(jsdoc_pattern_event, content)
+            match = profiling.search("event_jsdoc", jsdoc_pattern_event, content)
             if match:
                 comment = match.group(1).strip()
             else:
-                match = re.search(single_line_pattern_event, content)
+                match = profiling.search(
+                    "event_line_comment", single_line_pattern_event, content
+                )
                 if match:
                     comment = match.group(1).strip("//").strip()
                 else: # Fallback to @event patterns
-                    match = re.search(jsdoc_pattern_alt_event, content)
+                    match = profiling.search(
+                        "event_alt_jsdoc", jsdoc_pattern_alt_event, content
+                    )
                     if match:
                         comment = match.group(1).strip()
                     else:
-                        match = re.search(single_line_pattern_alt_event, content)
+                        match = profiling.search(
+                            "event_alt_line_comment",
+                            single_line_pattern_alt_event,
+                            content,
+                        )
                         if match:
                             comment = match.group(1).strip("//").strip()
             
@@ -339,7 +458,7 @@ def parse_component_file(path: Path) -> dict:
             current_prop_name = prop_detail_item["name"]
             escaped_current_prop_name = re.escape(current_prop_name)
             default_pattern = rf"\b{escaped_current_prop_name}\b\s*(?:[:?!][^=;]*)?\s*=\s*([^;]+?)\s*;"
-            default_match = re.search(default_pattern, content)
+            default_match = profiling.search("prop_default", default_pattern, content)
             if default_match:
                 default_values[current_prop_name] = default_match.group(1).strip()
 
@@ -350,7 +469,7 @@ def parse_component_file(path: Path) -> dict:
             "default_values": default_values,
         }
     except Exception as e:
-        print(f"Error parsing file {path}: {e}")
+        print(f"Error parsing file {source_name}: {e}")
         return {"props": [], "events": [], "slots": [], "default_values": {}}
 
 
@@ -455,12 +574,33 @@ def extract_component_details(repo_path: str, version: str = "v1") -> Dict:
 
 
 def save_analysis_to_json(component_details: Dict, output_file: str) -> None:
-    """Save component analysis to a JSON file."""
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(component_details, f, indent=2)
+    """Save component analysis to a JSON file (atomically)."""
+    with profiling.phase("write"):
+        write_json_atomic(output_file, component_details)
     print(f"Analysis saved to {output_file}")
 
 
+def save_components_stream(
+    components: Iterator[Tuple[str, dict]], output_file: str, names: List[str]
+) -> int:
+    """Stream (tag_name, details) pairs into a catalog file as they are extracted.
+
+    Only the component currently being written is held in memory; the tag
+    names are collected into `names` for the mapping step. The file is
+    replaced atomically once every component has been written.
+    """
+
+    def collect_names():
+        for name, details in components:
+            names.append(name)
+            yield name, details
+
+    with profiling.phase("write"):
+        count = write_catalog_stream(output_file, collect_names())
+    print(f"Analysis saved to {output_file} ({count} components)")
+    return count
+
+
 def create_manual_component_map() -> Dict:
     """
     Create a manual mapping of components between v1 and v2.
@@ -495,6 +635,7 @@ def create_manual_component_map() -> Dict:
     }
 
 
+@profiling.timed("framework")
 def extract_framework_examples(
     repo_path: str,
     version: str,
@@ -523,6 +664,7 @@ def extract_framework_examples(
                 with open(item_path, "r", encoding="utf-8") as f:
                     content = f.read()
                     examples[item_name] = content
+                profiling.record_read(item_path, content)
                 print(f"  Extracted example: {item_name}")
             except Exception as e:
                 print(f"Error reading example file {item_path}: {e}")
@@ -541,6 +683,7 @@ def extract_framework_examples(
                         with open(sub_item_path, "r", encoding="utf-8") as f:
                             content = f.read()
                             component_examples[sub_item_name] = content
+                        profiling.record_read(sub_item_path, content)
                         print(f"  Extracted example: {item_name}/{sub_item_name}")
                     except Exception as e:
                         print(f"Error reading example file {sub_item_path}: {e}")
@@ -550,6 +693,7 @@ def extract_framework_examples(
     return examples
 
 
+@profiling.timed("framework")
 def extract_framework_documentation(
     repo_path: str, mdx_file_path_relative_to_repo: str
 ) -> str:
@@ -560,6 +704,7 @@ def extract_framework_documentation(
         try:
             with open(mdx_file_path, "r", encoding="utf-8") as f:
                 documentation_content = f.read()
+            profiling.record_read(mdx_file_path, documentation_content)
             print(f"Successfully extracted documentation from: {mdx_file_path}")
         except Exception as e:
             print(f"Error reading .mdx documentation file {mdx_file_path}: {e}")
@@ -568,8 +713,342 @@ def extract_framework_documentation(
     return documentation_content
 
 
-def main():
+def _is_main_component_file(file_name: str, version: str) -> bool:
+    excluded = REPO_LAYOUTS[version]["excluded_suffixes"]
+    return file_name.endswith(".tsx") and not file_name.endswith(excluded)
+
+
+def build_component_details(parsed: dict, docs_info: dict, tag_name: str, is_v2: bool) -> dict:
+    """Combine parsed component source and storybook/docs info into a catalog entry."""
+    component_details = dict(parsed)
+    component_details["documentation"] = docs_info["documentation"]
+    if not is_v2:
+        component_details["storybook_content"] = docs_info["storybook_content"]
+    component_details["storybook"] = {
+        "examples": docs_info["examples"],
+        "variants": docs_info["variants"],
+        "prop_usage": docs_info["prop_usage"],
+    }
+    component_details["tag_name"] = tag_name
+    return component_details
+
+
+def _worktree_component_details(
+    component_dir: str, component_name: str, storybook_dir: Optional[str], version: str
+) -> Optional[dict]:
+    is_v2 = version == "v2"
+
+    # Find the main component file
+    with profiling.phase("discovery"):
+        tsx_files = [
+            f for f in os.listdir(component_dir) if _is_main_component_file(f, version)
+        ]
+    if not tsx_files:
+        return None
+
+    # Use the first component file
+    component_file = os.path.join(component_dir, tsx_files[0])
+    parsed = parse_component_file(Path(component_file))
+
+    # Extract storybook and docs (for v2, they're in the same directory)
+    docs_info = _empty_docs_info(is_v2)
+    story_dir = (
+        os.path.join(storybook_dir, component_name) if storybook_dir else component_dir
+    )
+    if os.path.exists(story_dir):
+        print(f"  Extracting docs and storybook content for: {component_name}")
+        docs_info = extract_storybook_and_docs(story_dir, is_v2=is_v2)
+
+    return build_component_details(parsed, docs_info, component_name, is_v2)
+
+
+def iter_worktree_components(repo_path: str, version: str) -> Iterator[Tuple[str, dict]]:
+    """Yield (tag_name, details) for each component in a checked-out repository."""
+    layout = REPO_LAYOUTS[version]
+    components_dir = os.path.join(repo_path, *layout["components"].split("/"))
+    storybook_dir = (
+        os.path.join(repo_path, *layout["storybook"].split("/"))
+        if layout["storybook"]
+        else None
+    )
+
+    if not os.path.exists(components_dir):
+        return
+
+    with profiling.phase("discovery"):
+        component_names = os.listdir(components_dir)
+
+    for component_name in component_names:
+        component_dir = os.path.join(components_dir, component_name)
+        if not (
+            os.path.isdir(component_dir)
+            and component_name.startswith(layout["tag_prefix"])
+        ):
+            continue
+        print(f"Processing component: {component_name}")
+
+        with profiling.component(component_name):
+            details = _worktree_component_details(
+                component_dir, component_name, storybook_dir, version
+            )
+        if details is not None:
+            yield component_name, details
+
+
+def _read_blob_text(reader: GitObjectReader, sha: str, path: str) -> str:
+    with profiling.phase("read"):
+        content = reader.read_text(sha) or ""
+    profiling.record_read(path, content)
+    return content
+
+
+def _ref_component_details(
+    reader: GitObjectReader,
+    component_name: str,
+    component_entries: list,
+    story_entries: list,
+    version: str,
+) -> Optional[dict]:
+    is_v2 = version == "v2"
+    main_files = [e for e in component_entries if _is_main_component_file(e.name, version)]
+    if not main_files:
+        return None
+
+    component_blob = main_files[0]
+    parsed = reader.memoize(
+        ("component", component_blob.sha),
+        lambda: parse_component_source(
+            _read_blob_text(reader, component_blob.sha, component_blob.path),
+            component_blob.path,
+        ),
+    )
+
+    story_blobs = tuple(
+        (e.name, e.sha, e.path)
+        for e in story_entries
+        if e.name.endswith((".stories.tsx", ".stories.ts", ".mdx"))
+    )
+    docs_info = reader.memoize(
+        ("storybook", is_v2, tuple((name, sha) for name, sha, _ in story_blobs)),
+        lambda: extract_storybook_and_docs_from_sources(
+            [
+                (name, _read_blob_text(reader, sha, path))
+                for name, sha, path in story_blobs
+            ],
+            is_v2,
+        ),
+    )
+
+    return build_component_details(parsed, docs_info, component_name, is_v2)
+
+
+def iter_components_at_ref(
+    reader: GitObjectReader, ref: str, version: str
+) -> Iterator[Tuple[str, dict]]:
+    """Yield (tag_name, details) for each component at a git ref, without a checkout.
+
+    Only the component and story directories are listed (one ls-tree call per
+    ref). Parsed component files and storybook/docs results are memoized on the
+    reader by blob SHA, so unchanged files are parsed once across refs.
+    """
+    layout = REPO_LAYOUTS[version]
+    with profiling.phase("discovery"):
+        entries = reader.ls_tree(ref, [layout["components"], layout["storybook"]])
+        component_groups = group_by_parent(entries, layout["components"])
+        story_groups = (
+            group_by_parent(entries, layout["storybook"])
+            if layout["storybook"]
+            else component_groups
+        )
+
+    for component_name in sorted(component_groups):
+        if not component_name.startswith(layout["tag_prefix"]):
+            continue
+        print(f"Processing component: {component_name} @ {ref}")
+
+        with profiling.component(component_name):
+            details = _ref_component_details(
+                reader,
+                component_name,
+                component_groups[component_name],
+                story_groups.get(component_name, []),
+                version,
+            )
+        if details is not None:
+            yield component_name, details
+
+
+@profiling.timed("framework")
+def extract_framework_examples_at_ref(
+    reader: GitObjectReader, ref: str, version: str, framework: str, examples_path: str
+) -> Dict:
+    """Git-object counterpart of extract_framework_examples()."""
+    examples = {}
+    examples_path = examples_path.replace(os.sep, "/")
+    entries = reader.ls_tree(ref, [examples_path])
+    if not entries:
+        print(f"Framework examples path not found at {ref}: {examples_path}")
+        return examples
+
+    print(f"Extracting {framework} {version} examples from {ref}:{examples_path}")
+    prefix = examples_path.rstrip("/") + "/"
+    for entry in sorted(entries, key=lambda e: e.path):
+        if not entry.name.endswith((".tsx", ".ts", ".html")):
+            continue
+        relative = entry.path[len(prefix):].split("/")
+        if len(relative) == 1:
+            examples[entry.name] = _read_blob_text(reader, entry.sha, entry.path)
+        elif len(relative) == 2:
+            examples.setdefault(relative[0], {})[entry.name] = _read_blob_text(
+                reader, entry.sha, entry.path
+            )
+        else:
+            continue
+        print(f"  Extracted example: {'/'.join(relative)}")
+    return examples
+
+
+@profiling.timed("framework")
+def extract_framework_documentation_at_ref(
+    reader: GitObjectReader, ref: str, mdx_file_path_relative_to_repo: str
+) -> str:
+    """Git-object counterpart of extract_framework_documentation()."""
+    mdx_path = mdx_file_path_relative_to_repo.replace(os.sep, "/")
+    content = reader.read_text(f"{ref}:{mdx_path}")
+    if content is not None:
+        profiling.record_read(mdx_path, content)
+    if content is None:
+        print(f".mdx documentation file not found at {ref}: {mdx_path}")
+        return ""
+    print(f"Successfully extracted documentation from: {ref}:{mdx_path}")
+    return content
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Extract Modus 1.0 and 2.0 component details into component_analysis/"
+    )
+    parser.add_argument(
+        "--v1-ref",
+        help="Read Modus 1.0 sources from this git ref (tag, branch or SHA) instead of the working tree",
+    )
+    parser.add_argument(
+        "--v2-ref",
+        help="Read Modus 2.0 sources from this git ref (tag, branch or SHA) instead of the working tree",
+    )
+    parser.add_argument(
+        "--releases",
+        action="append",
+        default=[],
+        metavar="VERSION=REF[,REF...]",
+        help=(
+            "Build a multi-release catalog instead of the v1/v2 catalogs, e.g. "
+            "--releases v2=2.0.0,2.1.0 or --releases 'v1=v1.*'. Repeatable."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of releases extracted in parallel (default: 4)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Record wall/CPU time per phase, per component and per regex pattern plus "
+            "bytes read per file; writes extraction_profile.json next to the catalog"
+        ),
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of slowest components listed in the profile summary (default: 10)",
+    )
+    parser.add_argument(
+        "--trace-file",
+        help=(
+            "Append a tracing span per phase and component to this JSONL file "
+            "(convert with python -m modus_migration.tracing)"
+        ),
+    )
+    return parser.parse_args(argv)
+
+
+def finish_profile(output_dir: str, top_n: int) -> None:
+    """Write extraction_profile.json and print the slowest phases/components."""
+    profiler = profiling.active()
+    if profiler is None:
+        return
+    profile_path = os.path.join(output_dir, "extraction_profile.json")
+    write_json_atomic(profile_path, profiler.report(top_n))
+    profiler.print_summary(top_n)
+    print(f"\nProfile saved to {profile_path}")
+    profiling.disable()
+
+
+def parse_release_specs(specs: List[str]) -> Dict[str, List[str]]:
+    """Turn ["v2=2.0.0,2.1.0", "v1=v1.*"] into {"v2": [...], "v1": [...]}."""
+    releases: Dict[str, List[str]] = {}
+    for spec in specs:
+        version, _, refs = spec.partition("=")
+        version = version.strip()
+        if version not in REPO_LAYOUTS or not refs:
+            raise SystemExit(
+                f"Invalid --releases value '{spec}', expected e.g. v2=2.0.0,2.1.0"
+            )
+        releases.setdefault(version, []).extend(
+            ref.strip() for ref in refs.split(",") if ref.strip()
+        )
+    return releases
+
+
+def extract_release_catalogs(
+    repo_paths: Dict[str, str], releases: Dict[str, List[str]], output_dir: str, workers: int
+) -> None:
+    """Build and save one release catalog per major version."""
+    for version, refs in releases.items():
+        print(f"\n=== Building {version} release catalog for {', '.join(refs)} ===")
+        catalog = build_release_catalog(
+            repo_paths[version], version, refs, iter_components_at_ref, workers
+        )
+        output_file = release_catalog_path(output_dir, version)
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        save_analysis_to_json(catalog, output_file)
+
+
+def report_mapping_suggestions(
+    output_dir: str, build_dir: str, mapping: Dict, top_k: int = 3
+) -> None:
+    """Print and save the closest v2 components of v1 components mapped to "Not Found"."""
+    try:
+        model = SimilarityModel.from_json(load_artifact(build_dir, SIMILARITY_FILE))
+    except FileNotFoundError:
+        return
+    report = model.unmapped_report(mapping, top_k)
+    report_path = os.path.join(output_dir, "mapping_suggestions.json")
+    write_json_atomic(report_path, report)
+    if report:
+        print("\nSuggested Modus 2.0 equivalents for unmapped 1.0 components:")
+        for v1_name, candidates in report.items():
+            ranked = ", ".join(f"{c['v2_component']} ({c['score']:.2f})" for c in candidates)
+            print(f"  {v1_name:<32} {ranked}")
+        print(f"Suggestions saved to {report_path}")
+
+
+def main(argv: Optional[List[str]] = None):
     """Main function to extract component details from Modus 1.0 and 2.0 repositories"""
+    args = parse_args(argv)
+    if args.profile:
+        profiling.enable()
+    tracing.configure(args.trace_file)
+    with tracing.span("component_extractor"):
+        run_extraction(args)
+
+
+def run_extraction(args: argparse.Namespace) -> None:
     print("Starting component extraction...")
 
     # Directory setup
@@ -587,9 +1066,24 @@ def main():
     v1_repo_path = os.path.join(repos_dir, "modus-web-components")
     v2_repo_path = os.path.join(repos_dir, "modus-wc-2.0")
 
-    # Clone repositories if they don't exist
-    clone_repo(v1_repo_url, v1_repo_path, False)
-    clone_repo(v2_repo_url, v2_repo_path, False)
+    # Clone repositories if they don't exist. When extracting from a ref an
+    # existing clone is reused as-is: objects are read without a checkout.
+    with profiling.phase("clone"):
+        clone_repo(v1_repo_url, v1_repo_path, bool(args.v1_ref or args.releases))
+        clone_repo(v2_repo_url, v2_repo_path, bool(args.v2_ref or args.releases))
+
+    if args.releases:
+        extract_release_catalogs(
+            {"v1": v1_repo_path, "v2": v2_repo_path},
+            parse_release_specs(args.releases),
+            output_dir,
+            args.workers,
+        )
+        finish_profile(output_dir, args.profile_top)
+        return
+
+    v1_reader = GitObjectReader(v1_repo_path) if args.v1_ref else None
+    v2_reader = GitObjectReader(v2_repo_path) if args.v2_ref else None
 
     # Modus 1.0 paths
     v1_components_dir = os.path.join(
@@ -634,105 +1128,41 @@ def main():
 
     # Validate paths
     print("\n=== Directory Validation ===")
-    print(f"Modus 1.0 components directory exists: {os.path.exists(v1_components_dir)}")
-    print(f"Modus 1.0 storybook directory exists: {os.path.exists(v1_storybook_dir)}")
-    print(f"Modus 2.0 components directory exists: {os.path.exists(v2_components_dir)}")
+    if v1_reader:
+        print(f"Modus 1.0 sources read from git ref: {args.v1_ref}")
+    else:
+        print(f"Modus 1.0 components directory exists: {os.path.exists(v1_components_dir)}")
+        print(f"Modus 1.0 storybook directory exists: {os.path.exists(v1_storybook_dir)}")
+    if v2_reader:
+        print(f"Modus 2.0 sources read from git ref: {args.v2_ref}")
+    else:
+        print(f"Modus 2.0 components directory exists: {os.path.exists(v2_components_dir)}")
 
-    # Process Modus 1.0 components
+    # Process Modus 1.0 components, streaming each one into v1_components.json
     print("\n=== Extracting Modus 1.0 Components ===")
-    v1_components = {}
-
-    if os.path.exists(v1_components_dir):
-        for component_name in os.listdir(v1_components_dir):
-            component_dir = os.path.join(v1_components_dir, component_name)
-            if os.path.isdir(component_dir) and component_name.startswith("modus-"):
-                print(f"Processing component: {component_name}")
-
-                # Find the main component file
-                tsx_files = [
-                    f
-                    for f in os.listdir(component_dir)
-                    if f.endswith(".tsx")
-                    and not f.endswith(".spec.tsx")
-                    and not f.endswith(".e2e.tsx")
-                    and not f.endswith(".stories.tsx")
-                ]
-
-                if tsx_files:
-                    # Use the first component file
-                    component_file = os.path.join(component_dir, tsx_files[0])
-                    component_details = parse_component_file(Path(component_file))
-
-                    # Extract storybook and docs
-                    docs_info = {
-                        "documentation": "",
-                        "storybook_content": "",
-                        "examples": [],
-                        "variants": [],
-                        "prop_usage": {},
-                    }
-                    if os.path.exists(v1_storybook_dir):
-                        component_story_dir = os.path.join(
-                            v1_storybook_dir, component_name
-                        )
-                        if os.path.exists(component_story_dir):
-                            print(
-                                f"  Extracting docs and storybook content for: {component_name}"
-                            )
-                            docs_info = extract_storybook_and_docs(
-                                component_story_dir, is_v2=False
-                            )
+    v1_components: List[str] = []
+    save_components_stream(
+        (
+            iter_components_at_ref(v1_reader, args.v1_ref, "v1")
+            if v1_reader
+            else iter_worktree_components(v1_repo_path, "v1")
+        ),
+        os.path.join(output_dir, "v1_components.json"),
+        v1_components,
+    )
 
-                    component_details["documentation"] = docs_info["documentation"]
-                    component_details["storybook_content"] = docs_info[
-                        "storybook_content"
-                    ]
-                    component_details["storybook"] = {
-                        "examples": docs_info["examples"],
-                        "variants": docs_info["variants"],
-                        "prop_usage": docs_info["prop_usage"],
-                    }
-                    component_details["tag_name"] = component_name
-                    v1_components[component_name] = component_details
-
-    # Process Modus 2.0 components
+    # Process Modus 2.0 components, streaming each one into v2_components.json
     print("\n=== Extracting Modus 2.0 Components ===")
-    v2_components = {}
-
-    if os.path.exists(v2_components_dir):
-        for component_name in os.listdir(v2_components_dir):
-            component_dir = os.path.join(v2_components_dir, component_name)
-            if os.path.isdir(component_dir) and component_name.startswith("modus-wc-"):
-                print(f"Processing component: {component_name}")
-
-                # Find the main component file
-                tsx_files = [
-                    f
-                    for f in os.listdir(component_dir)
-                    if f.endswith(".tsx")
-                    and not f.endswith(".spec.tsx")
-                    and not f.endswith(".stories.tsx")
-                ]
-
-                if tsx_files:
-                    # Use the first component file
-                    component_file = os.path.join(component_dir, tsx_files[0])
-                    component_details = parse_component_file(Path(component_file))
-
-                    # Extract storybook and docs (for v2, they're in the same directory)
-                    print(
-                        f"  Extracting docs and storybook content for: {component_name}"
-                    )
-                    docs_info = extract_storybook_and_docs(component_dir, is_v2=True)
-
-                    component_details["documentation"] = docs_info["documentation"]
-                    component_details["storybook"] = {
-                        "examples": docs_info["examples"],
-                        "variants": docs_info["variants"],
-                        "prop_usage": docs_info["prop_usage"],
-                    }
-                    component_details["tag_name"] = component_name
-                    v2_components[component_name] = component_details
+    v2_components: List[str] = []
+    save_components_stream(
+        (
+            iter_components_at_ref(v2_reader, args.v2_ref, "v2")
+            if v2_reader
+            else iter_worktree_components(v2_repo_path, "v2")
+        ),
+        os.path.join(output_dir, "v2_components.json"),
+        v2_components,
+    )
 
     # Create a simple mapping between v1 and v2 components
     component_mapping = {}
@@ -750,10 +1180,24 @@ def main():
     # Extract framework-specific data (documentation and examples)
     print("\n=== Extracting Framework Specific Data ===")
 
+    def framework_documentation(reader, ref, repo_path, mdx_path):
+        if reader:
+            return extract_framework_documentation_at_ref(reader, ref, mdx_path)
+        return extract_framework_documentation(repo_path, mdx_path)
+
+    def framework_examples(reader, ref, repo_path, version, framework, examples_path):
+        if reader:
+            return extract_framework_examples_at_ref(
+                reader, ref, version, framework, examples_path
+            )
+        return extract_framework_examples(repo_path, version, framework, examples_path)
+
     # V1 Angular
-    v1_angular_docs = extract_framework_documentation(v1_repo_path, v1_angular_mdx_path)
-    v1_angular_examples = extract_framework_examples(
-        v1_repo_path, "v1", "Angular", v1_angular_examples_path
+    v1_angular_docs = framework_documentation(
+        v1_reader, args.v1_ref, v1_repo_path, v1_angular_mdx_path
+    )
+    v1_angular_examples = framework_examples(
+        v1_reader, args.v1_ref, v1_repo_path, "v1", "Angular", v1_angular_examples_path
     )
     v1_angular_framework_data = {
         "documentation": v1_angular_docs,
@@ -761,9 +1205,11 @@ def main():
     }
 
     # V1 React
-    v1_react_docs = extract_framework_documentation(v1_repo_path, v1_react_mdx_path)
-    v1_react_examples = extract_framework_examples(
-        v1_repo_path, "v1", "React", v1_react_examples_path
+    v1_react_docs = framework_documentation(
+        v1_reader, args.v1_ref, v1_repo_path, v1_react_mdx_path
+    )
+    v1_react_examples = framework_examples(
+        v1_reader, args.v1_ref, v1_repo_path, "v1", "React", v1_react_examples_path
     )
     v1_react_framework_data = {
         "documentation": v1_react_docs,
@@ -771,7 +1217,9 @@ def main():
     }
 
     # V2 Angular
-    v2_angular_docs = extract_framework_documentation(v2_repo_path, v2_angular_mdx_path)
+    v2_angular_docs = framework_documentation(
+        v2_reader, args.v2_ref, v2_repo_path, v2_angular_mdx_path
+    )
     # V2 Angular examples are not in a dedicated directory, so this will likely be empty or based on .mdx content if adapted later
     v2_angular_examples = (
         {}
@@ -782,9 +1230,16 @@ def main():
     }
 
     # V2 React
-    v2_react_docs = extract_framework_documentation(v2_repo_path, v2_react_mdx_path)
-    v2_react_examples_v17 = extract_framework_examples(
-        v2_repo_path, "v2", "React v17", v2_react_examples_path_v17
+    v2_react_docs = framework_documentation(
+        v2_reader, args.v2_ref, v2_repo_path, v2_react_mdx_path
+    )
+    v2_react_examples_v17 = framework_examples(
+        v2_reader,
+        args.v2_ref,
+        v2_repo_path,
+        "v2",
+        "React v17",
+        v2_react_examples_path_v17,
     )
     # Consolidate v2 React examples if multiple versions are extracted (e.g., v18, v19)
     v2_react_examples_consolidated = {}
@@ -795,13 +1250,6 @@ def main():
         "examples": v2_react_examples_consolidated,
     }
 
-    # Save results
-    with open(os.path.join(output_dir, "v1_components.json"), "w") as f:
-        json.dump(v1_components, f, indent=2)
-
-    with open(os.path.join(output_dir, "v2_components.json"), "w") as f:
-        json.dump(v2_components, f, indent=2)
-
     # Generate and update component mapping
     # Path to the component_mapping.json file
     mapping_file_path = os.path.join(output_dir, "component_mapping.json")
@@ -829,7 +1277,7 @@ def main():
 
     # Generate new mappings based on detected v1_components and v2_components
     script_generated_v1_to_v2_map = {}
-    for v1_name_key in v1_components.keys(): # v1_components is a dict { "modus-button": {details...}, ... }
+    for v1_name_key in v1_components: # v1_components is a list of tag names [ "modus-button", ... ]
         v2_name_candidate = "" # Initialize candidate for each v1 component
 
         # Handle specific known mappings first
@@ -867,22 +1315,28 @@ def main():
     full_mapping_data["Mapping_v1_v2"].update(script_generated_v1_to_v2_map)
 
     # Save the updated (or new) full mapping data, including preserved sections
-    with open(mapping_file_path, "w", encoding="utf-8") as f:
-        json.dump(full_mapping_data, f, indent=2)
+    with profiling.phase("write"):
+        write_json_atomic(mapping_file_path, full_mapping_data)
     print(f"Component mapping updated and saved to {mapping_file_path}")
 
     # Save framework-specific data
-    with open(os.path.join(output_dir, "v1_angular_framework_data.json"), "w") as f:
-        json.dump(v1_angular_framework_data, f, indent=2)
-
-    with open(os.path.join(output_dir, "v1_react_framework_data.json"), "w") as f:
-        json.dump(v1_react_framework_data, f, indent=2)
-
-    with open(os.path.join(output_dir, "v2_angular_framework_data.json"), "w") as f:
-        json.dump(v2_angular_framework_data, f, indent=2)
-
-    with open(os.path.join(output_dir, "v2_react_framework_data.json"), "w") as f:
-        json.dump(v2_react_framework_data, f, indent=2)
+    with profiling.phase("write"):
+        write_json_atomic(
+            os.path.join(output_dir, "v1_angular_framework_data.json"),
+            v1_angular_framework_data,
+        )
+        write_json_atomic(
+            os.path.join(output_dir, "v1_react_framework_data.json"),
+            v1_react_framework_data,
+        )
+        write_json_atomic(
+            os.path.join(output_dir, "v2_angular_framework_data.json"),
+            v2_angular_framework_data,
+        )
+        write_json_atomic(
+            os.path.join(output_dir, "v2_react_framework_data.json"),
+            v2_react_framework_data,
+        )
 
     print(f"\nExtraction complete:")
     print(f"- Found {len(v1_components)} Modus 1.0 components")
@@ -902,6 +1356,22 @@ def main():
     )
     print(f"Results saved to the {output_dir} directory.")
 
+    with profiling.phase("compile"):
+        build_dir = compile_catalog(output_dir)
+
+    with profiling.phase("similarity"):
+        report_mapping_suggestions(output_dir, build_dir, full_mapping_data["Mapping_v1_v2"])
+
+    for reader in (v1_reader, v2_reader):
+        if reader:
+            print(
+                f"Git object cache for {reader.repo_path}: "
+                f"{reader.cache_hits} hits, {reader.cache_misses} misses"
+            )
+            reader.close()
+
+    finish_profile(output_dir, args.profile_top)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,169 @@
+"""
+BM25 full-text search over the documentation and storybook text of a catalog.
+
+Each text field (documentation, v1 storybook_content, storybook examples) is
+split into passages of a few paragraphs; passages are the BM25 documents, so a
+hit points at the relevant part of a long documentation field rather than the
+whole component. Passages are identified by component, section and character
+offsets into the field's text.
+
+Tokens are lower-cased alphanumeric words; camelCase and kebab-case words are
+also indexed by their parts, so "buttonStyle" matches a query for "style".
+
+The catalog build writes doc_index.json with, per version:
+
+    {"passages": [[component, section, start, end, length], ...],
+     "postings": {term: [passage, tf, passage, tf, ...], ...},
+     "avg_length": 57.3}
+"""
+
+import heapq
+import math
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+K1 = 1.2
+B = 0.75
+
+MIN_PASSAGE_CHARS = 400
+MAX_PASSAGE_CHARS = 1200
+
+_WORD = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_PART = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how i if in is it its of on or "
+    "that the this to was what when where which with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for word in _WORD.findall(text):
+        lowered = word.lower()
+        if lowered not in STOPWORDS:
+            tokens.append(lowered)
+        parts = _CAMEL_PART.findall(word)
+        if len(parts) > 1:
+            tokens.extend(p.lower() for p in parts if p.lower() not in STOPWORDS)
+    return tokens
+
+
+def split_passages(text: str) -> Iterator[Tuple[int, int]]:
+    """(start, end) offsets of passages of MIN..MAX_PASSAGE_CHARS characters.
+
+    Consecutive paragraphs are merged up to MIN_PASSAGE_CHARS; paragraphs
+    longer than MAX_PASSAGE_CHARS are cut at line breaks (or hard-cut).
+    """
+    paragraphs = []
+    position = 0
+    for match in _PARAGRAPH_BREAK.finditer(text):
+        paragraphs.append((position, match.start()))
+        position = match.end()
+    paragraphs.append((position, len(text)))
+
+    start = None
+    for p_start, p_end in paragraphs:
+        while p_end - p_start > MAX_PASSAGE_CHARS:
+            if start is not None:
+                yield start, p_start
+                start = None
+            cut = text.rfind("\n", p_start, p_start + MAX_PASSAGE_CHARS)
+            if cut <= p_start:
+                cut = p_start + MAX_PASSAGE_CHARS
+            yield p_start, cut
+            p_start = cut
+        if start is None:
+            start = p_start
+        if p_end - start >= MIN_PASSAGE_CHARS:
+            yield start, p_end
+            start = None
+    if start is not None and text[start:].strip():
+        yield start, len(text)
+
+
+def iter_text_sections(component: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """(section, text) pairs of the searchable fields of a catalog entry."""
+    for field in ("documentation", "storybook_content"):
+        if isinstance(component.get(field), str) and component[field].strip():
+            yield field, component[field]
+    storybook = component.get("storybook")
+    if isinstance(storybook, dict):
+        for i, example in enumerate(storybook.get("examples", []) or []):
+            if isinstance(example, str) and example.strip():
+                yield f"storybook.examples[{i}]", example
+
+
+class DocSearchIndex:
+    def __init__(self, passages: List[list], postings: Dict[str, List[int]], avg_length: float):
+        self.passages = passages
+        self.postings = postings
+        self.avg_length = avg_length or 1.0
+
+    @classmethod
+    def from_catalog(cls, items: Iterable[Tuple[str, Dict[str, Any]]]) -> "DocSearchIndex":
+        passages: List[list] = []
+        postings: Dict[str, List[int]] = {}
+        total_length = 0
+        for key, component in items:
+            for section, text in iter_text_sections(component):
+                for start, end in split_passages(text):
+                    tokens = tokenize(text[start:end])
+                    if not tokens:
+                        continue
+                    passage_id = len(passages)
+                    passages.append([key, section, start, end, len(tokens)])
+                    total_length += len(tokens)
+                    counts: Dict[str, int] = {}
+                    for token in tokens:
+                        counts[token] = counts.get(token, 0) + 1
+                    for token, tf in counts.items():
+                        postings.setdefault(token, []).extend((passage_id, tf))
+        avg_length = total_length / len(passages) if passages else 0.0
+        return cls(passages, postings, avg_length)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "passages": self.passages,
+            "postings": self.postings,
+            "avg_length": round(self.avg_length, 3),
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "DocSearchIndex":
+        return cls(data["passages"], data["postings"], data["avg_length"])
+
+    def search(self, query: str, top_k: int = 10,
+               component: Optional[str] = None) -> List[Tuple[float, list]]:
+        """Top passages for `query` as (score, [component, section, start, end, length])."""
+        n = len(self.passages)
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            df = len(posting) // 2
+            idf = math.log((n - df + 0.5) / (df + 0.5) + 1.0)
+            for i in range(0, len(posting), 2):
+                passage_id, tf = posting[i], posting[i + 1]
+                length = self.passages[passage_id][4]
+                norm = K1 * (1 - B + B * length / self.avg_length)
+                scores[passage_id] = scores.get(passage_id, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+        if component is not None:
+            scores = {p: s for p, s in scores.items() if self.passages[p][0] == component}
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(score, self.passages[passage_id]) for passage_id, score in best]
+
+
+def snippet(text: str, start: int, end: int, query: str, width: int = 240) -> Tuple[int, int]:
+    """Offsets of a window of about `width` characters of text[start:end]
+    centred on the first query term found in it."""
+    if end - start <= width:
+        return start, end
+    lowered = text[start:end].lower()
+    hits = [lowered.find(term) for term in tokenize(query)]
+    hits = [h for h in hits if h >= 0]
+    centre = start + (min(hits) if hits else 0)
+    window_start = max(start, min(centre - width // 3, end - width))
+    return window_start, min(end, window_start + width)
@@ -0,0 +1,248 @@
+"""
+Canonicalized, deduplicated storybook examples, ranked per component.
+
+Story files repeat the same markup with different indentation and attribute
+order. canonicalize() rewrites an example so that equivalent snippets compare
+equal: every opening tag has its attributes sorted, whitespace runs collapse
+to one space and whitespace between tags is dropped:
+
+    <modus-wc-button
+        size="sm"  color="primary"
+    >OK</modus-wc-button>
+        -> <modus-wc-button color="primary" size="sm">OK</modus-wc-button>
+
+The canonical form is only used to tell examples apart: each is identified by
+the hash of its canonical form and stored once per catalog, as first written
+in the story files (only surrounding whitespace stripped). Each component lists
+the examples that use its tag, with the (normalized) attributes set on that
+tag, ranked by prop coverage and then by size, so the smallest example covering
+a set of props is a scan of a short list. The catalog build writes
+example_corpus.json with, per version:
+
+    {"examples": {hash: code as written, ...},
+     "components": {"modus-wc-button": [[hash, ["color", "size"]], ...]},
+     "total_examples": 412}
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from modus_migration.attribute_index import normalize_name
+
+_TAG_OPEN = re.compile(r"<([A-Za-z][\w-]*)")
+_ATTRIBUTE_NAME = re.compile(r"[^\s=/>]+")
+_BARE_VALUE = re.compile(r"[^\s>]+")
+_WHITESPACE = re.compile(r"\s+")
+_BETWEEN_TAGS = re.compile(r">\s+<")
+
+# Lit binding prefixes: ?boolean, .property, @event
+_BINDING_PREFIXES = "?.@"
+
+
+def _skip_expression(text: str, pos: int) -> int:
+    """Index just past the `}` closing the `${` or `{` at `pos`."""
+    depth = 0
+    while pos < len(text):
+        char = text[pos]
+        if char in "\"'`":
+            end = text.find(char, pos + 1)
+            pos = len(text) if end < 0 else end + 1
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    return pos
+
+
+def _scan_tag(text: str, pos: int) -> Optional[Tuple[str, List[Tuple[str, Optional[str]]], int, bool]]:
+    """(tag, [(attribute, raw value)], end, self_closing) of the opening tag at
+    `pos`, or None if the text there is not a complete tag."""
+    match = _TAG_OPEN.match(text, pos)
+    if not match:
+        return None
+    tag, pos = match.group(1), match.end()
+    attributes: List[Tuple[str, Optional[str]]] = []
+    while pos < len(text):
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if text.startswith("/>", pos):
+            return tag, attributes, pos + 2, True
+        if text.startswith(">", pos):
+            return tag, attributes, pos + 1, False
+        if text.startswith("${", pos):
+            end = _skip_expression(text, pos + 1)
+            attributes.append((text[pos:end], None))
+            pos = end
+            continue
+        name_match = _ATTRIBUTE_NAME.match(text, pos)
+        if not name_match:
+            return None
+        name, pos = name_match.group(0), name_match.end()
+        if not text.startswith("=", pos):
+            attributes.append((name, None))
+            continue
+        pos += 1
+        if pos < len(text) and text[pos] in "\"'":
+            end = text.find(text[pos], pos + 1)
+            if end < 0:
+                return None
+            end += 1
+        elif text.startswith("${", pos) or text.startswith("{", pos):
+            end = _skip_expression(text, pos + (1 if text[pos] == "$" else 0))
+        else:
+            value_match = _BARE_VALUE.match(text, pos)
+            end = value_match.end() if value_match else pos
+        attributes.append((name, text[pos:end]))
+        pos = end
+    return None
+
+
+def _collapse(text: str) -> str:
+    return _WHITESPACE.sub(" ", text)
+
+
+def _iter_tags(text: str):
+    """(start, end, scanned tag) of every opening tag in `text`."""
+    pos = 0
+    while True:
+        start = text.find("<", pos)
+        if start < 0:
+            return
+        scanned = _scan_tag(text, start)
+        if scanned is None:
+            pos = start + 1
+            continue
+        yield start, scanned[2], scanned
+        pos = scanned[2]
+
+
+def canonicalize(example: str) -> str:
+    parts = []
+    position = 0
+    for start, end, (tag, attributes, _, self_closing) in _iter_tags(example):
+        parts.append(_collapse(example[position:start]))
+        rendered = sorted(
+            name if value is None else f"{name}={_collapse(value)}" for name, value in attributes
+        )
+        parts.append(f"<{tag}{''.join(' ' + a for a in rendered)}{' />' if self_closing else '>'}")
+        position = end
+    parts.append(_collapse(example[position:]))
+    return _BETWEEN_TAGS.sub("><", "".join(parts)).strip()
+
+
+def example_hash(canonical: str) -> str:
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def written_attributes(example: str, tag: str) -> List[str]:
+    """Names of the attributes set on `tag` anywhere in the example, as written."""
+    names = set()
+    for _, _, (found, attributes, _, _) in _iter_tags(example):
+        if found == tag:
+            names.update(name for name, _ in attributes if not name.startswith("$"))
+    return sorted(names)
+
+
+def tag_attributes(example: str, tag: str) -> FrozenSet[str]:
+    """Normalized names of the attributes set on `tag` anywhere in the example."""
+    names = {normalize_name(name.lstrip(_BINDING_PREFIXES)) for name in written_attributes(example, tag)}
+    names.discard("")
+    return frozenset(names)
+
+
+def _tag(key: str) -> str:
+    return key.split(".", 1)[0]
+
+
+class ExampleCorpus:
+    def __init__(self, examples: Dict[str, str],
+                 components: Dict[str, List[Tuple[str, FrozenSet[str]]]],
+                 total_examples: int = 0):
+        self.examples = examples
+        self.components = components
+        self.total_examples = total_examples
+
+    @classmethod
+    def from_catalog(cls, items: Iterable[Tuple[str, Dict[str, Any]]]) -> "ExampleCorpus":
+        examples: Dict[str, str] = {}
+        components: Dict[str, List[Tuple[str, FrozenSet[str]]]] = {}
+        total = 0
+        for key, component in items:
+            storybook = component.get("storybook")
+            raw_examples = storybook.get("examples", []) if isinstance(storybook, dict) else []
+            tag = component.get("tag_name") or _tag(key)
+            prop_names = {normalize_name(p.get("name", "")) for p in component.get("props", []) or []
+                          if isinstance(p, dict)}
+            entries: Dict[str, FrozenSet[str]] = {}
+            for raw in raw_examples or []:
+                if not isinstance(raw, str) or not raw.strip():
+                    continue
+                total += 1
+                digest = example_hash(canonicalize(raw))
+                example = examples.setdefault(digest, raw.strip())
+                entries[digest] = tag_attributes(example, tag)
+            if entries:
+                # Most props of the component covered first, then smallest
+                components[key] = sorted(
+                    entries.items(),
+                    key=lambda item: (-len(item[1] & prop_names), len(examples[item[0]]), item[0]),
+                )
+        return cls(examples, components, total)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "examples": self.examples,
+            "components": {
+                key: [[digest, sorted(attributes)] for digest, attributes in entries]
+                for key, entries in self.components.items()
+            },
+            "total_examples": self.total_examples,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "ExampleCorpus":
+        return cls(
+            data["examples"],
+            {
+                key: [(digest, frozenset(attributes)) for digest, attributes in entries]
+                for key, entries in data["components"].items()
+            },
+            data.get("total_examples", 0),
+        )
+
+    def ranked(self, key: str) -> List[Dict[str, Any]]:
+        return [
+            {"hash": digest, "size": len(self.examples[digest]),
+             "attributes": written_attributes(self.examples[digest], _tag(key)), "code": self.examples[digest]}
+            for digest, _ in self.components.get(key, [])
+        ]
+
+    def smallest_covering(self, key: str, props: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """Smallest example of `key` setting every prop in `props`.
+
+        If no example sets them all, the smallest of those covering the most
+        of them, with the props it lacks under "missing". None if the
+        component has no examples. "attributes" are spelled as in the example;
+        matching compares normalized names.
+        """
+        wanted = {normalize_name(p): p for p in props if normalize_name(p)}
+        best = None
+        for digest, attributes in self.components.get(key, []):
+            rank = (-len(wanted.keys() & attributes), len(self.examples[digest]))
+            if best is None or rank < best[0]:
+                best = (rank, digest, attributes)
+        if best is None:
+            return None
+        _, digest, attributes = best
+        return {
+            "hash": digest,
+            "size": len(self.examples[digest]),
+            "code": self.examples[digest],
+            "attributes": written_attributes(self.examples[digest], _tag(key)),
+            "missing": sorted(p for name, p in wanted.items() if name not in attributes),
+        }
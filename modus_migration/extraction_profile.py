@@ -0,0 +1,243 @@
+"""
+Opt-in profiling for component_extractor.py (`--profile`).
+
+Records wall and CPU time per phase (clone, discovery, parse, storybook,
+framework, write, ...) and per component, time spent in each named regex
+pattern, and bytes read per file. When profiling is not enabled every hook is
+a cheap no-op, so the instrumented extractor runs at full speed.
+
+Every phase is also a tracing span (see tracing.py), so with --trace-file
+the phases show up on a timeline, profiling enabled or not.
+
+Phases nest: a phase's "self" time excludes time spent in phases opened
+inside it, so e.g. "write" does not absorb the parsing done by the component
+generator it is consuming.
+"""
+
+import functools
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from modus_migration.tracing import span
+
+_active: Optional["ExtractionProfiler"] = None
+
+
+class _Frame:
+    __slots__ = ("name", "wall_start", "cpu_start", "child_wall", "child_cpu")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+
+
+class ExtractionProfiler:
+    def __init__(self):
+        self.started_at = time.time()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.components: Dict[str, Dict] = {}
+        self.regexes: Dict[str, Dict[str, float]] = {}
+        self.files: Dict[str, int] = {}
+
+    def _stack(self) -> List[_Frame]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def phase(self, name: str, **attributes):
+        stack = self._stack()
+        frame = _Frame(name)
+        stack.append(frame)
+        try:
+            with span(name, **attributes):
+                yield
+        finally:
+            stack.pop()
+            wall = time.perf_counter() - frame.wall_start
+            cpu = time.thread_time() - frame.cpu_start
+            if stack:
+                stack[-1].child_wall += wall
+                stack[-1].child_cpu += cpu
+            component = getattr(self._local, "component", None)
+            with self._lock:
+                totals = self.phases.setdefault(
+                    name,
+                    {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "self_wall_s": 0.0, "self_cpu_s": 0.0},
+                )
+                totals["calls"] += 1
+                totals["wall_s"] += wall
+                totals["cpu_s"] += cpu
+                totals["self_wall_s"] += wall - frame.child_wall
+                totals["self_cpu_s"] += cpu - frame.child_cpu
+                if component is not None and name != "component":
+                    phases = self.components[component]["phases"]
+                    phases[name] = phases.get(name, 0.0) + wall - frame.child_wall
+
+    @contextmanager
+    def component(self, name: str):
+        previous = getattr(self._local, "component", None)
+        with self._lock:
+            entry = self.components.setdefault(
+                name, {"wall_s": 0.0, "cpu_s": 0.0, "bytes_read": 0, "phases": {}}
+            )
+        self._local.component = name
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            with self.phase("component", component=name):
+                yield
+        finally:
+            self._local.component = previous
+            with self._lock:
+                entry["wall_s"] += time.perf_counter() - wall_start
+                entry["cpu_s"] += time.thread_time() - cpu_start
+
+    def record_regex(self, name: str, seconds: float, matches: int) -> None:
+        with self._lock:
+            totals = self.regexes.setdefault(name, {"calls": 0, "seconds": 0.0, "matches": 0})
+            totals["calls"] += 1
+            totals["seconds"] += seconds
+            totals["matches"] += matches
+
+    def record_read(self, path: str, nbytes: int) -> None:
+        component = getattr(self._local, "component", None)
+        with self._lock:
+            self.files[path] = self.files.get(path, 0) + nbytes
+            if component is not None:
+                self.components[component]["bytes_read"] += nbytes
+
+    def slowest_components(self, top_n: int = 10) -> List[Dict]:
+        ranked = sorted(self.components.items(), key=lambda kv: kv[1]["wall_s"], reverse=True)
+        return [{"component": name, **stats} for name, stats in ranked[:top_n]]
+
+    def report(self, top_n: int = 10) -> Dict:
+        def rounded(stats: Dict) -> Dict:
+            return {k: round(v, 6) if isinstance(v, float) else v for k, v in stats.items()}
+
+        return {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "total_wall_s": round(time.perf_counter() - self._wall_start, 6),
+            "total_cpu_s": round(time.process_time() - self._cpu_start, 6),
+            "phases": {
+                name: rounded(stats)
+                for name, stats in sorted(
+                    self.phases.items(), key=lambda kv: kv[1]["self_wall_s"], reverse=True
+                )
+            },
+            "regexes": {
+                name: rounded(stats)
+                for name, stats in sorted(
+                    self.regexes.items(), key=lambda kv: kv[1]["seconds"], reverse=True
+                )
+            },
+            "components": {
+                name: {**rounded(stats), "phases": rounded(stats["phases"])}
+                for name, stats in self.components.items()
+            },
+            "slowest_components": [
+                {**rounded(c), "phases": rounded(c["phases"])}
+                for c in self.slowest_components(top_n)
+            ],
+            "files": {
+                "count": len(self.files),
+                "total_bytes": sum(self.files.values()),
+                "bytes_by_file": dict(sorted(self.files.items())),
+            },
+        }
+
+    def print_summary(self, top_n: int = 10) -> None:
+        print("\n=== Extraction Profile ===")
+        print(f"{'phase':<16}{'calls':>8}{'self wall s':>14}{'self cpu s':>14}")
+        for name, stats in sorted(
+            self.phases.items(), key=lambda kv: kv[1]["self_wall_s"], reverse=True
+        ):
+            print(
+                f"{name:<16}{stats['calls']:>8}{stats['self_wall_s']:>14.4f}{stats['self_cpu_s']:>14.4f}"
+            )
+        print(f"\nTop {top_n} slowest components:")
+        for entry in self.slowest_components(top_n):
+            print(
+                f"  {entry['component']:<36}{entry['wall_s']:>10.4f}s wall"
+                f"{entry['cpu_s']:>10.4f}s cpu{entry['bytes_read']:>10,} bytes"
+            )
+        slow_regexes = sorted(self.regexes.items(), key=lambda kv: kv[1]["seconds"], reverse=True)
+        if slow_regexes:
+            print("\nSlowest regex patterns:")
+            for name, stats in slow_regexes[:5]:
+                print(f"  {name:<36}{stats['seconds']:>10.4f}s{stats['calls']:>8} calls")
+
+
+def enable() -> ExtractionProfiler:
+    global _active
+    _active = ExtractionProfiler()
+    return _active
+
+
+def disable() -> None:
+    global _active
+    _active = None
+
+
+def active() -> Optional[ExtractionProfiler]:
+    return _active
+
+
+def phase(name: str):
+    """Context manager timing a named phase; no-op unless profiling or tracing is enabled."""
+    return _active.phase(name) if _active is not None else span(name)
+
+
+def timed(phase_name: str):
+    """Decorator running the wrapped function inside phase(phase_name)."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(phase_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def component(name: str):
+    """Context manager attributing nested phases and reads to a component."""
+    return _active.component(name) if _active is not None else span("component", component=name)
+
+
+def record_read(path: str, content) -> None:
+    """Record bytes read from a file (content may be str or bytes)."""
+    if _active is not None:
+        nbytes = len(content.encode("utf-8")) if isinstance(content, str) else len(content)
+        _active.record_read(path, nbytes)
+
+
+def findall(name: str, pattern, string: str, flags: int = 0) -> list:
+    """re.findall() that records its time under `name` when profiling."""
+    if _active is None:
+        return re.findall(pattern, string, flags)
+    start = time.perf_counter()
+    result = re.findall(pattern, string, flags)
+    _active.record_regex(name, time.perf_counter() - start, len(result))
+    return result
+
+
+def search(name: str, pattern, string: str, flags: int = 0):
+    """re.search() that records its time under `name` when profiling."""
+    if _active is None:
+        return re.search(pattern, string, flags)
+    start = time.perf_counter()
+    result = re.search(pattern, string, flags)
+    _active.record_regex(name, time.perf_counter() - start, 1 if result else 0)
+    return result
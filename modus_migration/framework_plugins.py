@@ -0,0 +1,210 @@
+"""
+Registry of source frameworks that migrate to Modus 2.0 (MUI, shadcn/ui,
+Connect UI, ...).
+
+Each framework is declared once as a SourceFramework: its component mapping
+file ({"<name>_to_modus": {...}, "modus_to_<name>": {...}}), the directory of
+its five step prompts (<step>_<name>.md) and the Modus catalog version it
+targets. Nothing is read until a framework is first used; its FrameworkPack
+then loads the mapping (reloaded only when the file changes) and reads prompts
+per step on demand. All packs resolve Modus components through the shared
+CatalogStore, so the v2 catalog is parsed once for every framework.
+
+Adding a framework is one register() call:
+
+    registry.register(SourceFramework(
+        "vuetify", "Vuetify", "vuetify_migration/mapping/component_mappings.json",
+        "vuetify_migration/md_prompts"))
+"""
+
+import difflib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from modus_migration.catalog_store import CatalogStore
+
+logger = logging.getLogger(__name__)
+
+GUIDANCE_STEPS = ("analyze", "migrate", "verify", "log", "workflow")
+
+
+class SourceFramework(NamedTuple):
+    name: str
+    label: str
+    mapping_file: str  # relative to the project root
+    prompts_dir: str  # relative to the project root
+    catalog_version: str = "v2"
+
+    @property
+    def to_modus_key(self) -> str:
+        return f"{self.name}_to_modus"
+
+    @property
+    def from_modus_key(self) -> str:
+        return f"modus_to_{self.name}"
+
+    def prompt_file(self, step: str) -> str:
+        return os.path.join(self.prompts_dir, f"{step}_{self.name}.md")
+
+
+BUILTIN_FRAMEWORKS = (
+    SourceFramework(
+        "mui", "Material UI", "mui_migration/mapping/component_mappings.json", "mui_migration/md_prompts"
+    ),
+    SourceFramework(
+        "shadcn", "shadcn/ui", "shadcn_migration/mapping/component_mappings.json", "shadcn_migration/md_prompts"
+    ),
+    SourceFramework(
+        "connect",
+        "Connect UI",
+        "connect_migration/component_analysis/component_mappings.json",
+        "connect_migration/docs",
+    ),
+)
+
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FrameworkPack:
+    """Mapping and prompts of one source framework, loaded on first use."""
+
+    def __init__(self, framework: SourceFramework, project_root: str, catalog_store: CatalogStore):
+        self.framework = framework
+        self.project_root = project_root
+        self.catalog_store = catalog_store
+        self._lock = threading.Lock()
+        self._mapping: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+        self._prompts: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+    def _path(self, relative: str) -> str:
+        return os.path.join(self.project_root, relative)
+
+    def mapping(self) -> Dict[str, Any]:
+        path = self._path(self.framework.mapping_file)
+        signature = _file_signature(path)
+        with self._lock:
+            if self._mapping is None or self._mapping[0] != signature:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._mapping = (signature, json.load(f))
+                logger.info(f"Loaded {self.framework.name} component mapping from {path}")
+            return self._mapping[1]
+
+    def to_modus(self) -> Dict[str, Optional[str]]:
+        return self.mapping().get(self.framework.to_modus_key, {})
+
+    def from_modus(self) -> Dict[str, Any]:
+        return self.mapping().get(self.framework.from_modus_key, {})
+
+    def guidance(self, step: str) -> str:
+        """Text of the step prompt; raises KeyError for an unknown step."""
+        if step not in GUIDANCE_STEPS:
+            raise KeyError(step)
+        path = self._path(self.framework.prompt_file(step))
+        signature = _file_signature(path)
+        with self._lock:
+            cached = self._prompts.get(step)
+            if cached is None or cached[0] != signature:
+                with open(path, "r", encoding="utf-8") as f:
+                    cached = (signature, f.read())
+                self._prompts[step] = cached
+            return cached[1]
+
+    def _modus_summary(self, tag: str) -> Optional[Dict[str, Any]]:
+        component = self.catalog_store.model(self.framework.catalog_version).get(tag)
+        if component is None:
+            return None
+        return {
+            "tag": tag,
+            "props": component.names("props"),
+            "events": component.names("events"),
+            "slots": component.names("slots"),
+        }
+
+    def map_component(self, name: str) -> Dict[str, Any]:
+        """Modus equivalent of a source component, or the source components of a Modus tag."""
+        framework = self.framework.name
+        if name.startswith("modus-"):
+            reverse = {k.lower(): k for k in self.from_modus()}
+            tag = reverse.get(name.lower())
+            if tag is None:
+                return {
+                    "framework": framework,
+                    "component": name,
+                    "status": "unknown",
+                    "suggestions": difflib.get_close_matches(name, list(self.from_modus()), n=5),
+                }
+            return {
+                "framework": framework,
+                "component": tag,
+                "status": "mapped",
+                f"{framework}_equivalent": self.from_modus()[tag],
+                "modus_component": self._modus_summary(tag),
+            }
+
+        to_modus = self.to_modus()
+        names = {k.lower(): k for k in to_modus}
+        source = names.get(name.lower())
+        if source is None:
+            return {
+                "framework": framework,
+                "component": name,
+                "status": "unknown",
+                "suggestions": difflib.get_close_matches(name, list(to_modus), n=5),
+            }
+        tag = to_modus[source]
+        if not tag:
+            return {
+                "framework": framework,
+                "component": source,
+                "status": "no_equivalent",
+                "modus_equivalent": None,
+            }
+        return {
+            "framework": framework,
+            "component": source,
+            "status": "mapped",
+            "modus_equivalent": tag,
+            "modus_component": self._modus_summary(tag),
+        }
+
+
+class FrameworkRegistry:
+    def __init__(self, project_root: str, catalog_store: CatalogStore,
+                 frameworks=BUILTIN_FRAMEWORKS):
+        self.project_root = project_root
+        self.catalog_store = catalog_store
+        self._frameworks: Dict[str, SourceFramework] = {}
+        self._packs: Dict[str, FrameworkPack] = {}
+        self._lock = threading.Lock()
+        for framework in frameworks:
+            self.register(framework)
+
+    def register(self, framework: SourceFramework) -> None:
+        with self._lock:
+            self._frameworks[framework.name] = framework
+            self._packs.pop(framework.name, None)
+
+    def names(self) -> List[str]:
+        return sorted(self._frameworks)
+
+    def describe(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": f.name, "label": f.label, "loaded": f.name in self._packs}
+            for _, f in sorted(self._frameworks.items())
+        ]
+
+    def pack(self, name: str) -> FrameworkPack:
+        """The framework's pack, created on first use; raises KeyError if unregistered."""
+        key = name.lower()
+        with self._lock:
+            pack = self._packs.get(key)
+            if pack is None:
+                pack = FrameworkPack(self._frameworks[key], self.project_root, self.catalog_store)
+                self._packs[key] = pack
+            return pack
@@ -0,0 +1,186 @@
+"""
+Read Modus sources straight from git objects, without checking out a ref.
+
+A single `git cat-file --batch` process is kept open per repository and fed
+object names (blob SHAs or `<ref>:<path>` specs) over its stdin, so reading
+hundreds of files costs one process spawn instead of one per file. Trees are
+enumerated with `git ls-tree`, restricted to the paths the extractor needs.
+"""
+
+import subprocess
+import threading
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+
+class GitTreeEntry(NamedTuple):
+    """One blob entry returned by `git ls-tree`."""
+
+    mode: str
+    type: str
+    sha: str
+    path: str
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def parent(self) -> str:
+        return self.path.rsplit("/", 1)[0] if "/" in self.path else ""
+
+
+class ParseCache:
+    """Thread-safe memo of parse results, keyed by tuples built from blob SHAs."""
+
+    def __init__(self):
+        self._values: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: tuple, compute: Callable[[], object]):
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                return self._values[key]
+        value = compute()
+        with self._lock:
+            self.misses += 1
+            return self._values.setdefault(key, value)
+
+
+class GitObjectReader:
+    """Persistent `git cat-file --batch` pipe plus a parse cache keyed by blob SHA.
+
+    The parse cache outlives any single ref, so a component file that did not
+    change between two releases is only parsed once when extracting both.
+    Several readers (e.g. one per worker thread) can share one ParseCache.
+    Instances are safe to share between threads; requests on the pipe are
+    serialized with a lock.
+    """
+
+    def __init__(self, repo_path: str, parse_cache: Optional[ParseCache] = None):
+        self.repo_path = repo_path
+        self.parse_cache = parse_cache if parse_cache is not None else ParseCache()
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    @property
+    def cache_hits(self) -> int:
+        return self.parse_cache.hits
+
+    @property
+    def cache_misses(self) -> int:
+        return self.parse_cache.misses
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _git(self, *args: str) -> bytes:
+        return subprocess.run(
+            ["git", "-C", self.repo_path, *args],
+            check=True,
+            capture_output=True,
+        ).stdout
+
+    def _ensure_process(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["git", "-C", self.repo_path, "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+        return self._process
+
+    def list_tags(self, pattern: str) -> List[str]:
+        """List tags matching a glob pattern, oldest version first."""
+        output = self._git("tag", "--list", pattern, "--sort=version:refname")
+        return [line for line in output.decode().splitlines() if line]
+
+    def resolve(self, ref: str) -> str:
+        """Resolve a ref (tag, branch, SHA) to the commit SHA it points at."""
+        return self._git("rev-parse", "--verify", f"{ref}^{{commit}}").decode().strip()
+
+    def ls_tree(self, ref: str, paths: Iterable[str]) -> List[GitTreeEntry]:
+        """List every blob under the given repo-relative paths at `ref`."""
+        paths = [p for p in paths if p]
+        if not paths:
+            return []
+        output = self._git("ls-tree", "-r", "-z", "--full-tree", ref, "--", *paths)
+        entries = []
+        for record in output.split(b"\0"):
+            if not record:
+                continue
+            meta, path = record.split(b"\t", 1)
+            mode, obj_type, sha = meta.decode().split(" ")
+            if obj_type == "blob":
+                entries.append(GitTreeEntry(mode, obj_type, sha, path.decode("utf-8")))
+        return entries
+
+    def read_blob(self, object_name: str) -> Optional[bytes]:
+        """Read an object's content, or None if it does not exist.
+
+        Args:
+            object_name: A blob SHA or a `<ref>:<path>` spec.
+        """
+        with self._lock:
+            process = self._ensure_process()
+            process.stdin.write(object_name.encode("utf-8") + b"\n")
+            process.stdin.flush()
+            header = process.stdout.readline()
+            if not header:
+                raise RuntimeError(f"git cat-file exited while reading {object_name}")
+            parts = header.split()
+            if len(parts) != 3:
+                # "<name> missing" or "<name> ambiguous"
+                return None
+            size = int(parts[2])
+            content = process.stdout.read(size)
+            process.stdout.read(1)  # trailing newline after each object
+            return content
+
+    def read_text(self, object_name: str) -> Optional[str]:
+        content = self.read_blob(object_name)
+        if content is None:
+            return None
+        return content.decode("utf-8", errors="replace")
+
+    def memoize(self, key: tuple, compute: Callable[[], object]):
+        """Return the cached result for `key`, computing it on first use.
+
+        Keys should be built from blob SHAs so results are shared across refs.
+        """
+        return self.parse_cache.get_or_compute(key, compute)
+
+    def close(self) -> None:
+        if self._process is not None:
+            if self._process.stdin:
+                self._process.stdin.close()
+            self._process.wait()
+            if self._process.stdout:
+                self._process.stdout.close()
+            self._process = None
+
+
+def group_by_parent(entries: Iterable[GitTreeEntry], root: str) -> Dict[str, List[GitTreeEntry]]:
+    """Group the direct children of each first-level directory under `root`.
+
+    `src/components/modus-wc-button/modus-wc-button.tsx` is grouped under
+    `modus-wc-button`; deeper files (e.g. nested test folders) are skipped,
+    matching the os.listdir() walk used for working trees.
+    """
+    groups: Dict[str, List[GitTreeEntry]] = {}
+    prefix = root.rstrip("/") + "/"
+    for entry in entries:
+        if not entry.path.startswith(prefix):
+            continue
+        relative = entry.path[len(prefix):].split("/")
+        if len(relative) != 2:
+            continue
+        groups.setdefault(relative[0], []).append(entry)
+    for children in groups.values():
+        children.sort(key=lambda e: e.name)
+    return groups
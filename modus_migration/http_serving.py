@@ -0,0 +1,294 @@
+"""
+Serve an MCP server over stdio (the default) or HTTP.
+
+Over stdio every developer runs a private server process with its own
+catalog in memory. Over HTTP one instance can serve a team:
+
+    python mcp_server.py --transport streamable-http --host 0.0.0.0 --port 8000 --workers 4
+
+serves the streamable HTTP endpoint at http://<host>:8000/mcp (or, with
+--transport sse, the SSE endpoint at /sse). Connections are kept alive for
+--keep-alive seconds, and tool responses of at least --compress-min-bytes
+are gzip- or deflate-compressed when the client accepts it (the catalog
+tools return up to a few hundred KB of indented JSON; level 1 shrinks it
+about 5x for well under a millisecond per 100 KB). Streamable HTTP answers with single JSON responses instead of
+per-request event streams, so they can be compressed.
+
+With more than one worker, uvicorn starts that many processes. Sessions
+cannot follow a client across processes, so the server then runs stateless
+(--stateless): every request is handled on its own, without an MCP session.
+
+With --metrics-file, the tool metrics (see server_metrics.py) are written in
+the Prometheus text format every --metrics-interval seconds, over any
+transport. Each worker process writes its own file, named after its pid
+(metrics.prom becomes metrics.<pid>.prom). --trace-file appends tracing
+spans of every tool call to a JSONL file, shared by all workers (see
+tracing.py). The admission control options (--memory-budget-mb,
+--queue-timeout, ...) apply per process; see admission.py.
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import sys
+import zlib
+from typing import Any, Dict, List, Optional
+
+from modus_migration import tracing
+from modus_migration.admission import admission_of
+from modus_migration.server_metrics import metrics_of
+
+logger = logging.getLogger(__name__)
+
+TRANSPORTS = ("stdio", "streamable-http", "sse")
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+# Passes the serving options to uvicorn's worker processes
+_WORKER_ENV = "MODUS_MCP_HTTP_WORKER"
+
+
+def _accepted_encoding(accept_encoding: str) -> Optional[str]:
+    """"gzip" or "deflate" (gzip preferred) if the Accept-Encoding header allows it."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in ("gzip", "deflate"):
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def compress(body: bytes, coding: str, level: int = 1) -> bytes:
+    if coding == "gzip":
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(body) + compressor.flush()
+    # HTTP "deflate" is the zlib format (RFC 9110 section 8.4.1.2)
+    return zlib.compress(body, level)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete responses of at least `minimum_size` bytes.
+
+    Streamed responses (more than one body message, e.g. SSE) pass through
+    unchanged, as do responses that already have a Content-Encoding.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, level: int = 1):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        coding = _accepted_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Dict[str, Any] = {}
+        streaming = False
+
+        async def send_compressed(message):
+            nonlocal start, streaming
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or streaming:
+                await send(message)
+                return
+            response_headers = list(start.get("headers") or [])
+            names = {name.lower() for name, _ in response_headers}
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or b"content-encoding" in names
+                or len(body) < self.minimum_size
+            ):
+                streaming = message.get("more_body", False)
+                await send(start)
+                await send(message)
+                return
+            body = compress(body, coding, self.level)
+            response_headers = [
+                (name, value) for name, value in response_headers if name.lower() != b"content-length"
+            ]
+            response_headers += [
+                (b"content-encoding", coding.encode()),
+                (b"content-length", str(len(body)).encode()),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            await send(dict(start, headers=response_headers))
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+def add_serving_arguments(parser: argparse.ArgumentParser, default_port: int) -> None:
+    parser.add_argument("--transport", choices=TRANSPORTS, default="stdio",
+                        help="stdio (default), streamable-http or sse")
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=default_port,
+                        help=f"HTTP port (default: {default_port})")
+    parser.add_argument("--workers", type=int, default=1, help="HTTP worker processes (default: 1)")
+    parser.add_argument("--stateless", action="store_true",
+                        help="Serve without MCP sessions (implied by --workers > 1)")
+    parser.add_argument("--keep-alive", type=int, default=30,
+                        help="Seconds an idle HTTP connection is kept open (default: 30)")
+    parser.add_argument("--compress-min-bytes", type=int, default=1024,
+                        help="Compress HTTP responses of at least this size; 0 disables (default: 1024)")
+    parser.add_argument("--compress-level", type=int, default=1, choices=range(1, 10), metavar="1-9",
+                        help="zlib compression level (default: 1)")
+    parser.add_argument("--metrics-file",
+                        help="Periodically write tool metrics in the Prometheus text format to this file")
+    parser.add_argument("--metrics-interval", type=float, default=15.0,
+                        help="Seconds between --metrics-file writes (default: 15)")
+    parser.add_argument("--trace-file",
+                        help="Append tracing spans of every tool call to this JSONL file")
+    parser.add_argument("--memory-budget-mb", type=float, default=256,
+                        help="Memory reserved at most by concurrent heavy and bulk tool calls (default: 256)")
+    parser.add_argument("--heavy-concurrency", type=int, default=4,
+                        help="Heavy tool calls run at once (default: 4)")
+    parser.add_argument("--bulk-concurrency", type=int, default=1,
+                        help="Bulk tool calls (full catalog dumps) run at once (default: 1)")
+    parser.add_argument("--queue-limit", type=int, default=16,
+                        help="Calls queued per cost class before new ones are rejected (default: 16)")
+    parser.add_argument("--queue-timeout", type=float, default=30,
+                        help="Seconds a queued call waits before it is rejected (default: 30)")
+
+
+# add_serving_arguments options passed to AdmissionControl.configure()
+_ADMISSION_OPTIONS = ("memory_budget_mb", "heavy_concurrency", "bulk_concurrency", "queue_limit", "queue_timeout")
+
+
+def configure_admission(server, options: Dict[str, Any]) -> None:
+    admission = admission_of(server)
+    if admission is not None:
+        admission.configure(**{name: options[name] for name in _ADMISSION_OPTIONS})
+
+
+def configure(server, transport: str, host: str, stateless: bool) -> None:
+    """Apply the HTTP serving options to a FastMCP server's settings."""
+    server.settings.host = host
+    server.settings.json_response = transport == "streamable-http"
+    server.settings.stateless_http = stateless
+    if host not in LOOPBACK_HOSTS:
+        # FastMCP only allows loopback Host headers by default, which would
+        # reject every team member connecting by the machine's name
+        server.settings.transport_security = None
+
+
+def create_http_app(server, transport: str = "streamable-http", compress_min_bytes: int = 1024,
+                    compress_level: int = 1):
+    """The server's ASGI app for `transport`, with response compression."""
+    app = server.streamable_http_app() if transport == "streamable-http" else server.sse_app()
+    if compress_min_bytes > 0:
+        app = CompressionMiddleware(app, minimum_size=compress_min_bytes, level=compress_level)
+    return app
+
+
+def start_metrics_export(server, path: Optional[str], interval: float, per_process: bool = False) -> None:
+    if not path:
+        return
+    metrics = metrics_of(server)
+    if metrics is None:
+        logger.warning(f"{server.name} records no metrics; ignoring --metrics-file")
+        return
+    if per_process:
+        stem, extension = os.path.splitext(path)
+        path = f"{stem}.{os.getpid()}{extension}"
+    metrics.start_export(path, interval)
+
+
+def _load_script(script: str):
+    # uvicorn's workers are spawned: multiprocessing has already run the
+    # server script in them as __mp_main__
+    main = sys.modules.get("__mp_main__")
+    if main is not None and os.path.abspath(getattr(main, "__file__", "")) == script:
+        return main
+    spec = importlib.util.spec_from_file_location("_served_mcp_server", script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def worker_app():
+    """ASGI app factory run by each uvicorn worker process."""
+    options = json.loads(os.environ[_WORKER_ENV])
+    # serve() exported --trace-file to the environment
+    tracing.configure()
+    server = getattr(_load_script(options["script"]), options["server"])
+    configure(server, options["transport"], options["host"], options["stateless"])
+    configure_admission(server, options)
+    start_metrics_export(server, options["metrics_file"], options["metrics_interval"], per_process=True)
+    return create_http_app(
+        server, options["transport"], options["compress_min_bytes"], options["compress_level"]
+    )
+
+
+def serve(server, script: str, attribute: str, default_port: int,
+          argv: Optional[List[str]] = None) -> None:
+    """Run `server` (module attribute `attribute` of `script`) with the
+    transport chosen on the command line."""
+    parser = argparse.ArgumentParser(description=f"Serve {server.name}.")
+    add_serving_arguments(parser, default_port)
+    args = parser.parse_args(argv)
+    tracing.configure(args.trace_file)
+    configure_admission(server, vars(args))
+    workers = max(1, args.workers)
+    if args.transport == "stdio" or workers == 1:
+        start_metrics_export(server, args.metrics_file, args.metrics_interval)
+    if args.transport == "stdio":
+        server.run(transport="stdio")
+        return
+
+    import uvicorn
+
+    stateless = args.stateless or workers > 1
+    if args.transport == "sse" and workers > 1:
+        parser.error("--transport sse keeps per-client state; use one worker or streamable-http")
+    if args.host not in LOOPBACK_HOSTS:
+        logger.warning(f"Serving on {args.host}: the server has no authentication")
+    path = server.settings.streamable_http_path if args.transport == "streamable-http" else server.settings.sse_path
+    logger.info(
+        f"Serving {server.name} on http://{args.host}:{args.port}{path} "
+        f"({workers} worker{'s' if workers > 1 else ''}{', stateless' if stateless else ''})"
+    )
+
+    if workers == 1:
+        configure(server, args.transport, args.host, stateless)
+        app = create_http_app(server, args.transport, args.compress_min_bytes, args.compress_level)
+        uvicorn.run(app, host=args.host, port=args.port, timeout_keep_alive=args.keep_alive)
+        return
+
+    os.environ[_WORKER_ENV] = json.dumps({
+        "script": os.path.abspath(script),
+        "server": attribute,
+        "transport": args.transport,
+        "host": args.host,
+        "stateless": stateless,
+        "compress_min_bytes": args.compress_min_bytes,
+        "compress_level": args.compress_level,
+        "metrics_file": args.metrics_file,
+        "metrics_interval": args.metrics_interval,
+        **{name: getattr(args, name) for name in _ADMISSION_OPTIONS},
+    })
+    uvicorn.run(
+        f"{__name__}:worker_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        timeout_keep_alive=args.keep_alive,
+    )
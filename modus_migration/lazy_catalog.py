@@ -0,0 +1,127 @@
+"""
+Memory-mapped catalog files that decode one component at a time.
+
+A LazyCatalog maps a `{name: component}` JSON file read-only and keeps only
+the byte range of each top-level value. Looking a component up json-decodes
+its slice of the file; nothing else is parsed, and the untouched pages of the
+file are never read:
+
+    catalog = LazyCatalog(path, offsets)
+    catalog["modus-wc-button.tsx"]      # decodes ~2 KB of the file
+
+The catalog build writes the ranges of every compiled catalog to
+catalog_offsets.json:
+
+    {"v2_components.json": {"size": 612345, "mtime_ns": ...,
+                            "offsets": {"modus-wc-button.tsx": [14, 2093], ...}}}
+
+Without a matching sidecar (a source catalog, or a build written after the
+sidecar was read) the ranges are found with one scan of the mapped bytes,
+which skips over strings without decoding them.
+"""
+
+import json
+import mmap
+import os
+import re
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+# Strings (consumed whole, so brackets and commas inside them are skipped)
+# and the structural characters that change nesting or end a value
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\],]', re.S)
+_WHITESPACE = b" \t\n\r"
+# In indent=2 output (write_catalog_stream, json.dump(..., indent=2)) every
+# top-level key starts a line indented by exactly two spaces; JSON strings
+# cannot contain a raw newline, so nothing else matches
+_INDENTED_KEY = re.compile(rb'\n  ("(?:[^"\\\n]|\\.)*"): ')
+
+
+def file_signature(path: str) -> Dict[str, int]:
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _scan_indented(data) -> Dict[str, Tuple[int, int]]:
+    offsets: Dict[str, Tuple[int, int]] = {}
+    previous: Optional[Tuple[str, int]] = None
+    for match in _INDENTED_KEY.finditer(data):
+        if previous is not None:
+            # The previous value ends at the comma before this key's line
+            offsets[previous[0]] = (previous[1], data.rfind(b",", previous[1], match.start()))
+        previous = (json.loads(match.group(1)), match.end())
+    if previous is not None:
+        offsets[previous[0]] = (previous[1], data.rfind(b"\n}"))
+    return offsets
+
+
+def scan_offsets(data) -> Dict[str, Tuple[int, int]]:
+    """[start, end) byte range of every top-level value of a JSON object."""
+    if data[:5] == b'{\n  "':
+        return _scan_indented(data)
+    offsets: Dict[str, Tuple[int, int]] = {}
+    depth = 0
+    key: Optional[str] = None
+    start = 0
+    expect_key = False
+    for match in _TOKEN.finditer(data):
+        token = match.group()
+        if token[:1] == b'"':
+            if depth == 1 and expect_key:
+                key = json.loads(token)
+                start = data.find(b":", match.end()) + 1
+                while start < len(data) and data[start] in _WHITESPACE:
+                    start += 1
+                expect_key = False
+            continue
+        if token in (b"{", b"["):
+            depth += 1
+            if depth == 1:
+                expect_key = True
+            continue
+        if token == b"," and depth > 1:
+            continue
+        if depth == 1 and key is not None:
+            end = match.start()
+            while end > start and data[end - 1] in _WHITESPACE:
+                end -= 1
+            offsets[key] = (start, end)
+            key = None
+        if token == b",":
+            expect_key = depth == 1
+        else:
+            depth -= 1
+    if depth != 0:
+        raise ValueError("unterminated JSON object")
+    return offsets
+
+
+class LazyCatalog(Mapping[str, Any]):
+    """Read-only `{name: component}` view of a mapped catalog file.
+
+    Values are decoded on every lookup; callers that reuse a component keep
+    their own reference (see CatalogModel).
+    """
+
+    def __init__(self, path: str, sidecar: Optional[Dict[str, Any]] = None):
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            # mmap cannot map an empty file
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        if sidecar and {k: sidecar.get(k) for k in ("size", "mtime_ns")} == file_signature(path):
+            self._offsets = {key: tuple(span) for key, span in sidecar["offsets"].items()}
+        else:
+            self._offsets = scan_offsets(self._data) if size else {}
+
+    def __getitem__(self, key: str) -> Any:
+        start, end = self._offsets[key]
+        return json.loads(self._data[start:end])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._offsets
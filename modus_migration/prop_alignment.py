@@ -0,0 +1,220 @@
+"""
+Build-time alignment of v1 props to the props of their mapped v2 component.
+
+For every v1 -> v2 pair in component_mapping.json each v1 prop is scored
+against each v2 prop, as NumPy matrices per pair:
+
+- name similarity: cosine of character-trigram vectors of the normalized
+  names (an exact normalized match scores 1.0),
+- type compatibility: same primitive type, or overlap of string-literal unions,
+- description overlap: Jaccard of the words of the props' own doc comments.
+
+The weighted sum is raised to EXACT_NAME_SCORE for identical normalized names,
+and to LITERAL_UNION_WEIGHT x overlap for props with overlapping literal unions
+(v1 alert `type` and v2 alert `variant` both take 'error' | 'info' | ...).
+Props are then assigned one-to-one, best score first, above MIN_CONFIDENCE.
+Entries of create_manual_component_map()["prop_mappings"] override the
+computed result with confidence 1.0. The catalog build stores the table in
+prop_alignment.json, keyed by v1 tag, so tools answer with a dict lookup:
+
+    {"modus-button": {"v2_component": "modus-wc-button",
+                      "props": {"buttonStyle": {"target": "variant", "confidence": 1.0,
+                                                "source": "manual",
+                                                "candidates": [["variant", 0.41], ...]}},
+                      "unmatched_v2_props": ["fullWidth", ...]}}
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from modus_migration.attribute_index import normalize_name
+from modus_migration.doc_search import tokenize
+
+NAME_WEIGHT = 0.6
+TYPE_WEIGHT = 0.25
+DESCRIPTION_WEIGHT = 0.15
+
+EXACT_NAME_SCORE = 0.9
+LITERAL_UNION_WEIGHT = 0.9
+
+MIN_CONFIDENCE = 0.55
+MAX_CANDIDATES = 3
+
+_LITERAL = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+_PRIMITIVES = ("boolean", "number", "string")
+
+
+def _trigrams(name: str) -> List[str]:
+    padded = f"^{normalize_name(name)}$"
+    return [padded[i:i + 3] for i in range(max(1, len(padded) - 2))]
+
+
+def name_similarity(v1_names: List[str], v2_names: List[str]) -> np.ndarray:
+    """Cosine similarity of character-trigram count vectors, exact matches set to 1."""
+    vocabulary: Dict[str, int] = {}
+    grams = [_trigrams(n) for n in v1_names + v2_names]
+    for name_grams in grams:
+        for gram in name_grams:
+            vocabulary.setdefault(gram, len(vocabulary))
+    matrix = np.zeros((len(grams), max(1, len(vocabulary))))
+    for row, name_grams in enumerate(grams):
+        for gram in name_grams:
+            matrix[row, vocabulary[gram]] += 1
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    similarity = matrix[: len(v1_names)] @ matrix[len(v1_names):].T
+
+    v1_normalized = np.array([normalize_name(n) for n in v1_names], dtype=object)
+    v2_normalized = np.array([normalize_name(n) for n in v2_names], dtype=object)
+    similarity[v1_normalized[:, None] == v2_normalized[None, :]] = 1.0
+    return similarity
+
+
+def type_signature(type_text: str) -> Tuple[str, frozenset]:
+    """("literals", {...}) for string-literal unions, else (primitive or "other", {})."""
+    text = (type_text or "").strip().lstrip(":").strip()
+    literals = frozenset(a or b for a, b in _LITERAL.findall(text))
+    if literals:
+        return "literals", literals
+    lowered = text.lower()
+    for primitive in _PRIMITIVES:
+        if re.search(rf"\b{primitive}\b", lowered):
+            return primitive, frozenset()
+    return "other", frozenset()
+
+
+def literal_overlap(v1_type: str, v2_type: str) -> float:
+    """Jaccard overlap of two string-literal unions of at least two values each."""
+    kind1, literals1 = type_signature(v1_type)
+    kind2, literals2 = type_signature(v2_type)
+    if kind1 != "literals" or kind2 != "literals" or min(len(literals1), len(literals2)) < 2:
+        return 0.0
+    return len(literals1 & literals2) / len(literals1 | literals2)
+
+
+def type_compatibility(v1_type: str, v2_type: str) -> float:
+    kind1, literals1 = type_signature(v1_type)
+    kind2, literals2 = type_signature(v2_type)
+    if kind1 == kind2 == "literals":
+        return len(literals1 & literals2) / len(literals1 | literals2)
+    if {kind1, kind2} == {"literals", "string"}:
+        return 0.5
+    if "other" in (kind1, kind2):
+        # Named types (e.g. ButtonStyle) carry no information here
+        return 0.3
+    return 1.0 if kind1 == kind2 else 0.0
+
+
+def description_words(description: str) -> frozenset:
+    """Words of a prop's own doc comment (the last /** ... */ block)."""
+    own = (description or "").rsplit("/**", 1)[-1]
+    return frozenset(tokenize(own)) - {"optional"}
+
+
+def description_overlap(v1_descriptions: List[str], v2_descriptions: List[str]) -> np.ndarray:
+    v1_words = [description_words(d) for d in v1_descriptions]
+    v2_words = [description_words(d) for d in v2_descriptions]
+    overlap = np.zeros((len(v1_words), len(v2_words)))
+    for i, a in enumerate(v1_words):
+        for j, b in enumerate(v2_words):
+            if a and b:
+                overlap[i, j] = len(a & b) / len(a | b)
+    return overlap
+
+
+def _props(component: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [p for p in component.get("props", []) or [] if isinstance(p, dict) and p.get("name")]
+
+
+def score_props(v1_props: List[Dict], v2_props: List[Dict]) -> np.ndarray:
+    """Combined (len(v1_props), len(v2_props)) score matrix in [0, 1]."""
+    shape = (len(v1_props), len(v2_props))
+    names = name_similarity([p["name"] for p in v1_props], [p["name"] for p in v2_props])
+    type_pairs = [(a.get("type", ""), b.get("type", "")) for a in v1_props for b in v2_props]
+    types = np.array([type_compatibility(a, b) for a, b in type_pairs]).reshape(shape)
+    literals = np.array([literal_overlap(a, b) for a, b in type_pairs]).reshape(shape)
+    descriptions = description_overlap(
+        [p.get("description", "") for p in v1_props], [p.get("description", "") for p in v2_props]
+    )
+    scores = NAME_WEIGHT * names + TYPE_WEIGHT * types + DESCRIPTION_WEIGHT * descriptions
+    scores = np.maximum(scores, LITERAL_UNION_WEIGHT * literals)
+    scores[names >= 1.0] = np.maximum(scores[names >= 1.0], EXACT_NAME_SCORE)
+    return scores
+
+
+def align_component(v1_component: Dict[str, Any], v2_component: Dict[str, Any],
+                    manual: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    v1_props, v2_props = _props(v1_component), _props(v2_component)
+    v2_by_normalized = {normalize_name(p["name"]): p["name"] for p in v2_props}
+    rows: Dict[str, Dict[str, Any]] = {
+        p["name"]: {"target": None, "confidence": 0.0, "source": None, "candidates": []}
+        for p in v1_props
+    }
+
+    if v1_props and v2_props:
+        scores = score_props(v1_props, v2_props)
+        for i, prop in enumerate(v1_props):
+            ranked = np.argsort(-scores[i], kind="stable")[:MAX_CANDIDATES]
+            rows[prop["name"]]["candidates"] = [
+                [v2_props[j]["name"], round(float(scores[i, j]), 4)] for j in ranked
+            ]
+        # Greedy one-to-one assignment, best pairs first
+        taken_v1, taken_v2 = set(), set()
+        for flat in np.argsort(-scores, axis=None, kind="stable"):
+            i, j = divmod(int(flat), len(v2_props))
+            score = float(scores[i, j])
+            if score < MIN_CONFIDENCE:
+                break
+            if i in taken_v1 or j in taken_v2:
+                continue
+            taken_v1.add(i)
+            taken_v2.add(j)
+            v1_name, v2_name = v1_props[i]["name"], v2_props[j]["name"]
+            exact = normalize_name(v1_name) == normalize_name(v2_name)
+            rows[v1_name].update(
+                target=v2_name,
+                confidence=round(score, 4),
+                source="exact" if exact else "similarity",
+            )
+
+    # Manual mappings win; they may use kebab-case or name props missing from the catalog
+    v1_by_normalized = {normalize_name(name): name for name in rows}
+    for manual_v1, manual_v2 in (manual or {}).items():
+        v1_name = v1_by_normalized.get(normalize_name(manual_v1), manual_v1)
+        row = rows.setdefault(v1_name, {"target": None, "confidence": 0.0, "source": None, "candidates": []})
+        row.update(
+            target=v2_by_normalized.get(normalize_name(manual_v2), manual_v2),
+            confidence=1.0,
+            source="manual",
+        )
+
+    targets = {row["target"] for row in rows.values()}
+    return {
+        "props": rows,
+        "unmatched_v2_props": [p["name"] for p in v2_props if p["name"] not in targets],
+    }
+
+
+def build_alignment_table(v1_catalog: Dict[str, Any], v2_catalog: Dict[str, Any],
+                          component_map: Dict[str, Any],
+                          prop_mappings: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+    """Alignment of every v1 component whose mapped v2 component is in the catalog."""
+    table = {}
+    for v1_tag, v2_tag in component_map.items():
+        if not isinstance(v2_tag, str) or v1_tag not in v1_catalog or v2_tag not in v2_catalog:
+            continue
+        table[v1_tag] = {
+            "v2_component": v2_tag,
+            **align_component(v1_catalog[v1_tag], v2_catalog[v2_tag], prop_mappings.get(v1_tag)),
+        }
+    return table
+
+
+def attribute_changes(alignment: Dict[str, Any]) -> Dict[str, str]:
+    """{v1 prop: v2 prop} of the confidently aligned props that change name."""
+    return {
+        v1_name: row["target"]
+        for v1_name, row in alignment.get("props", {}).items()
+        if row["target"] and row["target"] != v1_name
+    }
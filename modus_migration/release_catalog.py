@@ -0,0 +1,220 @@
+"""
+Multi-release component catalogs with a per-release prop/event/slot diff index.
+
+A release catalog covers a list of tags of one Modus major version. Component
+entries are stored once per distinct content hash; each release only keeps a
+manifest of component name -> hash, so a component that did not change
+across ten releases is stored once. The diff index records, per component,
+which props, events and slots were added, removed or changed type in each
+release relative to the previous one.
+
+Layout of `component_analysis/releases/<version>_releases.json`:
+
+    {
+      "version": "v2",
+      "releases": ["2.0.0", "2.1.0"],
+      "commits": {"2.0.0": "<sha>", ...},
+      "manifests": {"2.0.0": {"modus-wc-button": "<hash>", ...}, ...},
+      "components": {"<hash>": {...component entry...}, ...},
+      "diff_index": {"modus-wc-button": {"2.1.0": {"props": {"added": [...]}}}}
+    }
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from modus_migration.git_source import GitObjectReader, ParseCache
+from modus_migration.tracing import propagate, span
+
+RELEASES_DIR_NAME = "releases"
+
+
+def release_catalog_path(output_dir: str, version: str) -> str:
+    return os.path.join(output_dir, RELEASES_DIR_NAME, f"{version}_releases.json")
+
+
+def content_hash(entry: dict) -> str:
+    """Stable hash of a component entry, independent of key order."""
+    canonical = json.dumps(entry, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:20]
+
+
+def expand_release_refs(reader: GitObjectReader, refs: List[str]) -> List[str]:
+    """Expand glob patterns (e.g. `v2.*`) against the repository's tags."""
+    expanded = []
+    for ref in refs:
+        matches = reader.list_tags(ref) if any(c in ref for c in "*?[") else [ref]
+        for match in matches:
+            if match not in expanded:
+                expanded.append(match)
+    return expanded
+
+
+def _prop_types(entry: dict) -> Dict[str, str]:
+    return {
+        p.get("name"): (p.get("type") or "").strip()
+        for p in entry.get("props", [])
+        if isinstance(p, dict) and p.get("name")
+    }
+
+
+def _names(items: list) -> List[str]:
+    names = []
+    for item in items or []:
+        name = item.get("name") if isinstance(item, dict) else item
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def diff_component(old: Optional[dict], new: Optional[dict]) -> dict:
+    """Describe prop/event/slot changes between two entries of one component.
+
+    Returns only non-empty sections, e.g.
+    {"props": {"added": ["size"], "type_changed": [{"name": "color", "from": ..., "to": ...}]}}
+    A component that appears or disappears is reported with "component": "added"/"removed".
+    """
+    if old is None and new is None:
+        return {}
+    if old is None:
+        return {"component": "added"}
+    if new is None:
+        return {"component": "removed"}
+
+    changes = {}
+
+    old_props, new_props = _prop_types(old), _prop_types(new)
+    prop_changes = {
+        "added": [n for n in new_props if n not in old_props],
+        "removed": [n for n in old_props if n not in new_props],
+        "type_changed": [
+            {"name": n, "from": old_props[n], "to": new_props[n]}
+            for n in new_props
+            if n in old_props and old_props[n] != new_props[n]
+        ],
+    }
+    prop_changes = {k: v for k, v in prop_changes.items() if v}
+    if prop_changes:
+        changes["props"] = prop_changes
+
+    for section in ("events", "slots"):
+        old_names, new_names = _names(old.get(section)), _names(new.get(section))
+        section_changes = {
+            "added": [n for n in new_names if n not in old_names],
+            "removed": [n for n in old_names if n not in new_names],
+        }
+        section_changes = {k: v for k, v in section_changes.items() if v}
+        if section_changes:
+            changes[section] = section_changes
+
+    return changes
+
+
+def build_release_catalog(
+    repo_path: str,
+    version: str,
+    releases: List[str],
+    iter_components: Callable[[GitObjectReader, str, str], Iterator[Tuple[str, dict]]],
+    max_workers: int = 4,
+) -> dict:
+    """Extract every release in parallel and fold them into one deduplicated catalog.
+
+    Args:
+        repo_path: Path of the cloned Modus repository.
+        version: "v1" or "v2", selects the repository layout.
+        releases: Tags/refs in release order; glob patterns are expanded.
+        iter_components: Yields (tag_name, entry) for a ref, e.g.
+            component_extractor.iter_components_at_ref.
+        max_workers: Number of refs extracted concurrently. Each worker gets its
+            own cat-file pipe; parsed blobs are shared through one ParseCache.
+    """
+    parse_cache = ParseCache()
+    with GitObjectReader(repo_path, parse_cache) as reader:
+        releases = expand_release_refs(reader, releases)
+        commits = {ref: reader.resolve(ref) for ref in releases}
+
+    def extract(ref: str) -> Dict[str, dict]:
+        with span("release", version=version, ref=ref), \
+                GitObjectReader(repo_path, parse_cache) as worker_reader:
+            return dict(iter_components(worker_reader, ref, version))
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        extracted = dict(zip(releases, executor.map(propagate(extract), releases)))
+
+    components: Dict[str, dict] = {}
+    manifests: Dict[str, Dict[str, str]] = {}
+    for ref in releases:
+        manifest = {}
+        for name, entry in sorted(extracted[ref].items()):
+            digest = content_hash(entry)
+            components.setdefault(digest, entry)
+            manifest[name] = digest
+        manifests[ref] = manifest
+
+    diff_index: Dict[str, Dict[str, dict]] = {}
+    # The first release is the baseline; every later one is diffed against its predecessor
+    for previous_ref, ref in zip(releases, releases[1:]):
+        previous, current = manifests[previous_ref], manifests[ref]
+        for name in sorted(set(previous) | set(current)):
+            if previous.get(name) == current.get(name):
+                continue
+            changes = diff_component(
+                components.get(previous.get(name)), components.get(current.get(name))
+            )
+            if changes:
+                diff_index.setdefault(name, {})[ref] = changes
+
+    print(
+        f"Release catalog {version}: {len(releases)} releases, "
+        f"{sum(len(m) for m in manifests.values())} component versions, "
+        f"{len(components)} unique entries "
+        f"(parse cache: {parse_cache.hits} hits, {parse_cache.misses} misses)"
+    )
+
+    return {
+        "version": version,
+        "releases": releases,
+        "commits": commits,
+        "manifests": manifests,
+        "components": components,
+        "diff_index": diff_index,
+    }
+
+
+def load_release_catalog(output_dir: str, version: str) -> dict:
+    with open(release_catalog_path(output_dir, version), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def release_components(catalog: dict, release: str) -> Dict[str, dict]:
+    """Return {tag_name: entry} for one release, sharing the deduplicated entries."""
+    if release not in catalog.get("manifests", {}):
+        raise KeyError(
+            f"Release '{release}' not in catalog; known releases: {catalog.get('releases', [])}"
+        )
+    components = catalog["components"]
+    return {name: components[digest] for name, digest in catalog["manifests"][release].items()}
+
+
+def component_changes(
+    catalog: dict,
+    component_name: str,
+    from_release: Optional[str] = None,
+    to_release: Optional[str] = None,
+) -> Dict[str, dict]:
+    """Return the diff index entries of a component for releases in (from, to].
+
+    An empty bound (None or "") is open; KeyError if a bound is not in the catalog.
+    """
+    releases = catalog.get("releases", [])
+    for release in (from_release, to_release):
+        if release and release not in releases:
+            raise KeyError(f"Release '{release}' not in catalog; known releases: {releases}")
+    start = releases.index(from_release) + 1 if from_release else 0
+    end = releases.index(to_release) + 1 if to_release else len(releases)
+    window = set(releases[start:end])
+    history = catalog.get("diff_index", {}).get(component_name, {})
+    return {ref: history[ref] for ref in releases if ref in window and ref in history}
@@ -0,0 +1,294 @@
+"""
+Per-tool metrics for the MCP servers.
+
+A server creates one ServerMetrics right after its FastMCP instance and
+before registering tools:
+
+    mcp = FastMCP("Modus Web Components Server")
+    server_metrics = ServerMetrics(mcp)
+    server_metrics.add_caches("catalog", catalog_store.cache_stats)
+
+Every tool registered afterwards is wrapped to record its call count,
+latency histogram, response size histogram and error count (exceptions, and
+JSON responses whose first key is a truthy "error", the way both servers
+report failures). Only calls through the MCP protocol are counted: the
+decorator still returns the undecorated function, so in-process callers such
+as the benchmarks are not.
+
+The servers expose snapshot() as the get_server_stats tool, and with
+--metrics-file (see http_serving.py) write prometheus() to a file every
+--metrics-interval seconds, e.g. for node_exporter's textfile collector.
+"""
+
+import bisect
+import functools
+import inspect
+import logging
+import os
+import re
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from modus_migration.catalog_io import atomic_write
+from modus_migration.tracing import span
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+SIZE_BUCKETS_BYTES: Tuple[float, ...] = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Tool responses are JSON with the "error" key first when a tool fails
+_ERROR_RESPONSE = re.compile(r'\s*\{\s*"error"\s*:(?!\s*(?:false|null|0)\b|\s*"")')
+
+_instrumented: "weakref.WeakKeyDictionary[Any, ServerMetrics]" = weakref.WeakKeyDictionary()
+
+
+def is_error_response(response: Any) -> bool:
+    return isinstance(response, str) and _ERROR_RESPONSE.match(response) is not None
+
+
+def response_size(response: Any) -> int:
+    if isinstance(response, str):
+        return len(response.encode("utf-8"))
+    if isinstance(response, (bytes, bytearray)):
+        return len(response)
+    return 0
+
+
+def metrics_of(server: Any) -> Optional["ServerMetrics"]:
+    """The ServerMetrics instrumenting FastMCP `server`, if any."""
+    return _instrumented.get(server)
+
+
+def _number(value: float) -> str:
+    """`value` exactly: integral values without a fraction, others as repr()."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts[i] holds values <= bounds[i], the last
+    count everything above."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, fraction: float) -> float:
+        """Estimate, interpolating linearly within the bucket (capped at the max seen)."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+        return self.max
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """[(le, cumulative count)], ending with "+Inf"."""
+        buckets, total = [], 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            buckets.append(("+Inf" if bound == float("inf") else _number(bound), total))
+        return buckets
+
+
+class ToolStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.response_bytes = Histogram(SIZE_BUCKETS_BYTES)
+
+    def to_json(self) -> Dict[str, Any]:
+        latency, size = self.latency_ms, self.response_bytes
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency_ms": {
+                "mean": round(latency.sum / latency.count, 3) if latency.count else 0.0,
+                "p50": round(latency.quantile(0.5), 3),
+                "p95": round(latency.quantile(0.95), 3),
+                "p99": round(latency.quantile(0.99), 3),
+                "max": round(latency.max, 3),
+                "buckets": dict(latency.cumulative()),
+            },
+            "response_bytes": {
+                "mean": round(size.sum / size.count) if size.count else 0,
+                "max": int(size.max),
+                "total": int(size.sum),
+                "buckets": dict(size.cumulative()),
+            },
+        }
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class ServerMetrics:
+    def __init__(self, server: Any):
+        self.server_name = server.name
+        self.started = time.time()
+        self._tools: Dict[str, ToolStats] = {}
+        self._caches: List[Tuple[str, Callable[[], Dict[str, Tuple[int, int]]]]] = []
+        self._lock = threading.Lock()
+        self._instrument(server)
+
+    def _instrument(self, server: Any) -> None:
+        add_tool = server.add_tool
+
+        def add_instrumented_tool(fn, name: Optional[str] = None, *args, **kwargs):
+            return add_tool(self.wrap(fn, name or fn.__name__), name, *args, **kwargs)
+
+        # FastMCP.tool() registers through self.add_tool
+        server.add_tool = add_instrumented_tool
+        _instrumented[server] = self
+
+    def wrap(self, fn: Callable, name: str) -> Callable:
+        """`fn` recording its calls as tool `name` (and tracing them as span
+        "tool.<name>"); keeps its signature."""
+        with self._lock:
+            self._tools.setdefault(name, ToolStats())
+        span_name = f"tool.{name}"
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def timed_async(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    with span(span_name):
+                        response = await fn(*args, **kwargs)
+                except Exception:
+                    self.record(name, time.perf_counter() - start, None, error=True)
+                    raise
+                self.record(name, time.perf_counter() - start, response)
+                return response
+
+            return timed_async
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                with span(span_name):
+                    response = fn(*args, **kwargs)
+            except Exception:
+                self.record(name, time.perf_counter() - start, None, error=True)
+                raise
+            self.record(name, time.perf_counter() - start, response)
+            return response
+
+        return timed
+
+    def record(self, tool: str, seconds: float, response: Any, error: bool = False) -> None:
+        error = error or is_error_response(response)
+        size = response_size(response)
+        with self._lock:
+            stats = self._tools.setdefault(tool, ToolStats())
+            stats.calls += 1
+            stats.errors += error
+            stats.latency_ms.observe(seconds * 1000)
+            stats.response_bytes.observe(size)
+
+    def add_caches(self, prefix: str, stats: Callable[[], Dict[str, Tuple[int, int]]]) -> None:
+        """Report `stats()` ({cache: (hits, misses)}) as caches "<prefix>.<cache>"."""
+        self._caches.append((prefix, stats))
+
+    def cache_counts(self) -> Dict[str, Tuple[int, int]]:
+        counts = {}
+        for prefix, stats in self._caches:
+            try:
+                for name, hits_misses in stats().items():
+                    counts[f"{prefix}.{name}"] = hits_misses
+            except Exception as e:
+                logger.warning(f"Cache statistics of {prefix} unavailable: {e}")
+        return counts
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            tools = {name: stats.to_json() for name, stats in sorted(self._tools.items())}
+        return {
+            "server": self.server_name,
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "tools": tools,
+            "caches": {
+                name: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+                }
+                for name, (hits, misses) in sorted(self.cache_counts().items())
+            },
+        }
+
+    def prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        server = f'server="{_label(self.server_name)}",pid="{os.getpid()}"'
+        with self._lock:
+            tools = [(name, _label(name), stats) for name, stats in sorted(self._tools.items())]
+            lines = [
+                "# HELP modus_mcp_tool_calls_total Tool calls.",
+                "# TYPE modus_mcp_tool_calls_total counter",
+            ]
+            lines += [f'modus_mcp_tool_calls_total{{{server},tool="{t}"}} {s.calls}' for _, t, s in tools]
+            lines += [
+                "# HELP modus_mcp_tool_errors_total Tool calls that raised or returned an error.",
+                "# TYPE modus_mcp_tool_errors_total counter",
+            ]
+            lines += [f'modus_mcp_tool_errors_total{{{server},tool="{t}"}} {s.errors}' for _, t, s in tools]
+            for metric, help_text, attribute, scale in (
+                ("modus_mcp_tool_latency_seconds", "Tool call latency.", "latency_ms", 1000),
+                ("modus_mcp_tool_response_bytes", "Tool response size.", "response_bytes", 1),
+            ):
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+                for _, t, stats in tools:
+                    histogram = getattr(stats, attribute)
+                    labels = f'{server},tool="{t}"'
+                    for le, count in histogram.cumulative():
+                        le = le if le == "+Inf" else _number(float(le) / scale)
+                        lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {count}')
+                    lines.append(f"{metric}_sum{{{labels}}} {_number(histogram.sum / scale)}")
+                    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        caches = sorted(self.cache_counts().items())
+        for metric, help_text, index in (
+            ("modus_mcp_cache_hits_total", "Cache lookups served from the cache.", 0),
+            ("modus_mcp_cache_misses_total", "Cache lookups that loaded or computed the value.", 1),
+        ):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            lines += [f'{metric}{{{server},cache="{_label(name)}"}} {counts[index]}' for name, counts in caches]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        with atomic_write(path) as f:
+            f.write(self.prometheus())
+
+    def start_export(self, path: str, interval: float = 15.0) -> threading.Thread:
+        """Rewrite `path` every `interval` seconds from a daemon thread."""
+
+        def export() -> None:
+            while True:
+                try:
+                    self.write_prometheus(path)
+                except OSError as e:
+                    logger.warning(f"Could not write metrics to {path}: {e}")
+                time.sleep(interval)
+
+        thread = threading.Thread(target=export, name="metrics-export", daemon=True)
+        thread.start()
+        return thread
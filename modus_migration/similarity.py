@@ -0,0 +1,134 @@
+"""
+TF-IDF similarity between v1 and v2 components, used to propose v2 targets for
+v1 components mapped to "Not Found" in component_mapping.json.
+
+Each component becomes a weighted bag of words from its tag name, prop, event
+and slot names, and documentation/storybook text (tokenized like search_docs,
+so `tableRowActions` contributes table/row/actions). Field weights favour
+names over prose. All v1 and v2 vectors are built as NumPy matrices and the
+full v1 x v2 cosine similarity matrix is one matrix product; everything runs
+offline.
+
+The catalog build stores the matrix in similarity.json:
+
+    {"v1": [v1 keys], "v2": [v2 keys], "scores": [[...], ...]}   # rows are v1
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from modus_migration.doc_search import tokenize
+
+FIELD_WEIGHTS = {"name": 4.0, "prop": 2.0, "event": 2.0, "slot": 2.0, "doc": 1.0}
+
+# Tokens every tag shares
+NAME_STOPWORDS = frozenset({"modus", "wc", "tsx", "js"})
+
+NOT_FOUND = "Not Found"
+
+
+def _field_texts(key: str, component: Dict[str, Any]) -> Dict[str, List[str]]:
+    def names(items):
+        return [i.get("name", "") if isinstance(i, dict) else str(i) for i in items or []]
+
+    docs = [component.get("documentation", ""), component.get("storybook_content", "")]
+    return {
+        "name": [key],
+        "prop": names(component.get("props")),
+        "event": names(component.get("events")),
+        "slot": names(component.get("slots")),
+        "doc": [d for d in docs if isinstance(d, str)],
+    }
+
+
+def component_features(key: str, component: Dict[str, Any]) -> Dict[str, float]:
+    """Weighted, sublinear term frequencies of a catalog entry."""
+    features: Dict[str, float] = {}
+    for field, texts in _field_texts(key, component).items():
+        counts: Dict[str, int] = {}
+        for text in texts:
+            for token in tokenize(text):
+                if token not in NAME_STOPWORDS:
+                    counts[token] = counts.get(token, 0) + 1
+        weight = FIELD_WEIGHTS[field]
+        for token, count in counts.items():
+            features[token] = features.get(token, 0.0) + weight * (1.0 + math.log(count))
+    return features
+
+
+def _tfidf_matrix(rows: List[Dict[str, float]], vocabulary: Dict[str, int],
+                  idf: np.ndarray) -> np.ndarray:
+    matrix = np.zeros((len(rows), len(vocabulary)), dtype=np.float64)
+    for i, features in enumerate(rows):
+        columns = [vocabulary[t] for t in features]
+        matrix[i, columns] = list(features.values())
+    matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class SimilarityModel:
+    def __init__(self, v1_keys: List[str], v2_keys: List[str], scores: np.ndarray):
+        self.v1_keys = v1_keys
+        self.v2_keys = v2_keys
+        self.scores = scores
+        self._v1_rows = {key: i for i, key in enumerate(v1_keys)}
+
+    @classmethod
+    def fit(cls, v1_items: Iterable[Tuple[str, Dict[str, Any]]],
+            v2_items: Iterable[Tuple[str, Dict[str, Any]]]) -> "SimilarityModel":
+        v1_keys, v1_rows = [], []
+        for key, component in v1_items:
+            v1_keys.append(key)
+            v1_rows.append(component_features(key, component))
+        v2_keys, v2_rows = [], []
+        for key, component in v2_items:
+            v2_keys.append(key)
+            v2_rows.append(component_features(key, component))
+
+        vocabulary: Dict[str, int] = {}
+        document_frequency: List[int] = []
+        for features in v1_rows + v2_rows:
+            for token in features:
+                column = vocabulary.setdefault(token, len(vocabulary))
+                if column == len(document_frequency):
+                    document_frequency.append(0)
+                document_frequency[column] += 1
+        n = len(v1_rows) + len(v2_rows)
+        idf = np.log((1 + n) / (1 + np.asarray(document_frequency, dtype=np.float64))) + 1.0
+
+        v1_matrix = _tfidf_matrix(v1_rows, vocabulary, idf)
+        v2_matrix = _tfidf_matrix(v2_rows, vocabulary, idf)
+        return cls(v1_keys, v2_keys, v1_matrix @ v2_matrix.T)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "v1": self.v1_keys,
+            "v2": self.v2_keys,
+            "scores": np.round(self.scores, 4).tolist(),
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "SimilarityModel":
+        scores = np.asarray(data["scores"], dtype=np.float64)
+        return cls(data["v1"], data["v2"], scores.reshape(len(data["v1"]), len(data["v2"])))
+
+    def candidates(self, v1_key: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        """v2 components most similar to `v1_key`, best first."""
+        row = self.scores[self._v1_rows[v1_key]]
+        best = np.argsort(-row, kind="stable")[:top_k]
+        return [(self.v2_keys[i], float(row[i])) for i in best]
+
+    def unmapped_report(self, mapping: Dict[str, str], top_k: int = 3) -> Dict[str, List[Dict]]:
+        """Ranked candidates for every v1 component mapped to "Not Found"."""
+        return {
+            v1_key: [
+                {"v2_component": v2_key, "score": round(score, 4)}
+                for v2_key, score in self.candidates(v1_key, top_k)
+            ]
+            for v1_key in self.v1_keys
+            if mapping.get(v1_key) == NOT_FOUND
+        }
@@ -0,0 +1,243 @@
+"""
+Edit lists and unified diffs for migrated sources.
+
+A migration returns the changes it made to a file instead of the whole
+rewritten file, so its size follows the number of changes, not the file's:
+
+    {"path": "src/Form.tsx",
+     "source_sha256": "<sha256 of the original text>",
+     "source_length": 58211,
+     "edits": [{"offset": 1520, "length": 19, "replacement": "<modus-wc-button>", "line": 48}],
+     "diff": "--- a/src/Form.tsx\\n+++ b/src/Form.tsx\\n@@ -48 +48 @@\\n..."}
+
+Offsets and lengths count characters (code points) of the original text;
+edits never overlap and are listed in source order. "line" is the 1-based
+line of the offset, for people reading the patch. Apply a patch with
+apply_patch(), which refuses a source that is not the one it was made for,
+or from the command line:
+
+    python -m modus_migration.source_edits src/Form.tsx form.patch.json --in-place
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import sys
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from modus_migration.catalog_io import atomic_write
+
+
+class Edit(NamedTuple):
+    offset: int
+    length: int
+    replacement: str
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"offset": self.offset, "length": self.length, "replacement": self.replacement}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "Edit":
+        return cls(int(data["offset"]), int(data["length"]), str(data["replacement"]))
+
+
+class LineIndex:
+    """Offset <-> line lookups in O(log lines) after one pass over the text."""
+
+    def __init__(self, text: str):
+        self.length = len(text)
+        starts = [0]
+        position = text.find("\n")
+        while position != -1:
+            starts.append(position + 1)
+            position = text.find("\n", position + 1)
+        if starts[-1] == self.length and self.length:
+            starts.pop()  # no line after the final newline
+        self.starts = starts
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def line_of(self, offset: int) -> int:
+        """0-based line containing `offset`."""
+        return max(0, bisect.bisect_right(self.starts, offset) - 1)
+
+    def start(self, line: int) -> int:
+        return self.starts[line] if line < len(self.starts) else self.length
+
+    def end(self, line: int) -> int:
+        """Offset after the line, including its newline."""
+        return self.start(line + 1)
+
+
+def text_sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def normalize(edits: Iterable[Edit], source_length: int) -> List[Edit]:
+    """`edits` in source order; ValueError if any is out of range or they overlap."""
+    ordered = sorted(edits, key=lambda e: (e.offset, e.length))
+    previous_end = 0
+    for edit in ordered:
+        if edit.offset < previous_end or edit.length < 0 or edit.end > source_length:
+            raise ValueError(f"Edit at offset {edit.offset} overlaps another edit or leaves the source")
+        previous_end = edit.end
+    return ordered
+
+
+def apply_edits(source: str, edits: Iterable[Edit]) -> str:
+    parts, position = [], 0
+    for edit in normalize(edits, len(source)):
+        parts.append(source[position:edit.offset])
+        parts.append(edit.replacement)
+        position = edit.end
+    parts.append(source[position:])
+    return "".join(parts)
+
+
+def _diff_lines(prefix: str, text: str) -> List[str]:
+    lines = []
+    for line in text.splitlines(keepends=True):
+        if line.endswith("\n"):
+            lines.append(prefix + line)
+        else:
+            lines.append(prefix + line + "\n\\ No newline at end of file\n")
+    return lines
+
+
+def _range(start: int, count: int) -> str:
+    # Unified diff line ranges are 1-based; an empty range names the line before it
+    if count == 1:
+        return str(start + 1)
+    return f"{start + 1 if count else start},{count}"
+
+
+def unified_diff(source: str, edits: Iterable[Edit], path: str = "source", context: int = 3,
+                 lines: Optional[LineIndex] = None) -> str:
+    """Unified diff of applying `edits` to `source`, built from the edited
+    lines only (the unchanged parts of the file are never compared)."""
+    edits = normalize(edits, len(source))
+    if not edits:
+        return ""
+    lines = lines or LineIndex(source)
+
+    def new_text(first: int, last: int, run_edits: List[Edit]) -> str:
+        base = lines.start(first)
+        return apply_edits(source[base:lines.end(last)],
+                           [Edit(e.offset - base, e.length, e.replacement) for e in run_edits])
+
+    # Runs of edits touching the same old lines: [first, last] line, edits
+    runs: List[Tuple[int, int, List[Edit]]] = []
+    for edit in edits:
+        first = lines.line_of(edit.offset)
+        last = lines.line_of(max(edit.offset, edit.end - 1))
+        if runs and first <= runs[-1][1]:
+            runs[-1][2].append(edit)
+            runs[-1] = (runs[-1][0], max(last, runs[-1][1]), runs[-1][2])
+        else:
+            runs.append((first, last, [edit]))
+        first, last, run_edits = runs[-1]
+        if edit.end == lines.end(last) < len(source) and not edit.replacement.endswith("\n") \
+                and (edit.replacement or new_text(first, last, run_edits)):
+            # A line break was replaced: the next line joins this run's last line
+            runs[-1] = (first, last + 1, run_edits)
+
+    # Runs whose context overlaps share a hunk
+    hunks: List[List[Tuple[int, int, List[Edit]]]] = []
+    for run in runs:
+        if hunks and run[0] - hunks[-1][-1][1] - 1 <= 2 * context:
+            hunks[-1].append(run)
+        else:
+            hunks.append([run])
+
+    output = [f"--- a/{path}\n", f"+++ b/{path}\n"]
+    line_delta = 0
+    for hunk in hunks:
+        start = max(0, hunk[0][0] - context)
+        stop = min(len(lines) - 1, hunk[-1][1] + context)
+        body, old_count, new_count, cursor = [], 0, 0, start
+        for first, last, run_edits in hunk:
+            unchanged = source[lines.start(cursor):lines.start(first)]
+            body += _diff_lines(" ", unchanged)
+            old_count += first - cursor
+            new_count += first - cursor
+            old_text = source[lines.start(first):lines.end(last)]
+            old_lines = _diff_lines("-", old_text)
+            new_lines = _diff_lines("+", new_text(first, last, run_edits))
+            body += old_lines + new_lines
+            old_count += len(old_lines)
+            new_count += len(new_lines)
+            cursor = last + 1
+        trailing = source[lines.start(cursor):lines.end(stop)] if cursor <= stop else ""
+        body += _diff_lines(" ", trailing)
+        old_count += max(0, stop + 1 - cursor)
+        new_count += max(0, stop + 1 - cursor)
+        new_start = start + line_delta
+        output.append(f"@@ -{_range(start, old_count)} +{_range(new_start, new_count)} @@\n")
+        output += body
+        line_delta += new_count - old_count
+    return "".join(output)
+
+
+def make_patch(source: str, edits: Sequence[Edit], path: str = "source", context: int = 3) -> Dict[str, Any]:
+    """The patch envelope of `edits` (see the module docstring)."""
+    edits = normalize(edits, len(source))
+    lines = LineIndex(source)
+    return {
+        "path": path,
+        "source_sha256": text_sha256(source),
+        "source_length": len(source),
+        "edits": [dict(edit.to_json(), line=lines.line_of(edit.offset) + 1) for edit in edits],
+        "diff": unified_diff(source, edits, path, context, lines),
+    }
+
+
+def patch_edits(patch: Dict[str, Any]) -> List[Edit]:
+    return [Edit.from_json(edit) for edit in patch.get("edits", [])]
+
+
+def apply_patch(source: str, patch: Dict[str, Any]) -> str:
+    """`source` with the patch's edits applied; ValueError if it is not the patched source."""
+    expected = patch.get("source_sha256")
+    if expected and text_sha256(source) != expected:
+        raise ValueError(f"{patch.get('path', 'source')} has changed since the patch was made")
+    return apply_edits(source, patch_edits(patch))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Apply a migration patch (edit list) to a file.")
+    parser.add_argument("file", help="The original source file")
+    parser.add_argument("patch", help="Patch JSON (with an 'edits' list), or - for stdin")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--in-place", action="store_true", help="Rewrite FILE")
+    target.add_argument("-o", "--output", help="Write the result here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    with open(args.file, "r", encoding="utf-8", newline="") as f:
+        source = f.read()
+    if args.patch == "-":
+        patch = json.load(sys.stdin)
+    else:
+        with open(args.patch, "r", encoding="utf-8") as f:
+            patch = json.load(f)
+    try:
+        result = apply_patch(source, patch)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    output = args.file if args.in_place else args.output
+    if output:
+        with atomic_write(output) as f:
+            f.write(result)
+    else:
+        sys.stdout.write(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Startup profiling for the MCP servers (--startup-profile).
+
+IDE clients spawn a server per workspace, so the time until the first tool
+response is user-visible. Running a server with --startup-profile
+
+    python mcp_server.py --startup-profile
+
+re-runs it under `python -X importtime` with an internal flag. That child
+imports and registers everything as usual, warms the catalog, answers one
+tool call through FastMCP and exits instead of serving stdio. The parent
+prints when each phase finished (from process spawn) and the import time per
+top-level package:
+
+    ready            412.3 ms  (interpreter, imports, tool registration)
+    catalog warm-up    3.1 ms
+    first tool         6.8 ms  (list_components)
+    time to first tool response 422.2 ms
+    imports 371.9 ms: mcp 298.0, pydantic 41.2, ...
+"""
+
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+STARTUP_PROFILE_FLAG = "--startup-profile"
+_CHILD_FLAG = "--startup-profile-child"
+_MARKER = "STARTUP_PROFILE "
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """Self import time in ms per top-level package, from -X importtime output."""
+    packages: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        package = fields[2].strip().split(".", 1)[0]
+        packages[package] = packages.get(package, 0.0) + int(fields[0]) / 1000
+    return packages
+
+
+def profile_startup(script: str, timeout: float = 120) -> Dict[str, Any]:
+    """Spawn `script` in profiling mode and time its startup phases."""
+    spawned = time.time()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", script, _CHILD_FLAG],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    markers = [line for line in process.stdout.splitlines() if line.startswith(_MARKER)]
+    if process.returncode != 0 or not markers:
+        raise RuntimeError(
+            f"{script} exited with {process.returncode} before reporting startup: "
+            f"{process.stderr.strip().splitlines()[-1:] or ''}"
+        )
+    phases = json.loads(markers[-1][len(_MARKER):])
+    packages = parse_importtime(process.stderr)
+
+    def since_spawn(timestamp: float) -> float:
+        return round((timestamp - spawned) * 1000, 1)
+
+    return {
+        "ready_ms": since_spawn(phases["ready"]),
+        "catalog_ms": round((phases["catalog"] - phases["ready"]) * 1000, 1),
+        "first_tool_ms": round((phases["first_tool"] - phases["catalog"]) * 1000, 1),
+        "time_to_first_tool_ms": since_spawn(phases["first_tool"]),
+        "tool": phases["tool"],
+        "tool_error": phases["tool_error"],
+        "imports_ms": round(sum(packages.values()), 1),
+        "imports": {
+            name: round(ms, 1)
+            for name, ms in sorted(packages.items(), key=lambda item: -item[1])
+        },
+    }
+
+
+def format_profile(profile: Dict[str, Any], top: int = 12) -> str:
+    packages = ", ".join(f"{name} {ms:.1f}" for name, ms in list(profile["imports"].items())[:top])
+    return "\n".join([
+        f"ready           {profile['ready_ms']:8.1f} ms  (interpreter, imports, tool registration)",
+        f"catalog warm-up {profile['catalog_ms']:8.1f} ms",
+        f"first tool      {profile['first_tool_ms']:8.1f} ms  ({profile['tool']}"
+        f"{', error' if profile['tool_error'] else ''})",
+        f"time to first tool response {profile['time_to_first_tool_ms']:.1f} ms",
+        f"imports {profile['imports_ms']:.1f} ms: {packages}",
+    ])
+
+
+def _run_child(server: Any, tool: str, arguments: Dict[str, Any],
+               warm_up: Optional[Callable[[], Any]]) -> None:
+    phases: Dict[str, Any] = {"ready": time.time(), "tool": tool}
+    if warm_up is not None:
+        warm_up()
+    phases["catalog"] = time.time()
+    try:
+        asyncio.run(server.call_tool(tool, arguments))
+        phases["tool_error"] = None
+    except Exception as e:
+        phases["tool_error"] = f"{type(e).__name__}: {e}"
+    phases["first_tool"] = time.time()
+    print(_MARKER + json.dumps(phases), flush=True)
+
+
+def handle_startup_profile(script: str, server: Any, tool: str, arguments: Dict[str, Any],
+                           warm_up: Optional[Callable[[], Any]] = None,
+                           argv: Optional[List[str]] = None) -> None:
+    """Call first in a server's __main__ block. With --startup-profile, print
+    the startup profile of `script` and exit; in the profiling child, time
+    `warm_up` and one call of `tool`, report and exit; otherwise return."""
+    argv = sys.argv[1:] if argv is None else argv
+    if _CHILD_FLAG in argv:
+        _run_child(server, tool, arguments, warm_up)
+        sys.exit(0)
+    if STARTUP_PROFILE_FLAG in argv:
+        print(format_profile(profile_startup(script)))
+        sys.exit(0)
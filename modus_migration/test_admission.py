@@ -0,0 +1,99 @@
+import asyncio
+import json
+import threading
+import unittest
+
+from mcp.server.fastmcp import FastMCP
+
+from modus_migration.admission import BULK, MEMORY_FACTOR, AdmissionControl, admission_of
+
+
+def _text(result):
+    return result[0][0].text
+
+
+class TestAdmission(unittest.TestCase):
+    def setUp(self):
+        self.server = FastMCP("Test Server")
+        self.admission = AdmissionControl(self.server, {"dump": BULK})
+        self.release = threading.Event()
+        self.order = []
+
+        @self.server.tool()
+        def dump(label: str) -> str:
+            self.release.wait(5)
+            self.order.append(label)
+            return json.dumps({"label": label, "data": "x" * 100_000})
+
+        @self.server.tool()
+        def lookup() -> str:
+            self.order.append("lookup")
+            return "{}"
+
+    def call(self, tool, **arguments):
+        return asyncio.ensure_future(self.server.call_tool(tool, arguments))
+
+    def test_light_calls_bypass_queued_bulk_calls(self):
+        async def run():
+            dumps = [self.call("dump", label=str(i)) for i in range(3)]
+            await asyncio.sleep(0.05)
+            self.assertEqual(self.admission.snapshot()["classes"]["bulk"]["waiting"], 2)
+            await self.call("lookup")
+            self.release.set()
+            return await asyncio.gather(*dumps)
+
+        results = asyncio.run(run())
+        self.assertEqual(self.order, ["lookup", "0", "1", "2"])
+        self.assertEqual([json.loads(_text(r))["label"] for r in results], ["0", "1", "2"])
+        self.assertEqual(self.admission.reserved, 0)
+        self.assertGreater(self.admission.estimate("dump"), 100_000 * MEMORY_FACTOR)
+
+    def test_rejects_with_retry_hint(self):
+        self.admission.configure(queue_limit=1, queue_timeout=0.05)
+
+        async def run():
+            calls = [self.call("dump", label=str(i)) for i in range(3)]
+            results = await asyncio.gather(*calls[1:])
+            self.release.set()
+            await calls[0]
+            return results
+
+        timed_out, full = [json.loads(_text(r)) for r in asyncio.run(run())]
+        self.assertIn("was not admitted within 0.05 s", timed_out["error"])
+        self.assertIn("queue is full", full["error"])
+        self.assertGreaterEqual(full["retry_after_s"], 1.0)
+        self.assertEqual(self.admission.snapshot()["classes"]["bulk"]["rejected"], 2)
+
+    def test_memory_budget_serializes_calls(self):
+        self.admission.configure(bulk_concurrency=2, memory_budget_mb=0.5)
+
+        async def run():
+            first, second = self.call("dump", label="a"), self.call("dump", label="b")
+            await asyncio.sleep(0.05)
+            # Neither 16 MiB default estimate fits, but a lone call always runs
+            self.assertEqual(self.admission.classes[BULK].running, 1)
+            self.release.set()
+            await asyncio.gather(first, second)
+
+        asyncio.run(run())
+        self.assertEqual(self.order, ["a", "b"])
+
+    def test_cancelled_waiter_leaves_the_queue(self):
+        async def run():
+            first = self.call("dump", label="a")
+            cancelled = self.call("dump", label="b")
+            await asyncio.sleep(0.05)
+            cancelled.cancel()
+            await asyncio.sleep(0)
+            self.release.set()
+            await first
+            await self.call("dump", label="c")
+
+        asyncio.run(run())
+        self.assertEqual(self.order, ["a", "c"])
+        self.assertIs(admission_of(self.server), self.admission)
+        self.assertEqual(self.admission.snapshot()["classes"]["bulk"]["waiting"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,258 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from modus_migration.blob_store import is_blob_ref
+from modus_migration import catalog_build
+from modus_migration.catalog_build import (
+    BUILD_FORMAT,
+    DOC_INDEX_FILE,
+    compile_catalog,
+    ensure_compiled,
+    is_build_current,
+    read_manifest,
+)
+from modus_migration.catalog_snapshot import SNAPSHOT_FILE, CatalogSnapshot
+from modus_migration.catalog_io import write_json_atomic
+from modus_migration.catalog_model import LazyText, Prop, item_field, text
+from modus_migration.catalog_store import CatalogStore
+from modus_migration.example_corpus import canonicalize
+from modus_migration.prop_alignment import align_component, attribute_changes
+from modus_migration.similarity import SimilarityModel
+
+SHARED_DOCS = "Shared storybook usage notes. " * 40
+
+
+class TestCatalogBuild(unittest.TestCase):
+    def setUp(self):
+        self.analysis_dir = tempfile.mkdtemp()
+        self.v2 = {
+            "modus-wc-button.tsx": {
+                "props": [
+                    {"name": "color", "description": "Button color", "type": "'primary' | 'secondary'"},
+                    {"name": "disabled", "description": "Disabled", "type": "boolean"},
+                ],
+                "events": [{"name": "buttonClick", "description": "Clicked"}],
+                "documentation": SHARED_DOCS,
+                "storybook": {"examples": [SHARED_DOCS], "variants": [], "prop_usage": []},
+            },
+            "modus-wc-alert.tsx": {
+                "props": [{"name": "disabled", "description": "Disabled", "type": "boolean"}],
+                "slots": ["header"],
+                "documentation": SHARED_DOCS,
+            },
+        }
+        write_json_atomic(os.path.join(self.analysis_dir, "v2_components.json"), self.v2)
+        write_json_atomic(
+            os.path.join(self.analysis_dir, "component_mapping.json"), {"Mapping_v1_v2": {}}
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.analysis_dir, ignore_errors=True)
+
+    def test_compiled_catalog_resolves_to_source(self):
+        build_dir = compile_catalog(self.analysis_dir, verbose=False)
+        with open(os.path.join(build_dir, "v2_components.json")) as f:
+            compiled = json.load(f)
+        self.assertTrue(is_blob_ref(compiled["modus-wc-button.tsx"]["documentation"]))
+        # The three copies of the shared text are stored once
+        blobs = [n for _, _, names in os.walk(os.path.join(build_dir, "blobs")) for n in names]
+        self.assertEqual(len(blobs), 1)
+
+        store = CatalogStore(self.analysis_dir)
+        self.assertEqual(store.resolve(store.components("2.0")), self.v2)
+        self.assertEqual(store.mapping(), {"Mapping_v1_v2": {}})
+
+    def test_catalog_model_reads_text_lazily(self):
+        store = CatalogStore(self.analysis_dir)
+        model = store.model("2.0")
+        button = model["modus-wc-button.tsx"]
+        self.assertIsInstance(button.documentation, LazyText)
+        self.assertEqual(text(button.documentation), SHARED_DOCS)
+        self.assertIsInstance(button.props[0], Prop)
+        self.assertEqual(button.names("props"), ["color", "disabled"])
+        self.assertIs(button.props[1].name, model["modus-wc-alert.tsx"].props[0].name)
+        self.assertEqual(button.section_text("storybook.examples[0]"), SHARED_DOCS)
+        self.assertEqual(model.loaded(), 2)
+        self.assertEqual(model.to_dict(), self.v2)
+        self.assertIs(store.model("v2"), model)
+
+    def test_items_with_extra_keys_stay_dicts(self):
+        self.v2["modus-wc-button.tsx"]["props"].append({"name": "size", "description": "Size", "default": "md"})
+        self.v2["modus-wc-button.tsx"]["events"] = ["legacyClick"]
+        write_json_atomic(os.path.join(self.analysis_dir, "v2_components.json"), self.v2)
+        button = CatalogStore(self.analysis_dir).model("2.0")["modus-wc-button.tsx"]
+        self.assertIsInstance(button.props[-1], dict)
+        self.assertEqual([item_field(p, "name") for p in button.props], ["color", "disabled", "size"])
+        self.assertEqual(text(item_field(button.props[-1], "description")), "Size")
+        self.assertIsNone(item_field(button.events[0], "name"))
+
+    def test_rebuilds_when_source_changes(self):
+        compile_catalog(self.analysis_dir, verbose=False)
+        self.assertTrue(is_build_current(self.analysis_dir))
+        store = CatalogStore(self.analysis_dir)
+        store.components("2.0")
+
+        self.v2["modus-wc-alert.tsx"]["documentation"] = "Alert docs " * 50
+        write_json_atomic(os.path.join(self.analysis_dir, "v2_components.json"), self.v2)
+        self.assertFalse(is_build_current(self.analysis_dir))
+        self.assertEqual(store.resolve(store.components("2.0")), self.v2)
+        self.assertTrue(is_build_current(self.analysis_dir))
+
+    def test_concurrent_callers_compile_once(self):
+        start = threading.Barrier(4)
+
+        def ensure():
+            start.wait()
+            ensure_compiled(self.analysis_dir)
+
+        with mock.patch.object(catalog_build, "_compile", wraps=catalog_build._compile) as compile_:
+            threads = [threading.Thread(target=ensure) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(compile_.call_count, 1)
+        self.assertTrue(is_build_current(self.analysis_dir))
+
+    def test_attribute_index_queries(self):
+        compile_catalog(self.analysis_dir, verbose=False)
+        index = CatalogStore(self.analysis_dir).attribute_index("2.0")
+        self.assertEqual(
+            sorted(index.query(prop=["disabled"])), ["modus-wc-alert.tsx", "modus-wc-button.tsx"]
+        )
+        self.assertEqual(index.query(prop=["Disabled"], event=["button-click"]), ["modus-wc-button.tsx"])
+        self.assertEqual(index.query(slot=["header"], type=["primary"]), [])
+        self.assertEqual(index.query(type=["secondary"]), ["modus-wc-button.tsx"])
+        self.assertEqual(index.similar_terms("event", "click"), ["buttonClick"])
+
+    def test_doc_search_returns_passage_offsets(self):
+        self.v2["modus-wc-alert.tsx"]["documentation"] = (
+            "Alerts show status messages.\n\n" + "Use the dismissible prop to add a close button. " * 3
+        )
+        write_json_atomic(os.path.join(self.analysis_dir, "v2_components.json"), self.v2)
+        compile_catalog(self.analysis_dir, verbose=False)
+        index = CatalogStore(self.analysis_dir).doc_index("2.0")
+
+        (score, (component, section, start, end, _)), *_ = index.search("dismissible close")
+        self.assertEqual((component, section), ("modus-wc-alert.tsx", "documentation"))
+        self.assertIn("dismissible", self.v2[component][section][start:end])
+        self.assertEqual(index.search("dismissible", component="modus-wc-button.tsx"), [])
+
+    def test_snapshot_matches_build(self):
+        build_dir = compile_catalog(self.analysis_dir, verbose=False)
+        path = os.path.join(build_dir, SNAPSHOT_FILE)
+        sources = read_manifest(build_dir)["sources"]
+        doc_index = os.path.join(build_dir, DOC_INDEX_FILE)
+        signature = {"size": os.path.getsize(doc_index), "mtime_ns": os.stat(doc_index).st_mtime_ns}
+
+        snapshot = CatalogSnapshot.open(path, BUILD_FORMAT, sources)
+        self.assertEqual(
+            snapshot.get(DOC_INDEX_FILE, signature)["v2"].search("disabled"),
+            CatalogStore(self.analysis_dir).doc_index("2.0").search("disabled"),
+        )
+        with self.assertRaises(KeyError):
+            CatalogSnapshot.open(path, BUILD_FORMAT, sources).get(DOC_INDEX_FILE, dict(signature, size=1))
+        changed = dict(sources, **{"v2_components.json": dict(sources["v2_components.json"], sha256="0")})
+        self.assertIsNone(CatalogSnapshot.open(path, BUILD_FORMAT, changed))
+        self.assertIsNone(CatalogSnapshot.open(path, BUILD_FORMAT - 1, sources))
+
+    def test_example_corpus_dedupes_and_finds_smallest(self):
+        self.assertEqual(
+            canonicalize('<modus-wc-button\n    size="sm"  ?disabled=${x}\n  >\n  OK\n</modus-wc-button>'),
+            '<modus-wc-button ?disabled=${x} size="sm"> OK </modus-wc-button>',
+        )
+        self.v2["modus-wc-button.tsx"]["storybook"]["examples"] = [
+            '<modus-wc-button color="primary" disabled>Save changes now</modus-wc-button>',
+            '<modus-wc-button\n  disabled\n  color="primary"\n>Save changes now</modus-wc-button>',
+            '<modus-wc-button color="secondary">Go</modus-wc-button>',
+            '<modus-wc-button custom-class="wide" ?full-width=${true}>Wide</modus-wc-button>',
+        ]
+        self.v2["modus-wc-alert.tsx"]["storybook"] = {
+            "examples": ['<modus-wc-button color="secondary">Go</modus-wc-button>']
+        }
+        write_json_atomic(os.path.join(self.analysis_dir, "v2_components.json"), self.v2)
+        compile_catalog(self.analysis_dir, verbose=False)
+        corpus = CatalogStore(self.analysis_dir).example_corpus("2.0")
+
+        self.assertEqual(corpus.total_examples, 5)
+        self.assertEqual(len(corpus.examples), 3)
+        self.assertEqual(len(corpus.components["modus-wc-button.tsx"]), 3)
+        # Stored as first written; the reordered copy only shares its hash
+        self.assertIn(
+            '<modus-wc-button color="primary" disabled>Save changes now</modus-wc-button>',
+            corpus.examples.values(),
+        )
+        wide = '<modus-wc-button custom-class="wide" ?full-width=${true}>Wide</modus-wc-button>'
+        self.assertIn(wide, [e["code"] for e in corpus.ranked("modus-wc-button.tsx")])
+        # The alert example doesn't use the alert tag
+        self.assertEqual(corpus.components["modus-wc-alert.tsx"][0][1], frozenset())
+        self.assertEqual(
+            corpus.smallest_covering("modus-wc-button.tsx", ["color"])["code"],
+            '<modus-wc-button color="secondary">Go</modus-wc-button>',
+        )
+        best = corpus.smallest_covering("modus-wc-button.tsx", ["Disabled", "color", "size"])
+        self.assertEqual(best["attributes"], ["color", "disabled"])
+        self.assertEqual(best["missing"], ["size"])
+        # Matched by normalized name, returned as written
+        wide = corpus.smallest_covering("modus-wc-button.tsx", ["customClass", "fullWidth"])
+        self.assertEqual(wide["attributes"], ["?full-width", "custom-class"])
+        self.assertEqual(wide["missing"], [])
+        self.assertIn(["?full-width", "custom-class"], [e["attributes"] for e in corpus.ranked("modus-wc-button.tsx")])
+
+    def test_similarity_ranks_closest_v2_component(self):
+        v1 = {
+            "modus-dropdown": {
+                "props": [{"name": "toggleElementId"}, {"name": "disabled"}],
+                "documentation": "A dropdown menu opened by a toggle button.",
+            }
+        }
+        v2 = {
+            "modus-wc-dropdown-menu": {
+                "props": [{"name": "menuVisible"}, {"name": "disabled"}],
+                "documentation": "Dropdown menu anchored to a button.",
+            },
+            "modus-wc-badge": {"props": [{"name": "color"}], "documentation": "A badge."},
+        }
+        model = SimilarityModel.fit(v1.items(), v2.items())
+        self.assertEqual(model.candidates("modus-dropdown", 1)[0][0], "modus-wc-dropdown-menu")
+        report = model.unmapped_report({"modus-dropdown": "Not Found"}, top_k=2)
+        self.assertEqual(
+            [c["v2_component"] for c in report["modus-dropdown"]],
+            ["modus-wc-dropdown-menu", "modus-wc-badge"],
+        )
+        round_tripped = SimilarityModel.from_json(json.loads(json.dumps(model.to_json())))
+        self.assertEqual(round_tripped.candidates("modus-dropdown", 2)[0][0], "modus-wc-dropdown-menu")
+
+    def test_prop_alignment_scores_and_manual_overrides(self):
+        v1 = {
+            "props": [
+                {"name": "type", "type": "'error' | 'info' | 'success' | 'warning' | 'info-gray'"},
+                {"name": "dismissible", "type": "boolean"},
+                {"name": "message", "type": "string"},
+            ]
+        }
+        v2 = {
+            "props": [
+                {"name": "variant", "type": ": 'error' | 'info' | 'success' | 'warning'"},
+                {"name": "dismissible", "type": ": boolean"},
+                {"name": "alertDescription", "type": ": string"},
+                {"name": "delay", "type": ": number"},
+            ]
+        }
+        alignment = align_component(v1, v2, {"message": "alert-description"})
+        props = alignment["props"]
+        self.assertEqual((props["dismissible"]["target"], props["dismissible"]["source"]), ("dismissible", "exact"))
+        self.assertEqual(props["type"]["target"], "variant")
+        self.assertGreaterEqual(props["type"]["confidence"], 0.55)
+        self.assertEqual((props["message"]["target"], props["message"]["confidence"]), ("alertDescription", 1.0))
+        self.assertEqual(alignment["unmatched_v2_props"], ["delay"])
+        self.assertEqual(attribute_changes(alignment), {"type": "variant", "message": "alertDescription"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from modus_migration.catalog_io import (
+    atomic_write,
+    iter_catalog_items,
+    write_catalog_stream,
+    write_json_atomic,
+)
+from modus_migration.lazy_catalog import LazyCatalog, file_signature, scan_offsets
+
+
+class TestCatalogIO(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.catalog_path = os.path.join(self.test_dir, "v2_components.json")
+        self.catalog = {
+            "modus-wc-button": {
+                "props": [{"name": "color", "type": "string"}],
+                "slots": [],
+                "default_values": {},
+            },
+            "modus-wc-alert": {"props": [], "events": [{"name": "dismissClick"}]},
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_stream_matches_json_dump(self):
+        count = write_catalog_stream(self.catalog_path, iter(self.catalog.items()))
+        self.assertEqual(count, 2)
+        with open(self.catalog_path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), json.dumps(self.catalog, indent=2))
+
+        write_catalog_stream(self.catalog_path, iter([]))
+        with open(self.catalog_path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), json.dumps({}, indent=2))
+
+    def test_iter_catalog_items_round_trips(self):
+        write_json_atomic(self.catalog_path, self.catalog)
+        self.assertEqual(dict(iter_catalog_items(self.catalog_path)), self.catalog)
+
+    def test_lazy_catalog_decodes_single_components(self):
+        self.catalog["modus-wc-alert"]["documentation"] = 'Schlie\u00dfen, "{x}" ]'
+        offsets = {}
+        write_catalog_stream(self.catalog_path, iter(self.catalog.items()), offsets=offsets)
+        with open(self.catalog_path, "rb") as f:
+            data = f.read()
+        self.assertEqual(scan_offsets(data), {k: tuple(v) for k, v in offsets.items()})
+
+        sidecar = dict(file_signature(self.catalog_path), offsets=offsets)
+        for catalog in (LazyCatalog(self.catalog_path, sidecar), LazyCatalog(self.catalog_path)):
+            self.assertEqual(list(catalog), list(self.catalog))
+            self.assertEqual(catalog["modus-wc-alert"], self.catalog["modus-wc-alert"])
+            self.assertNotIn("modus-wc-card", catalog)
+
+        # Compact (non-indented) JSON goes through the generic scan
+        compact = json.dumps(self.catalog, separators=(",", ":")).encode()
+        for key, (start, end) in scan_offsets(compact).items():
+            self.assertEqual(json.loads(compact[start:end]), self.catalog[key])
+
+    def test_failed_write_keeps_previous_catalog(self):
+        write_json_atomic(self.catalog_path, self.catalog)
+
+        def failing_items():
+            yield "modus-wc-badge", {"props": []}
+            raise RuntimeError("extractor crashed")
+
+        with self.assertRaises(RuntimeError):
+            write_catalog_stream(self.catalog_path, failing_items())
+
+        with open(self.catalog_path, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), self.catalog)
+        # No temp files are left behind
+        self.assertEqual(os.listdir(self.test_dir), ["v2_components.json"])
+
+    def test_atomic_write_preserves_permissions(self):
+        with open(self.catalog_path, "w") as f:
+            f.write("{}")
+        os.chmod(self.catalog_path, 0o640)
+        with atomic_write(self.catalog_path) as f:
+            f.write("{}")
+        self.assertEqual(os.stat(self.catalog_path).st_mode & 0o777, 0o640)
+
+
+if __name__ == "__main__":
+    unittest.main()
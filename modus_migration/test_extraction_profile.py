@@ -0,0 +1,59 @@
+import time
+import unittest
+
+from modus_migration import extraction_profile as profiling
+
+
+class TestExtractionProfile(unittest.TestCase):
+    def tearDown(self):
+        profiling.disable()
+
+    def test_nested_phase_self_time(self):
+        profiler = profiling.enable()
+        with profiling.phase("write"):
+            with profiling.phase("parse"):
+                time.sleep(0.05)
+        write, parse = profiler.phases["write"], profiler.phases["parse"]
+        self.assertGreaterEqual(write["wall_s"], 0.05)
+        # The parsing done inside "write" is not counted as its own time
+        self.assertLess(write["self_wall_s"], 0.02)
+        self.assertAlmostEqual(write["self_wall_s"] + parse["wall_s"], write["wall_s"], places=6)
+        self.assertEqual(list(profiler.report()["phases"]), ["parse", "write"])
+
+    def test_phases_and_reads_are_attributed_to_components(self):
+        profiler = profiling.enable()
+        with profiling.component("modus-wc-button"):
+            profiling.record_read("button.tsx", "abc")
+            with profiling.phase("parse"):
+                profiling.findall("prop", r"@Prop\(\)", "@Prop() a; @Prop() b;")
+        with profiling.component("modus-wc-badge"):
+            profiling.record_read("badge.tsx", b"ab")
+        profiling.record_read("README.md", "outside")
+
+        button = profiler.components["modus-wc-button"]
+        self.assertEqual(button["bytes_read"], 3)
+        self.assertEqual(list(button["phases"]), ["parse"])
+        self.assertEqual(profiler.components["modus-wc-badge"]["phases"], {})
+        self.assertEqual(profiler.files, {"button.tsx": 3, "badge.tsx": 2, "README.md": 7})
+        self.assertEqual(profiler.regexes["prop"]["matches"], 2)
+        self.assertEqual(profiler.phases["component"]["calls"], 2)
+        self.assertEqual(len(profiler.slowest_components(1)), 1)
+
+    def test_disabled_hooks_are_no_ops(self):
+        self.assertIsNone(profiling.active())
+        with profiling.component("modus-wc-button"):
+            with profiling.phase("parse"):
+                profiling.record_read("button.tsx", "abc")
+                self.assertEqual(profiling.findall("prop", r"\d", "a1b2"), ["1", "2"])
+                self.assertIsNotNone(profiling.search("prop", r"\d", "a1"))
+
+        @profiling.timed("discovery")
+        def discover():
+            return ["modus-wc-button"]
+
+        self.assertEqual(discover(), ["modus-wc-button"])
+        self.assertIsNone(profiling.active())
+
+
+if __name__ == "__main__":
+    unittest.main()
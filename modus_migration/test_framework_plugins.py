@@ -0,0 +1,65 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from modus_migration.catalog_store import CatalogStore
+from modus_migration.framework_plugins import FrameworkRegistry, SourceFramework
+
+
+class TestFrameworkRegistry(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        analysis_dir = os.path.join(self.root, "component_analysis")
+        os.makedirs(analysis_dir)
+        with open(os.path.join(analysis_dir, "v2_components.json"), "w", encoding="utf-8") as f:
+            json.dump({"modus-wc-button": {"props": [{"name": "color"}], "events": [], "slots": []}}, f)
+
+        os.makedirs(os.path.join(self.root, "vue_migration", "md_prompts"))
+        self.mapping_path = os.path.join(self.root, "vue_migration", "mapping.json")
+        self._write_mapping({"VBtn": "modus-wc-button", "VParallax": None})
+        with open(os.path.join(self.root, "vue_migration", "md_prompts", "migrate_vue.md"), "w") as f:
+            f.write("# Migrate Vue")
+
+        self.registry = FrameworkRegistry(
+            self.root,
+            CatalogStore(analysis_dir),
+            frameworks=[SourceFramework("vue", "Vue", "vue_migration/mapping.json", "vue_migration/md_prompts")],
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _write_mapping(self, to_modus):
+        with open(self.mapping_path, "w", encoding="utf-8") as f:
+            json.dump({"vue_to_modus": to_modus, "modus_to_vue": {"modus-wc-button": "VBtn"}}, f)
+
+    def test_packs_load_lazily(self):
+        self.assertEqual(self.registry.describe(), [{"name": "vue", "label": "Vue", "loaded": False}])
+        self.assertEqual(self.registry.pack("Vue").guidance("migrate"), "# Migrate Vue")
+        self.assertTrue(self.registry.describe()[0]["loaded"])
+        with self.assertRaises(KeyError):
+            self.registry.pack("angular")
+        with self.assertRaises(KeyError):
+            self.registry.pack("vue").guidance("deploy")
+
+    def test_map_component(self):
+        pack = self.registry.pack("vue")
+        mapped = pack.map_component("vbtn")
+        self.assertEqual(mapped["modus_equivalent"], "modus-wc-button")
+        self.assertEqual(mapped["modus_component"]["props"], ["color"])
+        self.assertEqual(pack.map_component("VParallax")["status"], "no_equivalent")
+        self.assertEqual(pack.map_component("VBtnn")["suggestions"], ["VBtn"])
+        self.assertEqual(pack.map_component("modus-wc-button")["vue_equivalent"], "VBtn")
+
+    def test_mapping_reloads_when_changed(self):
+        pack = self.registry.pack("vue")
+        self.assertEqual(pack.map_component("VCard")["status"], "unknown")
+        self._write_mapping({"VCard": "modus-wc-card"})
+        os.utime(self.mapping_path, ns=(1, 1))
+        self.assertEqual(pack.map_component("VCard")["modus_equivalent"], "modus-wc-card")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from modus_migration.catalog_store import CatalogStore
+from modus_migration.component_extractor import (
+    iter_components_at_ref,
+    iter_worktree_components,
+)
+from modus_migration.git_source import GitObjectReader
+from modus_migration.release_catalog import (
+    build_release_catalog,
+    component_changes,
+    release_catalog_path,
+    release_components,
+)
+
+BUTTON_V1 = """
+@Component({ tag: 'modus-wc-button' })
+export class ModusWcButton {
+  /** The color variant of the button. */
+  @Prop() color?: 'primary' | 'secondary' = 'primary';
+
+  /** Event emitted when the button is clicked. */
+  @Event() buttonClick: EventEmitter<void>;
+}
+"""
+
+BUTTON_STORIES = """
+export const Default = {
+  render: () => html`<modus-wc-button color="primary">Click</modus-wc-button>`,
+};
+"""
+
+
+class TestGitObjectExtraction(unittest.TestCase):
+    def setUp(self):
+        self.repo = tempfile.mkdtemp()
+        self._git("init", "-q")
+        self._git("config", "user.email", "test@example.com")
+        self._git("config", "user.name", "test")
+        self._write("src/components/modus-wc-button/modus-wc-button.tsx", BUTTON_V1)
+        self._write(
+            "src/components/modus-wc-button/modus-wc-button.stories.tsx", BUTTON_STORIES
+        )
+        self._write("src/components/modus-wc-button/modus-wc-button.spec.tsx", "spec")
+        self._write("README.md", "not a component")
+        self._commit("2.0.0")
+        self._write(
+            "src/components/modus-wc-button/modus-wc-button.tsx",
+            BUTTON_V1.replace("'secondary'", "'secondary' | 'tertiary'"),
+        )
+        self._commit("2.1.0")
+
+    def tearDown(self):
+        shutil.rmtree(self.repo, ignore_errors=True)
+
+    def _git(self, *args):
+        subprocess.run(["git", "-C", self.repo, *args], check=True, capture_output=True)
+
+    def _write(self, relative_path, content):
+        path = os.path.join(self.repo, *relative_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def _commit(self, tag):
+        self._git("add", "-A")
+        self._git("commit", "-q", "-m", tag)
+        self._git("tag", tag)
+
+    def test_ref_extraction_matches_worktree(self):
+        with GitObjectReader(self.repo) as reader:
+            from_git = dict(iter_components_at_ref(reader, "2.1.0", "v2"))
+        from_worktree = dict(iter_worktree_components(self.repo, "v2"))
+        self.assertEqual(from_git, from_worktree)
+        self.assertIn("modus-wc-button", from_git)
+
+    def test_reads_older_ref_without_checkout(self):
+        with GitObjectReader(self.repo) as reader:
+            old = dict(iter_components_at_ref(reader, "2.0.0", "v2"))
+        color = old["modus-wc-button"]["props"][0]
+        self.assertNotIn("tertiary", color["type"])
+        self.assertIn(
+            "tertiary",
+            open(
+                os.path.join(
+                    self.repo, "src/components/modus-wc-button/modus-wc-button.tsx"
+                )
+            ).read(),
+        )
+
+    def test_unchanged_blobs_are_parsed_once_across_refs(self):
+        with GitObjectReader(self.repo) as reader:
+            dict(iter_components_at_ref(reader, "2.0.0", "v2"))
+            dict(iter_components_at_ref(reader, "2.1.0", "v2"))
+            # Component file changed between the tags, the stories did not
+            self.assertEqual(reader.cache_misses, 3)
+            self.assertEqual(reader.cache_hits, 1)
+
+    def test_missing_object_returns_none(self):
+        with GitObjectReader(self.repo) as reader:
+            self.assertIsNone(reader.read_blob("2.0.0:does/not/exist.tsx"))
+            self.assertEqual(reader.read_text("2.0.0:README.md"), "not a component")
+
+    def test_release_catalog_dedupes_and_diffs(self):
+        self._write(
+            "src/components/modus-wc-badge/modus-wc-badge.tsx",
+            "@Prop() size?: string;\n",
+        )
+        self._commit("2.2.0")
+
+        catalog = build_release_catalog(
+            self.repo, "v2", ["2.*"], iter_components_at_ref, max_workers=3
+        )
+
+        self.assertEqual(catalog["releases"], ["2.0.0", "2.1.0", "2.2.0"])
+        # button changed once, badge was added once: three distinct entries
+        self.assertEqual(len(catalog["components"]), 3)
+        self.assertEqual(
+            catalog["manifests"]["2.1.0"]["modus-wc-button"],
+            catalog["manifests"]["2.2.0"]["modus-wc-button"],
+        )
+
+        changes = component_changes(catalog, "modus-wc-button")
+        self.assertEqual(list(changes), ["2.1.0"])
+        self.assertEqual(changes["2.1.0"]["props"]["type_changed"][0]["name"], "color")
+        self.assertEqual(
+            catalog["diff_index"]["modus-wc-badge"], {"2.2.0": {"component": "added"}}
+        )
+        self.assertEqual(component_changes(catalog, "modus-wc-button", "2.1.0"), {})
+        for bounds in (("v2.1.0", None), (None, "2.1")):
+            with self.assertRaises(KeyError):
+                component_changes(catalog, "modus-wc-button", *bounds)
+
+        old = release_components(catalog, "2.0.0")
+        self.assertNotIn("modus-wc-badge", old)
+        with self.assertRaises(KeyError):
+            release_components(catalog, "9.9.9")
+
+    def test_store_caches_release_catalog(self):
+        catalog = build_release_catalog(self.repo, "v2", ["2.*"], iter_components_at_ref)
+        analysis_dir = tempfile.mkdtemp()
+        try:
+            path = release_catalog_path(analysis_dir, "v2")
+            os.makedirs(os.path.dirname(path))
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(catalog, f)
+            store = CatalogStore(analysis_dir)
+            first = store.release_catalog("v2")
+            self.assertIs(store.release_catalog("v2"), first)
+            self.assertEqual(store.cache_stats()["releases"], (1, 1))
+            self.assertEqual(first["releases"], ["2.0.0", "2.1.0"])
+            with self.assertRaises(FileNotFoundError):
+                store.release_catalog("v1")
+        finally:
+            shutil.rmtree(analysis_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import gzip
+import unittest
+import zlib
+
+from modus_migration.http_serving import CompressionMiddleware, _accepted_encoding
+
+BODY = b'{"result": "' + b"modus-wc-button " * 200 + b'"}'
+
+
+def _app(chunks, headers=()):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json"), *headers]})
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+
+    return app
+
+
+def _call(app, accept_encoding):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=100)(scope, None, send))
+    return dict(messages[0]["headers"]), b"".join(m.get("body", b"") for m in messages[1:])
+
+
+class TestHttpServing(unittest.TestCase):
+    def test_accepted_encoding(self):
+        self.assertEqual(_accepted_encoding("gzip, deflate, br"), "gzip")
+        self.assertEqual(_accepted_encoding("deflate, gzip;q=0"), "deflate")
+        self.assertEqual(_accepted_encoding("*"), "gzip")
+        self.assertIsNone(_accepted_encoding("identity"))
+        self.assertIsNone(_accepted_encoding(""))
+
+    def test_compresses_complete_responses(self):
+        headers, body = _call(_app([BODY]), "gzip")
+        self.assertEqual(headers[b"content-encoding"], b"gzip")
+        self.assertEqual(int(headers[b"content-length"]), len(body))
+        self.assertEqual(gzip.decompress(body), BODY)
+
+        headers, body = _call(_app([BODY]), "deflate")
+        self.assertEqual(zlib.decompress(body), BODY)
+
+    def test_passes_through_small_streamed_and_encoded_responses(self):
+        for app in (_app([b"{}"]), _app([BODY, BODY]), _app([BODY], [(b"content-encoding", b"br")])):
+            headers, body = _call(app, "gzip")
+            self.assertNotEqual(headers.get(b"content-encoding"), b"gzip")
+            self.assertIn(body, (b"{}", BODY, BODY + BODY))
+        headers, body = _call(_app([BODY]), "identity")
+        self.assertEqual(body, BODY)
+
+
+if __name__ == "__main__":
+    unittest.main()
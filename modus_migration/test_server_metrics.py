@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from mcp.server.fastmcp import FastMCP
+
+from modus_migration.server_metrics import (
+    LATENCY_BUCKETS_MS,
+    SIZE_BUCKETS_BYTES,
+    Histogram,
+    ServerMetrics,
+    is_error_response,
+    metrics_of,
+)
+
+
+class TestServerMetrics(unittest.TestCase):
+    def setUp(self):
+        self.server = FastMCP("Test Server")
+        self.metrics = ServerMetrics(self.server)
+        self.metrics.add_caches("store", lambda: {"json": (3, 1)})
+
+        @self.server.tool()
+        def echo(text: str, fail: bool = False) -> str:
+            """Echo `text`."""
+            if fail:
+                raise ValueError("failed")
+            return json.dumps({"text": text})
+
+        @self.server.tool()
+        def missing(name: str) -> str:
+            return json.dumps({"error": f"'{name}' not found"})
+
+        self.echo = echo
+
+    def call(self, tool, **arguments):
+        try:
+            asyncio.run(self.server.call_tool(tool, arguments))
+        except Exception:
+            pass
+
+    def test_counts_protocol_calls_only(self):
+        self.assertIs(metrics_of(self.server), self.metrics)
+        self.call("echo", text="x" * 2000)
+        self.call("echo", text="y", fail=True)
+        self.call("missing", name="button")
+        self.echo("not counted")
+        tools = self.metrics.snapshot()["tools"]
+
+        self.assertEqual((tools["echo"]["calls"], tools["echo"]["errors"]), (2, 1))
+        self.assertEqual(tools["echo"]["response_bytes"]["max"], 2012)
+        self.assertEqual(tools["echo"]["response_bytes"]["buckets"]["4096"], 2)
+        self.assertEqual((tools["missing"]["calls"], tools["missing"]["errors"]), (1, 1))
+        self.assertEqual(self.metrics.snapshot()["caches"]["store.json"]["hit_rate"], 0.75)
+
+    def test_tool_schema_is_unchanged(self):
+        (echo,) = [t for t in asyncio.run(self.server.list_tools()) if t.name == "echo"]
+        self.assertEqual(sorted(echo.inputSchema["properties"]), ["fail", "text"])
+        self.assertEqual(echo.description, "Echo `text`.")
+
+    def test_error_responses(self):
+        self.assertTrue(is_error_response('{\n  "error": true,\n  "message": "x"}'))
+        self.assertTrue(is_error_response('{"error": "Component not found"}'))
+        self.assertFalse(is_error_response('{"error": false}'))
+        self.assertFalse(is_error_response('{"error": ""}'))
+        self.assertFalse(is_error_response('{"result": {"error": "x"}}'))
+        self.assertFalse(is_error_response(None))
+
+    def test_histogram_quantiles(self):
+        histogram = Histogram((1, 10, 100))
+        for value in (0.5, 2, 4, 6, 50, 500):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(), [("1", 1), ("10", 4), ("100", 5), ("+Inf", 6)])
+        self.assertAlmostEqual(histogram.quantile(0.5), 7.0)
+        self.assertEqual(histogram.quantile(1.0), 500)
+
+    def test_prometheus_file(self):
+        self.call("echo", text="x")
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = os.path.join(directory, "metrics.prom")
+        self.metrics.write_prometheus(path)
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+        labels = f'server="Test Server",pid="{os.getpid()}",tool="echo"'
+        self.assertIn(f"modus_mcp_tool_calls_total{{{labels}}} 1", lines)
+        self.assertIn(f'modus_mcp_tool_latency_seconds_bucket{{{labels},le="+Inf"}} 1', lines)
+        self.assertIn(f'modus_mcp_tool_response_bytes_bucket{{{labels},le="256"}} 1', lines)
+        self.assertIn(f'modus_mcp_cache_hits_total{{server="Test Server",pid="{os.getpid()}",cache="store.json"}} 3',
+                      lines)
+        self.assertIn("# HELP modus_mcp_cache_misses_total Cache lookups that loaded or computed the value.", lines)
+
+    def test_prometheus_values_are_exact(self):
+        self.call("echo", text="x")
+        stats = self.metrics._tools["echo"]
+        stats.latency_ms, stats.response_bytes = Histogram(LATENCY_BUCKETS_MS), Histogram(SIZE_BUCKETS_BYTES)
+        stats.latency_ms.observe(1.5)
+        stats.response_bytes.observe(123456789)
+        lines = self.metrics.prometheus().splitlines()
+
+        labels = f'server="Test Server",pid="{os.getpid()}",tool="echo"'
+        self.assertIn(f'modus_mcp_tool_response_bytes_bucket{{{labels},le="1048576"}} 0', lines)
+        self.assertIn(f'modus_mcp_tool_response_bytes_bucket{{{labels},le="4194304"}} 0', lines)
+        self.assertIn(f"modus_mcp_tool_response_bytes_sum{{{labels}}} 123456789", lines)
+        self.assertIn(f'modus_mcp_tool_latency_seconds_bucket{{{labels},le="0.0025"}} 1', lines)
+        self.assertIn(f'modus_mcp_tool_latency_seconds_bucket{{{labels},le="5"}} 1', lines)
+        self.assertIn(f"modus_mcp_tool_latency_seconds_sum{{{labels}}} 0.0015", lines)
+        self.assertEqual(Histogram(SIZE_BUCKETS_BYTES).cumulative()[-2], ("4194304", 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
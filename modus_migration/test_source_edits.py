@@ -0,0 +1,64 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from modus_migration.source_edits import Edit, apply_edits, apply_patch, main, make_patch, unified_diff
+
+SOURCE = "".join(f"line {i}\n" for i in range(1, 21))
+
+
+class TestSourceEdits(unittest.TestCase):
+    def test_apply_edits(self):
+        edits = [Edit(SOURCE.index("line 3"), 6, "third"), Edit(0, 0, "// header\n")]
+        migrated = apply_edits(SOURCE, edits)
+        self.assertTrue(migrated.startswith("// header\nline 1\nline 2\nthird\nline 4\n"))
+        with self.assertRaises(ValueError):
+            apply_edits(SOURCE, [Edit(0, 5, "a"), Edit(3, 1, "b")])
+        with self.assertRaises(ValueError):
+            apply_edits(SOURCE, [Edit(len(SOURCE), 1, "a")])
+
+    def test_unified_diff(self):
+        edits = [Edit(SOURCE.index("line 2\n"), 7, ""), Edit(SOURCE.index("line 19"), 7, "nineteen")]
+        self.assertEqual(
+            unified_diff(SOURCE, edits, "a.txt", context=1),
+            "--- a/a.txt\n+++ b/a.txt\n"
+            "@@ -1,3 +1,2 @@\n line 1\n-line 2\n line 3\n"
+            "@@ -18,3 +17,3 @@\n line 18\n-line 19\n+nineteen\n line 20\n",
+        )
+
+    def test_replaced_line_break_joins_the_next_line(self):
+        source = "a\nb\nc"
+        diff = unified_diff(source, [Edit(1, 1, " ")], "a.txt", context=0)
+        self.assertEqual(diff, "--- a/a.txt\n+++ b/a.txt\n@@ -1,2 +1 @@\n-a\n-b\n+a b\n")
+        diff = unified_diff(source, [Edit(4, 1, "d")], "a.txt", context=0)
+        self.assertIn("-c\n\\ No newline at end of file\n+d\n\\ No newline", diff)
+
+    def test_patch_round_trip(self):
+        patch = make_patch(SOURCE, [Edit(SOURCE.index("line 10"), 7, "ten")], "a.txt")
+        self.assertEqual(patch["edits"], [{"offset": 63, "length": 7, "replacement": "ten", "line": 10}])
+        self.assertEqual(apply_patch(SOURCE, json.loads(json.dumps(patch))), SOURCE.replace("line 10\n", "ten\n"))
+        with self.assertRaises(ValueError):
+            apply_patch(SOURCE.replace("line 1\n", "line one\n"), patch)
+
+    def test_main_in_place(self):
+        directory = tempfile.mkdtemp()
+        try:
+            source_path = os.path.join(directory, "a.txt")
+            patch_path = os.path.join(directory, "a.patch.json")
+            with open(source_path, "w", encoding="utf-8", newline="") as f:
+                f.write(SOURCE)
+            with open(patch_path, "w", encoding="utf-8") as f:
+                json.dump(make_patch(SOURCE, [Edit(0, 6, "first")]), f)
+            self.assertEqual(main([source_path, patch_path, "--in-place"]), 0)
+            with open(source_path, "r", encoding="utf-8", newline="") as f:
+                self.assertTrue(f.read().startswith("first\nline 2\n"))
+            # The file no longer matches the patch
+            self.assertEqual(main([source_path, patch_path, "--in-place"]), 1)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+
+from modus_migration.startup_profile import parse_importtime
+
+IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       2500 |     mcp.types
+import time:       500 |       3000 |   mcp
+import time:      1250 |       1250 | modus_migration.catalog_store
+INFO:mcp_server:not an import line
+"""
+
+
+class TestStartupProfile(unittest.TestCase):
+    def test_parse_importtime_groups_by_package(self):
+        self.assertEqual(
+            parse_importtime(IMPORTTIME),
+            {"_io": 0.12, "mcp": 2.5, "modus_migration": 1.25},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from modus_migration import tracing
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHILD = """
+from modus_migration import tracing
+tracing.configure()
+with tracing.span("child"):
+    pass
+"""
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "trace.jsonl")
+        tracing.enable(self.path)
+
+    def tearDown(self):
+        tracing.disable()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def events(self):
+        return {event["name"]: event for event in tracing.read_events(self.path)}
+
+    def test_nested_spans_share_a_trace(self):
+        with tracing.span("tool.search_docs", query="table") as root:
+            with tracing.span("load"):
+                pass
+            with self.assertRaises(KeyError), tracing.span("serialize"):
+                raise KeyError("x")
+            root.set(bytes=10)
+        events = self.events()
+
+        root = events["tool.search_docs"]
+        self.assertEqual((root["ph"], root["args"]["query"], root["args"]["bytes"]), ("X", "table", 10))
+        self.assertNotIn("parent_id", root["args"])
+        for name in ("load", "serialize"):
+            self.assertEqual(events[name]["args"]["trace_id"], root["args"]["trace_id"])
+            self.assertEqual(events[name]["args"]["parent_id"], root["args"]["span_id"])
+        self.assertEqual(events["serialize"]["args"]["error"], "KeyError: 'x'")
+        self.assertGreaterEqual(events["load"]["ts"], root["ts"])
+
+    def test_propagates_to_threads_and_processes(self):
+        def work(ref):
+            with tracing.span(f"release {ref}"):
+                pass
+
+        with tracing.span("extract") as root:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(tracing.propagate(work), ["a", "b", "c"]))
+            subprocess.run(
+                [sys.executable, "-c", CHILD],
+                env=dict(os.environ, PYTHONPATH=PROJECT_ROOT, **tracing.carrier()),
+                check=True,
+            )
+        events = self.events()
+
+        parent = root.context.span_id
+        for name in ("release a", "release b", "release c", "child"):
+            self.assertEqual(events[name]["args"]["parent_id"], parent)
+        self.assertNotEqual(events["child"]["pid"], os.getpid())
+
+    def test_disabled_spans_are_shared_noops(self):
+        tracing.disable()
+        self.assertIs(tracing.span("a"), tracing.span("b", x=1))
+        with tracing.span("a") as span:
+            span.set(x=1)
+        self.assertEqual(tracing.carrier(), {})
+        self.assertEqual(tracing.read_events(self.path), [])
+
+    def test_chrome_trace(self):
+        with tracing.span("b"):
+            pass
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"name": "cut sh')
+        trace = tracing.to_chrome_trace(tracing.read_events(self.path))
+        self.assertEqual([event["name"] for event in trace["traceEvents"]], ["b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
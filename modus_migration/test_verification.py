@@ -0,0 +1,129 @@
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from modus_migration.catalog_store import CatalogStore
+from modus_migration.source_edits import Edit, apply_edits
+from modus_migration.verification import FileVerifier, MigrationRules, ProjectVerifier, rules_for
+
+RULES = MigrationRules(
+    {"modus-button": "modus-wc-button", "modus-action-bar": "Not Found", "modus-alert": "modus-wc-alert"},
+    {
+        "modus-button": {
+            "v2_component": "modus-wc-button",
+            "props": {"buttonStyle": {"target": "variant"}, "disabled": {"target": "disabled"}},
+            "unmatched_v2_props": ["shape"],
+        }
+    },
+)
+SOURCE = (
+    '<modus-button button-style="outline" (buttonClick)="save()">Save</modus-button>\n'
+    "<modus-action-bar></modus-action-bar>\n"
+    '<modus-wc-button [buttonStyle]="style" variant="x" disabled>Ok</modus-wc-button>\n'
+)
+PIECES = ["<modus-button", "<modus-wc-button", "<modus-alert", ' button-style="x"', " disabled", ">", "/>",
+          "\n", "<div>", "text", '"', "'", "{", "}", " onClick={() => a < b}", "<", "</modus-button>"]
+
+
+def _state(verifier):
+    return list(verifier._iter_elements()), len(verifier), verifier.counts(), verifier._open_tags
+
+
+class TestFileVerifier(unittest.TestCase):
+    def test_rules(self):
+        findings = FileVerifier(RULES).verify(SOURCE).findings()
+        self.assertEqual(
+            [(f["line"], f["rule"]) for f in findings],
+            [(1, "v1-tag"), (2, "no-v2-equivalent"), (3, "v1-attribute")],
+        )
+        self.assertIn("rename button-style -> variant", findings[0]["message"])
+        self.assertIn("[buttonStyle] on <modus-wc-button>", findings[2]["message"])
+
+    def test_edits_recheck_only_the_changed_element(self):
+        verifier = FileVerifier(RULES).verify(SOURCE * 50)
+        self.assertEqual(verifier.rechecked, 150)
+        offset = verifier.text.rindex("<modus-button")
+        verifier.update([Edit(offset, len("<modus-button"), "<modus-wc-button")])
+        self.assertEqual(verifier.rechecked, 1)
+        self.assertEqual(verifier.counts(), {"no-v2-equivalent": 50, "v1-attribute": 51, "v1-tag": 49})
+        verifier.verify(verifier.text.replace('button-style="outline"', 'variant="outline"'))
+        self.assertEqual(verifier.counts()["v1-attribute"], 50)
+        self.assertEqual(len(verifier), 150)
+
+    def test_report_lists_the_rechecked_findings(self):
+        verifier = FileVerifier(RULES).verify(SOURCE * 50)
+        self.assertEqual(len(verifier.report("a.html", full=False)["findings"]), 150)
+        offset = verifier.text.rindex("<modus-button")
+        verifier.update([Edit(offset, len("<modus-button"), "<modus-wc-button")])
+        report = verifier.report("a.html", full=False)
+        self.assertEqual(report["rechecked_lines"], [[147, 148]])
+        self.assertEqual([(f["line"], f["rule"]) for f in report["findings"]], [(148, "v1-attribute")])
+        self.assertEqual((report["status"], report["counts"]["v1-attribute"]), ("fail", 51))
+
+        verifier.update([Edit(0, 0, "<!-- header -->\n\n")])
+        self.assertEqual(verifier.report("a.html", full=False)["findings"], [])
+        self.assertEqual(verifier.findings()[-1]["line"], 152)
+        self.assertEqual(len(verifier.report("a.html")["findings"]), 150)
+
+    def test_incremental_results_match_a_full_run(self):
+        random.seed(7)
+        for block_size in (2, 5, 128):
+            with mock.patch("modus_migration.verification._BLOCK_SIZE", block_size):
+                self._compare_with_full_runs()
+
+    def _compare_with_full_runs(self):
+        for _ in range(60):
+            text = "".join(random.choice(PIECES) for _ in range(random.randint(0, 40)))
+            verifier = FileVerifier(RULES).verify(text)
+            for _ in range(10):
+                edits, position = [], 0
+                while random.random() < 0.6 and position <= len(text):
+                    offset = random.randint(position, min(len(text), position + 30))
+                    length = random.randint(0, min(10, len(text) - offset))
+                    edits.append(Edit(offset, length, "".join(random.choice(PIECES) for _ in range(random.randint(0, 2)))))
+                    position = offset + length + 1
+                text = apply_edits(text, edits)
+                verifier.update(edits) if random.random() < 0.5 else verifier.verify(text)
+                self.assertEqual(_state(verifier), _state(FileVerifier(RULES).verify(text)), repr(text))
+
+
+class TestProjectVerifier(unittest.TestCase):
+    def test_summary_and_eviction(self):
+        project = ProjectVerifier(lambda: RULES, max_files=2)
+        with self.assertRaises(ValueError):
+            project.verify("a.html", edits=[])
+        project.verify("a.html", SOURCE)
+        project.verify("b.html", "<modus-wc-button></modus-wc-button>")
+        self.assertEqual(project.summary()["files_with_errors"], ["a.html"])
+        self.assertEqual(project.summary()["v1_usages"], {"modus-action-bar": 1, "modus-button": 1})
+        project.verify("c.html", "<modus-alert>")
+        self.assertNotIn("a.html", project)
+        self.assertEqual(project.summary()["counts"], {"v1-tag": 1})
+
+    def test_results_are_kept_without_a_build(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        with open(os.path.join(directory, "component_mapping.json"), "w", encoding="utf-8") as f:
+            json.dump({"Mapping_v1_v2": {"modus-button": "modus-wc-button"}}, f)
+        store = CatalogStore(directory)
+        project = ProjectVerifier(lambda: rules_for(store.mapping(), store.prop_alignment()))
+        with mock.patch("modus_migration.catalog_store.ensure_compiled", side_effect=OSError("read-only")):
+            project.verify("a.html", "<modus-button>Save</modus-button>")
+            verifier = project.verify("a.html", edits=[Edit(1, len("modus-button"), "modus-wc-button")])
+        self.assertEqual(verifier.rechecked, 1)
+        self.assertEqual(verifier.counts(), {})
+
+    def test_import_does_not_load_numpy(self):
+        code = "import sys, modus_migration.verification; print('numpy' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
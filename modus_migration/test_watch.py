@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from modus_migration.test_verification import RULES
+from modus_migration.watch import SUMMARY_FILE, ChangeQueue, PollingSource, ProjectWatch
+
+
+class TestProjectWatch(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.watch = ProjectWatch(self.root, lambda: RULES)
+        self._write("src/page.html", '<modus-button button-style="outline">Save</modus-button>\n')
+        self._write("src/ok.tsx", "<modus-wc-button>Ok</modus-wc-button>\n")
+        self._write("node_modules/lib/index.html", "<modus-button></modus-button>\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _path(self, relative):
+        return os.path.join(self.root, *relative.split("/"))
+
+    def _write(self, relative, text):
+        os.makedirs(os.path.dirname(self._path(relative)), exist_ok=True)
+        with open(self._path(relative), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _report(self, name):
+        with open(os.path.join(self.root, "analysis_reports", *name.split("/")), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_scan_writes_reports_and_summary(self):
+        self.assertEqual(self.watch.scan()["files"], 2)
+        self.assertEqual(self._report("src/page.html.v1-check.json")["counts"], {"v1-tag": 1})
+        summary = self._report(SUMMARY_FILE)
+        self.assertEqual(summary["files_with_errors"], ["src/page.html"])
+        self.assertEqual(summary["v1_usages"], {"modus-button": 1})
+        self.assertEqual(summary["v1_usages_left"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.root, "analysis_reports", "node_modules")))
+
+    def test_changes_update_and_remove_reports(self):
+        self.watch.scan()
+        self._write("src/page.html", '<modus-wc-button variant="outline">Save</modus-wc-button>\n')
+        batch = self.watch.check([self._path("src/page.html")])
+        self.assertEqual((batch["files"], batch["elements"]), (1, 1))
+        self.assertEqual(self._report("src/page.html.v1-check.json")["counts"], {})
+        self.assertEqual(self._report(SUMMARY_FILE)["v1_usages_left"], 0)
+
+        # A deleted directory stands for the files it had
+        shutil.rmtree(self._path("src"))
+        self.watch.check([self._path("src")])
+        self.assertFalse(os.path.exists(os.path.join(self.root, "analysis_reports", "src", "page.html.v1-check.json")))
+        self.assertEqual(self._report(SUMMARY_FILE)["files"], 0)
+
+
+class TestChangeSources(unittest.TestCase):
+    def test_polling_reports_changed_files(self):
+        root = tempfile.mkdtemp()
+        try:
+            watch = ProjectWatch(root, lambda: RULES)
+            with open(os.path.join(root, "a.html"), "w", encoding="utf-8") as f:
+                f.write("<modus-button>")
+            source = PollingSource(watch, ChangeQueue())
+            self.assertEqual(source.poll(), set())
+            with open(os.path.join(root, "a.html"), "a", encoding="utf-8") as f:
+                f.write("</modus-button>")
+            with open(os.path.join(root, "b.html"), "w", encoding="utf-8") as f:
+                f.write("")
+            self.assertEqual(source.poll(), {os.path.join(root, "a.html"), os.path.join(root, "b.html")})
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    def test_queue_debounces_bursts(self):
+        queue = ChangeQueue()
+
+        def burst():
+            for i in range(5):
+                queue.add([f"f{i}"])
+                time.sleep(0.01)
+
+        thread = threading.Thread(target=burst)
+        thread.start()
+        self.assertEqual(queue.take(debounce=0.2), {f"f{i}" for i in range(5)})
+        thread.join()
+        queue.stop()
+        self.assertEqual(queue.take(debounce=0.2), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,256 @@
+"""
+Opt-in span tracing for the MCP servers and the component extractor.
+
+Tracing is enabled with --trace-file (or the MODUS_TRACE_FILE environment
+variable) and appends one Trace Event Format "complete" event per finished
+span to a JSONL file:
+
+    {"name": "catalog.load", "cat": "modus", "ph": "X", "ts": 1718..., "dur": 2140,
+     "pid": 4242, "tid": 4242, "args": {"trace_id": "...", "span_id": "...",
+     "parent_id": "...", "file": "v2_components.json"}}
+
+Convert it for chrome://tracing, Perfetto (ui.perfetto.dev) or speedscope with
+
+    python -m modus_migration.tracing trace.jsonl -o trace.json
+
+Spans nest through a context variable, so concurrent tool calls on one event
+loop keep separate traces. Threads started by an executor do not inherit
+context variables: submit propagate(fn) instead of fn. Child processes join
+the trace through carrier() (environment variables for subprocess.run, or
+initargs for a pool initializer calling attach()).
+
+When tracing is not enabled span() returns a shared no-op object, so
+instrumented code costs one global lookup per span.
+"""
+
+import argparse
+import atexit
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional
+
+TRACE_FILE_ENV = "MODUS_TRACE_FILE"
+# "<trace id>-<span id>" of the span a child process continues
+TRACE_PARENT_ENV = "MODUS_TRACE_PARENT"
+
+
+class SpanContext(NamedTuple):
+    trace_id: str
+    span_id: str
+
+
+_current: contextvars.ContextVar[Optional[SpanContext]] = contextvars.ContextVar(
+    "modus_trace_span", default=None
+)
+_exporter: Optional["JsonlExporter"] = None
+
+
+def _new_id() -> str:
+    return os.urandom(8).hex()
+
+
+class JsonlExporter:
+    """Appends one JSON event per line. Every line is a single write() on an
+    O_APPEND descriptor, so several processes can share one file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._lock = threading.Lock()
+
+    def export(self, event: Dict[str, Any]) -> None:
+        line = (json.dumps(event, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        with self._lock:
+            if self._fd is not None:
+                os.write(self._fd, line)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+class _Span:
+    __slots__ = ("name", "attributes", "context", "parent", "_token", "_ts", "_start")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "_Span":
+        self.parent = _current.get()
+        trace_id = self.parent.trace_id if self.parent is not None else _new_id()
+        self.context = SpanContext(trace_id, _new_id())
+        self._token = _current.set(self.context)
+        self._ts = time.time_ns() // 1000
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        duration = (time.perf_counter_ns() - self._start) // 1000
+        _current.reset(self._token)
+        exporter = _exporter
+        if exporter is None:
+            return
+        args = {"trace_id": self.context.trace_id, "span_id": self.context.span_id}
+        if self.parent is not None:
+            args["parent_id"] = self.parent.span_id
+        if exc_type is not None:
+            args["error"] = f"{exc_type.__name__}: {exc}"
+        args.update(self.attributes)
+        exporter.export({
+            "name": self.name,
+            "cat": "modus",
+            "ph": "X",
+            "ts": self._ts,
+            "dur": duration,
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+            "args": args,
+        })
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **attributes: Any):
+    """Context manager recording a span; a no-op unless tracing is enabled.
+
+    `with span("catalog.load", file=name) as s: ...; s.set(bytes=n)`
+    """
+    return _Span(name, attributes) if _exporter is not None else _NOOP
+
+
+def traced(name: str):
+    """Decorator running the wrapped function inside span(name)."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+def enable(path: str) -> None:
+    """Export spans to `path` (appending); later calls with the same path are no-ops."""
+    global _exporter
+    if _exporter is not None and _exporter.path == path:
+        return
+    disable()
+    _exporter = JsonlExporter(path)
+    atexit.register(_exporter.close)
+
+
+def disable() -> None:
+    global _exporter
+    if _exporter is not None:
+        _exporter.close()
+        _exporter = None
+
+
+def propagate(fn: Callable) -> Callable:
+    """`fn` running in the caller's current span, e.g. for executor.submit()
+    or executor.map()."""
+    if _exporter is None:
+        return fn
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        # A context can only be entered by one thread at a time
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+def carrier() -> Dict[str, str]:
+    """Environment variables continuing the current trace in a child process."""
+    if _exporter is None:
+        return {}
+    values = {TRACE_FILE_ENV: _exporter.path}
+    current = _current.get()
+    if current is not None:
+        values[TRACE_PARENT_ENV] = f"{current.trace_id}-{current.span_id}"
+    return values
+
+
+def attach(values: Mapping[str, str]) -> None:
+    """Continue the trace described by `values` (see carrier()) in this process."""
+    path = values.get(TRACE_FILE_ENV)
+    if not path:
+        return
+    enable(path)
+    trace_id, _, span_id = values.get(TRACE_PARENT_ENV, "").partition("-")
+    if trace_id and span_id:
+        _current.set(SpanContext(trace_id, span_id))
+
+
+def configure(trace_file: Optional[str] = None) -> None:
+    """Enable tracing from a --trace-file option or the environment."""
+    if trace_file:
+        os.environ[TRACE_FILE_ENV] = os.path.abspath(trace_file)
+    attach(os.environ)
+
+
+def read_events(path: str) -> List[Dict[str, Any]]:
+    events = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue  # a line cut short by a killed process
+    return events
+
+
+def to_chrome_trace(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"traceEvents": sorted(events, key=lambda e: e["ts"]), "displayTimeUnit": "ms"}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert a span JSONL file to a Chrome trace.")
+    parser.add_argument("trace", help="JSONL file written with --trace-file")
+    parser.add_argument("-o", "--output", help="Output file (default: <trace>.json)")
+    args = parser.parse_args(argv)
+    output = args.output or os.path.splitext(args.trace)[0] + ".json"
+    events = read_events(args.trace)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(to_chrome_trace(events), f)
+    print(f"Wrote {len(events)} spans to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,606 @@
+"""
+Incremental checks of migrated sources for Modus 1 leftovers.
+
+The verify step (md_prompts/verify.md) reviews a migrated file as a whole.
+The mechanical part of that review is checked here, per Modus element
+(an opening tag `<modus-...>` in HTML, JSX or a template string):
+
+    v1-tag             a Modus 1 element whose component has a Modus 2 equivalent
+    no-v2-equivalent   a Modus 1 element mapped to "Not Found": kept, but logged
+    v1-attribute       an attribute of a Modus 2 element that is the Modus 1 name
+                       of a renamed prop (`button-style` on <modus-wc-button>)
+
+from component_mapping.json and the prop alignment table (prop_alignment.py).
+
+A FileVerifier keeps, for one file, every element's span and findings from
+its last run. Given edits (see source_edits.py) or the file's new text, it
+re-scans only the elements the changed region touches and re-runs the rules
+of those elements; every other element keeps its findings. Elements are kept
+in blocks of _BLOCK_SIZE, each storing offsets and line numbers relative to
+the block, so an edit rewrites one block and moves the blocks after it, and
+its report can list just the findings of the re-scanned lines: a
+fix-and-recheck loop costs about the same whatever the size of the file.
+
+A ProjectVerifier holds the FileVerifiers of a project, keyed by path, and
+sums their findings.
+"""
+
+import bisect
+import itertools
+import re
+from collections import Counter, OrderedDict
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from modus_migration.attribute_index import normalize_name
+from modus_migration.source_edits import Edit, normalize
+
+ERROR = "error"
+WARNING = "warning"
+# Rules whose findings are errors: a file with any of them fails
+ERROR_RULES = ("v1-tag", "v1-attribute")
+
+_TAG_START = "<modus-"
+_TAG = re.compile(r"<(modus-[a-z0-9]+(?:-[a-z0-9]+)*)(?=[\s/>])")
+_TAG_NAME_RUN = re.compile(r"<modus-[a-z0-9-]*")
+_ATTRIBUTE = re.compile(r"[^\s=/>{<\"']+")
+_UNQUOTED_VALUE = re.compile(r"[^\s>]+")
+# Binding syntax around attribute names: Angular [x] (x) [(x)] [attr.x],
+# Vue :x @x v-bind:x, Lit .x ?x @x, Solid on:x
+_BINDING = re.compile(r"^(?:\[\(|\[|\(|v-bind:|v-on:|on:|bind-|on-|[:@.?])(?:attr\.)?|[)\]]+$")
+
+# Checked (tag, attribute names) -> findings; cleared when it grows past this
+_RESULT_CACHE_SIZE = 4096
+# Elements per FileVerifier block
+_BLOCK_SIZE = 128
+
+
+class Finding(NamedTuple):
+    rule: str
+    severity: str
+    message: str
+
+
+class _Element(NamedTuple):
+    # Offsets and 0-based line of the opening tag, relative to its _Block
+    start: int
+    end: int
+    line: int
+    tag: str
+    findings: Tuple[Finding, ...]
+
+
+class MigrationRules:
+    """The per-element checks, built once per catalog."""
+
+    def __init__(self, component_map: Dict[str, Any], alignment: Dict[str, Any]):
+        # Deferred: prop_alignment imports numpy, which the servers don't load at startup
+        from modus_migration.prop_alignment import attribute_changes
+
+        self.v2_tags: Dict[str, Optional[str]] = {}
+        for v1_tag, target in component_map.items():
+            if isinstance(target, dict):
+                target = target.get("v2_component")
+            self.v2_tags[v1_tag] = target if isinstance(target, str) and target != "Not Found" else None
+        # v2 tag -> {normalized v1 prop name: (v1 name, v2 name)}
+        self.v1_props: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        # v1 tag -> {normalized v1 prop name: (v1 name, v2 name)}
+        self.renames: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        for v1_tag, entry in alignment.items():
+            v2_tag = entry.get("v2_component")
+            v2_names = {normalize_name(row["target"]) for row in entry.get("props", {}).values() if row["target"]}
+            v2_names.update(normalize_name(name) for name in entry.get("unmatched_v2_props", []))
+            renames = {
+                normalize_name(v1_name): (v1_name, v2_name)
+                for v1_name, v2_name in attribute_changes(entry).items()
+            }
+            self.renames[v1_tag] = renames
+            if v2_tag:
+                props = self.v1_props.setdefault(v2_tag, {})
+                props.update((key, names) for key, names in renames.items() if key not in v2_names)
+        self._results: Dict[Tuple[str, Tuple[str, ...]], Tuple[Finding, ...]] = {}
+
+    def check(self, tag: str, attributes: Tuple[str, ...]) -> Tuple[Finding, ...]:
+        key = (tag, attributes)
+        findings = self._results.get(key)
+        if findings is None:
+            if len(self._results) >= _RESULT_CACHE_SIZE:
+                self._results.clear()
+            findings = self._results[key] = tuple(self._check(tag, attributes))
+        return findings
+
+    def _check(self, tag: str, attributes: Tuple[str, ...]) -> Iterator[Finding]:
+        if tag in self.v2_tags:
+            v2_tag = self.v2_tags[tag]
+            if v2_tag is None:
+                yield Finding("no-v2-equivalent", WARNING,
+                              f"<{tag}> has no Modus 2 equivalent: keep it and note it in the migration log")
+                return
+            renames = self.renames.get(tag, {})
+            changes = [
+                f"{name} -> {renames[key][1]}"
+                for name, key in ((name, normalize_name(_BINDING.sub("", name))) for name in attributes)
+                if key in renames
+            ]
+            yield Finding("v1-tag", ERROR, f"<{tag}> is a Modus 1 component: migrate it to <{v2_tag}>"
+                          + (f" (rename {', '.join(changes)})" if changes else ""))
+            return
+        v1_props = self.v1_props.get(tag)
+        if not v1_props:
+            return
+        for name in attributes:
+            names = v1_props.get(normalize_name(_BINDING.sub("", name)))
+            if names:
+                yield Finding("v1-attribute", ERROR,
+                              f"{name} on <{tag}> is the Modus 1 name of {names[0]}: use {names[1]}")
+
+
+_rules_cache: Optional[Tuple[Any, Any, MigrationRules]] = None
+
+
+def rules_for(mapping: Dict[str, Any], alignment: Dict[str, Any]) -> MigrationRules:
+    """MigrationRules of component_mapping.json's data and the alignment table,
+    rebuilt when the catalog store hands out new ones."""
+    global _rules_cache
+    cached = _rules_cache
+    if cached is None or cached[0] is not mapping or cached[1] is not alignment:
+        cached = _rules_cache = (mapping, alignment,
+                                 MigrationRules(mapping.get("Mapping_v1_v2", {}), alignment))
+    return cached[2]
+
+
+# --- scanning ---
+
+
+def _skip_braces(text: str, pos: int) -> int:
+    """Index after the `}` matching the `{` at `pos`; -1 if unbalanced."""
+    depth = 0
+    while pos < len(text):
+        char = text[pos]
+        if char in "\"'`":
+            pos += 1
+            while pos < len(text) and text[pos] != char:
+                pos += 2 if text[pos] == "\\" else 1
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    return -1
+
+
+def _scan_tag(text: str, pos: int) -> Tuple[int, Optional[Tuple[str, ...]]]:
+    """(end, attribute names) of the opening tag whose name ends at `pos`.
+
+    A tag not terminated before the next tag (or the end of the text) has
+    no attribute names, and `end` is where the scan gave up: an edit there
+    or before it may complete the tag.
+    """
+    names = []
+    length = len(text)
+    while pos < length:
+        char = text[pos]
+        if char.isspace():
+            pos += 1
+        elif char == ">":
+            return pos + 1, tuple(names)
+        elif char == "<":
+            return pos, None
+        elif char == "{":
+            pos = _skip_braces(text, pos)
+            if pos < 0:
+                return length, None
+        else:
+            match = _ATTRIBUTE.match(text, pos)
+            if not match:
+                pos += 1  # "/" of "/>", or a stray quote
+                continue
+            names.append(match.group())
+            pos = match.end()
+            while pos < length and text[pos].isspace():
+                pos += 1
+            if pos >= length or text[pos] != "=":
+                continue
+            pos += 1
+            while pos < length and text[pos].isspace():
+                pos += 1
+            if pos >= length:
+                break
+            if text[pos] in "\"'":
+                pos = text.find(text[pos], pos + 1)
+                if pos < 0:
+                    return length, None
+                pos += 1
+            elif text[pos] == "{":
+                pos = _skip_braces(text, pos)
+                if pos < 0:
+                    return length, None
+            elif text[pos] != ">":
+                pos = _UNQUOTED_VALUE.match(text, pos).end()
+    return length, None
+
+
+def _common_prefix(a: str, b: str) -> int:
+    length, block, i = min(len(a), len(b)), 4096, 0
+    while i < length and a[i:i + block] == b[i:i + block]:
+        i += block
+    if i >= length:
+        return length
+    low, high = i, min(i + block, length)  # the first difference is in [low, high)
+    while low < high:
+        middle = (low + high) // 2
+        if a[i:middle + 1] == b[i:middle + 1]:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    block, i = 4096, 0
+    while i < limit and a[len(a) - min(i + block, limit):len(a) - i] == b[len(b) - min(i + block, limit):len(b) - i]:
+        i += block
+    if i >= limit:
+        return limit
+    low, high = i, min(i + block, limit)
+    while low < high:
+        middle = (low + high) // 2
+        if a[len(a) - middle - 1:len(a) - i] == b[len(b) - middle - 1:len(b) - i]:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+class _Block:
+    """A run of elements stored relative to `offset` and `line`, so that an
+    edit before the block moves it without touching its elements."""
+
+    __slots__ = ("offset", "line", "elements")
+
+    def __init__(self, elements: List[_Element]):
+        self.offset = 0
+        self.line = 0
+        self.elements = elements
+
+    def element(self, index: int, delta: int = 0, line_delta: int = 0) -> _Element:
+        """Element `index` in absolute offsets, moved by (`delta`, `line_delta`)."""
+        start, end, line, tag, findings = self.elements[index]
+        offset, base = self.offset + delta, self.line + line_delta
+        return _Element(start + offset, end + offset, line + base, tag, findings)
+
+
+# A position in FileVerifier._blocks: (block, index in the block); the end is
+# (number of blocks, 0)
+_Cursor = Tuple[int, int]
+
+
+class FileVerifier:
+    def __init__(self, rules: MigrationRules):
+        self.rules = rules
+        self.text = ""
+        self._blocks: List[_Block] = []
+        self._size = 0
+        # (position, reach) of the "<modus-" tags that are not terminated;
+        # usually none, so these keep absolute offsets
+        self._open_tags: List[Tuple[int, int]] = []
+        # (rule, tag) -> findings
+        self._counts: Counter = Counter()
+        # Elements scanned and checked by the last verify() or update()
+        self.rechecked = 0
+        # [start, end) spans of the text re-scanned by the last verify() or update()
+        self.changed: List[Tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    def verify(self, source: str) -> "FileVerifier":
+        """Re-check `source`, the file's new text, from the region that
+        differs from the text of the last run."""
+        prefix = _common_prefix(self.text, source)
+        suffix = _common_suffix(self.text, source, min(len(self.text), len(source)) - prefix)
+        if prefix == len(self.text) == len(source):
+            self.rechecked = 0
+            self.changed = []
+            return self
+        return self.update([Edit(prefix, len(self.text) - prefix - suffix, source[prefix:len(source) - suffix])])
+
+    def update(self, edits: Iterable[Edit]) -> "FileVerifier":
+        """Apply `edits` (offsets into the text of the last run) and re-check
+        the elements they touch."""
+        self.rechecked = 0
+        self.changed = []
+        # Last edit first, so that the offsets of the others stay valid
+        for edit in reversed(normalize(edits, len(self.text))):
+            self._apply(edit)
+        return self
+
+    # --- element positions ---
+
+    def _find(self, field: int, position: int) -> _Cursor:
+        """First element whose start (field 0) or end (field 1) is > `position`."""
+        blocks = self._blocks
+        b = bisect.bisect_right(blocks, position, key=lambda block: block.elements[-1][field] + block.offset)
+        if b == len(blocks):
+            return b, 0
+        block = blocks[b]
+        return b, bisect.bisect_right(block.elements, position - block.offset, key=itemgetter(field))
+
+    def _at(self, cursor: Optional[_Cursor]) -> Optional[_Element]:
+        if cursor is None or cursor[0] == len(self._blocks):
+            return None
+        return self._blocks[cursor[0]].element(cursor[1])
+
+    def _next(self, cursor: _Cursor) -> _Cursor:
+        b, j = cursor
+        return (b, j + 1) if j + 1 < len(self._blocks[b].elements) else (b + 1, 0)
+
+    def _previous(self, cursor: _Cursor) -> Optional[_Cursor]:
+        b, j = cursor
+        if j:
+            return b, j - 1
+        return (b - 1, len(self._blocks[b - 1].elements) - 1) if b else None
+
+    def _iter_elements(self, cursor: _Cursor = (0, 0)) -> Iterator[_Element]:
+        b, j = cursor
+        for block in self._blocks[b:]:
+            for index in range(j, len(block.elements)):
+                yield block.element(index)
+            j = 0
+
+    def _line_at(self, position: int) -> int:
+        """0-based line of `position`, counted from the closest element before it."""
+        previous = self._at(self._previous(self._find(0, position)))
+        if previous is None:
+            return self.text.count("\n", 0, position)
+        return previous.line + self.text.count("\n", previous.start, position)
+
+    def _splice(self, first: _Cursor, kept: _Cursor, found: List[_Element], delta: int, line_delta: int) -> None:
+        """Replace the elements in [first, kept) by `found` and move the ones
+        after them by (`delta`, `line_delta`)."""
+        blocks = self._blocks
+        (b0, j0), (b1, j1) = first, kept
+        merged = [blocks[b0].element(i) for i in range(j0)] if b0 < len(blocks) else []
+        merged += found
+        rest = b1
+        if b1 < len(blocks):
+            block = blocks[b1]
+            merged += [block.element(i, delta, line_delta) for i in range(j1, len(block.elements))]
+            rest += 1
+        if len(merged) < _BLOCK_SIZE // 2 and rest < len(blocks):
+            # Keep blocks from shrinking into many small ones
+            block = blocks[rest]
+            merged += [block.element(i, delta, line_delta) for i in range(len(block.elements))]
+            rest += 1
+        if delta or line_delta:
+            for block in blocks[rest:]:
+                block.offset += delta
+                block.line += line_delta
+        blocks[b0:rest] = [_Block(merged[i:i + _BLOCK_SIZE]) for i in range(0, len(merged), _BLOCK_SIZE)]
+
+    # --- checking ---
+
+    def _scan(self, text: str, position: int, stop: int, open_tags: List[Tuple[int, int]],
+              anchor: Tuple[int, int]) -> Iterator[_Element]:
+        """Elements of `text` starting in [position, stop), checked; tags
+        left open are added to `open_tags`. `anchor` is a (position, line)
+        before `position` to count lines from."""
+        line_position, line = anchor
+        while True:
+            position = text.find(_TAG_START, position, stop + len(_TAG_START) - 1)
+            if position < 0:
+                return
+            match = _TAG.match(text, position)
+            if match:
+                end, attributes = _scan_tag(text, match.end())
+            else:
+                end, attributes = _TAG_NAME_RUN.match(text, position).end(), None
+            if attributes is None:
+                open_tags.append((position, end))
+                position += 1
+                continue
+            self.rechecked += 1
+            line += text.count("\n", line_position, position)
+            line_position = position
+            yield _Element(position, end, line, match.group(1), self.rules.check(match.group(1), attributes))
+            position = end
+
+    def _apply(self, edit: Edit) -> None:
+        text = self.text
+        # Re-scan from where a tag the edit completes or changes may start:
+        # a "<modus-" the edit finishes, an open tag whose scan reached the
+        # edit, or the element the edit is in
+        start = max(0, edit.offset - len(_TAG_START) + 1)
+        for position, reach in self._open_tags:
+            if position < edit.offset <= reach:
+                start = min(start, position)
+        first = self._find(1, start)
+        element = self._at(first)
+        if element is not None:
+            start = min(start, element.start)
+        # Elements [first, last) overlap [start, edit.end)
+        last = max(first, self._find(0, edit.end - 1))
+        stop = max(edit.end, self._at(self._previous(last)).end) if last > first else edit.end
+        previous = self._at(self._previous(first))
+
+        text = text[:edit.offset] + edit.replacement + text[edit.end:]
+        delta = len(edit.replacement) - edit.length
+        line_delta = edit.replacement.count("\n") - self.text.count("\n", edit.offset, edit.end)
+        open_tags: List[Tuple[int, int]] = []
+        found = list(self._scan(text, start, stop + delta, open_tags,
+                                (previous.start, previous.line) if previous else (0, 0)))
+        scanned_until = stop + delta
+        # A rescanned tag can now run over elements that followed it; scan
+        # what those covered again
+        kept, following = last, self._at(last)
+        while found and following is not None and following.start + delta < found[-1].end:
+            covered_end = following.end + delta
+            while following is not None and following.start + delta < found[-1].end:
+                covered_end = max(covered_end, following.end + delta)
+                kept = self._next(kept)
+                following = self._at(kept)
+            if covered_end > found[-1].end:
+                anchor = (found[-1].start, found[-1].line)
+                found += self._scan(text, found[-1].end, covered_end, open_tags, anchor)
+                scanned_until = max(scanned_until, covered_end)
+        if found:
+            scanned_until = max(scanned_until, found[-1].end)
+
+        removed = 0
+        cursor = first
+        while cursor < kept:
+            element = self._at(cursor)
+            for finding in element.findings:
+                self._counts[finding.rule, element.tag] -= 1
+            removed += 1
+            cursor = self._next(cursor)
+        for element in found:
+            for finding in element.findings:
+                self._counts[finding.rule, element.tag] += 1
+        self._splice(first, kept, found, delta, line_delta)
+        self._size += len(found) - removed
+        self._open_tags = (
+            [tag for tag in self._open_tags if tag[0] < start]
+            + open_tags
+            + [(position + delta, reach + delta) for position, reach in self._open_tags
+               if position + delta >= scanned_until]
+        )
+        self.changed = _merge_spans(
+            [(_moved(a, edit), _moved(b, edit)) for a, b in self.changed] + [(start, scanned_until)]
+        )
+        self.text = text
+
+    # --- results ---
+
+    def counts(self) -> Dict[str, int]:
+        """{rule: findings}"""
+        totals: Counter = Counter()
+        for (rule, _), count in self._counts.items():
+            totals[rule] += count
+        return {rule: count for rule, count in sorted(totals.items()) if count}
+
+    def usages(self) -> Dict[str, int]:
+        """{Modus 1 tag: elements left}"""
+        totals: Counter = Counter()
+        for (rule, tag), count in self._counts.items():
+            if rule in ("v1-tag", "no-v2-equivalent"):
+                totals[tag] += count
+        return {tag: count for tag, count in sorted(totals.items()) if count}
+
+    def findings(self, spans: Optional[Iterable[Tuple[int, int]]] = None) -> List[Dict[str, Any]]:
+        """Every finding (or those of elements starting in `spans`), in source
+        order, with its 1-based line."""
+        if spans is None:
+            elements: Iterable[_Element] = self._iter_elements()
+        else:
+            elements = (
+                element for a, b in spans
+                for element in itertools.takewhile(lambda e: e.start < b, self._iter_elements(self._find(0, a - 1)))
+            )
+        return [
+            {"line": element.line + 1, "tag": element.tag, **finding._asdict()}
+            for element in elements for finding in element.findings
+        ]
+
+    def changed_lines(self) -> List[List[int]]:
+        """1-based [first, last] lines of the spans re-scanned by the last run."""
+        return [[self._line_at(a) + 1, self._line_at(max(a, b - 1)) + 1] for a, b in self.changed]
+
+    def report(self, path: str, full: bool = True) -> Dict[str, Any]:
+        """The file's check results; with full=False, "findings" only lists
+        those in the lines the last run re-checked ("rechecked_lines")."""
+        counts = self.counts()
+        report = {
+            "path": path,
+            "status": "fail" if any(rule in counts for rule in ERROR_RULES) else "pass",
+            "elements": self._size,
+            "rechecked": self.rechecked,
+            "counts": counts,
+        }
+        if full:
+            report["findings"] = self.findings()
+        else:
+            report["rechecked_lines"] = self.changed_lines()
+            report["findings"] = self.findings(self.changed)
+        return report
+
+
+def _moved(position: int, edit: Edit) -> int:
+    """`position` in the text before `edit`, in the text after it."""
+    if position <= edit.offset:
+        return position
+    return max(position + len(edit.replacement) - edit.length, edit.offset + len(edit.replacement))
+
+
+def _merge_spans(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for a, b in sorted(spans):
+        if merged and a <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(b, merged[-1][1]))
+        else:
+            merged.append((a, b))
+    return merged
+
+
+class ProjectVerifier:
+    """FileVerifiers by path; the least recently verified are dropped past
+    `max_files`."""
+
+    def __init__(self, rules: Callable[[], MigrationRules], max_files: Optional[int] = None):
+        self._rules = rules
+        self.max_files = max_files
+        self._files: "OrderedDict[str, FileVerifier]" = OrderedDict()
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._files
+
+    def get(self, path: str) -> Optional[FileVerifier]:
+        return self._files.get(path)
+
+    def paths(self) -> List[str]:
+        return list(self._files)
+
+    def verify(self, path: str, source: Optional[str] = None,
+               edits: Optional[Iterable[Edit]] = None) -> FileVerifier:
+        """Re-check `path` from its new `source`, or from `edits` to the text
+        of its last run; ValueError if there was no last run to edit."""
+        rules = self._rules()
+        verifier = self._files.get(path)
+        if verifier is not None and verifier.rules is not rules:
+            # The catalogs changed: every earlier result is stale
+            verifier = None
+        if verifier is None:
+            if source is None:
+                raise ValueError(f"{path} has not been verified yet: pass its whole source")
+            verifier = FileVerifier(rules)
+        if source is not None:
+            verifier.verify(source)
+        if edits is not None:
+            verifier.update(edits)
+        self._files[path] = verifier
+        self._files.move_to_end(path)
+        while self.max_files is not None and len(self._files) > self.max_files:
+            self._files.popitem(last=False)
+        return verifier
+
+    def forget(self, path: str) -> None:
+        self._files.pop(path, None)
+
+    def summary(self) -> Dict[str, Any]:
+        counts: Counter = Counter()
+        usages: Counter = Counter()
+        failing = []
+        for path, verifier in self._files.items():
+            file_counts = verifier.counts()
+            counts.update(file_counts)
+            usages.update(verifier.usages())
+            if any(rule in file_counts for rule in ERROR_RULES):
+                failing.append(path)
+        return {
+            "files": len(self._files),
+            "files_with_errors": sorted(failing),
+            "counts": dict(sorted(counts.items())),
+            "v1_usages": dict(sorted(usages.items())),
+        }
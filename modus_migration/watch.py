@@ -0,0 +1,350 @@
+"""
+Watch a project during a migration and keep its Modus 1 checks current.
+
+    python -m modus_migration.watch path/to/project
+
+checks every source file once (see verification.py), then re-checks files as
+they change: filesystem notifications through watchdog when it is installed
+(`pip install watchdog`), otherwise a stat() poll every --poll-interval
+seconds. Bursts of changes (a save-all, a git checkout) are collected until
+no new change arrives for --debounce seconds and then handled as one batch,
+in which each changed file is re-checked from the region that changed.
+
+Results go to the analysis_reports directory of the project (--reports-dir),
+next to the analysis reports of the migration workflow:
+
+    analysis_reports/<file>.v1-check.json   the file's findings, as returned by
+                                            verify_migrated_source
+    analysis_reports/v1-summary.json        the Modus 1 usages left per tag,
+                                            and the files that still fail
+
+A report is only rewritten when its content changes. Between batches the
+watcher blocks on an event (watchdog) or sleeps (polling), so it uses no CPU
+while nothing changes. --once checks the project, writes the reports and exits.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from modus_migration.catalog_io import atomic_write
+from modus_migration.catalog_store import CatalogStore
+from modus_migration.verification import MigrationRules, ProjectVerifier, rules_for
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # optional: fall back to polling
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXTENSIONS = (".html", ".htm", ".js", ".jsx", ".ts", ".tsx", ".vue", ".svelte")
+DEFAULT_EXCLUDES = ("node_modules", ".git", "dist", "build", "migration_logs", "__pycache__")
+REPORT_SUFFIX = ".v1-check.json"
+SUMMARY_FILE = "v1-summary.json"
+
+
+class ProjectWatch:
+    """The checks of the source files under `root` and their reports."""
+
+    def __init__(self, root: str, rules: Callable[[], MigrationRules], reports_dir: Optional[str] = None,
+                 extensions: Iterable[str] = DEFAULT_EXTENSIONS, excludes: Iterable[str] = DEFAULT_EXCLUDES):
+        self.root = os.path.abspath(root)
+        self.reports_dir = os.path.abspath(reports_dir or os.path.join(self.root, "analysis_reports"))
+        self.extensions = tuple(extensions)
+        self.excludes = frozenset(excludes)
+        self.project = ProjectVerifier(rules)
+        # Report file -> the content last written to it
+        self._written: Dict[str, str] = {}
+
+    def relative(self, path: str) -> str:
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def matches(self, path: str) -> bool:
+        """Whether `path` (absolute) is a source file to check."""
+        if not path.endswith(self.extensions) or path.startswith(self.reports_dir + os.sep):
+            return False
+        relative = self.relative(path)
+        return not relative.startswith("../") and not self.excludes.intersection(relative.split("/")[:-1])
+
+    def ignores_directory(self, path: str) -> bool:
+        relative = self.relative(path)
+        return (path == self.reports_dir or path.startswith(self.reports_dir + os.sep)
+                or relative.startswith("../") or bool(self.excludes.intersection(relative.split("/"))))
+
+    def files(self, directory: Optional[str] = None) -> Iterator[str]:
+        for current, directories, names in os.walk(directory or self.root):
+            directories[:] = [
+                d for d in directories
+                if d not in self.excludes and os.path.join(current, d) != self.reports_dir
+            ]
+            for name in names:
+                path = os.path.join(current, name)
+                if self.matches(path):
+                    yield path
+
+    def _expand(self, paths: Iterable[str]) -> Set[str]:
+        """The files behind changed `paths`; a changed directory stands for
+        every file in it, and for the known files it no longer has."""
+        files = set()
+        for path in paths:
+            if os.path.isdir(path):
+                files.update(self.files(path))
+            elif self.matches(path):
+                files.add(path)
+                continue
+            relative = self.relative(path)
+            prefix = "" if relative == "." else relative + "/"
+            files.update(
+                os.path.join(self.root, *known.split("/"))
+                for known in self._known() if known.startswith(prefix)
+            )
+        return files
+
+    def _known(self) -> List[str]:
+        known = set(self.project.paths())
+        known.update(
+            os.path.relpath(report, self.reports_dir).replace(os.sep, "/")[:-len(REPORT_SUFFIX)]
+            for report in self._written if report.endswith(REPORT_SUFFIX)
+        )
+        return sorted(known)
+
+    def scan(self) -> Dict[str, int]:
+        """Check every source file of the project."""
+        return self.check(self.files())
+
+    def check(self, paths: Iterable[str]) -> Dict[str, int]:
+        """Re-check the changed `paths` (absolute files or directories) and
+        update their reports and the summary."""
+        started = time.perf_counter()
+        checked = rechecked = 0
+        for path in sorted(self._expand(paths)):
+            relative = self.relative(path)
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+                    source = f.read()
+            except FileNotFoundError:
+                source = None
+            except OSError as e:
+                logger.warning(f"Could not read {relative}: {e}")
+                continue
+            checked += 1
+            if source is None or "<modus-" not in source:
+                # Deleted, or nothing to check: keep neither its text nor a report
+                self.project.forget(relative)
+                self._remove(self._report_path(relative))
+                continue
+            verifier = self.project.verify(relative, source)
+            rechecked += verifier.rechecked
+            self._write(self._report_path(relative), verifier.report(relative))
+        self._write(os.path.join(self.reports_dir, SUMMARY_FILE), self.summary())
+        return {"files": checked, "elements": rechecked, "ms": round((time.perf_counter() - started) * 1000, 1)}
+
+    def summary(self) -> Dict:
+        summary = self.project.summary()
+        summary["v1_usages_left"] = sum(summary["v1_usages"].values())
+        return summary
+
+    def _report_path(self, relative: str) -> str:
+        return os.path.join(self.reports_dir, *relative.split("/")) + REPORT_SUFFIX
+
+    def _write(self, path: str, report: Dict) -> None:
+        content = json.dumps(report, indent=2) + "\n"
+        if self._written.get(path) == content:
+            return
+        with atomic_write(path) as f:
+            f.write(content)
+        self._written[path] = content
+
+    def _remove(self, path: str) -> None:
+        self._written.pop(path, None)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class ChangeQueue:
+    """Changed paths reported by a change source, taken in debounced batches."""
+
+    def __init__(self):
+        self._paths: Set[str] = set()
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self.stopped = False
+
+    def add(self, paths: Iterable[str]) -> None:
+        with self._lock:
+            self._paths.update(paths)
+        self._changed.set()
+
+    def stop(self) -> None:
+        self.stopped = True
+        self._changed.set()
+
+    def take(self, debounce: float, max_wait: float = 5.0) -> Set[str]:
+        """Block until something changed, then until nothing has changed for
+        `debounce` seconds (at most `max_wait`); the paths changed meanwhile."""
+        self._changed.wait()
+        started = time.monotonic()
+        while not self.stopped:
+            self._changed.clear()
+            remaining = max_wait - (time.monotonic() - started)
+            if remaining <= 0 or not self._changed.wait(min(debounce, remaining)):
+                break
+        with self._lock:
+            paths, self._paths = self._paths, set()
+        return paths
+
+
+class PollingSource:
+    """Reports the files whose size or mtime changed, every `interval` seconds."""
+
+    def __init__(self, watch: ProjectWatch, queue: ChangeQueue, interval: float = 1.0):
+        self.watch = watch
+        self.queue = queue
+        self.interval = interval
+        self._stop = threading.Event()
+        self._signatures = self._stat()
+
+    def _stat(self) -> Dict[str, Tuple[int, int]]:
+        signatures = {}
+        for path in self.watch.files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signatures[path] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def poll(self) -> Set[str]:
+        signatures = self._stat()
+        previous, self._signatures = self._signatures, signatures
+        return {path for path in previous.keys() | signatures.keys() if previous.get(path) != signatures.get(path)}
+
+    def start(self) -> None:
+        def run() -> None:
+            while not self._stop.wait(self.interval):
+                changed = self.poll()
+                if changed:
+                    self.queue.add(changed)
+
+        threading.Thread(target=run, name="watch-poll", daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, watch: ProjectWatch, queue: ChangeQueue):
+        super().__init__()
+        self.watch = watch
+        self.queue = queue
+
+    def on_any_event(self, event) -> None:
+        if event.event_type in ("opened", "closed_no_write"):
+            return
+        if event.is_directory:
+            # A directory is "modified" whenever a file in it is; the file has its own event
+            if event.event_type == "modified":
+                return
+            relevant = [p for p in (event.src_path, getattr(event, "dest_path", ""))
+                        if p and not self.watch.ignores_directory(p)]
+        else:
+            relevant = [p for p in (event.src_path, getattr(event, "dest_path", "")) if p and self.watch.matches(p)]
+        if relevant:
+            self.queue.add(relevant)
+
+
+class WatchdogSource:
+    """Reports the paths of filesystem notifications under the project root."""
+
+    def __init__(self, watch: ProjectWatch, queue: ChangeQueue):
+        self.observer = Observer()
+        self.observer.schedule(_EventHandler(watch, queue), watch.root, recursive=True)
+
+    def start(self) -> None:
+        self.observer.start()
+
+    def stop(self) -> None:
+        self.observer.stop()
+        self.observer.join()
+
+
+def _print_summary(watch: ProjectWatch, batch: Dict[str, int]) -> None:
+    summary = watch.summary()
+    print(
+        f"Checked {batch['files']} file(s) ({batch['elements']} elements) in {batch['ms']} ms: "
+        f"{summary['v1_usages_left']} Modus 1 usage(s) left in {summary['files']} file(s), "
+        f"{len(summary['files_with_errors'])} failing",
+        flush=True,
+    )
+
+
+def run(watch: ProjectWatch, debounce: float = 0.3, poll_interval: float = 1.0, polling: bool = False,
+        queue: Optional[ChangeQueue] = None) -> None:
+    """Check the project, then re-check changed files until `queue` is stopped
+    (or Ctrl+C)."""
+    queue = queue or ChangeQueue()
+    if polling or Observer is None:
+        if not polling:
+            print(f"watchdog is not installed; polling for changes every {poll_interval:g} s", flush=True)
+        source = PollingSource(watch, queue, poll_interval)
+    else:
+        source = WatchdogSource(watch, queue)
+    # Watch first, so that no change made during the first check is missed
+    source.start()
+    try:
+        _print_summary(watch, watch.scan())
+        while not queue.stopped:
+            changed = queue.take(debounce)
+            if changed and not queue.stopped:
+                _print_summary(watch, watch.check(changed))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        source.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-check a project for Modus 1 usages as its files change.")
+    parser.add_argument("root", nargs="?", default=".", help="Project directory (default: .)")
+    parser.add_argument("--reports-dir", help="Where to write the reports (default: ROOT/analysis_reports)")
+    parser.add_argument("--extensions", default=",".join(DEFAULT_EXTENSIONS),
+                        help="Comma-separated file extensions to check")
+    parser.add_argument("--exclude", default=",".join(DEFAULT_EXCLUDES),
+                        help="Comma-separated directory names to skip")
+    parser.add_argument("--debounce", type=float, default=0.3,
+                        help="Seconds without changes before a batch is checked (default: 0.3)")
+    parser.add_argument("--poll-interval", type=float, default=1.0,
+                        help="Seconds between polls when watchdog is unavailable (default: 1)")
+    parser.add_argument("--polling", action="store_true", help="Poll even if watchdog is installed")
+    parser.add_argument("--once", action="store_true", help="Check the project once and exit")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    store = CatalogStore()
+    watch = ProjectWatch(
+        args.root,
+        lambda: rules_for(store.mapping(), store.prop_alignment()),
+        args.reports_dir,
+        extensions=[e.strip() for e in args.extensions.split(",") if e.strip()],
+        excludes=[e.strip() for e in args.exclude.split(",") if e.strip()],
+    )
+    if args.once:
+        _print_summary(watch, watch.scan())
+        return 0
+    print(f"Watching {watch.root}; reports in {watch.reports_dir} (Ctrl+C to stop)", flush=True)
+    run(watch, args.debounce, args.poll_interval, args.polling)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,147 +1,174 @@
 #!/usr/bin/env python3
 """
 Reorganize component files into a single folder with version suffixes.
-This script moves all component files from v1_components/ and v2_components/ 
-into the main component_analysis folder with -v1 and -v2 suffixes.
+This script materializes all component files from v1_components/ and v2_components/
+in the main component_analysis folder with -v1 and -v2 suffixes.
+
+Files are hardlinked rather than copied (falling back to a copy where links are
+not supported), and a manifest of source hashes is kept so that unchanged files
+are skipped and files whose source component was removed are pruned.
 """
 
+import hashlib
+import json
 import os
 import shutil
-import json
 from pathlib import Path
+from typing import Optional
+
+from modus_migration.catalog_io import write_json_atomic
+from split_components import HASH_MANIFEST_NAME, build_unified_index
+
+# Record of the flat files this script created, relative to component_analysis/
+MANIFEST_NAME = ".reorganize-manifest"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_json(path: Path, default=None):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def source_hash(path: Path, split_hashes: dict) -> str:
+    """Hash of a split file, taken from split_components' manifest when it is current."""
+    recorded = split_hashes.get(path.name)
+    stat = path.stat()
+    if recorded and recorded.get('size') == stat.st_size and recorded.get('mtime_ns') == stat.st_mtime_ns:
+        return recorded['sha256']
+    return file_sha256(path)
+
+
+def materialize(source: Path, target: Path) -> str:
+    """Atomically replace `target` with a hardlink to `source` (or a copy)."""
+    temp = target.with_name(f".{target.name}.tmp")
+    if temp.exists():
+        temp.unlink()
+    try:
+        os.link(source, temp)
+        method = "link"
+    except OSError:
+        shutil.copy2(source, temp)
+        method = "copy"
+    os.replace(temp, target)
+    return method
+
+
+def is_materialized(source: Path, target: Path, recorded: dict) -> bool:
+    """True if `target` still holds the content recorded for it."""
+    try:
+        if recorded.get('method') == 'link':
+            return os.path.samefile(source, target)
+        stat = target.stat()
+    except FileNotFoundError:
+        return False
+    return stat.st_size == recorded.get('size') and stat.st_mtime_ns == recorded.get('mtime_ns')
+
 
-def reorganize_components():
+def reorganize_components(component_analysis_dir: Optional[Path] = None):
     """Reorganize all component files into single folder with version suffixes"""
-    
-    # Base paths
-    base_dir = Path("/Users/eprabhu/Desktop/Projects/modus-code-generator-migration")
-    component_analysis_dir = base_dir / "modus_migration" / "component_analysis"
-    
+
+    # Base paths, relative to this script (the project root)
+    if component_analysis_dir is None:
+        base_dir = Path(__file__).resolve().parent
+        component_analysis_dir = base_dir / "modus_migration" / "component_analysis"
+    component_analysis_dir = Path(component_analysis_dir)
+
     # Source directories
     v1_dir = component_analysis_dir / "v1_components"
     v2_dir = component_analysis_dir / "v2_components"
-    
+
     print("🔄 Starting component reorganization...")
     print(f"Target folder: {component_analysis_dir}")
-    
+
     # Check if source directories exist
     if not v1_dir.exists():
         print(f"❌ V1 directory not found: {v1_dir}")
         return False
-        
+
     if not v2_dir.exists():
         print(f"❌ V2 directory not found: {v2_dir}")
         return False
-    
-    # Process V1 components
-    print(f"\n📁 Processing V1 components from {v1_dir}")
-    v1_files = list(v1_dir.glob("*.json"))
-    
-    for file_path in v1_files:
-        if file_path.name == "_index.json":
-            # Rename index file
-            new_name = "components-index-v1.json"
-        else:
-            # Add -v1 suffix to component files
-            component_name = file_path.stem  # filename without extension
-            new_name = f"{component_name}-v1.json"
-        
-        new_path = component_analysis_dir / new_name
-        
-        # Copy file to new location
-        shutil.copy2(file_path, new_path)
-        print(f"  ✅ {file_path.name} → {new_name}")
-    
-    # Process V2 components
-    print(f"\n📁 Processing V2 components from {v2_dir}")
-    v2_files = list(v2_dir.glob("*.json"))
-    
-    for file_path in v2_files:
-        if file_path.name == "_index.json":
-            # Rename index file
-            new_name = "components-index-v2.json"
-        else:
-            # Add -v2 suffix to component files
-            component_name = file_path.stem  # filename without extension
-            new_name = f"{component_name}-v2.json"
-        
-        new_path = component_analysis_dir / new_name
-        
-        # Copy file to new location
-        shutil.copy2(file_path, new_path)
-        print(f"  ✅ {file_path.name} → {new_name}")
-    
-    # Create unified index file
-    print(f"\n📋 Creating unified component index...")
-    
-    # Load both index files
-    v1_index_path = component_analysis_dir / "components-index-v1.json"
-    v2_index_path = component_analysis_dir / "components-index-v2.json"
-    
-    unified_index = {
-        "description": "Unified index of all Modus components (V1 and V2)",
-        "total_components": 0,
-        "v1_components": {},
-        "v2_components": {},
-        "file_naming": {
-            "v1_pattern": "{component_name}-v1.json",
-            "v2_pattern": "{component_name}-v2.json",
-            "index_v1": "components-index-v1.json",
-            "index_v2": "components-index-v2.json"
-        },
-        "usage": {
-            "get_v1_component": "Use filename: {component_name}-v1.json",
-            "get_v2_component": "Use filename: {component_name}-v2.json",
-            "examples": [
-                "button-v1.json (V1 button component)",
-                "button-v2.json (V2 button component)",
-                "text-input-v1.json (V1 text input)",
-                "text-input-v2.json (V2 text input)"
-            ]
-        }
-    }
-    
-    # Load V1 index
-    if v1_index_path.exists():
-        with open(v1_index_path, 'r', encoding='utf-8') as f:
-            v1_data = json.load(f)
-            unified_index["v1_components"] = v1_data.get("components", {})
-            print(f"  📊 Loaded {len(unified_index['v1_components'])} V1 components")
-    
-    # Load V2 index
-    if v2_index_path.exists():
-        with open(v2_index_path, 'r', encoding='utf-8') as f:
-            v2_data = json.load(f)
-            unified_index["v2_components"] = v2_data.get("components", {})
-            print(f"  📊 Loaded {len(unified_index['v2_components'])} V2 components")
-    
-    unified_index["total_components"] = len(unified_index["v1_components"]) + len(unified_index["v2_components"])
-    
-    # Save unified index
+
+    manifest_path = component_analysis_dir / MANIFEST_NAME
+    previous = load_json(manifest_path, {})
+    current = {}
+    stats = {"link": 0, "copy": 0, "unchanged": 0, "pruned": 0}
+
+    for version, source_dir in (("v1", v1_dir), ("v2", v2_dir)):
+        print(f"\n📁 Processing {version.upper()} components from {source_dir}")
+        split_hashes = load_json(source_dir / HASH_MANIFEST_NAME, {})
+
+        for file_path in sorted(source_dir.glob("*.json")):
+            if file_path.name == "_index.json":
+                # Rename index file
+                new_name = f"components-index-{version}.json"
+            else:
+                # Add version suffix to component files
+                new_name = f"{file_path.stem}-{version}.json"
+
+            new_path = component_analysis_dir / new_name
+            digest = source_hash(file_path, split_hashes)
+            recorded = previous.get(new_name)
+
+            if recorded and recorded.get('sha256') == digest and is_materialized(file_path, new_path, recorded):
+                current[new_name] = recorded
+                stats["unchanged"] += 1
+                continue
+
+            method = materialize(file_path, new_path)
+            stat = new_path.stat()
+            current[new_name] = {
+                "source": file_path.relative_to(component_analysis_dir).as_posix(),
+                "sha256": digest,
+                "method": method,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+            stats[method] += 1
+            print(f"  ✅ {file_path.name} → {new_name} ({method})")
+
+    # Prune flat files whose source component no longer exists
+    for stale_name in sorted(set(previous) - set(current)):
+        stale_path = component_analysis_dir / stale_name
+        if stale_path.exists():
+            stale_path.unlink()
+            stats["pruned"] += 1
+            print(f"  🗑️  Removed stale {stale_name}")
+
+    if current != previous:
+        write_json_atomic(str(manifest_path), dict(sorted(current.items())))
+
+    # The unified index is written by split_components.py; build it here only if missing
     unified_index_path = component_analysis_dir / "components-unified-index.json"
-    with open(unified_index_path, 'w', encoding='utf-8') as f:
-        json.dump(unified_index, f, indent=2)
-    
-    print(f"  ✅ Created unified index: {unified_index_path.name}")
-    
+    if not unified_index_path.exists():
+        print(f"\n📋 Creating unified component index...")
+        unified_index = build_unified_index(
+            load_json(component_analysis_dir / "components-index-v1.json"),
+            load_json(component_analysis_dir / "components-index-v2.json"),
+        )
+        write_json_atomic(str(unified_index_path), unified_index)
+        print(f"  ✅ Created unified index: {unified_index_path.name}")
+
     # Summary
     print(f"\n🎉 Reorganization Complete!")
     print(f"📊 Summary:")
-    print(f"  • V1 files moved: {len(v1_files)}")
-    print(f"  • V2 files moved: {len(v2_files)}")
-    print(f"  • Total files in folder: {len(v1_files) + len(v2_files) + 1} (including unified index)")
+    print(f"  • Files linked: {stats['link']}")
+    print(f"  • Files copied (links unsupported): {stats['copy']}")
+    print(f"  • Files unchanged: {stats['unchanged']}")
+    print(f"  • Stale files removed: {stats['pruned']}")
+    print(f"  • Total files in folder: {len(current) + 1} (including unified index)")
     print(f"  • Target folder: modus_migration/component_analysis/")
-    
-    # Show sample files
-    print(f"\n📁 Sample files created:")
-    sample_files = list(component_analysis_dir.glob("*-v*.json"))[:10]
-    for file_path in sample_files:
-        print(f"  • {file_path.name}")
-    
-    if len(sample_files) >= 10:
-        remaining = len(list(component_analysis_dir.glob("*-v*.json"))) - 10
-        print(f"  • ... and {remaining} more files")
-    
+
     return True
 
 if __name__ == "__main__":
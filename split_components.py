@@ -4,86 +4,180 @@ Split large component JSON files into individual component files.
 This improves data management and reduces file size for GitHub/n8n retrieval.
 """
 
+import hashlib
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from modus_migration.catalog_io import atomic_write, iter_catalog_items, write_json_atomic
 
-def split_components_json(input_file: str, output_dir: str, version: str):
-    """Split a components JSON file into individual component files."""
+# Per-directory record of the files written by this script and their hashes
+HASH_MANIFEST_NAME = ".split-hashes"
+
+
+class HashSkippingWriter:
+    """Write JSON files through a small thread pool, skipping unchanged ones.
+
+    A file is rewritten only if its rendered content hash differs from the one
+    recorded on the previous run, or the file was changed or removed since
+    (detected from its size/mtime, without reading it). With prune=True, files
+    written on a previous run but not on this one are deleted.
+    """
+
+    def __init__(self, output_dir: str, max_workers: int = 4, prune: bool = False):
+        self.output_dir = output_dir
+        self.prune = prune
+        self.manifest_path = os.path.join(output_dir, HASH_MANIFEST_NAME)
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.previous = json.load(f)
+        except (OSError, ValueError):
+            self.previous = {}
+        self.current = {}
+        self.written = 0
+        self.unchanged = 0
+        self.removed = 0
+        self._lock = threading.Lock()
+        self._futures = []
+        os.makedirs(output_dir, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(save_manifest=exc_type is None)
+
+    def _is_current(self, path: str, recorded: dict, digest: str) -> bool:
+        if recorded.get('sha256') != digest:
+            return False
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        return stat.st_size == recorded.get('size') and stat.st_mtime_ns == recorded.get('mtime_ns')
+
+    def _write(self, file_name: str, path: str, text: str, digest: str):
+        with atomic_write(path) as f:
+            f.write(text)
+        stat = os.stat(path)
+        with self._lock:
+            self.current[file_name] = {'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            self.written += 1
+
+    def write_json(self, file_name: str, data) -> bool:
+        """Queue `data` for writing to `file_name`; returns False if unchanged."""
+        text = json.dumps(data, indent=2)
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        path = os.path.join(self.output_dir, file_name)
+        recorded = self.previous.get(file_name)
+        if recorded and self._is_current(path, recorded, digest):
+            with self._lock:
+                self.current[file_name] = recorded
+                self.unchanged += 1
+            return False
+        self._futures.append(self._executor.submit(self._write, file_name, path, text, digest))
+        return True
+
+    def close(self, save_manifest: bool = True):
+        """Wait for pending writes, prune stale files and save the hash manifest."""
+        self._executor.shutdown(wait=True)
+        for future in self._futures:
+            future.result()
+        self._futures = []
+        if not save_manifest:
+            return
+        if self.prune:
+            for file_name in set(self.previous) - set(self.current):
+                try:
+                    os.unlink(os.path.join(self.output_dir, file_name))
+                    self.removed += 1
+                except FileNotFoundError:
+                    pass
+        if self.current != self.previous:
+            write_json_atomic(self.manifest_path, dict(sorted(self.current.items())))
+
+
+def split_components_json(input_file: str, output_dir: str, version: str, max_workers: int = 4):
+    """Split a components JSON file into individual component files plus `_index.json`.
+
+    The index is built from the in-memory component data; only files whose
+    content changed are rewritten. Returns the index data.
+    """
     print(f"\n{'='*60}")
     print(f"Splitting {input_file} into {output_dir}/")
     print(f"{'='*60}")
     
-    # Load the large JSON file
-    with open(input_file, 'r', encoding='utf-8') as f:
-        components_data = json.load(f)
-    
-    print(f"Found {len(components_data)} components")
-    
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Save each component to its own file
-    for component_name, component_data in components_data.items():
-        # Clean component name for filename (remove prefix)
-        clean_name = component_name.replace('modus-wc-', '').replace('modus-', '')
-        output_file = os.path.join(output_dir, f"{clean_name}.json")
+    index_entries = []
+    with HashSkippingWriter(output_dir, max_workers=max_workers, prune=True) as writer:
+        # Stream components out of the large JSON file and save each to its own file
+        for component_name, component_data in iter_catalog_items(input_file):
+            # Clean component name for filename (remove prefix)
+            clean_name = component_name.replace('modus-wc-', '').replace('modus-', '')
+            file_name = f"{clean_name}.json"
+            
+            # Add component name to the data
+            component_data_with_name = {
+                "component_name": component_name,
+                "version": version,
+                **component_data
+            }
+            
+            if writer.write_json(file_name, component_data_with_name):
+                print(f"  ✓ Saved: {file_name}")
+            
+            index_entries.append({
+                "file": file_name,
+                "component_name": component_name,
+                "props_count": len(component_data.get('props', [])),
+                "events_count": len(component_data.get('events', [])),
+                "slots_count": len(component_data.get('slots', []))
+            })
         
-        # Add component name to the data
-        component_data_with_name = {
-            "component_name": component_name,
+        index_entries.sort(key=lambda entry: entry["file"])
+        index_data = {
             "version": version,
-            **component_data
+            "total_components": len(index_entries),
+            "components": index_entries
         }
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(component_data_with_name, f, indent=2)
-        
-        print(f"  ✓ Saved: {clean_name}.json ({len(json.dumps(component_data)):,} bytes)")
+        index_written = writer.write_json('_index.json', index_data)
     
-    print(f"\n✅ Successfully split {len(components_data)} components")
-    return len(components_data)
+    print(f"  ✓ Index: _index.json ({'updated' if index_written else 'unchanged'})")
+    print(
+        f"\n✅ Split {len(index_entries)} components: {writer.written} files written, "
+        f"{writer.unchanged} unchanged, {writer.removed} stale files removed"
+    )
+    return index_data
 
 
-def create_index_file(output_dir: str, version: str):
-    """Create an index file listing all components."""
-    print(f"\nCreating index file for {output_dir}/")
-    
-    # Get all JSON files in the directory
-    json_files = sorted([f for f in os.listdir(output_dir) if f.endswith('.json') and f != '_index.json'])
-    
-    index_data = {
-        "version": version,
-        "total_components": len(json_files),
-        "components": []
+def build_unified_index(v1_index: dict, v2_index: dict) -> dict:
+    """Combine the per-version indexes into components-unified-index.json data."""
+    unified_index = {
+        "description": "Unified index of all Modus components (V1 and V2)",
+        "total_components": 0,
+        "v1_components": v1_index.get("components", []) if v1_index else [],
+        "v2_components": v2_index.get("components", []) if v2_index else [],
+        "file_naming": {
+            "v1_pattern": "{component_name}-v1.json",
+            "v2_pattern": "{component_name}-v2.json",
+            "index_v1": "components-index-v1.json",
+            "index_v2": "components-index-v2.json"
+        },
+        "usage": {
+            "get_v1_component": "Use filename: {component_name}-v1.json",
+            "get_v2_component": "Use filename: {component_name}-v2.json",
+            "examples": [
+                "button-v1.json (V1 button component)",
+                "button-v2.json (V2 button component)",
+                "text-input-v1.json (V1 text input)",
+                "text-input-v2.json (V2 text input)"
+            ]
+        }
     }
-    
-    for json_file in json_files:
-        file_path = os.path.join(output_dir, json_file)
-        with open(file_path, 'r', encoding='utf-8') as f:
-            component_data = json.load(f)
-        
-        component_name = component_data.get('component_name', json_file.replace('.json', ''))
-        props_count = len(component_data.get('props', []))
-        events_count = len(component_data.get('events', []))
-        slots_count = len(component_data.get('slots', []))
-        
-        index_data["components"].append({
-            "file": json_file,
-            "component_name": component_name,
-            "props_count": props_count,
-            "events_count": events_count,
-            "slots_count": slots_count
-        })
-    
-    # Save index file
-    index_file = os.path.join(output_dir, '_index.json')
-    with open(index_file, 'w', encoding='utf-8') as f:
-        json.dump(index_data, f, indent=2)
-    
-    print(f"  ✓ Created index: _index.json")
-    return index_data
+    unified_index["total_components"] = len(unified_index["v1_components"]) + len(unified_index["v2_components"])
+    return unified_index
 
 
 def move_framework_data():
@@ -130,10 +224,11 @@ def main():
     # Split V1 components
     v1_input = os.path.join(base_dir, 'v1_components.json')
     v1_output = os.path.join(base_dir, 'v1_components')
+    v1_index = None
     
     if os.path.exists(v1_input):
-        v1_count = split_components_json(v1_input, v1_output, 'v1')
-        v1_index = create_index_file(v1_output, 'v1')
+        v1_index = split_components_json(v1_input, v1_output, 'v1')
+        v1_count = v1_index["total_components"]
     else:
         print(f"❌ Error: {v1_input} not found")
         v1_count = 0
@@ -141,14 +236,22 @@ def main():
     # Split V2 components
     v2_input = os.path.join(base_dir, 'v2_components.json')
     v2_output = os.path.join(base_dir, 'v2_components')
+    v2_index = None
     
     if os.path.exists(v2_input):
-        v2_count = split_components_json(v2_input, v2_output, 'v2')
-        v2_index = create_index_file(v2_output, 'v2')
+        v2_index = split_components_json(v2_input, v2_output, 'v2')
+        v2_count = v2_index["total_components"]
     else:
         print(f"❌ Error: {v2_input} not found")
         v2_count = 0
     
+    # Unified index, built from the in-memory per-version indexes
+    with HashSkippingWriter(base_dir) as writer:
+        unified_written = writer.write_json(
+            'components-unified-index.json', build_unified_index(v1_index, v2_index)
+        )
+    print(f"\n📋 Unified index: components-unified-index.json ({'updated' if unified_written else 'unchanged'})")
+    
     # Note about framework data
     move_framework_data()
     
@@ -158,7 +261,7 @@ def main():
     print("="*60)
     print(f"V1 Components: {v1_count} components split into individual files")
     print(f"V2 Components: {v2_count} components split into individual files")
-    print(f"Total Files Created: {v1_count + v2_count + 2} (including 2 index files)")
+    print(f"Total Files: {v1_count + v2_count + 3} (including 2 version indexes and the unified index)")
     print("\nDirectory Structure:")
     print("  component_analysis/")
     print("    ├── v1_components/")
@@ -171,6 +274,7 @@ def main():
     print(f"    │   ├── button.json")
     print(f"    │   ├── alert.json")
     print(f"    │   └── ... ({v2_count} total)")
+    print("    ├── components-unified-index.json")
     print("    ├── component_mapping.json")
     print("    ├── v1_angular_framework_data.json")
     print("    ├── v1_react_framework_data.json")
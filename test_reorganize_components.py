@@ -0,0 +1,88 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import reorganize_components
+from reorganize_components import MANIFEST_NAME
+
+
+class TestReorganizeComponents(unittest.TestCase):
+    def setUp(self):
+        self.analysis_dir = Path(tempfile.mkdtemp())
+        for version in ("v1", "v2"):
+            (self.analysis_dir / f"{version}_components").mkdir()
+            self._write(f"{version}_components/_index.json", {"version": version})
+            self._write(f"{version}_components/button.json", {"component_name": "button", "version": version})
+        self._write("v1_components/alert.json", {"component_name": "alert"})
+
+    def tearDown(self):
+        shutil.rmtree(self.analysis_dir, ignore_errors=True)
+
+    def _write(self, relative, data):
+        with open(self.analysis_dir / relative, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def _reorganize(self):
+        """The flat files materialized by a run."""
+        with mock.patch.object(reorganize_components, "materialize", wraps=reorganize_components.materialize) as spy:
+            self.assertTrue(reorganize_components.reorganize_components(self.analysis_dir))
+        return sorted(call.args[1].name for call in spy.call_args_list)
+
+    def _manifest(self):
+        with open(self.analysis_dir / MANIFEST_NAME, encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_links_files_and_skips_them_on_the_next_run(self):
+        self.assertEqual(self._reorganize(), [
+            "alert-v1.json", "button-v1.json", "button-v2.json", "components-index-v1.json", "components-index-v2.json",
+        ])
+        self.assertTrue(os.path.samefile(self.analysis_dir / "v2_components/button.json",
+                                         self.analysis_dir / "button-v2.json"))
+        self.assertEqual(self._manifest()["button-v2.json"]["source"], "v2_components/button.json")
+        self.assertEqual({entry["method"] for entry in self._manifest().values()}, {"link"})
+        self.assertTrue((self.analysis_dir / "components-unified-index.json").exists())
+
+        self.assertEqual(self._reorganize(), [])
+
+    def test_changed_source_is_relinked_and_removed_source_pruned(self):
+        self._reorganize()
+        os.remove(self.analysis_dir / "v1_components/button.json")
+        self._write("v1_components/button.json", {"component_name": "button", "props": []})
+        os.remove(self.analysis_dir / "v1_components/alert.json")
+        self.assertEqual(self._reorganize(), ["button-v1.json"])
+        with open(self.analysis_dir / "button-v1.json", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["props"], [])
+        self.assertFalse((self.analysis_dir / "alert-v1.json").exists())
+        self.assertNotIn("alert-v1.json", self._manifest())
+
+    def test_hand_replaced_file_is_restored(self):
+        self._reorganize()
+        os.remove(self.analysis_dir / "button-v2.json")
+        self._write("button-v2.json", {"edited": True})
+        self.assertEqual(self._reorganize(), ["button-v2.json"])
+        self.assertTrue(os.path.samefile(self.analysis_dir / "v2_components/button.json",
+                                         self.analysis_dir / "button-v2.json"))
+
+    def test_copies_where_links_are_unsupported(self):
+        with mock.patch("os.link", side_effect=OSError("links not supported")):
+            self._reorganize()
+        self.assertEqual({entry["method"] for entry in self._manifest().values()}, {"copy"})
+        self.assertFalse(os.path.samefile(self.analysis_dir / "v1_components/alert.json",
+                                          self.analysis_dir / "alert-v1.json"))
+        self.assertEqual(self._reorganize(), [])
+
+        # A copy edited by hand no longer matches its recorded size and mtime
+        with open(self.analysis_dir / "alert-v1.json", "a", encoding="utf-8") as f:
+            f.write("\n")
+        with mock.patch("os.link", side_effect=OSError("links not supported")):
+            self.assertEqual(self._reorganize(), ["alert-v1.json"])
+        with open(self.analysis_dir / "alert-v1.json", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"component_name": "alert"})
+
+
+if __name__ == "__main__":
+    unittest.main()
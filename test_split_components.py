@@ -0,0 +1,90 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from split_components import HASH_MANIFEST_NAME, HashSkippingWriter, split_components_json
+
+CATALOG = {
+    "modus-wc-button": {"props": [{"name": "color"}], "events": []},
+    "modus-wc-badge": {"props": [], "events": []},
+}
+
+
+class TestSplitComponents(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.input_file = os.path.join(self.directory, "v2_components.json")
+        self.output_dir = os.path.join(self.directory, "v2_components")
+        self._write_catalog(CATALOG)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _write_catalog(self, catalog):
+        with open(self.input_file, "w", encoding="utf-8") as f:
+            json.dump(catalog, f)
+
+    def _read(self, file_name):
+        with open(os.path.join(self.output_dir, file_name), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _split(self):
+        """split_components_json(), and the writer it used."""
+        writers = []
+
+        def writer(*args, **kwargs):
+            writers.append(HashSkippingWriter(*args, **kwargs))
+            return writers[-1]
+
+        with mock.patch("split_components.HashSkippingWriter", side_effect=writer):
+            index = split_components_json(self.input_file, self.output_dir, "v2", max_workers=2)
+        return index, writers[0]
+
+    def test_second_run_writes_nothing(self):
+        index, writer = self._split()
+        self.assertEqual((writer.written, writer.unchanged), (3, 0))
+        self.assertEqual([c["file"] for c in index["components"]], ["badge.json", "button.json"])
+        self.assertEqual(self._read("button.json")["component_name"], "modus-wc-button")
+        self.assertEqual(set(self._read(HASH_MANIFEST_NAME)), {"_index.json", "badge.json", "button.json"})
+
+        _, writer = self._split()
+        self.assertEqual((writer.written, writer.unchanged, writer.removed), (0, 3, 0))
+
+    def test_changed_and_removed_components(self):
+        self._split()
+        self._write_catalog({"modus-wc-button": {"props": [], "events": []}})
+        index, writer = self._split()
+        # button and the index changed; badge is no longer in the catalog
+        self.assertEqual((writer.written, writer.unchanged, writer.removed), (2, 0, 1))
+        self.assertEqual(self._read("button.json")["props"], [])
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "badge.json")))
+        self.assertNotIn("badge.json", self._read(HASH_MANIFEST_NAME))
+        self.assertEqual(index["total_components"], 1)
+
+    def test_hand_edited_file_is_rewritten(self):
+        self._split()
+        with open(os.path.join(self.output_dir, "badge.json"), "w", encoding="utf-8") as f:
+            f.write("{}")
+        os.remove(os.path.join(self.output_dir, "button.json"))
+        _, writer = self._split()
+        self.assertEqual((writer.written, writer.unchanged), (2, 1))
+        self.assertEqual(self._read("badge.json")["component_name"], "modus-wc-badge")
+        self.assertEqual(self._read("button.json")["component_name"], "modus-wc-button")
+
+    def test_failed_run_keeps_the_previous_manifest(self):
+        with HashSkippingWriter(self.output_dir) as writer:
+            writer.write_json("a.json", {"a": 1})
+        manifest = self._read(HASH_MANIFEST_NAME)
+        with self.assertRaises(RuntimeError):
+            with HashSkippingWriter(self.output_dir, prune=True) as writer:
+                writer.write_json("b.json", {"b": 1})
+                raise RuntimeError("interrupted")
+        self.assertEqual(self._read(HASH_MANIFEST_NAME), manifest)
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "a.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()